@@ -1,52 +1,41 @@
 """
 Root package initialization for the Banking System project.
 Exposes core components for easy access across layers.
+
+The components are imported on first access (`banking_system.AccountService`, or
+`from banking_system import AccountService`), so `import banking_system` itself is
+cheap and a process only loads the layers it uses. Logging is configured by the
+entry points (the API, scripts), not by importing the package.
 """
+import importlib
+
+# Type checkers treat this name as true; importing it from typing would cost more than
+# the rest of this module
+TYPE_CHECKING = False
 
 # Package metadata
 __version__ = "1.0.0"
 __author__ = "CSC2218 Group-4-Project-2025"
 
-# Import key classes/functions to simplify external imports
-from banking_system.domain_layer.entities.bank_accounts.checking_account import (
-    CheckingAccount,
-)
-from banking_system.domain_layer.entities.bank_accounts.savings_account import (
-    SavingsAccount,
-)
-
-from banking_system.domain_layer.entities.bank_accounts.account import (
-    Account,
-    AccountStatus,
-    AccountType,
-)
-
-from banking_system.domain_layer.entities.transaction import (
-    Transaction,
-    TransactionType
-)
-
-from banking_system.application_layer.services import (
-    AccountService,
-    TransactionService
-)
-
-from banking_system.application_layer.repository_interfaces import(
-    AccountRepositoryInterface,TransactionRepositoryInterface, StatementAdapterInterface
-)
-
-from banking_system.infrastructure_layer.account_repository import (
-    AccountRepository,
-)
-
-from banking_system.infrastructure_layer.transaction_repository import (
-    TransactionRepository,
-)
-
-
-from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import(
-    DictionaryTransactionStrategy
-)
+# Public name -> module defining it, imported when the name is first used
+_EXPORTS = {
+    "CheckingAccount": "banking_system.domain_layer.entities.bank_accounts.checking_account",
+    "SavingsAccount": "banking_system.domain_layer.entities.bank_accounts.savings_account",
+    "Account": "banking_system.domain_layer.entities.bank_accounts.account",
+    "AccountStatus": "banking_system.domain_layer.entities.bank_accounts.account",
+    "AccountType": "banking_system.domain_layer.entities.bank_accounts.account",
+    "Transaction": "banking_system.domain_layer.entities.transaction",
+    "TransactionType": "banking_system.domain_layer.entities.transaction",
+    "TransactionRecord": "banking_system.domain_layer.entities.transaction_record",
+    "AccountService": "banking_system.application_layer.services",
+    "TransactionService": "banking_system.application_layer.services",
+    "AccountRepositoryInterface": "banking_system.application_layer.repository_interfaces",
+    "TransactionRepositoryInterface": "banking_system.application_layer.repository_interfaces",
+    "StatementAdapterInterface": "banking_system.application_layer.repository_interfaces",
+    "AccountRepository": "banking_system.infrastructure_layer.account_repository",
+    "TransactionRepository": "banking_system.infrastructure_layer.transaction_repository",
+    "DictionaryTransactionStrategy": "banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy",
+}
 
 # Define what gets imported with `from banking_system import *`
 __all__ = [
@@ -54,6 +43,7 @@ __all__ = [
     "SavingsAccount",
     "Transaction",
     "TransactionType",
+    "TransactionRecord",
     "AccountService",
     "TransactionService",
     "AccountRepository",
@@ -67,10 +57,33 @@ __all__ = [
     "StatementAdapterInterface",
 ]
 
-# Optional: Initialize package-wide configurations
-def _initialize_package():
-    import logging
-    logging.basicConfig(level=logging.INFO)
-    logging.getLogger(__name__).info("Banking system package initialized")
 
-_initialize_package()
\ No newline at end of file
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    # Cached as a module global, so later lookups skip this hook
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+if TYPE_CHECKING:
+    from banking_system.domain_layer.entities.bank_accounts.checking_account import CheckingAccount
+    from banking_system.domain_layer.entities.bank_accounts.savings_account import SavingsAccount
+    from banking_system.domain_layer.entities.bank_accounts.account import Account, AccountStatus, AccountType
+    from banking_system.domain_layer.entities.transaction import Transaction, TransactionType
+    from banking_system.domain_layer.entities.transaction_record import TransactionRecord
+    from banking_system.application_layer.services import AccountService, TransactionService
+    from banking_system.application_layer.repository_interfaces import (
+        AccountRepositoryInterface, TransactionRepositoryInterface, StatementAdapterInterface,
+    )
+    from banking_system.infrastructure_layer.account_repository import AccountRepository
+    from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+    from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import (
+        DictionaryTransactionStrategy,
+    )
@@ -1 +1,15 @@
-from .services import AccountService, TransactionService
\ No newline at end of file
+import importlib
+
+# Imported on first access, so that importing a submodule does not load the services
+_EXPORTS = {
+    "AccountService": "banking_system.application_layer.services",
+    "TransactionService": "banking_system.application_layer.services",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(module), name)
+    return value
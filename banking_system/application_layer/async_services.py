@@ -0,0 +1,160 @@
+from typing import List
+from banking_system import Transaction, Account
+from banking_system.application_layer.repository_interfaces import AsyncAccountRepositoryInterface, AsyncTransactionRepositoryInterface, StaleAccountVersionError
+from .services import NotificationService, LoggingService
+from .util import abstractions
+from .util.bounded_executor import BoundedExecutor, default_executor
+from .util.instrumentation import instrumented
+from .util.striped_locks import AsyncStripedLockManager, default_async_lock_manager
+
+# Async variants of the services for the FastAPI endpoints.
+# They never hold thread locks across an await: coroutines on the same account queue on
+# asyncio lock stripes. Those stripes do not exclude holders of the synchronous services'
+# thread stripes (nor other processes); what keeps a sync and an async writer from losing
+# each other's updates is that every account write in the application layer, interest
+# runs included, is a version compare-and-swap re-run on conflict.
+
+
+class AsyncAccountService:
+    def __init__(self, account_repository: AsyncAccountRepositoryInterface, lazy_interest: bool = False):
+        self.account_repository = account_repository
+        self.lazy_interest = lazy_interest
+
+    @instrumented("AsyncAccountService", "create_account")
+    async def create_account(self, account_type, initial_deposit=0.0, interest_rate=0.05):
+        """
+        Creates a new account with the specified type and initial deposit amount.
+        Returns the ID of the newly created account.
+        """
+        account = abstractions.build_account(account_type, initial_deposit, interest_rate, lazy_interest=self.lazy_interest)
+        await self.account_repository.create_account(account)
+        return account.account_id
+
+
+class AsyncTransactionService:
+    def __init__(self,
+                 account_repository: AsyncAccountRepositoryInterface,
+                 transaction_repository: AsyncTransactionRepositoryInterface,
+                 notification_service: NotificationService,
+                 logging_service: LoggingService,
+                 executor: BoundedExecutor = default_executor,
+                 lock_manager: AsyncStripedLockManager = default_async_lock_manager,
+                 max_retries: int = 3):
+        self.account_repository = account_repository
+        self.transaction_repository = transaction_repository
+        self.notification_service = notification_service
+        self.logging_service = logging_service
+        self.executor = executor
+        self.lock_manager = lock_manager
+        self.max_retries = max_retries
+
+    @instrumented("AsyncTransactionService", "deposit")
+    async def deposit(self, account_id, amount, expected_version=None) -> Transaction:
+        """
+        Deposits the specified amount into the account.
+        If `expected_version` is given, fails with StaleAccountVersionError unless the account is still at that version.
+        Returns a Transaction object representing the deposit.
+        """
+        return await abstractions.retry_on_conflict_async(
+            lambda: self._apply(account_id, lambda account: account.deposit(amount), expected_version),
+            self.max_retries,
+        )
+
+    @instrumented("AsyncTransactionService", "withdraw")
+    async def withdraw(self, account_id, amount, expected_version=None) -> Transaction:
+        """
+        Withdraws the specified amount from the account if sufficient funds are available.
+        If `expected_version` is given, fails with StaleAccountVersionError unless the account is still at that version.
+        Returns a Transaction object representing the withdrawal.
+        """
+        return await abstractions.retry_on_conflict_async(
+            lambda: self._apply(account_id, lambda account: account.withdraw(amount), expected_version),
+            self.max_retries,
+        )
+
+    @instrumented("AsyncTransactionService", "get_transaction_history")
+    async def get_transaction_history(self, account_id) -> List[Transaction]:
+        """
+        Retrieves the transactions recorded for the specified account.
+        """
+        return await self.transaction_repository.get_transactions_by_account_id(account_id)
+
+    async def _apply(self, account_id, operation, expected_version=None) -> Transaction:
+        async with self.lock_manager.locked(account_id):
+            account: Account = await self.account_repository.get_account_by_id(account_id)
+            if not account:
+                raise ValueError(f"Account with ID {account_id} not found")
+            if expected_version is not None and account.version != expected_version:
+                raise StaleAccountVersionError(f"Account {account_id} is at version {account.version}, not {expected_version}")
+
+            version = account.version
+            transaction: Transaction = operation(account)
+
+            await abstractions.save_transaction_async(
+                self.account_repository,
+                self.transaction_repository,
+                self.notification_service,
+                self.logging_service,
+                account,
+                transaction,
+                self.executor,
+                expected_version=version,
+            )
+        return transaction
+
+
+class AsyncFundTransferService:
+    def __init__(self,
+                 account_repository: AsyncAccountRepositoryInterface,
+                 transaction_repository: AsyncTransactionRepositoryInterface,
+                 notification_service: NotificationService,
+                 logging_service: LoggingService,
+                 executor: BoundedExecutor = default_executor,
+                 lock_manager: AsyncStripedLockManager = default_async_lock_manager,
+                 max_retries: int = 3):
+        self.account_repository = account_repository
+        self.transaction_repository = transaction_repository
+        self.notification_service = notification_service
+        self.logging_service = logging_service
+        self.executor = executor
+        self.lock_manager = lock_manager
+        self.max_retries = max_retries
+
+    @instrumented("AsyncFundTransferService", "transfer_funds")
+    async def transfer_funds(self, source_account_id, destination_account_id, amount):
+        """
+        Transfers the specified amount from the source account to the destination account.
+        Returns the recorded transfer transaction.
+        """
+        return await abstractions.retry_on_conflict_async(
+            lambda: self._transfer(source_account_id, destination_account_id, amount),
+            self.max_retries,
+        )
+
+    async def _transfer(self, source_account_id, destination_account_id, amount):
+        if source_account_id == destination_account_id:
+            raise ValueError("Cannot transfer funds to the same account")
+
+        async with self.lock_manager.locked(source_account_id, destination_account_id):
+            source_account: Account = await self.account_repository.get_account_by_id(source_account_id)
+            destination_account: Account = await self.account_repository.get_account_by_id(destination_account_id)
+            if not source_account:
+                raise ValueError(f"Source account with ID {source_account_id} not found")
+            if not destination_account:
+                raise ValueError(f"Destination account with ID {destination_account_id} not found")
+
+            source_version, destination_version = source_account.version, destination_account.version
+            transfer_transaction = source_account.transfer(amount, destination_account)
+            await abstractions.save_transaction_async(
+                self.account_repository,
+                self.transaction_repository,
+                self.notification_service,
+                self.logging_service,
+                source_account,
+                transfer_transaction,
+                self.executor,
+                expected_version=source_version,
+                destination_account=destination_account,
+                destination_expected_version=destination_version,
+            )
+        return transfer_transaction
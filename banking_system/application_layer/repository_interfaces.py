@@ -1,7 +1,22 @@
 import os, datetime
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
-from domain_layer import Transaction
+from typing import List, Optional, Dict, Any, AsyncIterator, Iterator
+from banking_system.domain_layer import Transaction
+from banking_system.application_layer.util.pagination import DEFAULT_PAGE_SIZE, EXPORT_CHUNK_SIZE, TransactionPage, paginate
+
+
+class ConcurrentUpdateError(Exception):
+    """
+    Raised when an account was modified by someone else between being read and written back
+    (a failed compare-and-swap). Services retry the operation a bounded number of times.
+    """
+
+
+class StaleAccountVersionError(ConcurrentUpdateError):
+    """
+    Raised when a caller-supplied expected account version (e.g. an HTTP If-Match header)
+    does not match the stored version. Never retried: the caller has to re-read.
+    """
 
 
 class AccountRepositoryInterface(ABC):
@@ -34,30 +49,108 @@ class AccountRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    def update_account(self, account):
+    def update_account(self, account, expected_version=None):
         """
         Updates an existing account in the persistence layer.
+        Every successful update increments the stored version and sets `account.version` to it.
         
         Args:
             account: The account entity with updated values
+            expected_version: When given, the update is a compare-and-swap: it only happens
+                if the stored version still equals this value
+
+        Returns:
+            True if the account was updated, False if it does not exist or the version did not match
         """
         pass
     
     # New methods for Week 2
     @abstractmethod
-    def update_accounts_atomically(self, source_account, destination_account):
+    def update_accounts_atomically(self, source_account, destination_account, expected_versions=None):
         """
         Updates two accounts atomically as part of a transfer operation.
         
         Args:
             source_account: The source account entity with updated balance
             destination_account: The destination account entity with updated balance
+            expected_versions: Optional (source_version, destination_version) pair; both
+                must match the stored versions for either update to happen
             
         Returns:
             True if both accounts were updated successfully, False otherwise
         """
         pass
 
+    def update_accounts(self, accounts, expected_versions=None):
+        """
+        Updates many accounts in one call (e.g. a month-end interest run).
+        Implementations should override this with a real, all-or-nothing bulk write;
+        the default falls back to one update_account call per account.
+
+        Args:
+            accounts: The account entities with updated values
+            expected_versions: Optional list of expected versions, one per account
+
+        Returns:
+            True if every account was updated successfully, False otherwise
+        """
+        if expected_versions is None:
+            expected_versions = [None] * len(accounts)
+        return all([
+            self.update_account(account, expected_version=version) is not False
+            for account, version in zip(accounts, expected_versions)
+        ])
+
+
+class AsyncAccountRepositoryInterface(ABC):
+    """
+    Abstract interface for account repository operations awaited from async code.
+    Mirrors AccountRepositoryInterface; implementations must not block the event loop.
+    """
+
+    @abstractmethod
+    async def create_account(self, account):
+        """
+        Creates a new account in the persistence layer.
+
+        Args:
+            account: The account entity to persist
+        """
+        pass
+
+    @abstractmethod
+    async def get_account_by_id(self, account_id):
+        """
+        Retrieves an account by its ID.
+
+        Args:
+            account_id: The ID of the account to retrieve
+
+        Returns:
+            The account entity if found, None otherwise
+        """
+        pass
+
+    @abstractmethod
+    async def update_account(self, account, expected_version=None):
+        """
+        Updates an existing account, optionally as a compare-and-swap on `expected_version`.
+
+        Returns:
+            True if the account was updated, False if it does not exist or the version did not match
+        """
+        pass
+
+    @abstractmethod
+    async def update_accounts_atomically(self, source_account, destination_account, expected_versions=None):
+        """
+        Updates two accounts atomically as part of a transfer operation.
+
+        Returns:
+            True if both accounts were updated successfully, False otherwise
+        """
+        pass
+
 
 class TransactionRepositoryInterface(ABC):
     """
@@ -75,6 +168,20 @@ class TransactionRepositoryInterface(ABC):
         """
         pass
     
+    def save_transactions(self, transactions):
+        """
+        Saves many transactions in one call (e.g. a batch of postings).
+        Implementations should override this with a real bulk append;
+        the default falls back to one save_transaction call per transaction.
+
+        Args:
+            transactions: The transaction entities to persist
+
+        Returns:
+            The list of persisted transaction IDs
+        """
+        return [self.save_transaction(transaction) for transaction in transactions]
+
     @abstractmethod
     def get_transactions_by_account_id(self, account_id):
         """
@@ -88,6 +195,46 @@ class TransactionRepositoryInterface(ABC):
         """
         pass
     
+    def get_transactions_page(self, account_id, cursor=None, limit=DEFAULT_PAGE_SIZE, start=None, end=None) -> TransactionPage:
+        """
+        Retrieves one page of an account's transactions, oldest first.
+        Implementations should override this with an indexed lookup; the default
+        loads the full history and pages through it by offset.
+
+        Args:
+            account_id: The ID of the account
+            cursor: The `next_cursor` of the previous page, or None for the first page
+            limit: Maximum number of transactions on the page
+            start: Only include transactions at or after this time
+            end: Only include transactions strictly before this time
+
+        Returns:
+            A TransactionPage with the transactions and the cursor for the next page
+        """
+        return paginate(self.get_transactions_by_account_id(account_id), cursor, limit, start, end)
+
+    def iter_transactions_by_account_id(self, account_id, start=None, end=None, chunk_size=EXPORT_CHUNK_SIZE) -> Iterator:
+        """
+        Iterates over an account's transactions, oldest first, without materializing the
+        whole history: pages of `chunk_size` are fetched as the iterator is consumed.
+
+        Args:
+            account_id: The ID of the account
+            start: Only include transactions at or after this time
+            end: Only include transactions strictly before this time
+            chunk_size: Number of transactions fetched per page
+
+        Returns:
+            An iterator of transaction entities
+        """
+        cursor = None
+        while True:
+            page = self.get_transactions_page(account_id, cursor=cursor, limit=chunk_size, start=start, end=end)
+            yield from page.transactions
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+
     # New methods for Week 2
     @abstractmethod
     def save_transfer_transaction(self, transfer_transaction):
@@ -116,6 +263,65 @@ class TransactionRepositoryInterface(ABC):
         pass
 
 
+class AsyncTransactionRepositoryInterface(ABC):
+    """
+    Abstract interface for transaction repository operations awaited from async code.
+    Mirrors TransactionRepositoryInterface; implementations must not block the event loop.
+    """
+
+    @abstractmethod
+    async def save_transaction(self, transaction):
+        """
+        Saves a transaction to the persistence layer.
+
+        Args:
+            transaction: The transaction entity to persist
+        """
+        pass
+
+    @abstractmethod
+    async def get_transactions_by_account_id(self, account_id):
+        """
+        Retrieves all transactions for a specific account.
+
+        Args:
+            account_id: The ID of the account
+
+        Returns:
+            A list of transaction entities
+        """
+        pass
+
+    @abstractmethod
+    async def get_transactions_page(self, account_id, cursor=None, limit=DEFAULT_PAGE_SIZE, start=None, end=None):
+        """
+        Retrieves one page of an account's transactions, oldest first
+        (see TransactionRepositoryInterface.get_transactions_page).
+        """
+        pass
+
+    @abstractmethod
+    def iter_transactions_by_account_id(self, account_id, start=None, end=None, chunk_size=EXPORT_CHUNK_SIZE) -> AsyncIterator:
+        """
+        Asynchronously iterates over an account's transactions, oldest first, one page at a time
+        (see TransactionRepositoryInterface.iter_transactions_by_account_id).
+        """
+        pass
+
+    @abstractmethod
+    async def get_transaction_by_id(self, transaction_id):
+        """
+        Retrieves a transaction by its ID.
+
+        Args:
+            transaction_id: The ID of the transaction to retrieve
+
+        Returns:
+            The transaction entity if found, None otherwise
+        """
+        pass
+
+
 # New interfaces for Week 2
 
 class NotificationAdapterInterface(ABC):
@@ -167,6 +373,106 @@ class NotificationAdapterInterface(ABC):
         pass
 
 
+class NotificationRepositoryInterface(ABC):
+    """
+    Abstract interface for notification preference storage.
+    Notification types are stored normalized to lower case ("email", "sms").
+    To be implemented by concrete infrastructure classes.
+    """
+
+    @abstractmethod
+    def save_notification_preference(self, account_id, notification_type):
+        """
+        Saves a notification preference for an account.
+
+        Returns:
+            True if the preference was saved
+        """
+        pass
+
+    @abstractmethod
+    def remove_notification_preference(self, account_id, notification_type):
+        """
+        Removes a notification preference for an account.
+
+        Returns:
+            True if the preference existed and was removed, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def get_notification_preferences(self, account_id):
+        """
+        Gets all notification types an account subscribed to.
+        """
+        pass
+
+    @abstractmethod
+    def get_subscribers(self, notification_type):
+        """
+        Gets the ids of every account subscribed to a notification type,
+        e.g. to broadcast to all SMS subscribers.
+        """
+        pass
+
+    def save_notification_preferences(self, preferences):
+        """
+        Saves many (account_id, notification_type) pairs in one call.
+        Implementations should override this with a real bulk write.
+
+        Returns:
+            The number of pairs that were not already saved
+        """
+        saved = 0
+        for account_id, notification_type in preferences:
+            before = len(self.get_notification_preferences(account_id))
+            self.save_notification_preference(account_id, notification_type)
+            saved += len(self.get_notification_preferences(account_id)) - before
+        return saved
+
+    def remove_notification_preferences(self, preferences):
+        """
+        Removes many (account_id, notification_type) pairs in one call.
+
+        Returns:
+            The number of pairs that existed and were removed
+        """
+        return sum(
+            1 for account_id, notification_type in preferences
+            if self.remove_notification_preference(account_id, notification_type)
+        )
+
+    def load_notification_preferences(self, account_ids):
+        """
+        Gets the notification types of many accounts in one call.
+
+        Returns:
+            A dict of account_id to list of notification types; accounts
+            without preferences map to an empty list
+        """
+        return {account_id: self.get_notification_preferences(account_id) for account_id in account_ids}
+
+
+class NotificationChannelInterface(ABC):
+    """
+    Delivery of notification messages over one medium (email, SMS, ...).
+    To be implemented by concrete infrastructure classes.
+    """
+
+    @abstractmethod
+    def send_batch(self, messages):
+        """
+        Delivers a batch of messages.
+
+        Args:
+            messages: NotificationMessage objects, all for this channel
+
+        Raises:
+            Any delivery error; the whole batch is then counted as failed
+        """
+        pass
+
+
 class LoggingRepositoryInterface(ABC):
     """
     Abstract interface for transaction and system logging operations.
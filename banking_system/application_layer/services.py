@@ -1,46 +1,35 @@
+import logging
 from typing import List
-from uuid import uuid4
-from datetime import datetime
-from banking_system import Transaction, TransactionType, Account, CheckingAccount, SavingsAccount
-from banking_system.application_layer.repository_interfaces import AccountRepositoryInterface, NotificationAdapterInterface, TransactionRepositoryInterface, StatementAdapterInterface
-from domain_layer import InterestStrategy,SavingsInterestStrategy, CheckingInterestStrategy, LimitConstraint, TransactionType
-from .util import abstractions
+from banking_system import Transaction, TransactionType, Account
+from banking_system.application_layer.repository_interfaces import AccountRepositoryInterface, NotificationAdapterInterface, TransactionRepositoryInterface, StatementAdapterInterface, StaleAccountVersionError, ConcurrentUpdateError
+from .util import abstractions, interest_engine
+from .util.interest_engine import InterestBatchReport
+from .util.instrumentation import INTEREST_ACCOUNTS, instrumented
+from .util.log_pipeline import log_fields
+from banking_system.domain_layer.util.tracing import traced
+from .util.batch_engine import BatchOperation, BatchReport, TRANSFER
+from .util.notification_outbox import NotificationOutbox, transaction_message
+from .util.striped_locks import StripedLockManager, default_lock_manager
 
 class AccountService:
-    def __init__(self, account_repository: AccountRepositoryInterface):
+    def __init__(self, account_repository: AccountRepositoryInterface, lazy_interest: bool = False):
+        """
+        Args:
+            lazy_interest: Create accounts that accrue interest in closed form on access
+                instead of relying on month-end interest runs.
+        """
         self.account_repository = account_repository
+        self.lazy_interest = lazy_interest
     
+    @instrumented("AccountService", "create_account")
     def create_account(self, account_type, initial_deposit=0.0,interest_rate=0.05):
         """
         Creates a new account with the specified type and initial deposit amount.
         Returns the ID of the newly created account.
         """
 
-        # Check minimum deposit requirements based on account type
-        if account_type == "SAVINGS" and initial_deposit < 100.0:
-            raise ValueError("Savings accounts require a minimum initial deposit of $100.00")
-        
-        limit_constraint = LimitConstraint(daily_limit=1000.0, monthly_limit=5000.0)
-        # Create a limit constraint for the account
-        
-        # Create a concrete account instance based on the account type
-        if account_type == "CHECKING":
-            account = CheckingAccount(
-                account_type=account_type,
-                initial_balance=initial_deposit,
-                interest_strategy=CheckingInterestStrategy(),
-                limit_constraint=limit_constraint,
-            )
-        elif account_type == "SAVINGS":
-            account = SavingsAccount(
-                account_type=account_type,
-                initial_balance=initial_deposit,
-                interest_strategy=SavingsInterestStrategy(interest_rate),
-                limit_constraint=limit_constraint,
-            )
-        else:
-            raise ValueError(f"Unsupported account type: {account_type}")
-        
+        account = abstractions.build_account(account_type, initial_deposit, interest_rate, lazy_interest=self.lazy_interest)
+
         # Save the account using the repository interface
         self.account_repository.create_account(account)
         
@@ -51,23 +40,25 @@ class AccountService:
         
 
 class NotificationService:
-    def __init__(self, notification_adapter:NotificationAdapterInterface):
+    def __init__(self, notification_adapter:NotificationAdapterInterface, outbox: NotificationOutbox = None):
+        """
+        With an `outbox`, `notify` only enqueues the transaction and background workers
+        deliver it per the account's preferences; otherwise it is sent through the adapter
+        before `notify` returns.
+        """
         self.is_subscribed = False
         self.adapter = notification_adapter
+        self.outbox = outbox
         
+    @traced("NotificationService.notify")
     def notify(self, transaction:Transaction):
         """
         Sends a notification (e.g., email/SMS) to the account owner(s) about the transaction.
         """
-
-        message = (
-            f"Transaction Notification:\n"
-            f"Type: {transaction.transaction_type}\n"
-            f"Amount: ${transaction.amount:.2f}\n"
-            f"Date: {transaction.timestamp}\n"
-            f"Account ID: {transaction.account_id}\n"
-        )
-        self.adapter.notify(message)
+        if self.outbox is not None:
+            self.outbox.enqueue(transaction)
+            return
+        self.adapter.notify(transaction_message(transaction))
     
     def subscribe(self,account_id, notification_type):
         self.is_subscribed = True
@@ -81,111 +72,190 @@ class NotificationService:
 
 
 class LoggingService:
+    def __init__(self, logger: logging.Logger = None):
+        # Records go wherever the logger's handlers send them; with a LogPipeline installed
+        # that is a queue, so logging never waits on I/O on the request path
+        self.logger = logger or logging.getLogger("banking_system.transactions")
+
     def log(self, message):
         """
-        Logs a message to the console or a file.
+        Logs a message.
         """
-        # Example logging logic 
-        print(f"LOG: {message}")
+        self.logger.info(message)
 
+    @traced("LoggingService.log_transaction")
     def log_transaction(self, transaction):
         """
-        Logs details of a transaction.
+        Logs details of a transaction as one structured record.
         """
-        log_message = (
-            f"Transaction Log:\n"
-            f"Type: {transaction.transaction_type}\n"
-            f"Amount: ${transaction.amount:.2f}\n"
-            f"Date: {transaction.timestamp}\n"
-            f"Account ID: {transaction.account_id}\n"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info(
+            "Transaction Log: %s of $%.2f on account %s",
+            getattr(transaction.transaction_type, "value", transaction.transaction_type),
+            transaction.amount,
+            transaction.account_id,
+            extra=log_fields(
+                transaction_id=getattr(transaction, "transaction_id", None),
+                transaction_type=getattr(transaction.transaction_type, "value", transaction.transaction_type),
+                amount=transaction.amount,
+                account_id=transaction.account_id,
+                destination_account_id=getattr(transaction, "destination_account_id", None),
+                timestamp=str(transaction.timestamp),
+            ),
         )
-        self.log(log_message)
-
 
 class TransactionService:
     def __init__(self, 
                  account_repository: AccountRepositoryInterface, 
                  transaction_repository: TransactionRepositoryInterface,
                  notification_service: NotificationService,
-                 logging_service: LoggingService):
+                 logging_service: LoggingService,
+                 lock_manager: StripedLockManager = default_lock_manager,
+                 max_retries: int = 3):
         self.account_repository = account_repository
         self.transaction_repository = transaction_repository
         self.notification_service = notification_service
         self.logging_service = logging_service
+        self.lock_manager = lock_manager
+        self.max_retries = max_retries
 
-    def deposit(self, account_id, amount)->Transaction:
+    @instrumented("TransactionService", "deposit")
+    def deposit(self, account_id, amount, expected_version=None)->Transaction:
         """
         Deposits the specified amount into the account.
+        If `expected_version` is given, fails with StaleAccountVersionError unless the account is still at that version.
         Returns a Transaction object representing the deposit.
         """
-
-        # Get the account using the repository interface
-        account:Account = self.account_repository.get_account_by_id(account_id)
-        if not account:
-            raise ValueError(f"Account with ID {account_id} not found")
-
-        transaction:Transaction = account.deposit(amount)
-
-        abstractions.save_transaction(
-            self.account_repository, 
-            self.transaction_repository, 
-            self.notification_service, 
-            self.logging_service, 
-            account, 
-            transaction
+        return abstractions.retry_on_conflict(
+            lambda: self._apply(account_id, lambda account: account.deposit(amount), expected_version),
+            self.max_retries,
         )
 
-        return transaction
-
-    def withdraw(self, account_id, amount):
+    @instrumented("TransactionService", "withdraw")
+    def withdraw(self, account_id, amount, expected_version=None):
         """
         Withdraws the specified amount from the account if sufficient funds are available.
+        If `expected_version` is given, fails with StaleAccountVersionError unless the account is still at that version.
         Returns a Transaction object representing the withdrawal.
         """
+        return abstractions.retry_on_conflict(
+            lambda: self._apply(account_id, lambda account: account.withdraw(amount), expected_version),
+            self.max_retries,
+        )
 
-        # Get the account using the repository interface
-        account:Account = self.account_repository.get_account_by_id(account_id)
-        if not account:
-            raise ValueError(f"Account with ID {account_id} not found")
-        
-        transaction = account.withdraw(amount)
-
-        abstractions.save_transaction(
-            self.account_repository, 
-            self.transaction_repository, 
-            self.notification_service, 
-            self.logging_service, 
-            account, 
-            transaction
+    @instrumented("TransactionService", "apply_batch")
+    def apply_batch(self, operations: List[BatchOperation]) -> BatchReport:
+        """
+        Applies a list of deposits, withdrawals and transfers in order.
+        All accounts touched are written back with one repository commit and all transactions
+        with one append; operations that fail validation are skipped and reported. Under
+        contention the batch is committed in smaller pieces, and only operations on accounts
+        that keep changing are reported as failed.
+        Returns a BatchReport with one result per operation.
+        """
+        return abstractions.save_batch(
+            self.account_repository,
+            self.transaction_repository,
+            self.notification_service,
+            self.logging_service,
+            operations,
+            self.max_retries,
         )
 
+    def _apply(self, account_id, operation, expected_version=None)->Transaction:
+        """
+        Reads the account, applies `operation` to it and writes it back with a compare-and-swap
+        on the version that was read. Raises ConcurrentUpdateError if the account changed meanwhile.
+        """
+        with self.lock_manager.locked(account_id):
+            # Get the account using the repository interface
+            account:Account = self.account_repository.get_account_by_id(account_id)
+            if not account:
+                raise ValueError(f"Account with ID {account_id} not found")
+            if expected_version is not None and account.version != expected_version:
+                raise StaleAccountVersionError(f"Account {account_id} is at version {account.version}, not {expected_version}")
+
+            version = account.version
+            transaction:Transaction = operation(account)
+
+            abstractions.save_transaction(
+                self.account_repository, 
+                self.transaction_repository, 
+                self.notification_service, 
+                self.logging_service, 
+                account, 
+                transaction,
+                expected_version=version,
+            )
+
         return transaction
     
 class InterestService:
-    def __init__(self, account_repository: AccountRepositoryInterface):
+    def __init__(self, account_repository: AccountRepositoryInterface, lock_manager: StripedLockManager = default_lock_manager,
+                 max_retries: int = 3):
         self.account_repository = account_repository
+        self.lock_manager = lock_manager
+        self.max_retries = max_retries
 
+    @instrumented("InterestService", "apply_interest_to_account")
     def apply_interest_to_account(self, account_id):
         """
         Applies interest to a specific account based on its type and balance.
+        The account is written back with a compare-and-swap on the version that was read and
+        the operation is re-run if it loses the race, so a concurrent deposit is never lost.
         """
-        account = self.account_repository.get_account_by_id(account_id)
-        if not account:
-            raise ValueError(f"Account with ID {account_id} not found")
-        account.calculate_interest()
-        self.account_repository.update_account(account)
+        abstractions.retry_on_conflict(lambda: self._apply_interest(account_id), self.max_retries)
+        INTEREST_ACCOUNTS.labels("applied").inc()
+
+    def _apply_interest(self, account_id):
+        with self.lock_manager.locked(account_id):
+            account = self.account_repository.get_account_by_id(account_id)
+            if not account:
+                raise ValueError(f"Account with ID {account_id} not found")
+            version = account.version
+            account.calculate_interest()
+            if self.account_repository.update_account(account, expected_version=version) is False:
+                raise ConcurrentUpdateError(f"Account {account_id} was modified concurrently")
 
-    def apply_interest_batch(self, account_ids):
+    @instrumented("InterestService", "apply_interest_batch")
+    def apply_interest_batch(self, account_ids, chunk_size: int = 10_000) -> InterestBatchReport:
         """
         Applies interest to a batch of accounts.
+        Accounts are grouped by interest strategy and rate, each group's balances are computed
+        in one vectorized pass and written back with a single bulk repository call per chunk.
+        The batch takes no lock stripes, so deposits and transfers keep flowing during a run;
+        instead each chunk is written with a compare-and-swap on the versions read and re-run
+        if it loses the race. A chunk still conflicting after `max_retries` re-runs is split in
+        halves, so only the accounts that keep changing end up reported as failed.
+        Returns an InterestBatchReport with the new balance or failure reason per account.
         """
-        
-        for account_id in account_ids:
-            try:
-                self.apply_interest_to_account(account_id)
+        account_ids = list(dict.fromkeys(account_ids))
+        report = InterestBatchReport()
+        for start in range(0, len(account_ids), chunk_size):
+            chunk_report = self._apply_interest_chunk(account_ids[start:start + chunk_size])
+            report.applied.update(chunk_report.applied)
+            report.failed.update(chunk_report.failed)
+        INTEREST_ACCOUNTS.labels("applied").inc(len(report.applied))
+        INTEREST_ACCOUNTS.labels("failed").inc(len(report.failed))
+        return report
 
-            except ValueError as e:
-                pass
+    def _apply_interest_chunk(self, chunk) -> InterestBatchReport:
+        try:
+            return abstractions.retry_on_conflict(
+                lambda: interest_engine.apply_interest_batch(self.account_repository, chunk), self.max_retries
+            )
+        except ConcurrentUpdateError as error:
+            if len(chunk) == 1:
+                report = InterestBatchReport()
+                report.failed[chunk[0]] = str(error)
+                return report
+        half = len(chunk) // 2
+        report = self._apply_interest_chunk(chunk[:half])
+        rest = self._apply_interest_chunk(chunk[half:])
+        report.applied.update(rest.applied)
+        report.failed.update(rest.failed)
+        return report
 
 
 class StatementService:
@@ -194,6 +264,7 @@ class StatementService:
         self.transaction_repository = transaction_repository
         self.statement_adapter = statement_adapter
 
+    @instrumented("StatementService", "generate_monthly_statement")
     def generate_monthly_statement(self, account_id):
         """
         Generates a monthly statement for the specified account.
@@ -207,6 +278,7 @@ class StatementService:
         statement["transactions"] = transactions
         return self.statement_adapter.generate(statement)
     
+    @instrumented("StatementService", "get_transaction_history")
     def get_transaction_history(self, account_id):
         """
         Retrieves the transaction history for the specified account.
@@ -224,34 +296,71 @@ class FundTransferService:
                  account_repository: AccountRepositoryInterface, 
                  transaction_repository: TransactionRepositoryInterface,
                  notification_service: NotificationService,
-                 logging_service: LoggingService):
+                 logging_service: LoggingService,
+                 lock_manager: StripedLockManager = default_lock_manager,
+                 max_retries: int = 3):
         self.account_repository = account_repository
         self.transaction_repository = transaction_repository
         self.notification_service = notification_service
         self.logging_service = logging_service
+        self.lock_manager = lock_manager
+        self.max_retries = max_retries
 
+    @instrumented("FundTransferService", "transfer_funds")
     def transfer_funds(self, source_account_id, destination_account_id, amount):
         """
         Transfers the specified amount from the source account to the destination account.
         Returns a dictionary containing the withdrawal and deposit transactions.
         """
+        return abstractions.retry_on_conflict(
+            lambda: self._transfer(source_account_id, destination_account_id, amount),
+            self.max_retries,
+        )
+
+    @instrumented("FundTransferService", "transfer_batch")
+    def transfer_batch(self, transfers) -> BatchReport:
+        """
+        Applies many transfers, given as (source_account_id, destination_account_id, amount)
+        tuples, with one repository commit. Failed transfers are skipped and reported.
+        Returns a BatchReport with one result per transfer.
+        """
+        operations = [BatchOperation(TRANSFER, source, amount, destination) for source, destination, amount in transfers]
+        return abstractions.save_batch(
+            self.account_repository,
+            self.transaction_repository,
+            self.notification_service,
+            self.logging_service,
+            operations,
+            self.max_retries,
+        )
 
-        # Get the source and destination accounts
-        source_account:Account = self.account_repository.get_account_by_id(source_account_id)
-        destination_account = self.account_repository.get_account_by_id(destination_account_id)
+    def _transfer(self, source_account_id, destination_account_id, amount):
+        if source_account_id == destination_account_id:
+            raise ValueError("Cannot transfer funds to the same account")
 
-        if not source_account:
-            raise ValueError(f"Source account with ID {source_account_id} not found")
-        if not destination_account:
-            raise ValueError(f"Destination account with ID {destination_account_id} not found")
+        # Both stripes are taken in a fixed order, so opposite transfers cannot deadlock
+        with self.lock_manager.locked(source_account_id, destination_account_id):
+            # Get the source and destination accounts
+            source_account:Account = self.account_repository.get_account_by_id(source_account_id)
+            destination_account = self.account_repository.get_account_by_id(destination_account_id)
 
-        transfer_transaction = source_account.transfer(amount, destination_account)
-        abstractions.save_transaction(
-            self.account_repository, 
-            self.transaction_repository, 
-            self.notification_service, 
-            self.logging_service, 
-            source_account, 
-            transfer_transaction
-        )
+            if not source_account:
+                raise ValueError(f"Source account with ID {source_account_id} not found")
+            if not destination_account:
+                raise ValueError(f"Destination account with ID {destination_account_id} not found")
+
+            source_version, destination_version = source_account.version, destination_account.version
+            transfer_transaction = source_account.transfer(amount, destination_account)
+            # Both sides are written back atomically, each with a compare-and-swap on its version
+            abstractions.save_transaction(
+                self.account_repository, 
+                self.transaction_repository, 
+                self.notification_service, 
+                self.logging_service, 
+                source_account, 
+                transfer_transaction,
+                expected_version=source_version,
+                destination_account=destination_account,
+                destination_expected_version=destination_version,
+            )
         return Transaction(transaction_type=TransactionType.TRANSFER,account_id=source_account,destination_account_id=destination_account,amount=amount)
\ No newline at end of file
@@ -1,10 +1,160 @@
-def save_transaction(account_repository, transaction_repository, notification_service, logging_service, account, transaction):
-    # update the account balance and save the transaction
-    account_repository.update_account(account)
+from banking_system import CheckingAccount, SavingsAccount
+from banking_system.application_layer.repository_interfaces import ConcurrentUpdateError, StaleAccountVersionError
+from banking_system.domain_layer import CheckingInterestStrategy, SavingsInterestStrategy, LimitConstraint
+from . import batch_engine
+from .instrumentation import AMOUNT_MOVED, CONFLICT_RETRIES
+
+
+def build_account(account_type, initial_deposit=0.0, interest_rate=0.05, lazy_interest=False):
+    """
+    Creates (but does not persist) a new account of the given type, enforcing opening rules.
+    Shared by the sync and async account services.
+    """
+    # Check minimum deposit requirements based on account type
+    if account_type == "SAVINGS" and initial_deposit < 100.0:
+        raise ValueError("Savings accounts require a minimum initial deposit of $100.00")
+    
+    limit_constraint = LimitConstraint(daily_limit=1000.0, monthly_limit=5000.0)
+    # Create a limit constraint for the account
+    
+    # Create a concrete account instance based on the account type
+    if account_type == "CHECKING":
+        account = CheckingAccount(
+            account_type=account_type,
+            initial_balance=initial_deposit,
+            interest_strategy=CheckingInterestStrategy(),
+            limit_constraint=limit_constraint,
+            lazy_interest=lazy_interest,
+        )
+    elif account_type == "SAVINGS":
+        account = SavingsAccount(
+            account_type=account_type,
+            initial_balance=initial_deposit,
+            interest_strategy=SavingsInterestStrategy(interest_rate),
+            limit_constraint=limit_constraint,
+            lazy_interest=lazy_interest,
+        )
+    else:
+        raise ValueError(f"Unsupported account type: {account_type}")
+
+    return account
+
+
+def record_amount_moved(transaction) -> None:
+    """Adds a committed transaction's amount to the per-operation AMOUNT_MOVED counter."""
+    operation = str(getattr(transaction.transaction_type, "value", transaction.transaction_type)).lower()
+    AMOUNT_MOVED.labels(operation).inc(transaction.amount)
+
+
+def save_transaction(account_repository, transaction_repository, notification_service, logging_service, account, transaction,
+                     expected_version=None, destination_account=None, destination_expected_version=None):
+    # update the account balance(s) with a compare-and-swap on the versions that were read
+    if destination_account is None:
+        updated = account_repository.update_account(account, expected_version=expected_version)
+    else:
+        updated = account_repository.update_accounts_atomically(
+            account, destination_account, expected_versions=(expected_version, destination_expected_version)
+        )
+    if updated is False:
+        raise ConcurrentUpdateError(f"Account {account.account_id} was modified concurrently")
+
+    # and save the transaction
     transaction_repository.save_transaction(transaction)
 
+    record_amount_moved(transaction)
+
     # Notify and log the transaction
     notification_service.notify(transaction)
     logging_service.log_transaction(transaction)
 
     return transaction
+
+
+async def save_transaction_async(account_repository, transaction_repository, notification_service, logging_service, account, transaction,
+                                 executor, expected_version=None, destination_account=None, destination_expected_version=None):
+    """
+    Async counterpart of save_transaction for async repositories.
+    Notification and logging are synchronous services and run on `executor`.
+    """
+    if destination_account is None:
+        updated = await account_repository.update_account(account, expected_version=expected_version)
+    else:
+        updated = await account_repository.update_accounts_atomically(
+            account, destination_account, expected_versions=(expected_version, destination_expected_version)
+        )
+    if updated is False:
+        raise ConcurrentUpdateError(f"Account {account.account_id} was modified concurrently")
+
+    await transaction_repository.save_transaction(transaction)
+    record_amount_moved(transaction)
+
+    await executor.run(notification_service.notify, transaction)
+    await executor.run(logging_service.log_transaction, transaction)
+
+    return transaction
+
+
+def save_batch(account_repository, transaction_repository, notification_service, logging_service, operations, max_retries):
+    """
+    Applies a batch of operations with one account commit and one transaction append, then
+    notifies and logs each applied transaction. Returns the BatchReport.
+    The batch takes no lock stripes: it is written with a compare-and-swap on the versions
+    read and re-run if it loses the race. A batch still conflicting after `max_retries` re-runs
+    is split in halves, applied in order, so only operations on accounts that keep changing
+    end up reported as failed.
+    """
+    report = _apply_batch_splitting(account_repository, transaction_repository, list(operations), max_retries)
+    for transaction in report.transactions:
+        record_amount_moved(transaction)
+        notification_service.notify(transaction)
+        logging_service.log_transaction(transaction)
+    return report
+
+
+def _apply_batch_splitting(account_repository, transaction_repository, operations, max_retries) -> batch_engine.BatchReport:
+    try:
+        return retry_on_conflict(
+            lambda: batch_engine.apply_batch(account_repository, transaction_repository, operations), max_retries
+        )
+    except ConcurrentUpdateError as error:
+        if len(operations) == 1:
+            return batch_engine.BatchReport([batch_engine.BatchItemResult(0, error=str(error))])
+    half = len(operations) // 2
+    report = _apply_batch_splitting(account_repository, transaction_repository, operations[:half], max_retries)
+    rest = _apply_batch_splitting(account_repository, transaction_repository, operations[half:], max_retries)
+    for result in rest.results:
+        result.index += half
+    report.results.extend(rest.results)
+    return report
+
+
+def retry_on_conflict(operation, max_retries):
+    """
+    Runs `operation` and re-runs it from scratch when it loses an optimistic concurrency race,
+    at most `max_retries` extra times. Conflicts caused by a stale caller-supplied version
+    are not retried.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return operation()
+        except StaleAccountVersionError:
+            raise
+        except ConcurrentUpdateError:
+            if attempt == max_retries:
+                raise
+            CONFLICT_RETRIES.labels().inc()
+
+
+async def retry_on_conflict_async(operation, max_retries):
+    """
+    Async counterpart of retry_on_conflict; `operation` is a coroutine function.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await operation()
+        except StaleAccountVersionError:
+            raise
+        except ConcurrentUpdateError:
+            if attempt == max_retries:
+                raise
+            CONFLICT_RETRIES.labels().inc()
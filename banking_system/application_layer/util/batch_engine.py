@@ -0,0 +1,163 @@
+"""
+Batch engine for deposits, withdrawals and transfers posted together (e.g. by clearing jobs).
+
+Every involved account is read once, the operations are applied in order to those
+in-memory copies, and the accounts that changed are written back with a single
+compare-and-swap `update_accounts` call followed by one bulk `save_transactions` append.
+An operation that fails validation (unknown account, insufficient funds, limits) is
+reported and skipped without affecting the others.
+"""
+from typing import List, Optional
+
+from banking_system.application_layer.repository_interfaces import ConcurrentUpdateError
+
+DEPOSIT, WITHDRAW, TRANSFER = "DEPOSIT", "WITHDRAW", "TRANSFER"
+OPERATION_TYPES = (DEPOSIT, WITHDRAW, TRANSFER)
+
+
+class BatchOperation:
+    """
+    One movement in a batch.
+    Attributes:
+        operation_type (str): DEPOSIT, WITHDRAW or TRANSFER.
+        account_id (str): The account credited/debited, or the transfer source.
+        amount (float): The amount to move.
+        destination_account_id (Optional[str]): The transfer destination.
+    """
+    __slots__ = ("operation_type", "account_id", "amount", "destination_account_id")
+
+    def __init__(self, operation_type: str, account_id: str, amount: float, destination_account_id: Optional[str] = None):
+        self.operation_type = str(getattr(operation_type, "value", operation_type)).upper()
+        self.account_id = account_id
+        self.amount = amount
+        self.destination_account_id = destination_account_id
+
+    @property
+    def account_ids(self):
+        if self.operation_type == TRANSFER:
+            return (self.account_id, self.destination_account_id)
+        return (self.account_id,)
+
+    def __repr__(self):
+        return f"<BatchOperation({self.operation_type}, {self.account_id}, {self.amount}, {self.destination_account_id})>"
+
+
+class BatchItemResult:
+    """
+    Outcome of one operation, at the same index as the operation in the batch.
+    Attributes:
+        transaction: The recorded transaction if the operation was applied, else None.
+        error (Optional[str]): Why the operation was rejected, else None.
+    """
+    __slots__ = ("index", "transaction", "error")
+
+    def __init__(self, index: int, transaction=None, error: Optional[str] = None):
+        self.index = index
+        self.transaction = transaction
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return f"<BatchItemResult(index={self.index}, succeeded={self.succeeded})>"
+
+
+class BatchReport:
+    """
+    Outcome of a batch, one BatchItemResult per operation in submission order.
+    """
+    def __init__(self, results: List[BatchItemResult] = None):
+        self.results: List[BatchItemResult] = results or []
+
+    @property
+    def transactions(self):
+        return [result.transaction for result in self.results if result.succeeded]
+
+    @property
+    def failed(self) -> List[BatchItemResult]:
+        return [result for result in self.results if not result.succeeded]
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed
+
+    def __repr__(self):
+        return f"<BatchReport(applied={len(self.results) - len(self.failed)}, failed={len(self.failed)})>"
+
+
+def validate_operations(operations: List[BatchOperation]) -> List[Optional[str]]:
+    """
+    Checks the shape of every operation up front; returns an error message (or None) per operation.
+    """
+    errors = []
+    for operation in operations:
+        if operation.operation_type not in OPERATION_TYPES:
+            errors.append(f"Unsupported operation type: {operation.operation_type}")
+        elif not operation.account_id:
+            errors.append("An account ID is required")
+        elif operation.operation_type == TRANSFER and not operation.destination_account_id:
+            errors.append("Transfers require a destination account ID")
+        elif operation.operation_type == TRANSFER and operation.destination_account_id == operation.account_id:
+            errors.append("Cannot transfer funds to the same account")
+        elif not isinstance(operation.amount, (int, float)) or operation.amount <= 0:
+            errors.append("Amount must be positive")
+        else:
+            errors.append(None)
+    return errors
+
+
+def apply_batch(account_repository, transaction_repository, operations: List[BatchOperation]) -> BatchReport:
+    """
+    Applies `operations` in order and commits them with one account write and one transaction append.
+    Raises ConcurrentUpdateError if any touched account changed after it was read, in which case
+    nothing was written and the whole batch can be retried.
+    """
+    errors = validate_operations(operations)
+
+    # Read each involved account once
+    accounts = {}
+    for operation, error in zip(operations, errors):
+        if error is None:
+            for account_id in operation.account_ids:
+                if account_id not in accounts:
+                    accounts[account_id] = account_repository.get_account_by_id(account_id)
+    versions = {account_id: account.version for account_id, account in accounts.items() if account}
+
+    results = []
+    touched = {}
+    for index, (operation, error) in enumerate(zip(operations, errors)):
+        if error is not None:
+            results.append(BatchItemResult(index, error=error))
+            continue
+        account = accounts[operation.account_id]
+        if not account:
+            results.append(BatchItemResult(index, error=f"Account with ID {operation.account_id} not found"))
+            continue
+        try:
+            if operation.operation_type == DEPOSIT:
+                transaction = account.deposit(operation.amount)
+            elif operation.operation_type == WITHDRAW:
+                transaction = account.withdraw(operation.amount)
+            else:
+                destination = accounts[operation.destination_account_id]
+                if not destination:
+                    raise ValueError(f"Destination account with ID {operation.destination_account_id} not found")
+                transaction = account.transfer(operation.amount, destination)
+                touched[destination.account_id] = destination
+        except ValueError as e:
+            results.append(BatchItemResult(index, error=str(e)))
+            continue
+        touched[account.account_id] = account
+        results.append(BatchItemResult(index, transaction=transaction))
+
+    report = BatchReport(results)
+    if not touched:
+        return report
+
+    changed = list(touched.values())
+    if account_repository.update_accounts(changed, expected_versions=[versions[account.account_id] for account in changed]) is False:
+        raise ConcurrentUpdateError("Accounts in the batch were modified concurrently")
+    transaction_repository.save_transactions(report.transactions)
+    return report
@@ -0,0 +1,60 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BoundedExecutor:
+    """
+    Runs blocking calls (storage, notification, logging) on a fixed thread pool so that
+    coroutines awaiting them never block the event loop.
+
+    At most `max_pending` calls per event loop may be queued or running at once; further
+    callers wait asynchronously for a free slot instead of growing the pool's queue without
+    bound, which keeps latency predictable when a backend slows down.
+    """
+    def __init__(self, max_workers: int = 16, max_pending: int = 256):
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("A bounded executor needs at least one worker and one pending slot.")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # asyncio semaphores belong to one event loop, so keep one per running loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="banking-io")
+        return self._pool
+
+    def _get_semaphore(self, loop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_pending)
+        return semaphore
+
+    async def run(self, function, *args, **kwargs):
+        """
+        Runs `function(*args, **kwargs)` on the pool and returns (or raises) its result.
+        The call sees the caller's context variables, such as the request's trace.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        async with self._get_semaphore(loop):
+            return await loop.run_in_executor(self._get_pool(), functools.partial(context.run, function, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the worker threads; the pool is recreated on the next call."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+# Shared by every async service and repository adapter in the process
+default_executor = BoundedExecutor()
@@ -0,0 +1,283 @@
+import functools
+import inspect
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from banking_system.domain_layer.util.tracing import span
+from .metrics import LATENCY_BUCKETS
+
+# Seconds, from 1 ms to 10 s: HTTP and service calls, which include storage and locking
+REQUEST_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r'\"') for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class _Sharded:
+    """
+    Per-thread cells for one metric child. Each thread increments only its own list, so
+    recording takes no lock; the lock guards only the list of shards, touched once per
+    thread, and reads sum over all shards. Shards of finished threads are kept, so
+    totals never go backwards.
+    """
+    def __init__(self, width: int) -> None:
+        self._width = width
+        self._local = threading.local()
+        self._shards: List[list] = []
+        self._lock = threading.Lock()
+
+    def _new_shard(self) -> list:
+        cells = self._local.cells = [0] * self._width
+        with self._lock:
+            self._shards.append(cells)
+        return cells
+
+    def _totals(self) -> list:
+        with self._lock:
+            shards = list(self._shards)
+        totals = [0] * self._width
+        for cells in shards:
+            for position, value in enumerate(cells):
+                totals[position] += value
+        return totals
+
+
+class ShardedCounter(_Sharded):
+    """A monotonically increasing count, recorded without locks."""
+    def __init__(self) -> None:
+        super().__init__(1)
+
+    def inc(self, amount: float = 1) -> None:
+        try:
+            cells = self._local.cells
+        except AttributeError:
+            cells = self._new_shard()
+        cells[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._totals()[0]
+
+
+class ShardedHistogram(_Sharded):
+    """A Histogram (see metrics.Histogram) recorded into per-thread bucket counts without locks."""
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        bounds = tuple(float(bound) for bound in buckets)
+        if not bounds or list(bounds) != sorted(set(bounds)):
+            raise ValueError("Histogram buckets must be a non-empty, strictly increasing sequence.")
+        self.buckets = bounds
+        # One count per bucket, the +Inf bucket, then the sum
+        super().__init__(len(bounds) + 2)
+
+    def observe(self, value: float) -> None:
+        try:
+            cells = self._local.cells
+        except AttributeError:
+            cells = self._new_shard()
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """Returns (upper bound, observations <= bound) pairs, ending with (inf, count)."""
+        totals = self._totals()
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets + (math.inf,), totals):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    @property
+    def count(self) -> int:
+        return sum(self._totals()[:-1])
+
+    @property
+    def sum(self) -> float:
+        return self._totals()[-1]
+
+
+class MetricFamily:
+    """
+    A named metric with labels; `labels(*values)` returns the child for one label
+    combination, creating it on first use. Callers on hot paths should keep the child.
+    """
+    def __init__(self, kind: str, name: str, documentation: str, labelnames: Sequence[str], factory: Callable) -> None:
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+        try:
+            return self._children[values]
+        except KeyError:
+            pass
+        with self._lock:
+            child = self._children.get(values)
+            if child is None:
+                child = self._children[values] = self._factory()
+            return child
+
+    def children(self) -> List[tuple]:
+        with self._lock:
+            return sorted(self._children.items(), key=lambda item: tuple(map(str, item[0])))
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in self.children():
+            if self.kind == "histogram":
+                for bound, cumulative in child.cumulative_counts():
+                    labels = _format_labels(self.labelnames + ("le",), values + (_format_value(bound),))
+                    yield f"{self.name}_bucket{labels} {cumulative}"
+                labels = _format_labels(self.labelnames, values)
+                totals = child._totals()
+                yield f"{self.name}_sum{labels} {_format_value(totals[-1])}"
+                yield f"{self.name}_count{labels} {sum(totals[:-1])}"
+            else:
+                yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class _Callback:
+    def __init__(self, read: Callable[[], float]) -> None:
+        self._read = read
+
+    @property
+    def value(self) -> float:
+        return self._read()
+
+
+class MetricsRegistry:
+    """
+    Metric families rendered together in the Prometheus text exposition format.
+    Registering a name twice returns the existing family.
+    """
+    def __init__(self) -> None:
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, kind: str, name: str, documentation: str, labelnames: Sequence[str], factory: Callable) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(kind, name, documentation, labelnames, factory)
+            elif family.kind != kind or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a {family.kind} with labels {family.labelnames}")
+            return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register("counter", name, documentation, labelnames, ShardedCounter)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = REQUEST_LATENCY_BUCKETS) -> MetricFamily:
+        return self._register("histogram", name, documentation, labelnames, lambda: ShardedHistogram(buckets))
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], float]) -> MetricFamily:
+        """A gauge whose value is read from `read()` at scrape time, e.g. a queue depth."""
+        family = self._register("gauge", name, documentation, (), lambda: _Callback(read))
+        family.labels()
+        return family
+
+    def counter_callback(self, name: str, documentation: str, read: Callable[[], float]) -> MetricFamily:
+        """A counter kept elsewhere (e.g. a metrics.Counter), read from `read()` at scrape time."""
+        family = self._register("counter", name, documentation, (), lambda: _Callback(read))
+        family.labels()
+        return family
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._families.get(name)
+
+    def render(self) -> str:
+        """The registry in Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda family: family.name)
+        lines = [line for family in families for line in family.render()]
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served on /metrics
+default_registry = MetricsRegistry()
+
+SERVICE_CALLS = default_registry.counter(
+    "banking_service_calls_total", "Service operations by outcome (ok or the exception type).",
+    ("service", "operation", "outcome"),
+)
+SERVICE_LATENCY = default_registry.histogram(
+    "banking_service_call_duration_seconds", "Service operation latency.", ("service", "operation"),
+)
+CONFLICT_RETRIES = default_registry.counter(
+    "banking_conflict_retries_total", "Operations re-run after losing an optimistic concurrency race.",
+)
+AMOUNT_MOVED = default_registry.counter(
+    "banking_amount_moved_total", "Money moved by committed deposits, withdrawals and transfers.", ("operation",),
+)
+INTEREST_ACCOUNTS = default_registry.counter(
+    "banking_interest_accounts_total", "Accounts processed by interest runs, applied or failed.", ("outcome",),
+)
+
+
+def instrumented(service: str, operation: str):
+    """
+    Decorates a service method (sync or async) to count its calls by outcome and
+    record its latency in SERVICE_CALLS and SERVICE_LATENCY, and to trace each call
+    as a "<service>.<operation>" span.
+    """
+    span_name = f"{service}.{operation}"
+    latency = SERVICE_LATENCY.labels(service, operation)
+    succeeded = SERVICE_CALLS.labels(service, operation, "ok")
+
+    def failed(error: BaseException) -> None:
+        SERVICE_CALLS.labels(service, operation, type(error).__name__).inc()
+
+    def decorate(method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def timed_async(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    with span(span_name):
+                        result = await method(*args, **kwargs)
+                except Exception as error:
+                    failed(error)
+                    raise
+                finally:
+                    latency.observe(time.perf_counter() - started)
+                succeeded.inc()
+                return result
+            return timed_async
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                with span(span_name):
+                    result = method(*args, **kwargs)
+            except Exception as error:
+                failed(error)
+                raise
+            finally:
+                latency.observe(time.perf_counter() - started)
+            succeeded.inc()
+            return result
+        return timed
+    return decorate
@@ -0,0 +1,108 @@
+"""
+Batch interest engine used for month-end runs.
+
+Accounts are grouped by interest strategy type and rate (a strategy of any other type is
+a group of its own); every group shares one growth factor, so its new balances are computed in a single vectorized pass (NumPy when it is
+installed, a plain list pass otherwise) and all results are written back with one bulk
+repository call.
+"""
+from typing import Dict, List
+from banking_system.application_layer.repository_interfaces import ConcurrentUpdateError
+from banking_system.domain_layer.entities.interest.interest_strategies import (
+    CheckingInterestStrategy, SavingsInterestStrategy,
+)
+
+# NumPy is an optional accelerator, imported by the first batch run rather than with the
+# services: False until then, None when it is not installed
+_numpy = False
+
+
+def _load_numpy():
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+class InterestBatchReport:
+    """
+    Outcome of a batch interest run.
+    Attributes:
+        applied (Dict[str, float]): New balance per account that received interest.
+        failed (Dict[str, str]): Reason per account that could not be processed.
+    """
+    def __init__(self):
+        self.applied: Dict[str, float] = {}
+        self.failed: Dict[str, str] = {}
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed
+
+    def __repr__(self):
+        return f"<InterestBatchReport(applied={len(self.applied)}, failed={len(self.failed)})>"
+
+
+def _group_key(strategy):
+    # Only the built-in strategies are known to grow alike when their rates match
+    if type(strategy) in (SavingsInterestStrategy, CheckingInterestStrategy):
+        return type(strategy), getattr(strategy, "annual_rate", None)
+    return type(strategy), id(strategy)
+
+
+def _grow(balances: List[float], factor: float) -> List[float]:
+    np = _load_numpy()
+    if np is not None:
+        return (np.fromiter(balances, dtype=np.float64, count=len(balances)) * factor).tolist()
+    return [balance * factor for balance in balances]
+
+
+def apply_interest_batch(account_repository, account_ids, months: int = 1) -> InterestBatchReport:
+    """
+    Applies `months` of interest to every account in `account_ids`.
+    Accounts in lazy interest mode are not grown again, only settled up to now.
+    Returns an InterestBatchReport; missing accounts and accounts without an interest strategy
+    are reported instead of raised. The accounts are written back with a compare-and-swap on
+    the versions that were read: if any of them changed meanwhile nothing is written and
+    ConcurrentUpdateError is raised, so the caller can re-run the batch.
+    """
+    report = InterestBatchReport()
+    groups = {}
+    lazy = []
+    versions = {}
+    for account_id in dict.fromkeys(account_ids):
+        account = account_repository.get_account_by_id(account_id)
+        if not account:
+            report.failed[account_id] = f"Account with ID {account_id} not found"
+            continue
+        if account.interest_strategy is None:
+            report.failed[account_id] = f"Account with ID {account_id} has no interest strategy"
+            continue
+        versions[account_id] = account.version
+        if getattr(account, "lazy_interest", False):
+            # Lazily accruing accounts already earn interest on access; only settle it
+            account.calculate_interest()
+            lazy.append(account)
+            continue
+        groups.setdefault(_group_key(account.interest_strategy), []).append(account)
+
+    updated = lazy
+    for accounts in groups.values():
+        factor = accounts[0].interest_strategy.growth_factor(months)
+        new_balances = _grow([account.balance for account in accounts], factor)
+        for account, balance in zip(accounts, new_balances):
+            account.balance = balance
+        updated.extend(accounts)
+
+    if not updated:
+        return report
+    expected_versions = [versions[account.account_id] for account in updated]
+    if account_repository.update_accounts(updated, expected_versions=expected_versions) is False:
+        raise ConcurrentUpdateError("An account in the interest batch was modified concurrently")
+    for account in updated:
+        report.applied[account.account_id] = account.balance
+    return report
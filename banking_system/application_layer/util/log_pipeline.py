@@ -0,0 +1,274 @@
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler
+from typing import Dict, Iterable, Optional
+from banking_system.domain_layer.util.tracing import current_trace_id
+from .metrics import Counter
+
+_STOP = object()
+# Attributes every LogRecord has; anything else on a record came in through `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+def log_fields(**fields) -> dict:
+    """`extra` for a structured log call: logger.info("deposit", extra=log_fields(account_id=..., amount=...))."""
+    return {"fields": fields}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line: ts (epoch seconds), level, logger,
+    message, the structured `fields` passed through `log_fields`, any other `extra`
+    attributes, and exc_info as a rendered traceback.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "fields":
+                entry[key] = value
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class LogPolicy:
+    """
+    Volume control for one logger and its children: keep a `sample_rate` fraction of
+    records (deterministically, every 1/rate-th one) and at most `max_per_second`.
+    Records at `always_level` (WARNING by default) and above always pass.
+    """
+    __slots__ = ("sample_rate", "max_per_second", "always_level", "_seen", "_tokens", "_refilled")
+
+    def __init__(self, sample_rate: float = 1.0, max_per_second: Optional[float] = None,
+                 always_level: int = logging.WARNING) -> None:
+        if not 0 < sample_rate <= 1:
+            raise ValueError("A sample rate must be in (0, 1].")
+        if max_per_second is not None and max_per_second <= 0:
+            raise ValueError("A rate limit must be positive.")
+        self.sample_rate = sample_rate
+        self.max_per_second = max_per_second
+        self.always_level = always_level
+        self._seen = 0
+        self._tokens = max_per_second
+        self._refilled = time.monotonic()
+
+    def admit(self, record: logging.LogRecord) -> Optional[str]:
+        """Returns None to keep the record, else why it is dropped ("sampled" or "rate_limited")."""
+        if record.levelno >= self.always_level:
+            return None
+        if self.sample_rate < 1:
+            self._seen += 1
+            if int(self._seen * self.sample_rate) == int((self._seen - 1) * self.sample_rate):
+                return "sampled"
+        if self.max_per_second is not None:
+            now = time.monotonic()
+            self._tokens = min(self.max_per_second, self._tokens + (now - self._refilled) * self.max_per_second)
+            self._refilled = now
+            if self._tokens < 1:
+                return "rate_limited"
+            self._tokens -= 1
+        return None
+
+
+def parse_policies(spec: str) -> Dict[str, LogPolicy]:
+    """
+    Parses "logger=rate[:per_second],..." (e.g. "banking_system.transactions=0.1:500")
+    into policies by logger name; an empty rate keeps every record.
+    """
+    policies = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, limits = item.partition("=")
+        rate, _, per_second = limits.partition(":")
+        try:
+            policies[name.strip()] = LogPolicy(float(rate) if rate else 1.0, float(per_second) if per_second else None)
+        except ValueError:
+            raise ValueError(f"Invalid log policy: {item}")
+    return policies
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """Applies the policies and hands records to the queue without ever waiting on it."""
+    def __init__(self, pipeline: "LogPipeline") -> None:
+        super().__init__(pipeline._queue)
+        self._pipeline = pipeline
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if self._pipeline._admit(record):
+            return super().handle(record)
+        return False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve what must not cross threads: arguments may change after the call returns
+        # and tracebacks keep frames alive. Formatting to JSON happens on the listener.
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        # The trace lives in a context variable of the logging thread
+        trace_id = current_trace_id()
+        if trace_id is not None:
+            record.trace_id = trace_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._pipeline.dropped.inc()
+
+
+class JsonLinesHandler(logging.StreamHandler):
+    """
+    Writes JSON lines to a stream without flushing after every record; the pipeline
+    flushes once per batch, so a burst of records costs one write to the file or pipe.
+    """
+    def __init__(self, stream=None) -> None:
+        super().__init__(stream)
+        self.setFormatter(JsonFormatter())
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class LogPipeline:
+    """
+    Takes log output off the request path.
+
+    Loggers it is installed on hand each record to a bounded queue and return; one
+    background listener thread takes the queued records in batches, formats them as JSON
+    lines (JsonFormatter), writes them to the target handlers and flushes each handler
+    once per batch. Per-logger LogPolicy entries sample and rate-limit
+    chatty loggers before anything is queued; a policy applies to the logger it names and
+    to that logger's children. When the queue is full the record is dropped rather than
+    blocking the caller.
+
+    Metrics: `dropped` (queue full), `sampled` and `rate_limited` counters.
+    """
+    def __init__(self, handlers: Optional[Iterable[logging.Handler]] = None, capacity: int = 10_000,
+                 policies: Optional[Dict[str, LogPolicy]] = None, batch_size: int = 512, linger_ms: float = 50.0) -> None:
+        """
+        Args:
+            handlers: Where records end up; a JsonLinesHandler on stderr by default. Handlers
+                without a formatter get a JsonFormatter. Stock StreamHandler and FileHandler
+                flush on every record, so prefer JsonLinesHandler for streams and files.
+            capacity: Records the queue holds before new ones are dropped.
+            policies: LogPolicy by logger name.
+            batch_size: Most records the listener writes between flushes.
+            linger_ms: How long the listener waits after a partial batch, so that it writes
+                a few large batches instead of waking (and taking the GIL) for every record.
+        """
+        if capacity < 1:
+            raise ValueError("A log queue needs a capacity of at least one record.")
+        self.handlers = list(handlers) if handlers is not None else [JsonLinesHandler(sys.stderr)]
+        for handler in self.handlers:
+            if handler.formatter is None:
+                handler.setFormatter(JsonFormatter())
+        self.policies = dict(policies or {})
+        self._queue = queue.Queue(maxsize=capacity)
+        self._handler = _NonBlockingQueueHandler(self)
+        self._batch_size = batch_size
+        self._linger_s = linger_ms / 1000
+        self._listener: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._policy_cache: Dict[str, Optional[LogPolicy]] = {}
+        self._installed = []
+        self.dropped = Counter()
+        self.sampled = Counter()
+        self.rate_limited = Counter()
+
+    def _policy(self, name: str) -> Optional[LogPolicy]:
+        try:
+            return self._policy_cache[name]
+        except KeyError:
+            pass
+        policy, candidate = None, name
+        while candidate:
+            policy = self.policies.get(candidate)
+            if policy is not None:
+                break
+            candidate = candidate.rpartition(".")[0]
+        self._policy_cache[name] = policy
+        return policy
+
+    def _admit(self, record: logging.LogRecord) -> bool:
+        policy = self._policy(record.name)
+        if policy is None:
+            return True
+        with self._lock:
+            reason = policy.admit(record)
+        if reason is None:
+            return True
+        (self.sampled if reason == "sampled" else self.rate_limited).inc()
+        return False
+
+    def install(self, logger_name: str = "banking_system", level: int = logging.INFO) -> "LogPipeline":
+        """
+        Routes `logger_name` and its children through the pipeline instead of propagating
+        to the root logger's (synchronous) handlers, and starts the listener.
+        """
+        logger = logging.getLogger(logger_name)
+        logger.addHandler(self._handler)
+        logger.setLevel(level)
+        logger.propagate = False
+        self._installed.append(logger)
+        self.start()
+        return self
+
+    def start(self) -> None:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="banking-log", daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            records = [self._queue.get()]
+            while len(records) < self._batch_size:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = False
+            for record in records:
+                if record is _STOP:
+                    stopping = True
+                    continue
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            if stopping:
+                return
+            if len(records) < self._batch_size and self._linger_s:
+                # Let the next batch build up instead of waking for every record
+                time.sleep(self._linger_s)
+
+    def stop(self) -> None:
+        """Detaches from the loggers and writes out every queued record. Safe to call twice."""
+        for logger in self._installed:
+            logger.removeHandler(self._handler)
+            logger.propagate = True
+        self._installed = []
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            # Waits for room behind the queued records rather than failing on a full queue
+            self._queue.put(_STOP)
+            listener.join()
@@ -0,0 +1,96 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Seconds, from 50 microseconds to 1 second
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+
+def exponential_buckets(start: float, factor: float, count: int) -> Tuple[float, ...]:
+    """Returns `count` bucket bounds starting at `start`, each `factor` times the previous."""
+    if start <= 0 or factor <= 1 or count < 1:
+        raise ValueError("Exponential buckets need start > 0, factor > 1 and count >= 1.")
+    return tuple(start * factor ** position for position in range(count))
+
+
+class Histogram:
+    """
+    Counts observations into fixed buckets (each bound is an inclusive upper edge, with an
+    implicit +Inf bucket after the last) and keeps their count and sum. Thread-safe.
+    """
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        bounds = tuple(float(bound) for bound in buckets)
+        if not bounds or list(bounds) != sorted(set(bounds)):
+            raise ValueError("Histogram buckets must be a non-empty, strictly increasing sequence.")
+        self.buckets = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        position = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[position] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        """Returns (upper bound, observations <= bound) pairs, ending with (inf, count)."""
+        with self._lock:
+            counts = list(self._counts)
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the q-th quantile (0 < q <= 1),
+        an over-estimate by at most one bucket width; 0.0 before any observation.
+        """
+        if not 0 < q <= 1:
+            raise ValueError("The quantile must be in (0, 1].")
+        pairs = self.cumulative_counts()
+        total = pairs[-1][1]
+        if total == 0:
+            return 0.0
+        for bound, cumulative in pairs:
+            if cumulative >= q * total:
+                return bound
+        return pairs[-1][0]
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean and the bucketed p50/p90/p99, for logs and benchmark reports."""
+        count = self.count
+        return {
+            "count": count,
+            "mean": self._sum / count if count else 0.0,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Counter:
+    """A monotonically increasing count. Thread-safe."""
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
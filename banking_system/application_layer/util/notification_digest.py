@@ -0,0 +1,142 @@
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from .metrics import Counter
+
+# Transactions listed one by one in a digest; the rest are only counted
+MAX_LISTED_TRANSACTIONS = 20
+_CREDIT_TYPES = ("DEPOSIT",)
+
+
+def signed_amount(event) -> float:
+    """The event's effect on the notified account: credits positive, debits (withdrawals, transfers out) negative."""
+    transaction_type = getattr(event.transaction_type, "value", event.transaction_type)
+    return event.amount if transaction_type in _CREDIT_TYPES else -event.amount
+
+
+def render_digest(account_id: str, events: List) -> Tuple[str, str]:
+    """Returns the (subject, body) of a digest summarising the events."""
+    net = sum(signed_amount(event) for event in events)
+    sign = "-" if net < 0 else "+"
+    subject = f"{len(events)} transactions, net {sign}${abs(net):.2f}"
+    lines = [
+        "Transaction Digest:",
+        f"Account ID: {account_id}",
+        f"Transactions: {len(events)}",
+        f"Net amount: {sign}${abs(net):.2f}",
+    ]
+    for event in events[:MAX_LISTED_TRANSACTIONS]:
+        transaction_type = getattr(event.transaction_type, "value", event.transaction_type)
+        lines.append(f"  {event.timestamp}  {transaction_type}  ${event.amount:.2f}  ({event.transaction_id})")
+    if len(events) > MAX_LISTED_TRANSACTIONS:
+        lines.append(f"  ... and {len(events) - MAX_LISTED_TRANSACTIONS} more")
+    return subject, "\n".join(lines) + "\n"
+
+
+class _Window:
+    __slots__ = ("deadline", "events")
+
+    def __init__(self, deadline: float) -> None:
+        self.deadline = deadline
+        self.events = []
+
+
+class NotificationCoalescer:
+    """
+    Coalesces notifications per (account, channel) over a time window.
+
+    The first notification for a quiet key passes straight through (`offer` returns True),
+    so a quiet account keeps single-transaction latency, and opens a window of `window_s`.
+    Notifications arriving while the window is open are buffered; when it closes, they
+    go out as one digest and a new window opens; a window that closes with nothing
+    buffered makes the key quiet again. A busy account therefore gets at most one message
+    per window per channel. Digests falling due together are handed over in one
+    `send_digests([(account_id, channel, events), ...])` call.
+    """
+    def __init__(self, window_s: float, send_digests: Callable[[List[Tuple[str, str, list]]], None],
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if window_s <= 0:
+            raise ValueError("The coalescing window must be positive.")
+        self._window = window_s
+        self._send_digests = send_digests
+        self._clock = clock
+        self._windows: Dict[Tuple[str, str], _Window] = {}
+        self._deadlines: List[Tuple[float, Tuple[str, str]]] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.coalesced = Counter()
+        self.digests = Counter()
+
+    def offer(self, channel: str, account_id: str, event) -> bool:
+        """Returns True if the notification should be sent now, False if it was buffered for a digest."""
+        key = (account_id, channel)
+        with self._condition:
+            window = self._windows.get(key)
+            if window is not None and not self._closed:
+                window.events.append(event)
+                self.coalesced.inc()
+                return False
+            if self._closed:
+                return True
+            self._open(key)
+            return True
+
+    def _open(self, key) -> None:
+        window = self._windows[key] = _Window(self._clock() + self._window)
+        heapq.heappush(self._deadlines, (window.deadline, key))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="banking-notify-digest", daemon=True)
+            self._thread.start()
+        elif self._deadlines[0][1] == key:
+            self._condition.notify()
+
+    def _expired(self, now: float) -> List[Tuple[Tuple[str, str], list]]:
+        """Closes every window whose deadline has passed; returns the buffered events to digest."""
+        due = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, key = heapq.heappop(self._deadlines)
+            window = self._windows.get(key)
+            if window is None or window.deadline != deadline:
+                continue
+            del self._windows[key]
+            if window.events:
+                due.append((key, window.events))
+                # Still busy: keep coalescing
+                self._open(key)
+        return due
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed:
+                    if self._deadlines:
+                        remaining = self._deadlines[0][0] - self._clock()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                if self._closed:
+                    return
+                due = self._expired(self._clock())
+            self._deliver(due)
+
+    def _deliver(self, due) -> None:
+        if due:
+            self._send_digests([(account_id, channel, events) for (account_id, channel), events in due])
+            self.digests.inc(len(due))
+
+    def flush(self) -> None:
+        """Sends every buffered digest now and stops the window thread; later offers pass straight through."""
+        with self._condition:
+            self._closed = True
+            due = [(key, window.events) for key, window in self._windows.items() if window.events]
+            self._windows.clear()
+            self._deadlines.clear()
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self._deliver(due)
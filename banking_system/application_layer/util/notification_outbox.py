@@ -0,0 +1,288 @@
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+from .metrics import Counter, Histogram, exponential_buckets
+from .notification_digest import NotificationCoalescer, render_digest
+
+logger = logging.getLogger(__name__)
+
+# Seconds from enqueue to delivery, 1 ms to about 65 s
+DELIVERY_LAG_BUCKETS = exponential_buckets(0.001, 2, 17)
+_STOP = object()
+
+
+def transaction_message(transaction) -> str:
+    """The notification text for a transaction (or a NotificationEvent)."""
+    return (
+        f"Transaction Notification:\n"
+        f"Type: {transaction.transaction_type}\n"
+        f"Amount: ${transaction.amount:.2f}\n"
+        f"Date: {transaction.timestamp}\n"
+        f"Account ID: {transaction.account_id}\n"
+    )
+
+
+def channel_key(notification_type) -> str:
+    """Normalizes a stored notification preference ("email", "SMS", an enum member) to a channel key."""
+    return str(getattr(notification_type, "value", notification_type)).lower()
+
+
+class NotificationEvent:
+    """The few fields of a transaction a notification needs, captured when it is enqueued."""
+    __slots__ = ("transaction_id", "transaction_type", "amount", "timestamp", "account_id", "enqueued")
+
+    def __init__(self, transaction_id, transaction_type, amount, timestamp, account_id) -> None:
+        self.transaction_id = transaction_id
+        self.transaction_type = transaction_type
+        self.amount = amount
+        self.timestamp = timestamp
+        self.account_id = account_id
+        self.enqueued = time.monotonic()
+
+    @classmethod
+    def from_transaction(cls, transaction) -> "NotificationEvent":
+        return cls(transaction.transaction_id, transaction.transaction_type, transaction.amount,
+                   transaction.timestamp, transaction.account_id)
+
+
+class NotificationMessage:
+    """One rendered notification for one account over one channel."""
+    __slots__ = ("account_id", "channel", "subject", "body")
+
+    def __init__(self, account_id: str, channel: str, subject: str, body: str) -> None:
+        self.account_id = account_id
+        self.channel = channel
+        self.subject = subject
+        self.body = body
+
+
+class NotificationOutbox:
+    """
+    Decouples notification delivery from the request path.
+
+    `enqueue` captures a NotificationEvent into a bounded queue and returns. A pool of
+    worker threads drains the queue in batches of up to `batch_size`, loads the
+    preferences of the batch's accounts in one call, renders the messages and hands each channel
+    its share in one `send_batch` call. A failing channel is logged and counted; it does
+    not affect the other channels or the transaction, which is already committed.
+
+    Backpressure: when the queue is full, `enqueue` blocks for up to `enqueue_timeout_s`
+    and then drops the event (counted in `dropped`) rather than failing a request whose
+    money movement already happened.
+
+    Coalescing: with `coalesce_window_s`, the first notification for a quiet account and
+    channel is delivered at once and later ones within the window are folded into one
+    digest (count, net amount, the transactions) sent when it closes; see
+    NotificationCoalescer. `coalescer.coalesced` and `coalescer.digests` count them.
+
+    Broadcast: `broadcast` sends one message to every subscriber of a notification type,
+    found through the preference store's reverse index rather than a scan of all accounts.
+
+    Metrics: `depth` (live queue depth), `queue_depth` (depth sampled as each batch is
+    taken), `delivery_lag` (seconds from enqueue to delivery), `batch_sizes`, and the
+    `enqueued`, `delivered`, `failed` and `dropped` counters.
+    """
+    def __init__(self, preferences, channels: Dict[str, object], workers: int = 4, capacity: int = 10_000,
+                 batch_size: int = 100, enqueue_timeout_s: float = 1.0,
+                 coalesce_window_s: Optional[float] = None) -> None:
+        """
+        Args:
+            preferences: Anything with `load_notification_preferences(account_ids)` and
+                `get_subscribers(notification_type)`, such as the notification adapter.
+            channels: NotificationChannelInterface implementations by preference name ("email", "sms").
+            workers: Delivery threads.
+            capacity: Events the queue holds before `enqueue` applies backpressure.
+            batch_size: Most events a worker takes per batch.
+            enqueue_timeout_s: How long `enqueue` waits on a full queue before dropping.
+            coalesce_window_s: Digest window per account and channel; None sends every notification.
+        """
+        if workers < 1 or capacity < 1 or batch_size < 1:
+            raise ValueError("An outbox needs at least one worker, one slot of capacity and a batch size of one.")
+        self._preferences = preferences
+        self._channels = {channel_key(name): channel for name, channel in channels.items()}
+        self._worker_count = workers
+        self._batch_size = batch_size
+        self._enqueue_timeout = enqueue_timeout_s
+        self._queue = queue.Queue(maxsize=capacity)
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        # Set by close: workers stop after the batch in hand, even with events still queued
+        self._stopping = threading.Event()
+        self.coalescer = None
+        if coalesce_window_s is not None:
+            self.coalescer = NotificationCoalescer(coalesce_window_s, self._send_digests)
+
+        self.enqueued = Counter()
+        self.delivered = Counter()
+        self.failed = Counter()
+        self.dropped = Counter()
+        self.queue_depth = Histogram(exponential_buckets(1, 4, max(1, (capacity.bit_length() + 1) // 2)))
+        self.delivery_lag = Histogram(DELIVERY_LAG_BUCKETS)
+        self.batch_sizes = Histogram(exponential_buckets(1, 2, max(1, batch_size.bit_length())))
+
+    @property
+    def depth(self) -> int:
+        """Events waiting for a worker."""
+        return self._queue.qsize()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._workers or self._closed:
+                return
+            for number in range(self._worker_count):
+                worker = threading.Thread(target=self._work, name=f"banking-notify-{number}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def enqueue(self, transaction) -> bool:
+        """
+        Queues a notification for the transaction; returns False if it was dropped
+        because the outbox is closed or stayed full for `enqueue_timeout_s`.
+        """
+        if self._closed:
+            self.dropped.inc()
+            return False
+        if not self._workers:
+            self._start()
+        try:
+            self._queue.put(NotificationEvent.from_transaction(transaction), timeout=self._enqueue_timeout)
+        except queue.Full:
+            self.dropped.inc()
+            logger.warning("Notification outbox full; dropped notification for transaction %s", transaction.transaction_id)
+            return False
+        self.enqueued.inc()
+        return True
+
+    def _work(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+            self.queue_depth.observe(self._queue.qsize() + 1)
+            batch, stopping = [first], False
+            while len(batch) < self._batch_size:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(event)
+            try:
+                self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stopping or self._stopping.is_set():
+                return
+
+    def _deliver(self, batch: List[NotificationEvent]) -> None:
+        try:
+            preferences = self._preferences.load_notification_preferences({event.account_id for event in batch})
+        except Exception:
+            logger.exception("Could not load notification preferences for a batch of %d notifications", len(batch))
+            preferences = {}
+        by_channel = defaultdict(list)
+        for event in batch:
+            kinds = preferences.get(event.account_id)
+            if not kinds:
+                continue
+            body = transaction_message(event)
+            subject = f"{event.transaction_type} of ${event.amount:.2f}"
+            for kind in kinds:
+                key = channel_key(kind)
+                if key not in self._channels:
+                    continue
+                if self.coalescer is not None and not self.coalescer.offer(key, event.account_id, event):
+                    continue
+                by_channel[key].append(NotificationMessage(event.account_id, key, subject, body))
+
+        for key, messages in by_channel.items():
+            self._send(key, messages)
+
+        now = time.monotonic()
+        for event in batch:
+            self.delivery_lag.observe(now - event.enqueued)
+        self.batch_sizes.observe(len(batch))
+
+    def _send(self, key: str, messages: List[NotificationMessage]) -> None:
+        try:
+            self._channels[key].send_batch(messages)
+            self.delivered.inc(len(messages))
+        except Exception:
+            self.failed.inc(len(messages))
+            logger.exception("Delivery of %d %s notifications failed", len(messages), key)
+
+    def broadcast(self, notification_type, subject: str, body: str) -> int:
+        """
+        Sends the same message to every account subscribed to `notification_type` (e.g. a
+        rate change to all SMS subscribers), in batches of `batch_size` on the calling thread.
+        Returns the number of messages handed to the channel.
+        """
+        key = channel_key(notification_type)
+        if key not in self._channels:
+            raise ValueError(f"No notification channel for {notification_type}")
+        subscribers = self._preferences.get_subscribers(key)
+        for start in range(0, len(subscribers), self._batch_size):
+            self._send(key, [NotificationMessage(account_id, key, subject, body)
+                             for account_id in subscribers[start:start + self._batch_size]])
+        return len(subscribers)
+
+    def _send_digests(self, digests) -> None:
+        by_channel = defaultdict(list)
+        for account_id, key, events in digests:
+            subject, body = render_digest(account_id, events)
+            by_channel[key].append(NotificationMessage(account_id, key, subject, body))
+        for key, messages in by_channel.items():
+            self._send(key, messages)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every queued event has been handled; returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Shutdown hook: stops accepting events, delivers what is queued, stops the workers
+        and sends any pending digests. Draining and stopping share one `timeout`; events
+        still queued when it runs out are counted as dropped, and a worker stuck in a
+        channel is left to finish its batch on its own. Returns False if the queue did not drain in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        drained = self.drain(timeout)
+        self._stopping.set()
+        for _ in workers:
+            try:
+                # Wakes a worker waiting on an empty queue; busy ones see _stopping instead
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                break
+        for worker in workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        while True:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is not _STOP:
+                self.dropped.inc()
+            self._queue.task_done()
+        if self.coalescer is not None:
+            self.coalescer.flush()
+        return drained
@@ -0,0 +1,64 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+# Page size used when streaming a whole history
+EXPORT_CHUNK_SIZE = 1000
+
+
+class TransactionPage:
+    """
+    One page of an account's transaction history, oldest first.
+    Attributes:
+        transactions (List): The transactions on this page.
+        next_cursor (Optional[str]): Opaque cursor for the following page, None on the last page.
+    """
+    def __init__(self, transactions: List, next_cursor: Optional[str] = None):
+        self.transactions = transactions
+        self.next_cursor = next_cursor
+
+    def __repr__(self):
+        return f"<TransactionPage(size={len(self.transactions)}, has_more={self.next_cursor is not None})>"
+
+
+def encode_cursor(*parts: int) -> str:
+    """Packs integer positions into an opaque, URL-safe cursor string."""
+    raw = ":".join(str(part) for part in parts).encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Tuple[int, ...]:
+    """Inverse of `encode_cursor`; raises ValueError for anything that is not a cursor of `size` parts."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        parts = tuple(int(part) for part in raw.split(":"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+    if len(parts) != size:
+        raise ValueError("Invalid pagination cursor")
+    return parts
+
+
+def validate_page_size(limit: int) -> None:
+    if limit < 1:
+        raise ValueError("Page size must be at least 1")
+
+
+def paginate(transactions: List, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+             start: Optional[datetime] = None, end: Optional[datetime] = None) -> TransactionPage:
+    """
+    Pages through an already time-ordered list by offset, keeping only transactions with
+    `start <= timestamp < end`. Used by repositories without a native time index.
+    """
+    validate_page_size(limit)
+    if start is not None or end is not None:
+        transactions = [
+            transaction for transaction in transactions
+            if (start is None or transaction.timestamp >= start) and (end is None or transaction.timestamp < end)
+        ]
+    offset = decode_cursor(cursor, 1)[0] if cursor else 0
+    page = transactions[offset:offset + limit]
+    next_cursor = encode_cursor(offset + limit) if offset + limit < len(transactions) else None
+    return TransactionPage(page, next_cursor)
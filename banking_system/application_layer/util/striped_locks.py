@@ -0,0 +1,105 @@
+import threading
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class StripedLockManager:
+    """
+    Fixed pool of re-entrant locks ("stripes") keyed by account id.
+
+    Operations on unrelated accounts usually map to different stripes and proceed in
+    parallel, while operations on the same account serialize. Multi-account operations
+    (transfers, batches) acquire their stripes in ascending stripe order, so two transfers
+    over the same pair of accounts can never deadlock whatever their direction.
+    """
+    def __init__(self, stripes: int = 256):
+        if stripes < 1:
+            raise ValueError("A lock manager needs at least one stripe.")
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    @property
+    def stripes(self) -> int:
+        return len(self._locks)
+
+    def stripe_for(self, account_id: str) -> int:
+        """Returns the stripe index guarding the account within this process."""
+        return hash(account_id) % len(self._locks)
+
+    @contextmanager
+    def locked(self, *account_ids: str):
+        """Holds the stripes of every given account for the duration of the block."""
+        if len(account_ids) == 1:
+            lock = self._locks[self.stripe_for(account_ids[0])]
+            with lock:
+                yield
+            return
+        stripes = sorted({self.stripe_for(account_id) for account_id in account_ids})
+        acquired = []
+        try:
+            for stripe in stripes:
+                self._locks[stripe].acquire()
+                acquired.append(stripe)
+            yield
+        finally:
+            for stripe in reversed(acquired):
+                self._locks[stripe].release()
+
+
+class AsyncStripedLockManager:
+    """
+    Event-loop counterpart of StripedLockManager built on asyncio locks.
+
+    Waiting for a stripe suspends only the calling coroutine, so the loop keeps serving
+    other requests. Coroutines on the same account queue up instead of racing each other
+    into compare-and-swap conflicts; stripes are taken in ascending order as above.
+    """
+    def __init__(self, stripes: int = 256):
+        if stripes < 1:
+            raise ValueError("A lock manager needs at least one stripe.")
+        self._stripes = stripes
+        # asyncio locks belong to one event loop, so each running loop gets its own stripes
+        self._locks = weakref.WeakKeyDictionary()
+
+    @property
+    def stripes(self) -> int:
+        return self._stripes
+
+    def stripe_for(self, account_id: str) -> int:
+        """Returns the stripe index guarding the account within this process."""
+        return hash(account_id) % self._stripes
+
+    def _lock(self, stripe: int) -> "asyncio.Lock":
+        # Only reached inside a running loop, so this finds asyncio already loaded; a
+        # module-level import would make every synchronous process pay for it
+        import asyncio
+        locks = self._locks.get(asyncio.get_running_loop())
+        if locks is None:
+            locks = self._locks[asyncio.get_running_loop()] = {}
+        lock = locks.get(stripe)
+        if lock is None:
+            lock = locks[stripe] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def locked(self, *account_ids: str):
+        """Holds the stripes of every given account for the duration of the block."""
+        stripes = sorted({self.stripe_for(account_id) for account_id in account_ids})
+        acquired = []
+        try:
+            for stripe in stripes:
+                lock = self._lock(stripe)
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+
+# Shared by every service instance so that locking works across per-request service objects
+default_lock_manager = StripedLockManager()
+default_async_lock_manager = AsyncStripedLockManager()
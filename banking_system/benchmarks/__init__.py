@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the banking system.
+Each module is runnable on its own, e.g. `python -m banking_system.benchmarks.transaction_memory`.
+"""
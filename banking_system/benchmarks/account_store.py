@@ -0,0 +1,83 @@
+"""
+Compares the dict-of-objects account store with the columnar (struct-of-arrays) store:
+bytes retained per account and the time of a whole-book balance scan.
+
+Usage:
+    python -m banking_system.benchmarks.account_store [--accounts 100000]
+"""
+import argparse
+import contextlib
+import gc
+import os
+import random
+import time
+import tracemalloc
+
+from banking_system import AccountType, CheckingAccount, SavingsAccount
+from banking_system.domain_layer import CheckingInterestStrategy, SavingsInterestStrategy, LimitConstraint
+from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+from banking_system.infrastructure_layer.strategies.columnar_account_strategy import ColumnarAccountStrategy
+
+
+def _make_account(rng):
+    limit_constraint = LimitConstraint(daily_limit=1000.0, monthly_limit=5000.0)
+    if rng.random() < 0.5:
+        return CheckingAccount(AccountType.CHECKING, rng.uniform(5, 10_000), CheckingInterestStrategy(), limit_constraint)
+    return SavingsAccount(AccountType.SAVINGS, rng.uniform(100, 50_000), SavingsInterestStrategy(0.05), limit_constraint)
+
+
+def _fill(strategy, count):
+    rng = random.Random(7)
+    for _ in range(count):
+        strategy.create_account(_make_account(rng))
+
+
+def measure_memory(strategy_class, count: int) -> float:
+    """Returns the bytes retained by the strategy per stored account."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    strategy = strategy_class()
+    _fill(strategy, count)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def measure_scan(count: int):
+    """Returns the seconds taken to total every balance in each store."""
+    dictionary, columnar = DictionaryAccountStrategy(), ColumnarAccountStrategy()
+    _fill(dictionary, count)
+    _fill(columnar, count)
+
+    start = time.perf_counter()
+    sum(account.balance for account in dictionary._accounts.values())
+    dictionary_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columnar.total_balance()
+    columnar_seconds = time.perf_counter() - start
+    return dictionary_seconds, columnar_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=100_000, help="number of accounts to store")
+    args = parser.parse_args()
+
+    # Account construction validates through a chatty validator; keep it out of the output.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        dictionary_bytes = measure_memory(DictionaryAccountStrategy, args.accounts)
+        columnar_bytes = measure_memory(ColumnarAccountStrategy, args.accounts)
+        dictionary_scan, columnar_scan = measure_scan(args.accounts)
+
+    print(f"accounts stored      : {args.accounts}")
+    print(f"dictionary strategy  : {dictionary_bytes:8.1f} bytes/account, scan {dictionary_scan * 1e3:8.2f} ms")
+    print(f"columnar strategy    : {columnar_bytes:8.1f} bytes/account, scan {columnar_scan * 1e3:8.2f} ms")
+    print(f"memory reduction     : {dictionary_bytes / columnar_bytes:8.2f}x")
+    print(f"scan speedup         : {dictionary_scan / columnar_scan:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Multi-threaded stress test for deposits, withdrawals and transfers.
+
+Runs the same random workload with 1..N threads, once behind a single lock (one stripe)
+and once with striped per-account locks, reports throughput for each and checks that
+money is conserved: the final book total must equal the opening total plus deposits
+minus withdrawals, and no balance may go negative.
+
+Usage:
+    python -m banking_system.benchmarks.concurrency_stress [--accounts 1000] [--ops 20000] [--threads 1 2 4 8]
+
+Note: on a GIL build of CPython pure-Python work does not run in parallel, so scaling
+mostly shows lock contention overhead; it becomes visible once storage or notification
+calls release the GIL (I/O, free-threaded builds).
+"""
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+
+from banking_system import AccountType, CheckingAccount
+from banking_system.application_layer.services import TransactionService, FundTransferService
+from banking_system.application_layer.util.striped_locks import StripedLockManager
+from banking_system.infrastructure_layer.account_repository import AccountRepository
+from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+
+OPENING_BALANCE = 1_000
+
+
+class _Silent:
+    """Stands in for the notification and logging services."""
+    def notify(self, transaction):
+        pass
+
+    def log_transaction(self, transaction):
+        pass
+
+
+def _worker(seed, ops, account_ids, transaction_service, transfer_service, totals):
+    rng = random.Random(seed)
+    deposited = withdrawn = 0
+    for _ in range(ops):
+        amount = rng.randint(1, 100)
+        choice = rng.random()
+        try:
+            if choice < 0.4:
+                transaction_service.deposit(rng.choice(account_ids), amount)
+                deposited += amount
+            elif choice < 0.7:
+                transaction_service.withdraw(rng.choice(account_ids), amount)
+                withdrawn += amount
+            else:
+                source, destination = rng.sample(account_ids, 2)
+                transfer_service.transfer_funds(source, destination, amount)
+        except ValueError:
+            pass  # insufficient funds
+    totals.append((deposited, withdrawn))
+
+
+def run(accounts: int, ops: int, threads: int, stripes: int):
+    """Returns (operations per second, consistency errors) for one configuration."""
+    account_repository = AccountRepository(DictionaryAccountStrategy())
+    transaction_repository = TransactionRepository(DictionaryTransactionStrategy(compact=True))
+    account_ids = []
+    for _ in range(accounts):
+        account = CheckingAccount(AccountType.CHECKING, OPENING_BALANCE)
+        account_repository.create_account(account)
+        account_ids.append(account.account_id)
+
+    lock_manager = StripedLockManager(stripes)
+    transaction_service = TransactionService(account_repository, transaction_repository, _Silent(), _Silent(), lock_manager)
+    transfer_service = FundTransferService(account_repository, transaction_repository, _Silent(), _Silent(), lock_manager)
+
+    totals = []
+    workers = [
+        threading.Thread(target=_worker, args=(seed, ops // threads, account_ids, transaction_service, transfer_service, totals))
+        for seed in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    balances = [account_repository.get_account_by_id(account_id).balance for account_id in account_ids]
+    expected = accounts * OPENING_BALANCE + sum(d for d, _ in totals) - sum(w for _, w in totals)
+    errors = []
+    if sum(balances) != expected:
+        errors.append(f"book total {sum(balances)} != expected {expected}")
+    if min(balances) < 0:
+        errors.append(f"negative balance {min(balances)}")
+    return (ops // threads) * threads / elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=1_000)
+    parser.add_argument("--ops", type=int, default=20_000, help="total operations per run")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--stripes", type=int, default=256)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'threads':>7} {'single lock ops/s':>18} {'striped ops/s':>14} {'scaling':>8}")
+    for threads in args.threads:
+        # Account and transaction construction validates through a chatty validator
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            single, single_errors = run(args.accounts, args.ops, threads, stripes=1)
+            striped, striped_errors = run(args.accounts, args.ops, threads, stripes=args.stripes)
+        print(f"{threads:>7} {single:>18.0f} {striped:>14.0f} {striped / single:>7.2f}x")
+        for error in single_errors + striped_errors:
+            failed = True
+            print(f"  INCONSISTENT: {error}")
+    if failed:
+        raise SystemExit(1)
+    print("balances consistent in every run")
+
+
+if __name__ == "__main__":
+    main()
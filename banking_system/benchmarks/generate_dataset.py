@@ -0,0 +1,118 @@
+"""
+Builds a synthetic dataset of accounts and transaction histories for large-scale
+benchmarks (see infrastructure_layer/synthetic_data.py), in one of these layouts:
+
+    files   OUT/accounts: a JournaledAccountStrategy snapshot, and
+            OUT/transactions: SegmentedLogTransactionStrategy segment files (fastest)
+    sqlite  OUT/bank.db, for SQLiteAccountStrategy and SQLiteTransactionStrategy; the rows
+            are generated in parallel but inserted by a single connection
+
+Generation runs on `--processes` worker processes (all cores by default), with numpy when
+it is installed; the same arguments and `--end` always produce the same dataset, as long
+as the same generator draws it (`--pure-python` forces the one that needs no numpy).
+
+Usage:
+    python -m banking_system.benchmarks.generate_dataset OUT [--format files|sqlite]
+        [--accounts 1000000] [--transactions 10000000] [--skew 1.1] [--days 365]
+        [--savings 0.3] [--mix deposit=45,withdraw=35,transfer=20] [--seed 42] [--pure-python] [--verify]
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+from banking_system.infrastructure_layer.synthetic_data import (
+    DatasetSpec, account_id, write_account_snapshot, write_sqlite_database, write_transaction_segments,
+)
+
+RECORDS_PER_SEGMENT = 1 << 18
+
+
+def _mix(text: str) -> dict:
+    weights = {}
+    for item in filter(None, text.split(",")):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def _verify(args, spec: DatasetSpec) -> None:
+    """Opens the dataset with the strategies it was built for and reads one account back."""
+    sample = account_id(spec, 0)
+    started = time.perf_counter()
+    if args.format == "files":
+        from banking_system.infrastructure_layer.strategies.journaled_account_strategy import JournaledAccountStrategy
+        from banking_system.infrastructure_layer.strategies.segmented_log_transaction_strategy import SegmentedLogTransactionStrategy
+        accounts = JournaledAccountStrategy(os.path.join(args.out, "accounts"), snapshot_interval_s=None)
+        transactions = SegmentedLogTransactionStrategy(os.path.join(args.out, "transactions"), RECORDS_PER_SEGMENT)
+        loaded = len(transactions)
+    else:
+        from banking_system.infrastructure_layer.strategies.sqlite_account_strategy import SQLiteAccountStrategy
+        from banking_system.infrastructure_layer.strategies.sqlite_transaction_strategy import SQLiteTransactionStrategy
+        path = os.path.join(args.out, "bank.db")
+        accounts, transactions = SQLiteAccountStrategy(path), SQLiteTransactionStrategy(path)
+        loaded = spec.transactions
+    try:
+        account = accounts.get_account_by_id(sample)
+        page = transactions.get_transactions_page(sample, limit=5)
+        if account is None or loaded != spec.transactions:
+            raise SystemExit(f"verification failed: account {sample} is {account}, {loaded} transactions loaded")
+        print(f"opened and verified in {time.perf_counter() - started:.1f} s: {account!r}, "
+              f"first page of its history: {len(page.transactions)} transactions")
+    finally:
+        accounts.close()
+        transactions.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out", help="output directory (must not hold a dataset yet)")
+    parser.add_argument("--format", choices=("files", "sqlite"), default="files")
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--transactions", type=int, default=10_000_000)
+    parser.add_argument("--savings", type=float, default=0.3, help="share of savings accounts")
+    parser.add_argument("--closed", type=float, default=0.02, help="share of closed accounts")
+    parser.add_argument("--balance-median", type=float, default=2_500.0)
+    parser.add_argument("--balance-sigma", type=float, default=1.2, help="log-normal shape of opening balances")
+    parser.add_argument("--amount-median", type=float, default=60.0)
+    parser.add_argument("--amount-sigma", type=float, default=1.0, help="log-normal shape of transaction amounts")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of activity per account (0 = uniform)")
+    parser.add_argument("--days", type=float, default=365.0, help="time span of the transactions")
+    parser.add_argument("--end", type=datetime.fromisoformat, help="time of the last transaction (default: now)")
+    parser.add_argument("--mix", type=_mix, default="deposit=45,withdraw=35,transfer=20")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--processes", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--pure-python", action="store_true",
+                        help="draw rows with the pure-Python generator even when numpy is installed (a different dataset)")
+    parser.add_argument("--verify", action="store_true", help="open the dataset with its strategies afterwards")
+    args = parser.parse_args()
+
+    try:
+        spec = DatasetSpec(
+            args.accounts, args.transactions, savings_fraction=args.savings, closed_fraction=args.closed,
+            balance_median=args.balance_median, balance_sigma=args.balance_sigma, amount_median=args.amount_median,
+            amount_sigma=args.amount_sigma, activity_skew=args.skew, mix=args.mix, end=args.end, days=args.days,
+            seed=args.seed, vectorized=False if args.pure_python else None,
+        )
+    except ValueError as error:
+        parser.error(str(error))
+
+    started = time.perf_counter()
+    if args.format == "files":
+        write_account_snapshot(spec, os.path.join(args.out, "accounts"), args.processes)
+        accounts_done = time.perf_counter()
+        write_transaction_segments(spec, os.path.join(args.out, "transactions"), RECORDS_PER_SEGMENT, args.processes)
+    else:
+        os.makedirs(args.out, exist_ok=True)
+        accounts_done = started
+        write_sqlite_database(spec, os.path.join(args.out, "bank.db"), args.processes)
+    elapsed = time.perf_counter() - started
+
+    print(f"{spec.accounts:,} accounts and {spec.transactions:,} transactions in {elapsed:.1f} s "
+          f"({spec.transactions / max(elapsed - (accounts_done - started), 1e-9):,.0f} transactions/s) -> {args.out}")
+    if args.verify:
+        _verify(args, spec)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Import-time (cold start) benchmark.
+
+Each profile is the set of modules one kind of process imports before doing any work:
+- package: `import banking_system` alone;
+- batch: what a CLI batch job (a month-end interest run over the durable stores) imports:
+  the services, repositories and the journaled/segmented strategies;
+- api: the FastAPI application module the server process loads, which also builds the
+  configured repositories.
+
+Every run is a fresh interpreter started with `python -X importtime`, so the numbers are
+the interpreter's own per-module timings. The profile's import time (the median over
+`--repeat` runs) is checked against its target, and the modules that cost the most are
+listed, by package and one by one. A run also fails if any file of the package is loaded
+under two module names (e.g. as both `domain_layer.x` and `banking_system.domain_layer.x`).
+
+The command exits with status 1 when a profile misses its target or loads a module
+twice; a profile whose imports fail (e.g. FastAPI is not installed) is reported and
+skipped.
+
+Usage:
+    python -m banking_system.benchmarks.import_time [PROFILE ...] [--module NAME ...]
+        [--repeat 5] [--top 12] [--output results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Profile -> (modules imported, target import time in milliseconds)
+PROFILES: Dict[str, tuple] = {
+    "package": (["banking_system"], 5.0),
+    "batch": ([
+        "banking_system.application_layer.services",
+        "banking_system.infrastructure_layer.account_repository",
+        "banking_system.infrastructure_layer.transaction_repository",
+        "banking_system.infrastructure_layer.strategies.journaled_account_strategy",
+        "banking_system.infrastructure_layer.strategies.segmented_log_transaction_strategy",
+    ], 120.0),
+    # FastAPI and pydantic are most of this; the banking modules add the services and
+    # only the storage backend the environment selects
+    "api": (["banking_system.presentation_layer.api_endpoints"], 400.0),
+}
+
+_START, _END = "--import-time-start--", "--import-time-end--"
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Run in the child: import the profile between two markers on stderr, then report every
+# file of this repository loaded under more than one module name. os._exit skips waiting
+# for the worker threads an application module may have started.
+_CHILD = """
+import sys
+sys.stderr.write({start!r} + "\\n")
+sys.stderr.flush()
+for name in {modules!r}:
+    __import__(name)
+sys.stderr.write({end!r} + "\\n")
+sys.stderr.flush()
+import json, os
+files = {{}}
+for name, module in list(sys.modules.items()):
+    path = getattr(module, "__file__", None)
+    if path and os.path.realpath(path).startswith({root!r}):
+        files.setdefault(os.path.realpath(path), []).append(name)
+sys.stdout.write(json.dumps(sorted(sorted(names) for names in files.values() if len(names) > 1)))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def parse_importtime(stderr: str) -> List[tuple]:
+    """
+    Returns (module, self_us, cumulative_us, depth) for each import between the markers
+    in `-X importtime` output; depth 0 is a module the profile imported directly.
+    """
+    entries, recording = [], False
+    for line in stderr.splitlines():
+        if line == _START:
+            recording = True
+        elif line == _END:
+            break
+        elif recording and line.startswith("import time:"):
+            fields = line[len("import time:"):].split("|")
+            if len(fields) != 3 or not fields[0].strip().isdigit():
+                continue
+            name = fields[2].rstrip()
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            entries.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return entries
+
+
+def run_once(modules: Sequence[str]) -> dict:
+    """Imports `modules` in a fresh interpreter; returns its timings, or its error."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPOSITORY_ROOT, os.environ.get("PYTHONPATH")])))
+    child = _CHILD.format(start=_START, end=_END, modules=list(modules), root=os.path.join(os.path.realpath(REPOSITORY_ROOT), ""))
+    started = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", child],
+                             capture_output=True, text=True, cwd=REPOSITORY_ROOT, env=env, timeout=120)
+    process_ms = (time.perf_counter() - started) * 1000
+    if process.returncode != 0:
+        lines = [line for line in process.stderr.splitlines() if not line.startswith("import time:")]
+        return {"error": lines[-1] if lines else f"exit status {process.returncode}"}
+    entries = parse_importtime(process.stderr)
+    return {
+        "import_ms": sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000,
+        "process_ms": process_ms,
+        "entries": entries,
+        "duplicates": json.loads(process.stdout or "[]"),
+    }
+
+
+def measure(modules: Sequence[str], repeat: int) -> dict:
+    """Runs the profile `repeat` times; the details come from the median run."""
+    runs = []
+    for _ in range(repeat):
+        result = run_once(modules)
+        if "error" in result:
+            return result
+        runs.append(result)
+    runs.sort(key=lambda run: run["import_ms"])
+    median = runs[len(runs) // 2]
+    return {
+        "import_ms": statistics.median(run["import_ms"] for run in runs),
+        "min_ms": runs[0]["import_ms"],
+        "max_ms": runs[-1]["import_ms"],
+        "process_ms": statistics.median(run["process_ms"] for run in runs),
+        "modules": len(median["entries"]),
+        "entries": median["entries"],
+        "duplicates": median["duplicates"],
+    }
+
+
+def by_package(entries: Sequence[tuple]) -> List[tuple]:
+    """Self time summed per top-level package (the first name of the module), largest first."""
+    totals: Dict[str, int] = {}
+    for name, self_us, _, _ in entries:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+def print_profile(name: str, target_ms: Optional[float], result: dict, top: int) -> None:
+    if "error" in result:
+        print(f"{name}: skipped, the imports failed: {result['error']}")
+        return
+    verdict = "" if target_ms is None else f"  target {target_ms:.0f} ms: {'ok' if result['import_ms'] <= target_ms else 'MISSED'}"
+    print(f"{name}: imports {result['import_ms']:.1f} ms (min {result['min_ms']:.1f}, max {result['max_ms']:.1f}), "
+          f"process {result['process_ms']:.0f} ms, {result['modules']} modules{verdict}")
+    for names in result["duplicates"]:
+        print(f"  LOADED TWICE: {' and '.join(names)}")
+    packages = by_package(result["entries"])[:top]
+    print("  by package (self ms): " + ", ".join(f"{package} {self_us / 1000:.1f}" for package, self_us in packages))
+    print("  slowest modules (self ms):")
+    for module, self_us, cumulative_us, _ in sorted(result["entries"], key=lambda entry: -entry[1])[:top]:
+        print(f"    {self_us / 1000:7.2f}  (with imports {cumulative_us / 1000:7.2f})  {module}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("profiles", nargs="*", help=f"profiles to run, of {', '.join(PROFILES)} (default: all)")
+    parser.add_argument("--module", action="append", default=[], help="also measure importing this module alone")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per profile")
+    parser.add_argument("--top", type=int, default=12, help="packages and modules listed per profile")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.profiles if name not in PROFILES]
+    if unknown:
+        parser.error(f"unknown profile(s) {', '.join(unknown)}; choose from {', '.join(PROFILES)}")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    selected = {name: PROFILES[name] for name in (args.profiles or ([] if args.module else PROFILES))}
+    selected.update({module: ([module], None) for module in args.module})
+    results, failed = {}, []
+    for name, (modules, target_ms) in selected.items():
+        result = results[name] = measure(modules, args.repeat)
+        print_profile(name, target_ms, result, args.top)
+        if "error" not in result and (result["duplicates"] or (target_ms is not None and result["import_ms"] > target_ms)):
+            failed.append(name)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"python": sys.version.split()[0], "profiles": results}, file, indent=2)
+    print(f"\n{len(failed)} profile(s) over target or loading modules twice" + (f": {', '.join(failed)}" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
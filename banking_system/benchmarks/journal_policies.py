@@ -0,0 +1,93 @@
+"""
+Write throughput of the journaled account store under each fsync policy, against the
+plain in-memory store: concurrent threads update random accounts, and the run reports
+updates per second, fsyncs issued (group commit shares them between writers), and the
+time to take a snapshot and to recover from it plus the log tail.
+
+Usage:
+    python -m banking_system.benchmarks.journal_policies [--accounts 10000] [--updates 20000] [--threads 8]
+"""
+import argparse
+import contextlib
+import os
+import random
+import tempfile
+import threading
+import time
+
+from banking_system import AccountType, CheckingAccount
+from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+from banking_system.infrastructure_layer.strategies.journaled_account_strategy import JournaledAccountStrategy
+from banking_system.infrastructure_layer.strategies.write_ahead_log import FSYNC_POLICIES
+
+
+def _writer(strategy, account_ids, updates, seed):
+    rng = random.Random(seed)
+    for _ in range(updates):
+        account = strategy.get_account_by_id(rng.choice(account_ids))
+        account.balance += 1.0
+        strategy.update_account(account)
+
+
+def _fill(strategy, count):
+    account_ids = []
+    # Account construction validates through a chatty validator
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(count):
+            account = CheckingAccount(AccountType.CHECKING, 1_000.0)
+            strategy.create_account(account)
+            account_ids.append(account.account_id)
+    return account_ids
+
+
+def run(strategy, account_ids, updates: int, threads: int) -> float:
+    """Returns updates per second with `threads` concurrent writers."""
+    workers = [
+        threading.Thread(target=_writer, args=(strategy, account_ids, updates // threads, seed))
+        for seed in range(threads)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (updates // threads) * threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="fsync period of the interval policy")
+    args = parser.parse_args()
+
+    store = DictionaryAccountStrategy()
+    baseline = run(store, _fill(store, args.accounts), args.updates, args.threads)
+    print(f"{'policy':>9} {'updates/s':>10} {'vs memory':>10} {'fsyncs':>7} {'snapshot s':>11} {'recovery s':>11}")
+    print(f"{'memory':>9} {baseline:>10.0f} {1:>9.2f}x {0:>7} {'-':>11} {'-':>11}")
+    for policy in FSYNC_POLICIES:
+        with tempfile.TemporaryDirectory() as directory:
+            strategy = JournaledAccountStrategy(directory, fsync=policy, fsync_interval_ms=args.interval_ms,
+                                                snapshot_interval_s=None)
+            account_ids = _fill(strategy, args.accounts)
+            strategy.snapshot()
+            fsyncs = strategy.fsyncs
+            throughput = run(strategy, account_ids, args.updates, args.threads)
+            fsyncs = strategy.fsyncs - fsyncs
+            start = time.perf_counter()
+            strategy.snapshot()
+            snapshot_seconds = time.perf_counter() - start
+            # Leave a log tail behind the snapshot for recovery to replay
+            run(strategy, account_ids, args.updates, args.threads)
+            strategy.close()
+
+            start = time.perf_counter()
+            JournaledAccountStrategy(directory, snapshot_interval_s=None).close()
+            recovery_seconds = time.perf_counter() - start
+        print(f"{policy:>9} {throughput:>10.0f} {throughput / baseline:>9.2f}x {fsyncs:>7} "
+              f"{snapshot_seconds:>11.3f} {recovery_seconds:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
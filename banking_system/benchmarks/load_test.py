@@ -0,0 +1,461 @@
+"""
+HTTP load generator for the API: throughput and p50/p95/p99/p99.9 latency per route.
+
+By default it drives the FastAPI `app` in-process, calling it as an ASGI application with
+the lifespan startup/shutdown hooks run, so no server or network is involved and the
+numbers measure the app itself (routing, validation, services, storage). With `--url` it
+sends the same workload over HTTP/1.1 keep-alive connections to a running server, e.g.
+`uvicorn banking_system.presentation_layer.api_endpoints:app --port 8000`, which adds the
+server and the network.
+
+The workload is closed-loop: `--concurrency` workers each send a request and wait for the
+response before sending the next. Each worker picks an operation from the weighted
+`--mix` and an account from a Zipf distribution over the `--accounts` opened first, so a
+few hot accounts get most of the traffic, as in production; `--zipf 0` picks uniformly.
+Several concurrency levels can be given and are run one after another.
+
+Responses are counted as ok (2xx), rejected (4xx: limits, insufficient funds, conflicts)
+or errors (5xx and failed requests). Only the daily and monthly limits of the accounts
+bound how many withdrawals and transfers succeed, so rejections rise with run length.
+
+Usage:
+    python -m banking_system.benchmarks.load_test [--concurrency 1 8 32] [--duration 10]
+        [--mix deposit=35,withdraw=15,transfer=15,balance=20,history=10,create=4,statement=1]
+        [--accounts 1000] [--zipf 1.1] [--url http://127.0.0.1:8000] [--output results.json]
+"""
+import argparse
+import asyncio
+import importlib
+import itertools
+import json
+import math
+import random
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_APP = "banking_system.presentation_layer.api_endpoints:app"
+DEFAULT_MIX = "deposit=35,withdraw=15,transfer=15,balance=20,history=10,create=4,statement=1"
+PERCENTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("p999", 0.999))
+
+
+class ZipfSampler:
+    """
+    Draws indexes 0..n-1 with P(k) proportional to 1 / (k + 1) ** s, by bisecting the
+    precomputed cumulative weights. s = 0 is uniform; around 1 a few indexes dominate.
+    """
+    def __init__(self, n: int, s: float, rng: random.Random) -> None:
+        if n < 1 or s < 0:
+            raise ValueError("A Zipf distribution needs at least one item and a non-negative exponent.")
+        self._cumulative = list(itertools.accumulate(1.0 / (rank + 1) ** s for rank in range(n)))
+        self._rng = rng
+
+    def sample(self) -> int:
+        return min(bisect_left(self._cumulative, self._rng.random() * self._cumulative[-1]), len(self._cumulative) - 1)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parses "operation=weight,..." into weights, checking the operation names."""
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}.")
+        mix[name] = float(weight or 1)
+        if mix[name] < 0:
+            raise ValueError(f"The weight of {name} must not be negative.")
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("The mix needs at least one operation with a positive weight.")
+    return mix
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return math.nan
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+# Requests are (route template, method, path, JSON body or None); `pick` draws an account id
+def _create(pick, rng):
+    account_type = rng.choice(("CHECKING", "SAVINGS"))
+    return "/accounts", "POST", "/accounts", {"account_type": account_type, "initialDeposit": 500.0}
+
+
+def _deposit(pick, rng):
+    account_id = pick()
+    return ("/accounts/{account_id}/deposit", "POST", f"/accounts/{account_id}/deposit",
+            {"amount": round(rng.uniform(1, 50), 2)})
+
+
+def _withdraw(pick, rng):
+    account_id = pick()
+    return ("/accounts/{account_id}/withdraw", "POST", f"/accounts/{account_id}/withdraw",
+            {"amount": round(rng.uniform(1, 20), 2)})
+
+
+def _transfer(pick, rng):
+    source = destination = pick()
+    # Skewed picks often repeat; transfers to the same account are rejected, so re-draw
+    for _ in range(8):
+        if destination != source:
+            break
+        destination = pick()
+    return ("/accounts/transfer", "POST", "/accounts/transfer",
+            {"sourceAccountId": source, "destinationAccountId": destination, "amount": round(rng.uniform(1, 20), 2)})
+
+
+def _balance(pick, rng):
+    account_id = pick()
+    return "/accounts/{account_id}/balance", "GET", f"/accounts/{account_id}/balance", None
+
+
+def _history(pick, rng):
+    account_id = pick()
+    return "/accounts/{account_id}/transactions", "GET", f"/accounts/{account_id}/transactions?limit=50", None
+
+
+def _statement(pick, rng):
+    # CSV, so the run does not depend on the PDF renderer
+    account_id = pick()
+    return "/accounts/{accountId}/statement", "GET", f"/accounts/{account_id}/statement?format=csv", None
+
+
+OPERATIONS: Dict[str, Callable] = {
+    "create": _create, "deposit": _deposit, "withdraw": _withdraw, "transfer": _transfer,
+    "balance": _balance, "history": _history, "statement": _statement,
+}
+
+
+class AsgiClient:
+    """
+    Sends requests straight to an ASGI application. `start`/`stop` run the app's
+    lifespan protocol, so its startup and shutdown hooks run as under a server.
+    """
+    def __init__(self, app) -> None:
+        self.app = app
+        self._lifespan: Optional[asyncio.Task] = None
+        self._lifespan_inbox: asyncio.Queue = asyncio.Queue()
+        self._lifespan_outbox: asyncio.Queue = asyncio.Queue()
+
+    async def start(self) -> None:
+        async def receive():
+            return await self._lifespan_inbox.get()
+
+        async def send(message):
+            await self._lifespan_outbox.put(message)
+
+        async def run():
+            try:
+                await self.app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, receive, send)
+            except Exception:
+                # Apps without lifespan support raise on the scope; that is allowed
+                await self._lifespan_outbox.put({"type": "lifespan.unsupported"})
+
+        self._lifespan = asyncio.create_task(run())
+        await self._lifespan_inbox.put({"type": "lifespan.startup"})
+        message = await self._lifespan_outbox.get()
+        if message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(f"The app failed to start: {message.get('message', '')}")
+        if message["type"] == "lifespan.unsupported":
+            self._lifespan = None
+
+    async def stop(self) -> None:
+        if self._lifespan is not None:
+            await self._lifespan_inbox.put({"type": "lifespan.shutdown"})
+            await self._lifespan_outbox.get()
+            await self._lifespan
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None) -> Tuple[int, bytes]:
+        path, _, query = path.partition("?")
+        headers = [(b"host", b"loadtest"), (b"accept", b"*/*")]
+        if body is not None:
+            headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+            "root_path": "", "headers": headers, "client": ("127.0.0.1", 50000), "server": ("loadtest", 80),
+        }
+        done = asyncio.Event()
+        sent_body = False
+        status, chunks = 500, []
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": body or b"", "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            done.set()
+        return status, b"".join(chunks)
+
+
+class HttpClient:
+    """Sends requests to a server over one HTTP/1.1 keep-alive connection, reconnecting as needed."""
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError("The target must be an http:// URL.")
+        self._host, self._port = parts.hostname, parts.port or 80
+        self._base = parts.path.rstrip("/")
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, body: Optional[bytes] = None) -> Tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+        head = f"{method} {self._base}{path} HTTP/1.1\r\nHost: {self._host}:{self._port}\r\n"
+        if body is not None:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        elif method != "GET":
+            head += "Content-Length: 0\r\n"
+        self._writer.write(head.encode("latin-1") + b"\r\n" + (body or b""))
+        try:
+            return await self._read_response()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await self.stop()
+            raise
+
+    async def _read_response(self) -> Tuple[int, bytes]:
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        else:
+            payload = await self._reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            await self.stop()
+        return status, payload
+
+
+class RouteStats:
+    __slots__ = ("latencies", "ok", "rejected", "errors")
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.ok = self.rejected = self.errors = 0
+
+    def summary(self, elapsed: float) -> dict:
+        ordered = sorted(self.latencies)
+        summary = {
+            "requests": len(ordered), "ok": self.ok, "rejected": self.rejected, "errors": self.errors,
+            "throughput": len(ordered) / elapsed if elapsed else 0.0,
+            "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else math.nan,
+        }
+        for name, fraction in PERCENTILES:
+            summary[f"{name}_ms"] = percentile(ordered, fraction) * 1000
+        return summary
+
+
+async def open_accounts(make_client, count: int, concurrency: int) -> List[str]:
+    """Opens `count` checking accounts through the API, over `concurrency` clients, and returns their ids."""
+    account_ids: List[str] = []
+    remaining = iter(range(count))
+
+    async def open_some():
+        client = make_client()
+        await client.start()
+        try:
+            for _ in remaining:
+                body = json.dumps({"account_type": "CHECKING", "initialDeposit": 1_000.0}).encode()
+                status, payload = await client.request("POST", "/accounts", body)
+                if status != 201:
+                    raise RuntimeError(f"Opening an account failed with {status}: {payload[:200]!r}")
+                account_ids.append(json.loads(payload)["account_id"])
+        finally:
+            await client.stop()
+
+    await asyncio.gather(*(open_some() for _ in range(max(1, min(concurrency, count)))))
+    return account_ids
+
+
+async def run_level(make_client, account_ids: List[str], mix: Dict[str, float], concurrency: int,
+                    duration: float, max_requests: Optional[int], zipf: float, seed: int) -> dict:
+    """Runs one closed-loop load level and returns per-route and total statistics."""
+    stats: Dict[str, RouteStats] = {}
+    names, weights = list(mix), list(itertools.accumulate(mix.values()))
+    # The hottest ranks go to random accounts, not to the first ones opened
+    ranked = list(account_ids)
+    random.Random(seed).shuffle(ranked)
+    budget = itertools.count() if max_requests is None else iter(range(max_requests))
+    deadline = time.perf_counter() + duration
+
+    async def worker(number: int) -> None:
+        rng = random.Random(seed * 1_000 + number)
+        sampler = ZipfSampler(len(ranked), zipf, rng)
+        client = make_client()
+        await client.start()
+
+        def pick() -> str:
+            return ranked[sampler.sample()]
+
+        try:
+            for _ in budget:
+                if time.perf_counter() >= deadline:
+                    break
+                name = names[bisect_left(weights, rng.random() * weights[-1])]
+                route, method, path, body = OPERATIONS[name](pick, rng)
+                payload = json.dumps(body).encode() if body is not None else None
+                started = time.perf_counter()
+                try:
+                    status, _ = await client.request(method, path, payload)
+                except Exception:
+                    status = None
+                elapsed = time.perf_counter() - started
+                route_stats = stats.get(route)
+                if route_stats is None:
+                    route_stats = stats[route] = RouteStats()
+                route_stats.latencies.append(elapsed)
+                if status is None or status >= 500:
+                    route_stats.errors += 1
+                elif status >= 400:
+                    route_stats.rejected += 1
+                else:
+                    route_stats.ok += 1
+        finally:
+            await client.stop()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    total = RouteStats()
+    for route_stats in stats.values():
+        total.latencies += route_stats.latencies
+        total.ok += route_stats.ok
+        total.rejected += route_stats.rejected
+        total.errors += route_stats.errors
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "routes": {route: route_stats.summary(elapsed) for route, route_stats in sorted(stats.items())},
+        "total": total.summary(elapsed),
+    }
+
+
+def print_level(result: dict) -> None:
+    print(f"\nconcurrency {result['concurrency']}, {result['elapsed_s']:.1f} s")
+    print(f"{'route':38s} {'requests':>9s} {'req/s':>9s} {'ok':>7s} {'4xx':>6s} {'err':>5s}"
+          f" {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'p999 ms':>8s}")
+    rows = list(result["routes"].items()) + [("total", result["total"])]
+    for route, summary in rows:
+        print(f"{route:38s} {summary['requests']:>9d} {summary['throughput']:>9.0f} {summary['ok']:>7d}"
+              f" {summary['rejected']:>6d} {summary['errors']:>5d} {summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f}"
+              f" {summary['p99_ms']:>8.2f} {summary['p999_ms']:>8.2f}")
+
+
+def load_app(target: str):
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+async def main_async(args) -> List[dict]:
+    mix = parse_mix(args.mix)
+    if args.url:
+        # One keep-alive connection per worker
+        app_client = None
+
+        def make_client():
+            return HttpClient(args.url)
+    else:
+        app_client = AsgiClient(load_app(args.app))
+
+        def make_client():
+            return _Borrowed(app_client)
+        await app_client.start()
+    try:
+        account_ids = await open_accounts(make_client, args.accounts, max(args.concurrency))
+        if args.warmup > 0:
+            await run_level(make_client, account_ids, mix, max(args.concurrency), args.warmup, None, args.zipf, args.seed)
+        results = []
+        for concurrency in args.concurrency:
+            result = await run_level(make_client, account_ids, mix, concurrency, args.duration, args.requests,
+                                     args.zipf, args.seed)
+            print_level(result)
+            results.append(result)
+        return results
+    finally:
+        if app_client is not None:
+            await app_client.stop()
+
+
+class _Borrowed:
+    """A worker's handle on the shared in-process client; the run starts and stops the app once."""
+    def __init__(self, client: AsgiClient) -> None:
+        self.request = client.request
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=DEFAULT_APP, help="ASGI app to drive in-process, as module:attribute")
+    parser.add_argument("--url", help="send requests to the server at this URL instead of in-process")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="closed-loop workers per level")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per level")
+    parser.add_argument("--requests", type=int, help="stop a level after this many requests")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before the first level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation weights, as name=weight,...")
+    parser.add_argument("--accounts", type=int, default=1_000, help="accounts opened before the run")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of account selection (0 = uniform)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+    if args.accounts < 1 or min(args.concurrency) < 1:
+        parser.error("--accounts and --concurrency must be positive")
+    try:
+        parse_mix(args.mix)
+    except ValueError as error:
+        parser.error(str(error))
+
+    results = asyncio.run(main_async(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"target": args.url or args.app, "mix": parse_mix(args.mix), "zipf": args.zipf,
+                       "accounts": args.accounts, "levels": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Request throughput with logging off, with a synchronous handler (records formatted, written
+and flushed on the request thread, under the handler lock), and through the LogPipeline
+(queued, written as JSON lines by the listener thread and flushed once per batch), also with
+transaction records sampled. `--sink-latency-ms` makes every flush of the log file take that
+long, as a slow disk, pipe or log collector would.
+
+Each request logs what a deposit through the API does: the endpoint's info line and the
+LoggingService transaction record, around a TransactionService.deposit on the in-memory store.
+
+Usage:
+    python -m banking_system.benchmarks.logging_overhead [--requests 40000] [--threads 4] [--sample 0.1] [--sink-latency-ms 0]
+"""
+import argparse
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+
+from banking_system import AccountType, CheckingAccount
+from banking_system.application_layer.services import LoggingService, TransactionService
+from banking_system.application_layer.util.log_pipeline import JsonLinesHandler, LogPipeline, LogPolicy
+from banking_system.infrastructure_layer.account_repository import AccountRepository
+from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+
+ROOT = "banking_system"
+endpoint_logger = logging.getLogger("banking_system.presentation_layer.api_endpoints")
+
+
+class _SlowFile:
+    """A log file whose every flush takes `latency_s`."""
+    def __init__(self, path: str, latency_s: float) -> None:
+        self._file = open(path, "w")
+        self._latency_s = latency_s
+
+    def write(self, text: str) -> int:
+        return self._file.write(text)
+
+    def flush(self) -> None:
+        self._file.flush()
+        if self._latency_s:
+            time.sleep(self._latency_s)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _Silent:
+    """Stands in for the notification service."""
+    def notify(self, transaction):
+        pass
+
+
+def _service(accounts: int):
+    account_repository = AccountRepository(DictionaryAccountStrategy())
+    account_ids = []
+    for _ in range(accounts):
+        account = CheckingAccount(AccountType.CHECKING, 1_000)
+        account_repository.create_account(account)
+        account_ids.append(account.account_id)
+    service = TransactionService(account_repository, TransactionRepository(DictionaryTransactionStrategy()),
+                                 _Silent(), LoggingService())
+    return service, account_ids
+
+
+def _requests(service, account_ids, count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        account_id = rng.choice(account_ids)
+        endpoint_logger.info("Depositing %s to account %s", 10.0, account_id)
+        service.deposit(account_id, 10.0)
+
+
+def run(mode: str, path: str, requests: int, threads: int, sample: float, latency_s: float, accounts: int = 1_000) -> float:
+    """Returns requests per second with logging configured as `mode`."""
+    root = logging.getLogger(ROOT)
+    root.propagate = False
+    pipeline = handler = None
+    if mode == "off":
+        root.setLevel(logging.WARNING)
+    else:
+        root.setLevel(logging.INFO)
+        sink = _SlowFile(path, latency_s)
+        if mode == "sync":
+            # A stock StreamHandler: flushes after every record
+            handler = logging.StreamHandler(sink)
+            handler.setFormatter(JsonLinesHandler().formatter)
+            root.addHandler(handler)
+        else:
+            policies = {"banking_system.transactions": LogPolicy(sample_rate=sample)} if mode == "sampled" else None
+            handler = JsonLinesHandler(sink)
+            pipeline = LogPipeline(handlers=[handler], capacity=100_000, policies=policies).install(ROOT)
+
+    service, account_ids = _service(accounts)
+    per_thread = requests // threads
+    workers = [threading.Thread(target=_requests, args=(service, account_ids, per_thread, seed)) for seed in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    if pipeline is not None:
+        pipeline.stop()
+        if pipeline.dropped.value:
+            print(f"  ({mode}: {pipeline.dropped.value} records dropped on a full queue)")
+    if handler is not None:
+        root.removeHandler(handler)
+        handler.stream.close()
+    root.propagate = True
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=40_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--sample", type=float, default=0.1, help="transaction record sample rate for 'sampled'")
+    parser.add_argument("--sink-latency-ms", type=float, default=0.0, help="time every flush of the log file takes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {mode: run(mode, os.path.join(directory, f"{mode}.log"), args.requests, args.threads, args.sample,
+                          args.sink_latency_ms / 1000)
+                   for mode in ("off", "sync", "pipeline", "sampled")}
+    print(f"{'logging':>9} {'requests/s':>11} {'vs off':>7}")
+    for mode, rate in results.items():
+        print(f"{mode:>9} {rate:>11.0f} {rate / results['off']:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+Microbenchmarks for the domain and repository hot paths: account operations (with
+validate_transaction and enforce_limits), Transaction construction and return_dict,
+LimitConstraint, the interest strategies, the dictionary strategies and
+abstractions.save_transaction.
+
+Each benchmark reports:
+- ops/sec from the fastest of `--repeat` timed runs (and the median);
+- the bytes one call allocates at its peak, with tracemalloc;
+- the bytes it retains per call, e.g. what a store keeps for each saved transaction.
+
+Results can be written as JSON (`--output`) and are compared with a saved baseline
+(`benchmarks/baselines/microbench.json` by default). A benchmark more than `--threshold`
+slower, or allocating that much more, is reported as a regression and makes the
+command exit with status 1. Baselines are machine specific: save one (`--save-baseline`)
+on the machine the comparison runs on, before the change being measured.
+
+Usage:
+    python -m banking_system.benchmarks.microbench [-k account.] [--quick] [--output results.json]
+        [--baseline PATH | --no-compare] [--save-baseline] [--threshold 0.10]
+"""
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from banking_system import AccountType, CheckingAccount, SavingsAccount, Transaction, TransactionType
+from banking_system.application_layer.util import abstractions
+from banking_system.domain_layer.entities.interest.interest_strategies import CheckingInterestStrategy, SavingsInterestStrategy
+from banking_system.domain_layer.entities.transaction_limits.limits import LimitConstraint
+from banking_system.infrastructure_layer.account_repository import AccountRepository
+from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "microbench.json")
+# Allocation changes smaller than this many bytes per call are noise, not regressions
+ALLOCATION_SLACK = 32
+
+# name -> setup function returning the zero-argument operation to measure
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Registers a setup function; each call of the operation it returns is one op."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class _Silent:
+    """Stands in for the notification and logging services."""
+    def notify(self, transaction):
+        pass
+
+    def log_transaction(self, transaction):
+        pass
+
+
+def _rich_account(account_class=CheckingAccount, limits: bool = True):
+    # Balances and limits large enough that no run of the benchmark exhausts them
+    limit_constraint = LimitConstraint(daily_limit=1e15, monthly_limit=1e15) if limits else None
+    return account_class(AccountType.CHECKING, initial_balance=1e12, limit_constraint=limit_constraint)
+
+
+@benchmark("account.deposit")
+def _account_deposit():
+    account = _rich_account()
+    return lambda: account.deposit(10.0)
+
+
+@benchmark("account.withdraw")
+def _account_withdraw():
+    account = _rich_account()
+    return lambda: account.withdraw(10.0)
+
+
+@benchmark("account.withdraw_no_limits")
+def _account_withdraw_no_limits():
+    account = _rich_account(limits=False)
+    return lambda: account.withdraw(10.0)
+
+
+@benchmark("account.withdraw_savings")
+def _account_withdraw_savings():
+    account = _rich_account(SavingsAccount)
+    return lambda: account.withdraw(10.0)
+
+
+@benchmark("account.transfer")
+def _account_transfer():
+    source, destination = _rich_account(), _rich_account()
+    return lambda: source.transfer(10.0, destination)
+
+
+@benchmark("transaction.create")
+def _transaction_create():
+    return lambda: Transaction(TransactionType.DEPOSIT, 125.5, "account-1")
+
+
+@benchmark("transaction.create_transfer")
+def _transaction_create_transfer():
+    return lambda: Transaction(TransactionType.TRANSFER, 125.5, "account-1", "account-2")
+
+
+@benchmark("transaction.return_dict")
+def _transaction_return_dict():
+    transaction = Transaction(TransactionType.TRANSFER, 125.5, "account-1", "account-2")
+    return transaction.return_dict
+
+
+@benchmark("limits.validate")
+def _limits_validate():
+    constraint = LimitConstraint(daily_limit=1e15, monthly_limit=1e15)
+    return lambda: constraint.validate(10.0)
+
+
+@benchmark("limits.validate_record")
+def _limits_validate_record():
+    constraint = LimitConstraint(daily_limit=1e15, monthly_limit=1e15)
+
+    def validate_and_record():
+        constraint.validate(10.0)
+        constraint.record(10.0)
+    return validate_and_record
+
+
+@benchmark("interest.savings_apply")
+def _interest_savings_apply():
+    strategy = SavingsInterestStrategy(0.05)
+    return lambda: strategy.apply_interest(1_000.0)
+
+
+@benchmark("interest.savings_apply_12_months")
+def _interest_savings_apply_months():
+    strategy = SavingsInterestStrategy(0.05)
+    return lambda: strategy.apply_interest(1_000.0, 12)
+
+
+@benchmark("interest.checking_apply")
+def _interest_checking_apply():
+    strategy = CheckingInterestStrategy()
+    return lambda: strategy.apply_interest(1_000.0)
+
+
+def _stored_accounts(count: int):
+    strategy = DictionaryAccountStrategy()
+    accounts = [_rich_account() for _ in range(count)]
+    for account in accounts:
+        strategy.create_account(account)
+    return strategy, accounts
+
+
+@benchmark("dict_accounts.create")
+def _dict_accounts_create():
+    strategy = DictionaryAccountStrategy()
+    account = _rich_account()
+    # Storing one account over and over measures the store, not account construction
+    return lambda: strategy.create_account(account)
+
+
+@benchmark("dict_accounts.get")
+def _dict_accounts_get():
+    strategy, accounts = _stored_accounts(1_000)
+    account_id = accounts[500].account_id
+    return lambda: strategy.get_account_by_id(account_id)
+
+
+@benchmark("dict_accounts.update")
+def _dict_accounts_update():
+    strategy, accounts = _stored_accounts(1_000)
+    account = accounts[500]
+    return lambda: strategy.update_account(account, expected_version=account.version)
+
+
+@benchmark("dict_accounts.update_atomically")
+def _dict_accounts_update_atomically():
+    strategy, accounts = _stored_accounts(1_000)
+    first, second = accounts[10], accounts[20]
+    return lambda: strategy.update_accounts_atomically(first, second, expected_versions=(first.version, second.version))
+
+
+def _transactions(count: int, account_id: str) -> List[Transaction]:
+    return [Transaction(TransactionType.DEPOSIT, 10.0 + number, account_id) for number in range(count)]
+
+
+def _saving(compact: bool):
+    strategy = DictionaryTransactionStrategy(compact=compact)
+    # Built up front and reused in turn, so the op is the save, not Transaction construction
+    pending = itertools.cycle(_transactions(10_000, "account-1"))
+
+    def save():
+        strategy.save_transaction(next(pending))
+    return save
+
+
+@benchmark("dict_transactions.save")
+def _dict_transactions_save():
+    return _saving(compact=False)
+
+
+@benchmark("dict_transactions.save_compact")
+def _dict_transactions_save_compact():
+    return _saving(compact=True)
+
+
+@benchmark("dict_transactions.history_100")
+def _dict_transactions_history():
+    strategy = DictionaryTransactionStrategy()
+    strategy.save_transactions(_transactions(100, "account-1"))
+    return lambda: strategy.get_transactions_by_account_id("account-1")
+
+
+@benchmark("dict_transactions.page_20")
+def _dict_transactions_page():
+    strategy = DictionaryTransactionStrategy()
+    strategy.save_transactions(_transactions(1_000, "account-1"))
+    return lambda: strategy.get_transactions_page("account-1", limit=20)
+
+
+@benchmark("abstractions.save_transaction")
+def _abstractions_save_transaction():
+    account_repository = AccountRepository(DictionaryAccountStrategy())
+    transaction_repository = TransactionRepository(DictionaryTransactionStrategy())
+    account = _rich_account()
+    account_repository.create_account(account)
+    pending = itertools.cycle(_transactions(10_000, account.account_id))
+    silent = _Silent()
+
+    def save():
+        abstractions.save_transaction(
+            account_repository, transaction_repository, silent, silent, account, next(pending),
+            expected_version=account.version,
+        )
+    return save
+
+
+@benchmark("abstractions.save_transfer")
+def _abstractions_save_transfer():
+    account_repository = AccountRepository(DictionaryAccountStrategy())
+    transaction_repository = TransactionRepository(DictionaryTransactionStrategy())
+    source, destination = _rich_account(), _rich_account()
+    account_repository.create_account(source)
+    account_repository.create_account(destination)
+    pending = itertools.cycle([
+        Transaction(TransactionType.TRANSFER, 10.0, source.account_id, destination.account_id) for _ in range(10_000)
+    ])
+    silent = _Silent()
+
+    def save():
+        abstractions.save_transaction(
+            account_repository, transaction_repository, silent, silent, source, next(pending),
+            expected_version=source.version, destination_account=destination,
+            destination_expected_version=destination.version,
+        )
+    return save
+
+
+def _time(operation: Callable[[], object], loops: int) -> float:
+    repeat = itertools.repeat(None, loops)
+    started = time.perf_counter()
+    for _ in repeat:
+        operation()
+    return time.perf_counter() - started
+
+
+def measure_speed(operation: Callable[[], object], min_time: float, repeat: int) -> dict:
+    """
+    Times `repeat` runs of the operation, each of enough loops to take at least
+    `min_time` seconds, after one calibration pass that also warms it up.
+    """
+    loops = 1
+    while True:
+        elapsed = _time(operation, loops)
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed * 1.2) + 1))
+    timings = [_time(operation, loops) for _ in range(repeat)]
+    rates = sorted(loops / elapsed for elapsed in timings)
+    return {
+        "ops_per_sec": rates[-1],
+        "median_ops_per_sec": statistics.median(rates),
+        # (fastest - slowest) / median: how noisy the runs were
+        "spread": (rates[-1] - rates[0]) / statistics.median(rates),
+        "loops": loops,
+    }
+
+
+def measure_allocations(operation: Callable[[], object], calls: int) -> dict:
+    """
+    Traces `calls` calls with tracemalloc (and the garbage collector off): the mean peak
+    bytes allocated during one call, and the bytes still held per call after all of them.
+    """
+    operation()
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        peak_total = 0
+        for _ in range(calls):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return {
+        "alloc_bytes_per_op": peak_total / calls,
+        "retained_bytes_per_op": max(0.0, (end - start) / calls),
+    }
+
+
+def run(names: List[str], min_time: float, repeat: int, alloc_calls: int) -> dict:
+    """Runs the named benchmarks; each phase gets a fresh setup so state does not carry over."""
+    results = {}
+    for name in names:
+        result = measure_speed(BENCHMARKS[name](), min_time, repeat)
+        result.update(measure_allocations(BENCHMARKS[name](), alloc_calls))
+        results[name] = result
+        print(f"{name:36s} {result['ops_per_sec']:>14,.0f} ops/s  {result['alloc_bytes_per_op']:>8,.0f} B/op"
+              f"  ±{result['spread'] * 100:4.1f}%", flush=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "min_time": min_time,
+            "repeat": repeat,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Prints each benchmark's change against the baseline and returns the names that
+    regressed: slower by more than `threshold`, or allocating more by that fraction
+    (and by more than ALLOCATION_SLACK bytes).
+    """
+    regressions = []
+    base = baseline.get("benchmarks", {})
+    print(f"\n{'benchmark':36s} {'baseline ops/s':>14s} {'ops/s':>14s} {'change':>8s} {'alloc B/op':>16s}")
+    for name, result in current["benchmarks"].items():
+        if name not in base:
+            print(f"{name:36s} {'-':>14s} {result['ops_per_sec']:>14,.0f}      new")
+            continue
+        before = base[name]
+        change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+        alloc_before, alloc_now = before["alloc_bytes_per_op"], result["alloc_bytes_per_op"]
+        slower = change < -threshold
+        heavier = alloc_now - alloc_before > max(ALLOCATION_SLACK, threshold * alloc_before)
+        flag = "  REGRESSION" if slower or heavier else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:36s} {before['ops_per_sec']:>14,.0f} {result['ops_per_sec']:>14,.0f} {change * 100:>+7.1f}%"
+              f" {alloc_before:>7,.0f}->{alloc_now:<7,.0f}{flag}")
+    if baseline.get("meta", {}).get("platform") != current["meta"]["platform"]:
+        print("note: the baseline was recorded on a different platform; timings are not comparable")
+    return regressions
+
+
+def _write(path: str, results: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--alloc-calls", type=int, default=500, help="calls traced for allocations")
+    parser.add_argument("--quick", action="store_true", help="short runs, for a smoke test")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--no-compare", action="store_true", help="do not compare against the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="fraction counted as a regression")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.pattern in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        parser.error(f"no benchmark matches {args.pattern!r}")
+    if args.quick:
+        args.min_time, args.repeat, args.alloc_calls = 0.02, 3, 50
+
+    results = run(names, args.min_time, args.repeat, args.alloc_calls)
+    if args.output:
+        _write(args.output, results)
+
+    regressions = []
+    if not args.no_compare and not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}" + (f": {', '.join(regressions)}" if regressions else ""))
+    if args.save_baseline:
+        if args.pattern and os.path.exists(args.baseline):
+            # A partial run updates only the benchmarks it ran
+            with open(args.baseline, encoding="utf-8") as file:
+                saved = json.load(file)
+            saved["benchmarks"].update(results["benchmarks"])
+            saved["meta"] = results["meta"]
+            results = saved
+        _write(args.baseline, results)
+        print(f"baseline saved to {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
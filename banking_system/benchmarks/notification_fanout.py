@@ -0,0 +1,100 @@
+"""
+Notification delivery throughput against the local SMTP and SMS stand-ins: one connection
+(and, for SMS, one request) per message versus the pooled email client and the batched
+SMS client driven by concurrent senders, as the outbox workers would.
+
+Usage:
+    python -m banking_system.benchmarks.notification_fanout [--messages 2000] [--senders 4] [--batch 50]
+"""
+import argparse
+import json
+import smtplib
+import threading
+import time
+import urllib.request
+from email.message import EmailMessage
+
+from banking_system.infrastructure_layer.notifications.batched_sms_client import BatchedSMSClient
+from banking_system.infrastructure_layer.notifications.local_servers import LocalSMSServer, LocalSMTPServer
+from banking_system.infrastructure_layer.notifications.pooled_email_client import PooledEmailClient
+
+
+def _mails(count):
+    return [("bank@local", f"acc{n}@local", "Transaction Notification", f"Deposit of ${n}.00") for n in range(count)]
+
+
+def _texts(count):
+    return [("BANK", f"+1555{n:07d}", f"Deposit of ${n}.00") for n in range(count)]
+
+
+def email_per_connection(port: int, mails) -> float:
+    start = time.perf_counter()
+    for from_addr, to_addr, subject, body in mails:
+        message = EmailMessage()
+        message["From"], message["To"], message["Subject"] = from_addr, to_addr, subject
+        message.set_content(body)
+        with smtplib.SMTP("127.0.0.1", port) as connection:
+            connection.send_message(message)
+    return len(mails) / (time.perf_counter() - start)
+
+
+def sms_per_request(url: str, texts) -> float:
+    start = time.perf_counter()
+    for from_number, to_number, body in texts:
+        payload = json.dumps({"messages": [{"from": from_number, "to": to_number, "body": body}]}).encode("utf-8")
+        request = urllib.request.Request(url, data=payload, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            response.read()
+    return len(texts) / (time.perf_counter() - start)
+
+
+def concurrently(send, items, senders: int, batch: int) -> float:
+    """Splits `items` into batches shared by `senders` threads; returns items per second."""
+    batches = [items[start:start + batch] for start in range(0, len(items), batch)]
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not batches:
+                    return
+                chunk = batches.pop()
+            send(chunk)
+
+    threads = [threading.Thread(target=worker) for _ in range(senders)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2_000)
+    parser.add_argument("--senders", type=int, default=4, help="concurrent senders (outbox workers)")
+    parser.add_argument("--batch", type=int, default=50, help="messages per outbox batch")
+    args = parser.parse_args()
+
+    with LocalSMTPServer() as smtp_server, LocalSMSServer() as sms_server:
+        naive_email = email_per_connection(smtp_server.port, _mails(args.messages))
+        email_client = PooledEmailClient("127.0.0.1", smtp_server.port, pool_size=args.senders)
+        pooled_email = concurrently(email_client.send_mails, _mails(args.messages), args.senders, args.batch)
+        email_client.close()
+
+        naive_sms = sms_per_request(sms_server.url, _texts(args.messages))
+        sms_client = BatchedSMSClient(sms_server.url, batch_size=args.batch, max_connections=args.senders)
+        batched_sms = concurrently(sms_client.send_messages, _texts(args.messages), args.senders, args.batch)
+        sms_client.close()
+
+    print(f"{'channel':>7} {'per-message msgs/s':>19} {'pooled msgs/s':>14} {'speedup':>8}")
+    print(f"{'email':>7} {naive_email:>19.0f} {pooled_email:>14.0f} {pooled_email / naive_email:>7.1f}x")
+    print(f"{'sms':>7} {naive_sms:>19.0f} {batched_sms:>14.0f} {batched_sms / naive_sms:>7.1f}x")
+    print(f"email connections opened: {email_client.metrics.connections_opened.value}, "
+          f"p99 send {email_client.metrics.call_latency.quantile(0.99) * 1000:.2f} ms; "
+          f"sms requests: {sms_server.requests}")
+
+
+if __name__ == "__main__":
+    main()
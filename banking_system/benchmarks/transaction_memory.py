@@ -0,0 +1,70 @@
+"""
+Measures how many bytes the transaction store retains per transaction, with full
+`Transaction` objects (default) versus the compact, array-backed mode that hands
+out `TransactionRecord` views.
+
+Usage:
+    python -m banking_system.benchmarks.transaction_memory [--count 200000] [--accounts 1000]
+"""
+import argparse
+import contextlib
+import gc
+import os
+import random
+import tracemalloc
+import uuid
+
+from banking_system import Transaction, TransactionType
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+
+
+def _make_transactions(count, account_ids):
+    rng = random.Random(42)
+    types = (TransactionType.DEPOSIT, TransactionType.WITHDRAW, TransactionType.TRANSFER)
+    for _ in range(count):
+        transaction_type = rng.choice(types)
+        destination = rng.choice(account_ids) if transaction_type is TransactionType.TRANSFER else None
+        yield Transaction(
+            transaction_type=transaction_type,
+            amount=round(rng.uniform(1, 5000), 2),
+            account_id=rng.choice(account_ids),
+            destination_account_id=destination,
+        )
+
+
+def measure(count: int, accounts: int, compact: bool) -> float:
+    """Returns the bytes retained by the strategy per stored transaction."""
+    # Account ids are owned by the accounts, not the transactions, so allocate them up front.
+    account_ids = [str(uuid.uuid4()) for _ in range(accounts)]
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    strategy = DictionaryTransactionStrategy(compact=compact)
+    for transaction in _make_transactions(count, account_ids):
+        strategy.save_transaction(transaction)
+    del transaction
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200_000, help="number of transactions to store")
+    parser.add_argument("--accounts", type=int, default=1_000, help="number of distinct accounts")
+    args = parser.parse_args()
+
+    # Transaction construction validates through a chatty validator; keep it out of the output.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        full = measure(args.count, args.accounts, compact=False)
+        compact = measure(args.count, args.accounts, compact=True)
+
+    print(f"transactions stored : {args.count}")
+    print(f"Transaction objects : {full:8.1f} bytes/transaction")
+    print(f"compact table       : {compact:8.1f} bytes/transaction")
+    print(f"reduction           : {full / compact:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
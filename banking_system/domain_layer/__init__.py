@@ -1,19 +1,22 @@
-from .util.validators import float_greater_than_zero
+from .util.validators import float_greater_than_zero, is_whole_cents
 from .util.decorators import validate_transaction,enforce_limits
 from .entities.interest.interest_strategies import InterestStrategy, SavingsInterestStrategy, CheckingInterestStrategy
 from .entities.transaction_limits.limits import LimitConstraint
 from .entities.transaction import Transaction, TransactionType
+from .entities.transaction_record import TransactionRecord
 from .entities.bank_accounts.account import Account
 
 __all__ = [
     'validate_transaction',
     'enforce_limits',
     'float_greater_than_zero',
+    'is_whole_cents',
     'InterestStrategy',
     'SavingsInterestStrategy',
     'CheckingInterestStrategy',
     'LimitConstraint',
     'Transaction',
     'TransactionType',
+    'TransactionRecord',
 ]
 
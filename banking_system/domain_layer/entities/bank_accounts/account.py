@@ -1,11 +1,9 @@
 from enum import Enum
 from abc import ABC, abstractmethod
 from datetime import datetime
-import uuid, sys
-from pathlib import Path
-
-sys.path.append(str(Path(__file__).resolve().parents[3]))
-from domain_layer import validate_transaction,enforce_limits,float_greater_than_zero,Transaction, TransactionType, InterestStrategy, LimitConstraint
+import copy, uuid
+from banking_system.domain_layer import validate_transaction,enforce_limits,float_greater_than_zero,is_whole_cents,Transaction, TransactionType, InterestStrategy, LimitConstraint
+from banking_system.domain_layer.util.tracing import traced
 
 
 
@@ -33,6 +31,12 @@ class Account(ABC):
         balance (float): The current balance of the account. Defaults to 0.0.
         status (AccountStatus): The current status of the account (e.g., active, closed).
         creation_date (datetime): The date and time when the account was created.
+        lazy_interest (bool): When True, interest accrues in closed form whenever the balance is
+            read or mutated, one period per month boundary crossed since `last_accrual`,
+            instead of requiring an explicit month-end interest run.
+        last_accrual (datetime): The instant interest was last accrued up to.
+        version (int): Incremented by the repository on every successful write; used for
+            optimistic concurrency (compare-and-swap updates) and conditional requests.
     Methods:
         __init__(account_type: AccountType, initial_balance: float = 0.0):
             Initializes a new account with the specified type and initial balance.
@@ -51,18 +55,67 @@ class Account(ABC):
             Returns a string representation of the account, including its ID, type, 
             balance, status, and creation date.
     """
-    def __init__(self, account_type: AccountType, initial_balance: float = 5.0,interest_strategy:InterestStrategy=None, limit_constraint:LimitConstraint=None):
+    def __init__(self, account_type: AccountType, initial_balance: float = 5.0,interest_strategy:InterestStrategy=None, limit_constraint:LimitConstraint=None, lazy_interest: bool = False, now_provider=datetime.now):
         # Ensure initial balance is positive
         if not float_greater_than_zero(initial_balance):
             raise ValueError("Initial balance cannot be negative.")
+        self.lazy_interest = lazy_interest
+        self.now_provider = now_provider
         self.account_id = str(uuid.uuid4())
         self.account_type = account_type
         self.balance = initial_balance
         self.status = AccountStatus.ACTIVE
-        self.creation_date = datetime.now()
+        self.creation_date = now_provider()
+        self.last_accrual = self.creation_date
         self.interest_strategy = interest_strategy
         self.limit_constraint = limit_constraint
-
+        self.version = 0
+
+    @classmethod
+    def restore(cls, account_id: str, account_type: AccountType, balance: float, status: AccountStatus, creation_date: datetime, interest_strategy:InterestStrategy=None, limit_constraint:LimitConstraint=None, lazy_interest: bool = False, last_accrual: datetime = None, now_provider=datetime.now, version: int = 0):
+        """Rebuilds an account from persisted state, keeping its id and creation date and skipping creation-time validation."""
+        account = cls.__new__(cls)
+        account.lazy_interest = lazy_interest
+        account.now_provider = now_provider
+        account.account_id = account_id
+        account.account_type = account_type
+        account.balance = balance
+        account.status = status
+        account.creation_date = creation_date
+        account.last_accrual = last_accrual or creation_date
+        account.interest_strategy = interest_strategy
+        account.limit_constraint = limit_constraint
+        account.version = version
+        return account
+
+    def clone(self):
+        """Returns a detached copy of the account; mutating it (including its limit counters) leaves this one untouched."""
+        account = copy.copy(self)
+        if self.limit_constraint is not None:
+            account.limit_constraint = copy.copy(self.limit_constraint)
+        return account
+
+    @property
+    def balance(self) -> float:
+        """The current balance; in lazy interest mode, interest accrued since the last read is settled first."""
+        if self.lazy_interest:
+            self._accrue_interest()
+        return self._balance
+
+    @balance.setter
+    def balance(self, value: float):
+        self._balance = value
+
+    def _accrue_interest(self):
+        """Applies, in closed form, one period of interest per month boundary crossed since `last_accrual`."""
+        now = self.now_provider()
+        months = (now.year - self.last_accrual.year) * 12 + (now.month - self.last_accrual.month)
+        if months > 0:
+            if self.interest_strategy is not None:
+                self._balance = self.interest_strategy.apply_interest(self._balance, months)
+            self.last_accrual = now
+
+    @traced("Account.withdraw")
     @validate_transaction("withdraw")  
     @enforce_limits
     def withdraw(self, amount: float):
@@ -74,9 +127,12 @@ class Account(ABC):
         #create a record of the transaction
         return Transaction(account_id=self.account_id, amount=amount,transaction_type=TransactionType.WITHDRAW)
 
+    @traced("Account.deposit")
     def deposit(self, amount: float):
         if amount <= 0:
             raise ValueError("Deposit amount must be positive.")
+        if not is_whole_cents(amount):
+            raise ValueError("Deposit amount must be a whole number of cents.")
         self.balance += amount
         #create a record of the transaction
         return Transaction(account_id=self.account_id, amount=amount,transaction_type=TransactionType.DEPOSIT)
@@ -92,6 +148,7 @@ class Account(ABC):
         """Validate conditions before allowing withdrawal. Specialized behavior for different account types."""
         pass
 
+    @traced("Account.transfer")
     @validate_transaction("transfer")
     def transfer(self, amount: float, destination_account) -> Transaction:
         """Transfer money to another account."""
@@ -105,6 +162,10 @@ class Account(ABC):
         return Transaction(account_id=self.account_id, destination_account_id=destination_account.account_id,amount=amount,transaction_type=TransactionType.TRANSFER)
 
     def calculate_interest(self) -> float:
+        if self.lazy_interest:
+            # Interest is accrued on access; calculating only settles what is due so far
+            self._accrue_interest()
+            return
         self.balance = self.interest_strategy.apply_interest(self.balance)
     
     def generate_monthly_statement(self):
@@ -5,6 +5,14 @@ class InterestStrategy(ABC):
     def apply_interest(self, balance):
         pass
 
+    def growth_factor(self, months=1):
+        """
+        Returns the multiplier `apply_interest` applies to a balance, so batches can be computed in bulk.
+        By default it is measured on a balance of 1 and compounded monthly; strategies that know
+        their rate override it.
+        """
+        return self.apply_interest(1.0) ** months
+
 
 class SavingsInterestStrategy(InterestStrategy):
     def __init__(self, annual_rate):
@@ -14,7 +22,15 @@ class SavingsInterestStrategy(InterestStrategy):
         monthly_rate = self.annual_rate / 12
         return balance * ((1 + monthly_rate) ** months)
 
+    def growth_factor(self, months=1):
+        return (1 + self.annual_rate / 12) ** months
+
 class CheckingInterestStrategy(InterestStrategy):
-    def apply_interest(self, balance):
-        flat_interest = 0.001  # 0.1%
-        return balance + balance * flat_interest
\ No newline at end of file
+    FLAT_INTEREST = 0.001  # 0.1%
+
+    def apply_interest(self, balance, months=1):
+        flat_interest = self.FLAT_INTEREST
+        return balance * ((1 + flat_interest) ** months)
+
+    def growth_factor(self, months=1):
+        return (1 + self.FLAT_INTEREST) ** months
@@ -4,7 +4,7 @@ from enum import Enum
 import uuid
 from datetime import datetime
 
-from ..util.validators import float_greater_than_zero
+from ..util.validators import float_greater_than_zero, is_whole_cents
 
 
 class TransactionType(Enum):
@@ -39,11 +39,13 @@ class Transaction:
             account_id (str): The identifier of the account associated with the transaction.
             destination_account_id (str, optional): The identifier of the destination account for transfer transactions.
         Raises:
-            ValueError: If the transaction amount is not positive.
+            ValueError: If the transaction amount is not positive or not a whole number of cents.
         """
         #check if the amount is less than zero
         if not float_greater_than_zero(amount):
             raise ValueError("Transaction amount must be positive.")
+        if not is_whole_cents(amount):
+            raise ValueError("Transaction amount must be a whole number of cents.")
 
         self.transaction_id = str(uuid.uuid4())
         self.transaction_type = transaction_type
@@ -9,6 +9,15 @@ class LimitConstraint:
         self._monthly_total = 0.0
         self._last_check:datetime = self.now_provider()
 
+    @classmethod
+    def restore(cls, daily_limit: float, monthly_limit: float, daily_total: float, monthly_total: float, last_check: datetime, now_provider=datetime.now):
+        """Rebuilds a constraint from persisted limits and running totals."""
+        constraint = cls(daily_limit=daily_limit, monthly_limit=monthly_limit, now_provider=now_provider)
+        constraint._daily_total = daily_total
+        constraint._monthly_total = monthly_total
+        constraint._last_check = last_check
+        return constraint
+
     def _reset_if_needed(self):
         today:datetime = self.now_provider()
         if today.date() != self._last_check.date():
@@ -0,0 +1,154 @@
+import uuid
+from datetime import datetime, timedelta
+
+from .transaction import Transaction, TransactionType
+from ..util.validators import is_whole_cents
+
+
+# Integer codes used to pack the transaction type into a single small int.
+# Ordered by definition so the code is stable as long as the enum is append-only.
+_TYPES = tuple(TransactionType)
+_TYPE_CODES = {transaction_type.value: code for code, transaction_type in enumerate(_TYPES)}
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """
+    Converts a naive wall-clock datetime into integer nanoseconds since the epoch (exact, no float rounding).
+    Timestamps are stamped in naive local time, so a timezone-aware datetime is converted to local time first.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def ns_to_datetime(value: int) -> datetime:
+    """Inverse of `datetime_to_ns`."""
+    return _EPOCH + timedelta(microseconds=value // 1000)
+
+
+def amount_to_cents(amount: float) -> int:
+    """
+    Converts a currency amount into integer minor units (cents). Raises ValueError for a
+    fraction of a cent, which the record could not keep.
+    """
+    if not is_whole_cents(amount):
+        raise ValueError(f"{amount} is not a whole number of cents.")
+    return round(amount * 100)
+
+
+def type_code(transaction_type) -> int:
+    """Returns the packed code for a TransactionType (matched by value so enum copies compare equal)."""
+    return _TYPE_CODES[getattr(transaction_type, "value", transaction_type)]
+
+
+class TransactionRecord:
+    """
+    Compact, immutable representation of a Transaction meant for long-term retention.
+
+    Compared to `Transaction` it has no per-instance `__dict__` and stores:
+        - the transaction id as its 16 raw UUID bytes instead of a 36 character string,
+        - the transaction type as a small integer code instead of an Enum reference,
+        - the amount as integer minor units (cents) instead of a float,
+        - the timestamp as integer nanoseconds since the epoch instead of a datetime.
+    Account ids are kept as references to the (shared) account id strings.
+
+    The public read API mirrors `Transaction` (`transaction_id`, `transaction_type`, `amount`,
+    `timestamp`, `return_dict()`, ...), decoding fields lazily on access, so records can be
+    handed to services and API response models unchanged. `to_transaction()` materializes a
+    full `Transaction` when one is required.
+    """
+    __slots__ = ("id_bytes", "type_code", "amount_cents", "timestamp_ns", "account_id", "destination_account_id")
+
+    def __init__(self, id_bytes: bytes, type_code: int, amount_cents: int, timestamp_ns: int, account_id: str, destination_account_id: str = None):
+        self.id_bytes = id_bytes
+        self.type_code = type_code
+        self.amount_cents = amount_cents
+        self.timestamp_ns = timestamp_ns
+        self.account_id = account_id
+        self.destination_account_id = destination_account_id
+
+    @classmethod
+    def from_transaction(cls, transaction: Transaction) -> "TransactionRecord":
+        """Packs a Transaction into a compact record."""
+        return cls(
+            uuid.UUID(transaction.transaction_id).bytes,
+            type_code(transaction.transaction_type),
+            amount_to_cents(transaction.amount),
+            datetime_to_ns(transaction.timestamp),
+            transaction.account_id,
+            transaction.destination_account_id,
+        )
+
+    @property
+    def transaction_id(self) -> str:
+        return str(uuid.UUID(bytes=self.id_bytes))
+
+    @property
+    def transaction_type(self) -> TransactionType:
+        return _TYPES[self.type_code]
+
+    @property
+    def amount(self) -> float:
+        return self.amount_cents / 100
+
+    @property
+    def timestamp(self) -> datetime:
+        return ns_to_datetime(self.timestamp_ns)
+
+    def is_deposit(self) -> bool:
+        return self.transaction_type == TransactionType.DEPOSIT
+
+    def is_withdrawal(self) -> bool:
+        return self.transaction_type == TransactionType.WITHDRAW
+
+    def is_transfer(self) -> bool:
+        return self.transaction_type == TransactionType.TRANSFER
+
+    def to_transaction(self) -> Transaction:
+        """Materializes a full Transaction carrying the same id, type, amount and timestamp."""
+        transaction = Transaction.__new__(Transaction)
+        transaction.transaction_id = self.transaction_id
+        transaction.transaction_type = self.transaction_type
+        transaction.amount = self.amount
+        transaction.timestamp = self.timestamp
+        transaction.account_id = self.account_id
+        transaction.destination_account_id = self.destination_account_id
+        return transaction
+
+    def __eq__(self, other):
+        if not isinstance(other, TransactionRecord):
+            return NotImplemented
+        return (
+            self.id_bytes == other.id_bytes
+            and self.type_code == other.type_code
+            and self.amount_cents == other.amount_cents
+            and self.timestamp_ns == other.timestamp_ns
+            and self.account_id == other.account_id
+            and self.destination_account_id == other.destination_account_id
+        )
+
+    def __hash__(self):
+        return hash(self.id_bytes)
+
+    def __repr__(self):
+        return (
+            f"<TransactionRecord(id={self.transaction_id}, "
+            f"type={self.transaction_type.value}, "
+            f"amount={self.amount}, "
+            f"account_id={self.account_id}, "
+            f"destination_account_id={self.destination_account_id}, "
+            f"timestamp={self.timestamp.isoformat()})>"
+        )
+
+    def return_dict(self):
+        return {
+            "transaction_id": self.transaction_id,
+            "transaction_type": self.transaction_type.value,
+            "amount": self.amount,
+            "account_id": self.account_id,
+            "destination_account_id": self.destination_account_id,
+            "timestamp": self.timestamp.isoformat()
+        }
@@ -1,17 +1,23 @@
 from functools import wraps
+from banking_system.domain_layer.util.tracing import span
+from banking_system.domain_layer.util.validators import is_whole_cents
 
 def validate_transaction(action):
     def decorator(func):
         @wraps(func)
         def wrapper(self, amount, *args, **kwargs):
-            if not self.is_active():
-                raise ValueError(f"Cannot {action} from a closed account.")
+            with span("validate_transaction", action=action):
+                if not self.is_active():
+                    raise ValueError(f"Cannot {action} from a closed account.")
 
-            if amount <= 0:
-                raise ValueError(f"{action} amount must be positive.")
+                if amount <= 0:
+                    raise ValueError(f"{action} amount must be positive.")
 
-            if hasattr(self, 'balance') and amount > self.balance:
-                raise ValueError(f"Insufficient funds for {action}.")
+                if not is_whole_cents(amount):
+                    raise ValueError(f"{action} amount must be a whole number of cents.")
+
+                if hasattr(self, 'balance') and amount > self.balance:
+                    raise ValueError(f"Insufficient funds for {action}.")
 
             return func(self, amount, *args, **kwargs)
         return wrapper
@@ -20,7 +26,8 @@ def validate_transaction(action):
 def enforce_limits(method):
     def wrapper(self, amount, *args, **kwargs):
         if self.limit_constraint:
-            self.limit_constraint.validate(amount)
+            with span("enforce_limits"):
+                self.limit_constraint.validate(amount)
         result = method(self, amount, *args, **kwargs)
         if self.limit_constraint:
             self.limit_constraint.record(amount)
@@ -0,0 +1,219 @@
+"""
+Lightweight request tracing.
+
+A trace is started once per request (see presentation_layer/utility/tracing_middleware.py)
+and carried through contextvars, so it follows the request across function calls, awaits,
+asyncio tasks and calls run on the BoundedExecutor's threads without being passed along.
+Code marks the interesting parts of the request with `span(name)` or `@traced(name)`.
+
+Only a `sample_rate` fraction of traces record spans. In a trace that is not sampled (and
+outside any trace) `span` returns a shared no-op context manager, so instrumentation costs
+one context variable lookup and can stay in place in production. Every trace, sampled or
+not, has an id that logs can carry (`current_trace_id`).
+
+Finished sampled traces are handed to the tracer's exporter in one `export(spans)` call.
+
+Import this module as `banking_system.domain_layer.util.tracing` everywhere, so that
+all layers share the one context variable.
+"""
+import contextvars
+import functools
+import inspect
+import random
+import threading
+import time
+from typing import List, Optional
+
+# perf_counter for durations, anchored to the wall clock so timestamps line up across traces
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+def new_id(bits: int = 64) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """One timed operation within a trace. Timestamps are nanoseconds since the epoch."""
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "thread_id", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Optional[dict] = None) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = new_id()
+        self.parent_id = parent_id
+        self.start_ns = time.perf_counter_ns() + _EPOCH_OFFSET_NS
+        self.end_ns = None
+        self.thread_id = threading.get_ident()
+        self.attributes = attributes or {}
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or self.start_ns) - self.start_ns
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+
+class _Trace:
+    __slots__ = ("trace_id", "sampled", "spans", "max_spans", "dropped")
+
+    def __init__(self, trace_id: str, sampled: bool, max_spans: int) -> None:
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.spans: List[Span] = []
+        self.max_spans = max_spans
+        self.dropped = 0
+
+
+# (trace, innermost open span) of the running request, or None outside any trace
+_context: contextvars.ContextVar = contextvars.ContextVar("banking_trace", default=None)
+
+
+class _NoopSpan:
+    """Stands in for a span when nothing is recorded; also usable as the `with` target."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("_trace", "_span", "_token")
+
+    def __init__(self, trace: _Trace, span: Span) -> None:
+        self._trace = trace
+        self._span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _context.set((self._trace, self._span))
+        return self._span
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        span = self._span
+        span.end_ns = time.perf_counter_ns() + _EPOCH_OFFSET_NS
+        if exc_type is not None:
+            span.attributes["error"] = exc_type.__name__
+        trace = self._trace
+        if len(trace.spans) < trace.max_spans:
+            trace.spans.append(span)
+        else:
+            trace.dropped += 1
+        _context.reset(self._token)
+        return False
+
+
+def span(name: str, **attributes):
+    """
+    Context manager timing the enclosed block as a child of the current span.
+    A no-op unless the current trace is sampled.
+    """
+    current = _context.get()
+    if current is None or not current[0].sampled:
+        return NOOP_SPAN
+    trace, parent = current
+    return _ActiveSpan(trace, Span(name, trace.trace_id, parent.span_id if parent else None, attributes))
+
+
+def traced(name: str):
+    """Decorator wrapping each call of a sync or async function in `span(name)`."""
+    def decorate(function):
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def traced_async(*args, **kwargs):
+                with span(name):
+                    return await function(*args, **kwargs)
+            return traced_async
+
+        @functools.wraps(function)
+        def traced_sync(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return traced_sync
+    return decorate
+
+
+def current_trace_id() -> Optional[str]:
+    """The id of the running request's trace, sampled or not; None outside a trace."""
+    current = _context.get()
+    return current[0].trace_id if current is not None else None
+
+
+class _RootSpan:
+    def __init__(self, tracer: "Tracer", trace: _Trace, name: str, attributes: dict) -> None:
+        self._tracer = tracer
+        self._trace = trace
+        self._span = Span(name, trace.trace_id, None, attributes) if trace.sampled else None
+        self._token = None
+
+    def __enter__(self):
+        self._token = _context.set((self._trace, self._span))
+        return self._span if self._span is not None else NOOP_SPAN
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        _context.reset(self._token)
+        trace = self._trace
+        if self._span is not None:
+            self._span.end_ns = time.perf_counter_ns() + _EPOCH_OFFSET_NS
+            if exc_type is not None:
+                self._span.attributes["error"] = exc_type.__name__
+            if trace.dropped:
+                self._span.attributes["dropped_spans"] = trace.dropped
+            trace.spans.append(self._span)
+            self._tracer.finish(trace.spans)
+        return False
+
+
+class Tracer:
+    """
+    Starts traces, decides which are sampled and passes finished ones to the exporter.
+
+    Args:
+        sample_rate: Fraction of traces that record spans, 0 (none) to 1 (all).
+        exporter: Anything with `export(spans)`; without one nothing is recorded.
+        max_spans_per_trace: Spans kept per trace; later ones are counted on the root
+            span as `dropped_spans`, so a runaway loop cannot hold unbounded memory.
+    """
+    def __init__(self, sample_rate: float = 0.0, exporter=None, max_spans_per_trace: int = 1_000) -> None:
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("A sample rate must be in [0, 1].")
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.max_spans_per_trace = max_spans_per_trace
+
+    def start_trace(self, name: str, trace_id: Optional[str] = None, sampled: Optional[bool] = None, **attributes):
+        """
+        Context manager running the block as a new trace, with a root span `name`.
+        `trace_id` continues an id received from a caller; `sampled` overrides the sample rate.
+        Yields the root Span, or a no-op stand-in when the trace is not sampled.
+        """
+        if sampled is None:
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        trace = _Trace(trace_id or new_id(128), sampled and self.exporter is not None, self.max_spans_per_trace)
+        return _RootSpan(self, trace, name, attributes)
+
+    def finish(self, spans: List[Span]) -> None:
+        if self.exporter is not None:
+            self.exporter.export(spans)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def configure(sample_rate: float, exporter=None, max_spans_per_trace: int = 1_000) -> Tracer:
+    """Replaces the process-wide tracer; traces already running finish on the old one."""
+    global _tracer
+    _tracer = Tracer(sample_rate, exporter, max_spans_per_trace)
+    return _tracer
+
@@ -3,15 +3,25 @@ This file holds the validator class that holds methods, all predicates for commo
 """
 
 
+import logging
+import math
+
+# Runs on every account and transaction construction, so it only logs failures, at debug level
+logger = logging.getLogger("banking_system.validation")
+
 #to keep things simple, use validator function for now
 #TODO when multiple functions are created, use one class to simplify imports 
 
 def float_greater_than_zero(value:float) -> bool :
-    print(f"Validating if {value} is greater than zero.")
     if value > 0:
-        print("Validation passed.")
         return True
-    else:
-        print("Validation failed.")
-        return False
+    logger.debug("Validation failed: %s is not greater than zero.", value)
+    return False
 
+def is_whole_cents(value: float) -> bool:
+    """True if a currency amount has no fraction of a cent (allowing for float representation error)."""
+    cents = value * 100
+    if math.isclose(cents, round(cents), rel_tol=1e-12, abs_tol=1e-6):
+        return True
+    logger.debug("Validation failed: %s is not a whole number of cents.", value)
+    return False
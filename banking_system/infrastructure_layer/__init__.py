@@ -1,3 +1,15 @@
+import importlib
 
-from .account_repository import AccountRepository
-from .transaction_repository import TransactionRepository
\ No newline at end of file
+# Imported on first access, so that importing a submodule does not load the repositories
+_EXPORTS = {
+    "AccountRepository": "banking_system.infrastructure_layer.account_repository",
+    "TransactionRepository": "banking_system.infrastructure_layer.transaction_repository",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(module), name)
+    return value
@@ -1,19 +1,26 @@
 # infrastructure/account_repository.py
-import threading
 from banking_system import Account, AccountRepositoryInterface
 
 
-from typing import Optional
+from typing import List, Optional, Sequence
+from banking_system.domain_layer.util.tracing import traced
 
 
 class AccountRepository(AccountRepositoryInterface):
     def __init__(self, strategy) -> None:
         """
         Initialize a repository for account operations.
+        Writes take no repository-wide lock: every strategy applies a (multi-account)
+        compare-and-swap atomically under its own lock or SQL transaction.
         """
         self._strategy = strategy
-        self._lock = threading.RLock()
+
+    @property
+    def blocking(self) -> bool:
+        """Whether calls may block on I/O; strategies that never do declare `blocking = False`."""
+        return getattr(self._strategy, "blocking", True)
     
+    @traced("AccountRepository.create_account")
     def create_account(self, account: 'Account') -> str:
         """
         Store a new account in the repository.
@@ -28,6 +35,7 @@ class AccountRepository(AccountRepositoryInterface):
         return account_id
     
     
+    @traced("AccountRepository.get_account_by_id")
     def get_account_by_id(self, account_id: str) -> Optional['Account']:
         """
         Retrieve an account by its ID.
@@ -40,27 +48,36 @@ class AccountRepository(AccountRepositoryInterface):
         """
         return self._strategy.get_account_by_id(account_id)
     
-    def update_account(self, account: 'Account') -> None:
+    @traced("AccountRepository.update_account")
+    def update_account(self, account: 'Account', expected_version: Optional[int] = None) -> bool:
         """
         Update an existing account in the repository.
         
         Args:
             account (Account): The account object with updated information.
+            expected_version (Optional[int]): When given, only update if the stored
+                version still matches (compare-and-swap).
             
-        Raises:
-            ValueError: If the account does not exist.
+        Returns:
+            bool: True if updated, False if the account does not exist or the version changed.
         """
-        self._strategy.update_account(account)
+        return self._strategy.update_account(account, expected_version=expected_version)
 
-    def update_accounts_atomically(self, source_account: Account, destination_account: Account) -> bool:
+    @traced("AccountRepository.update_accounts_atomically")
+    def update_accounts_atomically(self, source_account: Account, destination_account: Account, expected_versions: Optional[Sequence[int]] = None) -> bool:
         """
         Updates two accounts atomically as part of a transfer operation.
         Returns True if both updates succeed, False otherwise.
         """
-        with self._lock:
-            try:
-                self._strategy.update_account(source_account)
-                self._strategy.update_account(destination_account)
-                return True
-            except Exception:
-                return False
+        try:
+            return self._strategy.update_accounts_atomically(source_account, destination_account, expected_versions=expected_versions)
+        except Exception:
+            return False
+
+    @traced("AccountRepository.update_accounts")
+    def update_accounts(self, accounts: List[Account], expected_versions: Optional[Sequence[int]] = None) -> bool:
+        """
+        Updates many accounts with a single bulk call to the storage strategy.
+        Returns True if every update succeeds, False otherwise.
+        """
+        return self._strategy.update_accounts(accounts, expected_versions=expected_versions)
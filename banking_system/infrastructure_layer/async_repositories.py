@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence
+from banking_system import Account, Transaction
+from banking_system.application_layer.repository_interfaces import (
+    AccountRepositoryInterface,
+    AsyncAccountRepositoryInterface,
+    AsyncTransactionRepositoryInterface,
+    TransactionRepositoryInterface,
+)
+from banking_system.application_layer.util.bounded_executor import BoundedExecutor, default_executor
+from banking_system.application_layer.util.pagination import DEFAULT_PAGE_SIZE, EXPORT_CHUNK_SIZE, TransactionPage
+
+
+class _AsyncAdapter:
+    def __init__(self, repository, executor: BoundedExecutor = None) -> None:
+        self._repository = repository
+        self._executor = executor or default_executor
+        # In-memory storage never waits on I/O, so a thread hop would only add latency
+        self._inline = not getattr(repository, "blocking", True)
+
+    async def _call(self, function, *args, **kwargs):
+        if self._inline:
+            return function(*args, **kwargs)
+        return await self._executor.run(function, *args, **kwargs)
+
+
+class AsyncAccountRepository(_AsyncAdapter, AsyncAccountRepositoryInterface):
+    def __init__(self, repository: AccountRepositoryInterface, executor: BoundedExecutor = None) -> None:
+        """
+        Async facade over a synchronous account repository.
+        Calls run inline when the underlying storage is in-memory and on the bounded
+        executor otherwise, so awaiting them never blocks the event loop.
+        """
+        super().__init__(repository, executor)
+
+    async def create_account(self, account: Account) -> str:
+        return await self._call(self._repository.create_account, account)
+
+    async def get_account_by_id(self, account_id: str) -> Optional[Account]:
+        return await self._call(self._repository.get_account_by_id, account_id)
+
+    async def update_account(self, account: Account, expected_version: Optional[int] = None) -> bool:
+        return await self._call(self._repository.update_account, account, expected_version=expected_version)
+
+    async def update_accounts_atomically(self, source_account: Account, destination_account: Account, expected_versions: Optional[Sequence[int]] = None) -> bool:
+        return await self._call(
+            self._repository.update_accounts_atomically, source_account, destination_account, expected_versions=expected_versions
+        )
+
+
+class AsyncTransactionRepository(_AsyncAdapter, AsyncTransactionRepositoryInterface):
+    def __init__(self, repository: TransactionRepositoryInterface, executor: BoundedExecutor = None) -> None:
+        """
+        Async facade over a synchronous transaction repository (see AsyncAccountRepository).
+        """
+        super().__init__(repository, executor)
+
+    async def save_transaction(self, transaction: Transaction) -> str:
+        return await self._call(self._repository.save_transaction, transaction)
+
+    async def get_transactions_by_account_id(self, account_id: str) -> List[Transaction]:
+        return await self._call(self._repository.get_transactions_by_account_id, account_id)
+
+    async def get_transactions_page(self, account_id: str, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                                    start: Optional[datetime] = None, end: Optional[datetime] = None) -> TransactionPage:
+        return await self._call(self._repository.get_transactions_page, account_id, cursor=cursor, limit=limit, start=start, end=end)
+
+    async def iter_transactions_by_account_id(self, account_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                              chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[Transaction]:
+        # Each page is one (possibly offloaded) call, so the loop is never held for a whole history
+        cursor = None
+        while True:
+            page = await self.get_transactions_page(account_id, cursor=cursor, limit=chunk_size, start=start, end=end)
+            for transaction in page.transactions:
+                yield transaction
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+
+    async def get_transaction_by_id(self, transaction_id: str) -> Optional[Transaction]:
+        return await self._call(self._repository.get_transaction_by_id, transaction_id)
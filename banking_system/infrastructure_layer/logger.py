@@ -1,39 +1,40 @@
 import logging
+from banking_system.application_layer.util.log_pipeline import log_fields
 
-# Configure root logger for the banking_system
+# Root logger for the banking_system. It has no handler of its own: records propagate to
+# the root logger's, or go through a LogPipeline once one is installed on it.
 logger = logging.getLogger("banking_system")
 logger.setLevel(logging.INFO)
 
-# Console handler
-_ch = logging.StreamHandler()
-_ch.setLevel(logging.INFO)
-_formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-_ch.setFormatter(_formatter)
-logger.addHandler(_ch)
-
 class Logger:
     """
     Simple wrapper around Python's logging module for injection into services.
+    Keyword arguments become structured fields of the record, e.g.
+    `log.info("Deposit", account_id=account_id, amount=amount)`.
     """
     def __init__(self, name: str = "banking_system"):
         self._logger = logging.getLogger(name)
 
-    def info(self, message: str) -> None:
+    def _log(self, level: int, message: str, fields: dict) -> None:
+        if self._logger.isEnabledFor(level):
+            self._logger.log(level, message, extra=log_fields(**fields) if fields else None)
+
+    def info(self, message: str, **fields) -> None:
         """Log an information message."""
-        self._logger.info(message)
+        self._log(logging.INFO, message, fields)
 
-    def warning(self, message: str) -> None:
+    def warning(self, message: str, **fields) -> None:
         """Log a warning message."""
-        self._logger.warning(message)
+        self._log(logging.WARNING, message, fields)
 
-    def error(self, message: str) -> None:
+    def error(self, message: str, **fields) -> None:
         """Log an error message."""
-        self._logger.error(message)
+        self._log(logging.ERROR, message, fields)
 
-    def debug(self, message: str) -> None:
+    def debug(self, message: str, **fields) -> None:
         """Log a debug message."""
-        self._logger.debug(message)
+        self._log(logging.DEBUG, message, fields)
 
-    def critical(self, message: str) -> None:
+    def critical(self, message: str, **fields) -> None:
         """Log a critical message."""
-        self._logger.critical(message)
+        self._log(logging.CRITICAL, message, fields)
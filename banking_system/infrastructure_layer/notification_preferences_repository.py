@@ -1,32 +1,92 @@
-from typing import List
+import threading
+from typing import Dict, Iterable, List, Tuple
 from banking_system.application_layer.repository_interfaces import NotificationRepositoryInterface
 
+
+def normalize_notification_type(notification_type) -> str:
+    """Stored form of a notification type: "email" for "EMAIL", "Email" or an enum member."""
+    return str(getattr(notification_type, "value", notification_type)).lower()
+
+
 class NotificationPreferencesRepository(NotificationRepositoryInterface):
     def __init__(self) -> None:
         """
         In-memory storage for notification preferences.
+        Keeps both directions indexed, account -> types and type -> accounts, so looking up
+        an account's preferences and listing a type's subscribers cost O(result), not a scan.
         """
         self._prefs: dict[str, set[str]] = {}
+        self._subscribers: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, account_id: str, notification_type: str) -> bool:
+        types = self._prefs.setdefault(account_id, set())
+        if notification_type in types:
+            return False
+        types.add(notification_type)
+        self._subscribers.setdefault(notification_type, set()).add(account_id)
+        return True
+
+    def _discard(self, account_id: str, notification_type: str) -> bool:
+        types = self._prefs.get(account_id)
+        if not types or notification_type not in types:
+            return False
+        types.remove(notification_type)
+        if not types:
+            del self._prefs[account_id]
+        subscribers = self._subscribers[notification_type]
+        subscribers.remove(account_id)
+        if not subscribers:
+            del self._subscribers[notification_type]
+        return True
 
     def save_notification_preference(self, account_id: str, notification_type: str) -> bool:
         """
         Saves a notification preference for an account.
         """
-        self._prefs.setdefault(account_id, set()).add(notification_type)
+        self.save_notification_preferences([(account_id, notification_type)])
         return True
 
     def remove_notification_preference(self, account_id: str, notification_type: str) -> bool:
         """
         Removes a notification preference for an account.
         """
-        types = self._prefs.get(account_id)
-        if types and notification_type in types:
-            types.remove(notification_type)
-            return True
-        return False
+        return self.remove_notification_preferences([(account_id, notification_type)]) == 1
 
     def get_notification_preferences(self, account_id: str) -> List[str]:
         """
         Gets all notification preferences for an account.
         """
-        return list(self._prefs.get(account_id, []))
+        return list(self._prefs.get(account_id, ()))
+
+    def get_subscribers(self, notification_type: str) -> List[str]:
+        """
+        Gets every account subscribed to a notification type.
+        """
+        with self._lock:
+            return list(self._subscribers.get(normalize_notification_type(notification_type), ()))
+
+    def save_notification_preferences(self, preferences: Iterable[Tuple[str, str]]) -> int:
+        """
+        Saves many (account_id, notification_type) pairs under one lock acquisition.
+        Returns the number of pairs that were not already saved.
+        """
+        pairs = [(account_id, normalize_notification_type(notification_type)) for account_id, notification_type in preferences]
+        with self._lock:
+            return sum(self._add(account_id, notification_type) for account_id, notification_type in pairs)
+
+    def remove_notification_preferences(self, preferences: Iterable[Tuple[str, str]]) -> int:
+        """
+        Removes many (account_id, notification_type) pairs under one lock acquisition.
+        Returns the number of pairs that existed and were removed.
+        """
+        pairs = [(account_id, normalize_notification_type(notification_type)) for account_id, notification_type in preferences]
+        with self._lock:
+            return sum(self._discard(account_id, notification_type) for account_id, notification_type in pairs)
+
+    def load_notification_preferences(self, account_ids: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Gets the notification preferences of many accounts.
+        """
+        with self._lock:
+            return {account_id: list(self._prefs.get(account_id, ())) for account_id in account_ids}
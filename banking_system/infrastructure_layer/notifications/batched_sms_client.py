@@ -0,0 +1,92 @@
+import http.client
+import json
+import logging
+import time
+from urllib.parse import urlsplit
+from .delivery import ConnectionPool, DeliveryMetrics
+from .sms_client import SMSClient
+
+logger = logging.getLogger(__name__)
+
+
+class _TransientStatus(Exception):
+    """The provider answered 429 or 5xx: worth retrying."""
+
+
+class BatchedSMSClient(SMSClient):
+    """
+    SMS delivery through an HTTP provider's batch endpoint over persistent connections.
+
+    `send_messages` posts up to `batch_size` messages per request as
+    `{"messages": [{"from": ..., "to": ..., "body": ...}, ...]}` on keep-alive connections
+    from a pool of `max_connections`, which also caps concurrent requests. 429 and 5xx
+    replies and connection failures are retried with exponential backoff and raised after
+    `max_retries`; other 4xx replies reject the batch permanently and are logged and
+    counted as failed.
+    """
+    def __init__(self, provider_url: str, batch_size: int = 100, max_connections: int = 4, max_retries: int = 3,
+                 retry_backoff_s: float = 0.05, timeout_s: float = 10.0):
+        super().__init__(provider_url)
+        if batch_size < 1:
+            raise ValueError("An SMS batch must hold at least one message.")
+        parts = urlsplit(provider_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported SMS provider URL: {provider_url}")
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+        self.timeout_s = timeout_s
+        self.metrics = DeliveryMetrics()
+        self._pool = ConnectionPool(self._connect, max_connections, metrics=self.metrics)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        return self._connection_class(self._host, self._port, timeout=self.timeout_s)
+
+    def send_message(self, from_number: str, to_number: str, message: str) -> None:
+        self.send_messages([(from_number, to_number, message)])
+
+    def send_messages(self, messages) -> None:
+        """Sends (from_number, to_number, message) tuples in batches of `batch_size`."""
+        messages = [{"from": from_number, "to": to_number, "body": body} for from_number, to_number, body in messages]
+        for start in range(0, len(messages), self.batch_size):
+            batch = messages[start:start + self.batch_size]
+            self._post(json.dumps({"messages": batch}).encode("utf-8"), len(batch))
+
+    def _request(self, payload: bytes) -> int:
+        with self._pool.connection() as connection:
+            started = time.perf_counter()
+            connection.request("POST", self._path, body=payload,
+                               headers={"Content-Type": "application/json", "Connection": "keep-alive"})
+            response = connection.getresponse()
+            # The body must be consumed before the connection can carry the next request
+            response.read()
+            self.metrics.call_latency.observe(time.perf_counter() - started)
+            if response.status == 429 or response.status >= 500:
+                raise _TransientStatus(f"SMS provider answered {response.status}")
+            return response.status
+
+    def _post(self, payload: bytes, count: int) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                status = self._request(payload)
+            except (_TransientStatus, http.client.HTTPException, OSError):
+                if attempt == self.max_retries:
+                    self.metrics.failed.inc(count)
+                    raise
+                self.metrics.retries.inc()
+                time.sleep(self.retry_backoff_s * 2 ** attempt)
+                continue
+            if 200 <= status < 300:
+                self.metrics.sent.inc(count)
+            else:
+                self.metrics.failed.inc(count)
+                logger.error("SMS provider rejected a batch of %d messages with status %d", count, status)
+            return
+
+    def close(self) -> None:
+        """Closes every idle connection."""
+        self._pool.close()
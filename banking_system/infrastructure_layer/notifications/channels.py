@@ -0,0 +1,45 @@
+from typing import Callable, List
+from banking_system.application_layer.repository_interfaces import NotificationChannelInterface
+from .email_client import EmailClient
+from .sms_client import SMSClient
+
+
+class EmailNotificationChannel(NotificationChannelInterface):
+    def __init__(self, client: EmailClient, from_addr: str = "notifications@bank.local",
+                 address_for: Callable[[str], str] = str) -> None:
+        """
+        Delivers notifications as emails through an EmailClient.
+
+        Args:
+            client: The email client.
+            from_addr: Sender address.
+            address_for: Maps an account id to the recipient's address.
+        """
+        self.client = client
+        self.from_addr = from_addr
+        self.address_for = address_for
+
+    def send_batch(self, messages: List) -> None:
+        self.client.send_mails(
+            (self.from_addr, self.address_for(message.account_id), message.subject, message.body) for message in messages
+        )
+
+
+class SMSNotificationChannel(NotificationChannelInterface):
+    def __init__(self, client: SMSClient, from_number: str = "BANK", number_for: Callable[[str], str] = str) -> None:
+        """
+        Delivers notifications as text messages through an SMSClient.
+
+        Args:
+            client: The SMS client.
+            from_number: Sender number or id.
+            number_for: Maps an account id to the recipient's phone number.
+        """
+        self.client = client
+        self.from_number = from_number
+        self.number_for = number_for
+
+    def send_batch(self, messages: List) -> None:
+        self.client.send_messages(
+            (self.from_number, self.number_for(message.account_id), message.body) for message in messages
+        )
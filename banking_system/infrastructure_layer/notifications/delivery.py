@@ -0,0 +1,64 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, List
+from banking_system.application_layer.util.metrics import Counter, Histogram, LATENCY_BUCKETS
+
+
+class DeliveryMetrics:
+    """Per-channel delivery counters and the latency of each provider call (seconds)."""
+    def __init__(self) -> None:
+        self.sent = Counter()
+        self.failed = Counter()
+        self.retries = Counter()
+        self.connections_opened = Counter()
+        self.call_latency = Histogram(LATENCY_BUCKETS)
+
+
+class ConnectionPool:
+    """
+    Keeps up to `size` persistent connections to a provider and limits concurrent use to
+    the same number: callers beyond it wait for a connection to be returned. Connections
+    are reused most-recently-returned first; one that raised is closed instead of returned,
+    so the next caller opens a fresh one.
+    """
+    def __init__(self, factory: Callable[[], object], size: int, close: Callable[[object], None] = None,
+                 metrics: DeliveryMetrics = None) -> None:
+        if size < 1:
+            raise ValueError("A connection pool needs room for at least one connection.")
+        self._factory = factory
+        self._close = close or (lambda connection: connection.close())
+        self._metrics = metrics
+        self._idle: List[object] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self):
+        """Lends a connection for the duration of the block."""
+        with self._slots:
+            with self._lock:
+                connection = self._idle.pop() if self._idle else None
+            if connection is None:
+                connection = self._factory()
+                if self._metrics is not None:
+                    self._metrics.connections_opened.inc()
+            try:
+                yield connection
+            except BaseException:
+                self._discard(connection)
+                raise
+            with self._lock:
+                self._idle.append(connection)
+
+    def _discard(self, connection) -> None:
+        try:
+            self._close(connection)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Closes every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
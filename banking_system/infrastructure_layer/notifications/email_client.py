@@ -9,4 +9,8 @@ class EmailClient:
         # Implementation that sends email via SMTP
         print(f"[EMAILCLIENT] Sending email from {from_addr} to {to_addr}")
         print(f"Subject: {subject}")
-        print(f"Body: {body}")
\ No newline at end of file
+        print(f"Body: {body}")
+    def send_mails(self, mails) -> None:
+        """Sends (from_addr, to_addr, subject, body) tuples; one send_mail each."""
+        for from_addr, to_addr, subject, body in mails:
+            self.send_mail(from_addr, to_addr, subject, body)
@@ -0,0 +1,171 @@
+import json
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+# Local stand-ins for the SMTP server and the SMS provider, for development, tests and
+# benchmarks. They accept everything they are sent and keep it in memory.
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib: HELO/EHLO, MAIL, RCPT, DATA, RSET, NOOP and QUIT."""
+    def _reply(self, line: str) -> None:
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self) -> None:
+        server = self.server.owner
+        with server._lock:
+            server.connections += 1
+            server._sessions.append(self.request)
+        self._reply("220 localhost stand-in SMTP")
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("ascii", "replace").strip()
+            verb = command[:4].upper()
+            if verb == "EHLO":
+                self._reply("250-localhost")
+                self._reply("250 PIPELINING")
+            elif verb in ("HELO", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "RSET":
+                sender, recipients = None, []
+                self._reply("250 OK")
+            elif verb == "MAIL":
+                sender, recipients = command.partition(":")[2].strip(), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.partition(":")[2].strip())
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line == b".\r\n":
+                        break
+                    data.append(line[1:] if line.startswith(b"..") else line)
+                with server._lock:
+                    server.messages.append((sender, recipients, b"".join(data)))
+                sender, recipients = None, []
+                self._reply("250 OK queued")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalSMTPServer:
+    """
+    An in-process SMTP stand-in on 127.0.0.1 (port 0 picks a free one).
+    `messages` holds (sender, recipients, raw message) tuples and `connections`
+    counts the sessions opened, which shows whether a client reuses them.
+    """
+    def __init__(self, port: int = 0) -> None:
+        self.messages: List[tuple] = []
+        self.connections = 0
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._server = _ThreadingTCPServer(("127.0.0.1", port), _SMTPHandler)
+        self._server.owner = self
+        self.port = self._server.server_address[1]
+        self._thread = None
+
+    def start(self) -> "LocalSMTPServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-smtp", daemon=True)
+        self._thread.start()
+        return self
+
+    def drop_connections(self) -> None:
+        """Hangs up every open session, as a server restart or idle timeout would."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        self.drop_connections()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class _SMSHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        server = self.server.owner
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server._lock:
+            server.requests += 1
+            failing = server.fail_next > 0
+            if failing:
+                server.fail_next -= 1
+            else:
+                messages = json.loads(body)["messages"]
+                server.messages.extend(messages)
+        status, reply = (503, {"error": "unavailable"}) if failing else (200, {"accepted": len(messages)})
+        payload = json.dumps(reply).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _ThreadingHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class LocalSMSServer:
+    """
+    An in-process HTTP stand-in for an SMS provider's batch endpoint on 127.0.0.1.
+    `messages` holds the accepted message dicts, `requests` counts POSTs, and setting
+    `fail_next` makes that many following requests answer 503.
+    """
+    def __init__(self, port: int = 0) -> None:
+        self.messages: List[dict] = []
+        self.requests = 0
+        self.fail_next = 0
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer(("127.0.0.1", port), _SMSHandler)
+        self._server.owner = self
+        self.port = self._server.server_address[1]
+        self.url = f"http://127.0.0.1:{self.port}/messages"
+        self._thread = None
+
+    def start(self) -> "LocalSMSServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-sms", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
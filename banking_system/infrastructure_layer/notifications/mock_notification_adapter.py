@@ -1,25 +1,26 @@
-from application_layer.repository_interfaces import NotificationAdapterInterface
+from banking_system.application_layer.repository_interfaces import NotificationAdapterInterface
+from banking_system.infrastructure_layer.notification_preferences_repository import NotificationPreferencesRepository
 
 class NotificationAdapter(NotificationAdapterInterface):
-    def __init__(self):
-        # {account_id: set of notification_types}
-        self._preferences = {}
+    def __init__(self, preferences=None):
+        # Preference storage (a NotificationRepositoryInterface); in memory unless one is given
+        self._preferences = preferences if preferences is not None else NotificationPreferencesRepository()
 
     def notify(self, message):
         # For demonstration, just print the message
         print(f"Notification sent: {message}")
 
     def save_notification_preference(self, account_id, notification_type):
-        if account_id not in self._preferences:
-            self._preferences[account_id] = set()
-        self._preferences[account_id].add(notification_type)
-        return True
+        return self._preferences.save_notification_preference(account_id, notification_type)
 
     def remove_notification_preference(self, account_id, notification_type):
-        if account_id in self._preferences and notification_type in self._preferences[account_id]:
-            self._preferences[account_id].remove(notification_type)
-            return True
-        return False
+        return self._preferences.remove_notification_preference(account_id, notification_type)
 
     def get_notification_preferences(self, account_id):
-        return list(self._preferences.get(account_id, []))
\ No newline at end of file
+        return self._preferences.get_notification_preferences(account_id)
+
+    def load_notification_preferences(self, account_ids):
+        return self._preferences.load_notification_preferences(account_ids)
+
+    def get_subscribers(self, notification_type):
+        return self._preferences.get_subscribers(notification_type)
@@ -0,0 +1,101 @@
+import logging
+import smtplib
+import time
+from email.message import EmailMessage
+from .delivery import ConnectionPool, DeliveryMetrics
+from .email_client import EmailClient
+
+logger = logging.getLogger(__name__)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Connection failures and 4xx replies are worth retrying; 5xx replies and refused recipients are not."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    # smtplib.SMTPException derives from OSError, as do socket errors and timeouts
+    return isinstance(error, OSError)
+
+
+class PooledEmailClient(EmailClient):
+    """
+    Email delivery over a pool of persistent SMTP connections.
+
+    Opening an SMTP session (TCP, greeting, EHLO, possibly STARTTLS and AUTH) costs several
+    round trips, so connections are kept open and reused; `pool_size` also caps how many
+    sends run at once. `send_mails` pushes a whole batch through one connection. On a
+    transient failure (dropped connection, 4xx reply) the connection is discarded and the
+    rest of the batch is retried on a fresh one with exponential backoff; after
+    `max_retries` the error is raised. Permanently rejected messages (5xx, refused
+    recipients) are logged, counted as failed and skipped.
+    """
+    def __init__(self, smtp_server: str, port: int, pool_size: int = 4, max_retries: int = 3,
+                 retry_backoff_s: float = 0.05, timeout_s: float = 10.0, starttls: bool = False,
+                 username: str = None, password: str = None):
+        super().__init__(smtp_server, port)
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+        self.timeout_s = timeout_s
+        self.starttls = starttls
+        self.username = username
+        self.password = password
+        self.metrics = DeliveryMetrics()
+        self._pool = ConnectionPool(self._connect, pool_size, close=self._quit, metrics=self.metrics)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.smtp_server, self.port, timeout=self.timeout_s)
+        connection.ehlo()
+        if self.starttls:
+            connection.starttls()
+            connection.ehlo()
+        if self.username:
+            connection.login(self.username, self.password)
+        return connection
+
+    @staticmethod
+    def _quit(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+    def send_mail(self, from_addr: str, to_addr: str, subject: str, body: str) -> None:
+        self.send_mails([(from_addr, to_addr, subject, body)])
+
+    def send_mails(self, mails) -> None:
+        """Sends (from_addr, to_addr, subject, body) tuples over one pooled connection."""
+        pending = []
+        for from_addr, to_addr, subject, body in mails:
+            message = EmailMessage()
+            message["From"], message["To"], message["Subject"] = from_addr, to_addr, subject
+            message.set_content(body)
+            pending.append(message)
+
+        position, attempt = 0, 0
+        while position < len(pending):
+            try:
+                with self._pool.connection() as connection:
+                    while position < len(pending):
+                        started = time.perf_counter()
+                        try:
+                            connection.send_message(pending[position])
+                            self.metrics.sent.inc()
+                        except Exception as error:
+                            if _is_transient(error):
+                                raise
+                            self.metrics.failed.inc()
+                            logger.error("Email to %s rejected: %s", pending[position]["To"], error)
+                        self.metrics.call_latency.observe(time.perf_counter() - started)
+                        position += 1
+            except Exception as error:
+                if not _is_transient(error) or attempt == self.max_retries:
+                    self.metrics.failed.inc(len(pending) - position)
+                    raise
+                self.metrics.retries.inc()
+                time.sleep(self.retry_backoff_s * 2 ** attempt)
+                attempt += 1
+
+    def close(self) -> None:
+        """Quits every idle connection."""
+        self._pool.close()
@@ -6,4 +6,8 @@ class SMSClient:
         self.provider_url = provider_url
     def send_message(self, from_number: str, to_number: str, message: str) -> None:
         # Implementation that sends SMS via external API
-        print(f"[SMSCLIENT] Sending SMS from {from_number} to {to_number}")
\ No newline at end of file
+        print(f"[SMSCLIENT] Sending SMS from {from_number} to {to_number}")
+    def send_messages(self, messages) -> None:
+        """Sends (from_number, to_number, message) tuples; one send_message each."""
+        for from_number, to_number, message in messages:
+            self.send_message(from_number, to_number, message)
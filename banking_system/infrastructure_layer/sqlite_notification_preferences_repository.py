@@ -0,0 +1,78 @@
+from typing import Iterable, Tuple
+from .notification_preferences_repository import NotificationPreferencesRepository, normalize_notification_type
+from .strategies.sqlite_connection_pool import SQLiteConnectionPool
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS notification_preferences (
+        account_id         TEXT NOT NULL,
+        notification_type  TEXT NOT NULL,
+        PRIMARY KEY (account_id, notification_type)
+    ) WITHOUT ROWID
+    """,
+    # Reverse index: subscribers of a type without scanning every account
+    "CREATE INDEX IF NOT EXISTS notification_preferences_by_type "
+    "ON notification_preferences (notification_type, account_id)",
+)
+_INSERT = "INSERT OR IGNORE INTO notification_preferences (account_id, notification_type) VALUES (?, ?)"
+_DELETE = "DELETE FROM notification_preferences WHERE account_id = ? AND notification_type = ?"
+_SELECT_ALL = "SELECT account_id, notification_type FROM notification_preferences"
+
+
+class SQLiteNotificationPreferencesRepository(NotificationPreferencesRepository):
+    def __init__(self, path: str, synchronous: str = "NORMAL") -> None:
+        """
+        Notification preferences persisted in a SQLite database file, so they survive restarts.
+
+        Preferences are small (a few types per account), so the whole table is loaded into the
+        in-memory indexes at startup and every read is served from memory; writes go through
+        to SQLite first, one SQL transaction per bulk call, and reach the indexes only once
+        committed.
+
+        Args:
+            path: Database file; may be shared with the sqlite account and transaction strategies.
+            synchronous: SQLite `synchronous` pragma (see SQLiteAccountStrategy).
+        """
+        super().__init__()
+        self._pool = SQLiteConnectionPool(path, synchronous=synchronous)
+        with self._pool.transaction() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+        for account_id, notification_type in self._pool.connection().execute(_SELECT_ALL):
+            self._add(account_id, notification_type)
+
+    def save_notification_preferences(self, preferences: Iterable[Tuple[str, str]]) -> int:
+        """
+        Saves many (account_id, notification_type) pairs in one SQL transaction.
+        Returns the number of pairs that were not already saved.
+        """
+        pairs = {(account_id, normalize_notification_type(notification_type)) for account_id, notification_type in preferences}
+        with self._lock:
+            new = [(account_id, notification_type) for account_id, notification_type in pairs
+                   if notification_type not in self._prefs.get(account_id, ())]
+            if new:
+                with self._pool.transaction() as connection:
+                    connection.executemany(_INSERT, new)
+            for account_id, notification_type in new:
+                self._add(account_id, notification_type)
+        return len(new)
+
+    def remove_notification_preferences(self, preferences: Iterable[Tuple[str, str]]) -> int:
+        """
+        Removes many (account_id, notification_type) pairs in one SQL transaction.
+        Returns the number of pairs that existed and were removed.
+        """
+        pairs = {(account_id, normalize_notification_type(notification_type)) for account_id, notification_type in preferences}
+        with self._lock:
+            existing = [(account_id, notification_type) for account_id, notification_type in pairs
+                        if notification_type in self._prefs.get(account_id, ())]
+            if existing:
+                with self._pool.transaction() as connection:
+                    connection.executemany(_DELETE, existing)
+            for account_id, notification_type in existing:
+                self._discard(account_id, notification_type)
+        return len(existing)
+
+    def close(self) -> None:
+        """Closes the database connections."""
+        self._pool.close()
@@ -0,0 +1,102 @@
+from banking_system.domain_layer import Account, CheckingInterestStrategy, SavingsInterestStrategy, LimitConstraint
+from banking_system import AccountStatus, AccountType, CheckingAccount, SavingsAccount
+from banking_system.domain_layer.entities.transaction_record import datetime_to_ns, ns_to_datetime
+
+# Flat encoding of an account's state into primitive fields, shared by the storage strategies
+# that do not retain `Account` objects (columnar arrays, SQLite rows).
+
+ACCOUNT_TYPES = (AccountType.CHECKING, AccountType.SAVINGS)
+ACCOUNT_CLASSES = (CheckingAccount, SavingsAccount)
+ACCOUNT_TYPE_CODES = {account_type.value: code for code, account_type in enumerate(ACCOUNT_TYPES)}
+STATUSES = (AccountStatus.ACTIVE, AccountStatus.CLOSED)
+STATUS_CODES = {status.value: code for code, status in enumerate(STATUSES)}
+
+NO_INTEREST, CHECKING_INTEREST, SAVINGS_INTEREST = 0, 1, 2
+
+# Order of the values returned by `encode_account` (after the id) and taken by `decode_account`
+ACCOUNT_FIELDS = (
+    "balance", "account_type", "status", "creation_date", "interest_kind", "interest_rate",
+    "has_limits", "daily_limit", "monthly_limit", "daily_total", "monthly_total", "last_check",
+    "lazy_interest", "last_accrual",
+)
+
+
+def encode_account(account: Account) -> tuple:
+    """
+    Returns the account's state as primitives in ACCOUNT_FIELDS order.
+    Enums become small integer codes, datetimes integer nanoseconds, and a missing
+    limit None; strategies without a null value substitute their own sentinel.
+    """
+    account_type = getattr(account.account_type, "value", account.account_type)
+    # Reading the balance settles lazy interest, so read it before last_accrual
+    balance = account.balance
+
+    strategy = account.interest_strategy
+    if strategy is None:
+        interest_kind, interest_rate = NO_INTEREST, 0.0
+    elif isinstance(strategy, SavingsInterestStrategy):
+        interest_kind, interest_rate = SAVINGS_INTEREST, strategy.annual_rate
+    elif isinstance(strategy, CheckingInterestStrategy):
+        interest_kind, interest_rate = CHECKING_INTEREST, 0.0
+    else:
+        raise ValueError(f"Unsupported interest strategy for flat storage: {type(strategy).__name__}")
+
+    constraint = account.limit_constraint
+    if constraint is None:
+        limits = (False, None, None, 0.0, 0.0, 0)
+    else:
+        limits = (
+            True,
+            constraint.daily_limit,
+            constraint.monthly_limit,
+            constraint._daily_total,
+            constraint._monthly_total,
+            datetime_to_ns(constraint._last_check),
+        )
+
+    return (
+        balance,
+        ACCOUNT_TYPE_CODES[account_type],
+        STATUS_CODES[account.status.value],
+        datetime_to_ns(account.creation_date),
+        interest_kind,
+        interest_rate,
+        *limits,
+        bool(getattr(account, "lazy_interest", False)),
+        datetime_to_ns(getattr(account, "last_accrual", account.creation_date)),
+    )
+
+
+def decode_account(account_id, balance, account_type, status, creation_date, interest_kind, interest_rate,
+                   has_limits, daily_limit, monthly_limit, daily_total, monthly_total, last_check,
+                   lazy_interest, last_accrual, version=0) -> Account:
+    """Materializes a detached CheckingAccount/SavingsAccount from fields produced by `encode_account`."""
+    if interest_kind == SAVINGS_INTEREST:
+        interest_strategy = SavingsInterestStrategy(interest_rate)
+    elif interest_kind == CHECKING_INTEREST:
+        interest_strategy = CheckingInterestStrategy()
+    else:
+        interest_strategy = None
+
+    limit_constraint = None
+    if has_limits:
+        limit_constraint = LimitConstraint.restore(
+            daily_limit=daily_limit,
+            monthly_limit=monthly_limit,
+            daily_total=daily_total,
+            monthly_total=monthly_total,
+            last_check=ns_to_datetime(last_check),
+        )
+
+    return ACCOUNT_CLASSES[account_type].restore(
+        account_id=account_id,
+        account_type=ACCOUNT_TYPES[account_type],
+        balance=balance,
+        status=STATUSES[status],
+        creation_date=ns_to_datetime(creation_date),
+        interest_strategy=interest_strategy,
+        limit_constraint=limit_constraint,
+        lazy_interest=bool(lazy_interest),
+        last_accrual=ns_to_datetime(last_accrual),
+        version=version,
+    )
@@ -0,0 +1,55 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Optional, Tuple
+
+
+class AccountTimeIndex:
+    """
+    One account's transactions kept in (timestamp, row) order at insert time.
+
+    Rows are global, monotonically increasing insertion numbers, so they break ties
+    between equal timestamps and, paired with the timestamp, form a stable position
+    for cursors. Transactions normally arrive in time order and are appended in O(1);
+    a late arrival is placed with a binary search.
+    """
+    __slots__ = ("timestamps", "rows")
+
+    def __init__(self) -> None:
+        self.timestamps = array("q")
+        self.rows = array("I")
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def insert(self, timestamp_ns: int, row: int) -> None:
+        timestamps = self.timestamps
+        if not timestamps or timestamp_ns >= timestamps[-1]:
+            timestamps.append(timestamp_ns)
+            self.rows.append(row)
+            return
+        # New rows are the largest yet, so they go after every equal timestamp
+        position = bisect_right(timestamps, timestamp_ns)
+        timestamps.insert(position, timestamp_ns)
+        self.rows.insert(position, row)
+
+    def _position_after(self, timestamp_ns: int, row: int) -> int:
+        low = bisect_left(self.timestamps, timestamp_ns)
+        high = bisect_right(self.timestamps, timestamp_ns, low)
+        return bisect_right(self.rows, row, low, high)
+
+    def page(self, after: Optional[Tuple[int, int]], limit: int,
+             start_ns: Optional[int] = None, end_ns: Optional[int] = None):
+        """
+        Returns (rows, next_key) for up to `limit` entries with start_ns <= timestamp < end_ns
+        that come after the `(timestamp, row)` key `after`. `next_key` is the key of the last
+        returned entry when more remain, else None. Costs O(log n + limit).
+        """
+        begin = bisect_left(self.timestamps, start_ns) if start_ns is not None else 0
+        if after is not None:
+            begin = max(begin, self._position_after(*after))
+        stop = bisect_left(self.timestamps, end_ns, begin) if end_ns is not None else len(self.rows)
+        stop = max(stop, begin)
+        last = min(stop, begin + limit)
+        rows = self.rows[begin:last]
+        next_key = (self.timestamps[last - 1], self.rows[last - 1]) if last < stop else None
+        return rows, next_key
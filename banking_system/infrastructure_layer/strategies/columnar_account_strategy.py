@@ -0,0 +1,177 @@
+import math
+import threading
+from array import array
+from typing import Dict, List, Optional, Sequence
+from banking_system.domain_layer import Account
+from banking_system import AccountRepositoryInterface
+from banking_system.domain_layer.entities.transaction_record import datetime_to_ns
+from .account_codec import decode_account, encode_account
+
+# Arrays have no null, so missing limits are stored as NaN
+_NO_LIMIT = math.nan
+
+
+class ColumnarAccountStrategy(AccountRepositoryInterface):
+    # Pure in-memory: safe to call inline from the event loop
+    blocking = False
+
+    def __init__(self) -> None:
+        """
+        In-memory account storage laid out as a struct of arrays.
+
+        Each account gets a dense slot number; its balance, status, type, creation time,
+        interest settings and limit counters live at that slot in contiguous typed arrays.
+        No `Account` objects are retained: `get_account_by_id` materializes a detached
+        `CheckingAccount`/`SavingsAccount` view, and `update_account` writes it back.
+        Whole-book scans (`total_balance`, `balances`) run over the raw arrays.
+        """
+        self._ids: List[str] = []
+        self._slots: Dict[str, int] = {}
+        self._balances = array("d")
+        self._types = array("B")
+        self._statuses = array("B")
+        self._created = array("q")
+        self._interest_kinds = array("B")
+        self._interest_rates = array("d")
+        self._has_limits = array("B")
+        self._daily_limits = array("d")
+        self._monthly_limits = array("d")
+        self._daily_totals = array("d")
+        self._monthly_totals = array("d")
+        self._last_checks = array("q")
+        self._lazy_interest = array("B")
+        self._last_accruals = array("q")
+        self._versions = array("Q")
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def create_account(self, account: Account) -> str:
+        """
+        Persist a new account.
+        Returns the account_id for convenience.
+        """
+        account_id = account.account_id
+        # Encoded before a slot is taken, so an account that cannot be stored leaves nothing behind
+        fields = encode_account(account)
+        created = datetime_to_ns(account.creation_date)
+        with self._lock:
+            if account_id in self._slots:
+                raise ValueError(f"Account with ID {account_id} already exists")
+            self._slots[account_id] = len(self._ids)
+            self._ids.append(account_id)
+            for column in (self._balances, self._interest_rates, self._daily_limits,
+                           self._monthly_limits, self._daily_totals, self._monthly_totals):
+                column.append(0.0)
+            for column in (self._types, self._statuses, self._interest_kinds, self._has_limits, self._lazy_interest):
+                column.append(0)
+            for column in (self._last_checks, self._last_accruals):
+                column.append(0)
+            self._versions.append(account.version)
+            self._created.append(created)
+            self._write(self._slots[account_id], fields)
+        return account_id
+
+    def get_account_by_id(self, account_id: str) -> Optional[Account]:
+        """
+        Materialize a detached view of the account, or None if it does not exist.
+        """
+        slot = self._slots.get(account_id)
+        if slot is None:
+            return None
+        return self._read(slot)
+
+    def update_account(self, account: Account, expected_version: int = None) -> bool:
+        """
+        Write the account's state back to its slot; returns True if updated, False if not found
+        or if `expected_version` no longer matches the stored version.
+        """
+        return self.update_accounts([account], [expected_version])
+
+    def update_accounts_atomically(
+        self, source_account: Account, destination_account: Account, expected_versions: Sequence[int] = None
+    ) -> bool:
+        """
+        Atomically update two accounts (e.g. during a transfer).
+        Returns True if both were updated, False otherwise.
+        """
+        return self.update_accounts([source_account, destination_account], expected_versions)
+
+    def update_accounts(self, accounts: List[Account], expected_versions: Sequence[int] = None) -> bool:
+        """
+        Write many accounts back under one lock acquisition.
+        Returns True if all were updated; nothing is written if any is missing
+        or any expected version does not match.
+        """
+        slots = [self._slots.get(account.account_id) for account in accounts]
+        if None in slots:
+            return False
+        if expected_versions is None:
+            expected_versions = [None] * len(accounts)
+        # Every account is encoded before any is written, so one that cannot be stored fails the whole batch
+        encoded = [encode_account(account) for account in accounts]
+        with self._lock:
+            for slot, expected_version in zip(slots, expected_versions):
+                if expected_version is not None and self._versions[slot] != expected_version:
+                    return False
+            for slot, account, fields in zip(slots, accounts, encoded):
+                self._write(slot, fields)
+                self._versions[slot] += 1
+                account.version = self._versions[slot]
+        return True
+
+    # Whole-book scans
+
+    def snapshot(self) -> List[Account]:
+        """Materializes a point-in-time list of every stored account."""
+        with self._lock:
+            return [self._read(slot) for slot in range(len(self._ids))]
+
+    def account_ids(self) -> List[str]:
+        """Returns the account ids in slot order."""
+        return list(self._ids)
+
+    def balances(self) -> memoryview:
+        """
+        Returns a read-only view of the balance column, indexed by slot.
+        Balances of lazily accruing accounts exclude interest not yet settled.
+        """
+        return memoryview(self._balances).toreadonly()
+
+    def total_balance(self) -> float:
+        """Sums every balance in the book."""
+        return math.fsum(self._balances)
+
+    # Encoding helpers
+
+    def _write(self, slot: int, fields: tuple) -> None:
+        """Stores the fields encode_account produced for an account at its slot."""
+        (self._balances[slot], self._types[slot], self._statuses[slot], _, self._interest_kinds[slot],
+         self._interest_rates[slot], self._has_limits[slot], daily_limit, monthly_limit, self._daily_totals[slot],
+         self._monthly_totals[slot], self._last_checks[slot], self._lazy_interest[slot],
+         self._last_accruals[slot]) = fields
+        self._daily_limits[slot] = _NO_LIMIT if daily_limit is None else daily_limit
+        self._monthly_limits[slot] = _NO_LIMIT if monthly_limit is None else monthly_limit
+
+    def _read(self, slot: int) -> Account:
+        daily_limit = self._daily_limits[slot]
+        monthly_limit = self._monthly_limits[slot]
+        return decode_account(
+            self._ids[slot],
+            self._balances[slot],
+            self._types[slot],
+            self._statuses[slot],
+            self._created[slot],
+            self._interest_kinds[slot],
+            self._interest_rates[slot],
+            self._has_limits[slot],
+            None if math.isnan(daily_limit) else daily_limit,
+            None if math.isnan(monthly_limit) else monthly_limit,
+            self._daily_totals[slot],
+            self._monthly_totals[slot],
+            self._last_checks[slot],
+            self._lazy_interest[slot],
+            self._last_accruals[slot],
+            self._versions[slot],
+        )
@@ -1,12 +1,18 @@
 import threading
-from typing import Optional
-from domain_layer import Account
+from typing import List, Optional, Sequence
+from banking_system.domain_layer import Account
 from banking_system import AccountRepositoryInterface
 
 class DictionaryAccountStrategy(AccountRepositoryInterface):
+    # Pure in-memory: safe to call inline from the event loop
+    blocking = False
+
     def __init__(self) -> None:
         """
         In-memory account storage.
+        Accounts are stored and handed out as detached copies, so a caller's changes only
+        become visible once written back, and versioned (compare-and-swap) updates can
+        detect lost updates.
         """
         self._accounts: dict[str, Account] = {}
         self._lock = threading.Lock()
@@ -17,41 +23,59 @@ class DictionaryAccountStrategy(AccountRepositoryInterface):
         Returns the account_id for convenience.
         """
         account_id = account.account_id
-        self._accounts[account_id] = account
+        self._accounts[account_id] = account.clone()
         return account_id
 
     def get_account_by_id(self, account_id: str) -> Optional[Account]:
         """
-        Retrieve an account by ID.
+        Retrieve a detached copy of an account by ID.
         """
-        return self._accounts.get(account_id)
+        account = self._accounts.get(account_id)
+        return account.clone() if account is not None else None
 
-    def update_account(self, account: Account) -> bool:
+    def update_account(self, account: Account, expected_version: int = None) -> bool:
         """
-        Update an existing account; returns True if updated, False if not found.
+        Update an existing account; returns True if updated, False if not found
+        or if `expected_version` no longer matches the stored version.
         """
-        account_id = account.account_id
-        if account_id not in self._accounts:
-            return False
-        self._accounts[account_id] = account
-        return True
+        return self.update_accounts([account], [expected_version])
 
     def update_accounts_atomically(
-        self, source_account: Account, destination_account: Account
+        self, source_account: Account, destination_account: Account, expected_versions: Sequence[int] = None
     ) -> bool:
         """
         Atomically update two accounts (e.g. during a transfer).
         Returns True if both were updated, False otherwise.
         """
-        with self._lock:
-            src_id = source_account.account_id
-            dst_id = destination_account.account_id
+        return self.update_accounts([source_account, destination_account], expected_versions)
 
-            # Ensure both accounts exist
-            if src_id not in self._accounts or dst_id not in self._accounts:
-                return False
+    def update_accounts(self, accounts: List[Account], expected_versions: Sequence[int] = None) -> bool:
+        """
+        Update many existing accounts under one lock acquisition.
+        Returns True if all were updated; nothing is written if any is missing
+        or any expected version does not match.
+        """
+        if expected_versions is None:
+            expected_versions = [None] * len(accounts)
+        with self._lock:
+            # Ensure every account exists and is unchanged since it was read
+            for account, expected_version in zip(accounts, expected_versions):
+                stored = self._accounts.get(account.account_id)
+                if stored is None:
+                    return False
+                if expected_version is not None and stored.version != expected_version:
+                    return False
 
             # Perform updates
-            self._accounts[src_id] = source_account
-            self._accounts[dst_id] = destination_account
+            for account in accounts:
+                account.version = self._accounts[account.account_id].version + 1
+                self._accounts[account.account_id] = account.clone()
             return True
+
+    def snapshot(self) -> List[Account]:
+        """
+        Returns a point-in-time list of every stored account without copying them:
+        stored instances are replaced, never modified, by updates. Callers must not modify them.
+        """
+        with self._lock:
+            return list(self._accounts.values())
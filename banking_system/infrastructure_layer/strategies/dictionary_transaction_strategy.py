@@ -1,45 +1,116 @@
+import threading
+import uuid
+from datetime import datetime
 from typing import Dict, List, Optional
-from banking_system import Transaction, TransactionRepositoryInterface
+from banking_system import Transaction, TransactionRecord, TransactionRepositoryInterface
+from banking_system.application_layer.util.pagination import (
+    DEFAULT_PAGE_SIZE, TransactionPage, decode_cursor, encode_cursor, validate_page_size
+)
+from banking_system.domain_layer.entities.transaction_record import datetime_to_ns
+from .account_time_index import AccountTimeIndex
+from .transaction_table import TransactionTable
 
 
+def _as_record(transaction) -> TransactionRecord:
+    return transaction if isinstance(transaction, TransactionRecord) else TransactionRecord.from_transaction(transaction)
+
 
 class DictionaryTransactionStrategy(TransactionRepositoryInterface):
-    def __init__(self) -> None:
+    # Pure in-memory: safe to call inline from the event loop
+    blocking = False
+
+    def __init__(self, compact: bool = False) -> None:
         """
         In-memory transaction storage with transfer support.
+        Each account's transactions are indexed in timestamp order as they are saved, so
+        history reads need no sorting and a page costs O(log n + page size).
+
+        Args:
+            compact: When True, transactions are packed into an array-backed `TransactionTable`
+                and per-account indexes hold row numbers instead of object references, which
+                cuts the retained memory per transaction several-fold. Reads then return
+                `TransactionRecord` views, which expose the same read API as `Transaction`.
         """
+        self._compact = compact
+        self._table = TransactionTable() if compact else None
         self._transactions: Dict[str, Transaction] = {}
-        self._account_transactions: Dict[str, List[Transaction]] = {}
+        self._rows: List[Transaction] = []
+        self._account_index: Dict[str, AccountTimeIndex] = {}
+        self._lock = threading.Lock()
 
     def save_transaction(self, transaction: Transaction) -> str:
         """
         Store a new transaction in memory.
         """
-        tid = transaction.transaction_id
-        self._transactions[tid] = transaction
+        with self._lock:
+            return self._save(transaction)
 
-        # Index under primary account
-        primary = getattr(transaction, 'account_id', None)
-        if primary:
-            self._account_transactions.setdefault(primary, []).append(transaction)
+    def save_transactions(self, transactions: List[Transaction]) -> List[str]:
+        """
+        Store many transactions under one lock acquisition.
+        In compact mode every transaction is converted to a record before any is stored, so
+        one that cannot be stored fails the call with nothing written.
+        """
+        if self._compact:
+            transactions = [_as_record(transaction) for transaction in transactions]
+        with self._lock:
+            return [self._save(transaction) for transaction in transactions]
 
-        # If transfer, index under destination account as well
-        dest = getattr(transaction, 'destination_account_id', None)
-        if dest:
-            self._account_transactions.setdefault(dest, []).append(transaction)
+    def _save(self, transaction: Transaction) -> str:
+        if self._compact:
+            row = self._table.append(transaction)
+            timestamp_ns = self._table.timestamp_ns(row)
+        else:
+            timestamp_ns = datetime_to_ns(transaction.timestamp)
+            row = len(self._rows)
+            self._rows.append(transaction)
+            self._transactions[transaction.transaction_id] = transaction
 
-        return tid
+        # Index under the primary account and, for transfers, the destination account as well
+        for account_id in (transaction.account_id, getattr(transaction, 'destination_account_id', None)):
+            if account_id:
+                index = self._account_index.get(account_id)
+                if index is None:
+                    index = self._account_index[account_id] = AccountTimeIndex()
+                index.insert(timestamp_ns, row)
+        return transaction.transaction_id
+
+    def _materialize(self, rows) -> List[Transaction]:
+        if self._compact:
+            return list(self._table.records(rows))
+        return [self._rows[row] for row in rows]
 
     def get_transactions_by_account_id(self, account_id: str) -> List[Transaction]:
         """
         Retrieve all transactions for the specified account.
         Sorted by timestamp.
         """
-        txns = self._account_transactions.get(account_id, [])
-        ordered = list(txns)
-        if ordered and hasattr(ordered[0], "timestamp"):
-            ordered.sort(key=lambda t: t.timestamp)
-        return ordered
+        index = self._account_index.get(account_id)
+        if index is None:
+            return []
+        with self._lock:
+            rows = index.rows[:]
+        return self._materialize(rows)
+
+    def get_transactions_page(self, account_id: str, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                              start: Optional[datetime] = None, end: Optional[datetime] = None) -> TransactionPage:
+        """
+        Retrieve one page of the account's transactions in timestamp order,
+        restricted to `start <= timestamp < end` when given.
+        """
+        validate_page_size(limit)
+        after = decode_cursor(cursor, 2) if cursor else None
+        index = self._account_index.get(account_id)
+        if index is None:
+            return TransactionPage([])
+        with self._lock:
+            rows, next_key = index.page(
+                after,
+                limit,
+                start_ns=datetime_to_ns(start) if start is not None else None,
+                end_ns=datetime_to_ns(end) if end is not None else None,
+            )
+        return TransactionPage(self._materialize(rows), encode_cursor(*next_key) if next_key else None)
 
     def save_transfer_transaction(self, transfer_transaction: Transaction) -> str:
         """
@@ -52,4 +123,10 @@ class DictionaryTransactionStrategy(TransactionRepositoryInterface):
         """
         Retrieve a transaction by its ID.
         """
-        return self._transactions.get(transaction_id)
\ No newline at end of file
+        if self._compact:
+            try:
+                row = self._table.find(uuid.UUID(transaction_id).bytes)
+            except ValueError:
+                return None
+            return self._table.record(row) if row >= 0 else None
+        return self._transactions.get(transaction_id)
@@ -0,0 +1,308 @@
+import math
+import os
+import re
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence
+from banking_system.domain_layer import Account
+from banking_system import AccountRepositoryInterface
+from .account_codec import decode_account, encode_account
+from .dictionary_account_strategy import DictionaryAccountStrategy
+from .write_ahead_log import FSYNC_ALWAYS, WriteAheadLog, frame, fsync_directory, read_frames
+
+# One journal entry: the number of accounts, then per account its id (length-prefixed UTF-8)
+# followed by its version and `encode_account` fields, missing limits stored as NaN
+_COUNT = struct.Struct("<I")
+_ID_LENGTH = struct.Struct("<H")
+_ACCOUNT = struct.Struct("<QdBBqBdBddddqBq")
+_DAILY_LIMIT, _MONTHLY_LIMIT = 7, 8
+_SNAPSHOT_PREFIX = "snapshot-"
+_SNAPSHOT_SUFFIX = ".snap"
+_SNAPSHOT_NAME = re.compile(rf"^{_SNAPSHOT_PREFIX}(\d+){re.escape(_SNAPSHOT_SUFFIX)}$")
+# Accounts per frame in a snapshot file
+_SNAPSHOT_BATCH = 4096
+
+
+def encode_entry(accounts: List[Account], fields: List[tuple] = None) -> bytes:
+    """
+    Packs the post-update state of accounts into one journal entry.
+    `fields` are their `encode_account` values when already computed.
+    """
+    if fields is None:
+        fields = [encode_account(account) for account in accounts]
+    return encode_states([(account.account_id, account.version, values) for account, values in zip(accounts, fields)])
+
+
+def encode_states(states: List[tuple]) -> bytes:
+    """Packs (account_id, version, `encode_account` fields) triples into one journal entry."""
+    parts = [_COUNT.pack(len(states))]
+    for account_id, version, values in states:
+        account_id = account_id.encode("utf-8")
+        values = list(values)
+        for position in (_DAILY_LIMIT, _MONTHLY_LIMIT):
+            if values[position] is None:
+                values[position] = math.nan
+        parts.append(_ID_LENGTH.pack(len(account_id)))
+        parts.append(account_id)
+        parts.append(_ACCOUNT.pack(version, *values))
+    return b"".join(parts)
+
+
+def snapshot_file_name(number: int) -> str:
+    """Name of snapshot `number` in a journal directory; recovery loads the highest-numbered one."""
+    return f"{_SNAPSHOT_PREFIX}{number:06d}{_SNAPSHOT_SUFFIX}"
+
+
+def decode_entry(payload: bytes):
+    """Yields (account_id, version, fields) for every account in a journal entry."""
+    (count,), offset = _COUNT.unpack_from(payload), _COUNT.size
+    for _ in range(count):
+        (length,) = _ID_LENGTH.unpack_from(payload, offset)
+        offset += _ID_LENGTH.size
+        account_id = payload[offset:offset + length].decode("utf-8")
+        offset += length
+        version, *fields = _ACCOUNT.unpack_from(payload, offset)
+        offset += _ACCOUNT.size
+        for position in (_DAILY_LIMIT, _MONTHLY_LIMIT):
+            if math.isnan(fields[position]):
+                fields[position] = None
+        yield account_id, version, fields
+
+
+class JournaledAccountStrategy(AccountRepositoryInterface):
+    def __init__(self, directory: str, store: AccountRepositoryInterface = None, fsync: str = FSYNC_ALWAYS,
+                 fsync_interval_ms: float = 10.0, snapshot_interval_s: Optional[float] = 60.0,
+                 snapshot_min_entries: int = 10_000) -> None:
+        """
+        Makes an in-memory account store durable with a write-ahead log and snapshots.
+
+        Reads are served by the wrapped store at its usual speed. Every successful
+        `create_account` / `update_account(s)` / `update_accounts_atomically` is journaled
+        as the post-update state of the accounts it touched, in the same order the store
+        applied them; the call returns once the entry is as durable as `fsync` promises
+        (concurrent writers share fsyncs, see WriteAheadLog). Another thread may read the
+        new state before it is durable.
+
+        A change is applied to the store before it is journaled, so a log that cannot be
+        written (a full disk, an I/O error) is fatal: the call that hits it raises that
+        error, and every later call, reads included, raises RuntimeError instead of
+        serving a state that was never journaled. Reopening the directory recovers the
+        journaled state.
+
+        A background thread takes a snapshot every `snapshot_interval_s` seconds once at
+        least `snapshot_min_entries` entries were journaled since the last one: the log is
+        rotated under the write lock together with a point-in-time copy of the store, the
+        copy is written out to a new snapshot file, and the rotated log segments are removed.
+        On start-up the newest snapshot is loaded and the log written after it replayed.
+
+        Args:
+            directory: Folder holding the log segments and snapshots (created if missing).
+            store: An empty in-memory strategy with a `snapshot()` method;
+                DictionaryAccountStrategy by default.
+            fsync: "always" (every write, grouped), "interval" (every `fsync_interval_ms`)
+                or "os" (left to the operating system).
+            fsync_interval_ms: fsync period of the "interval" policy.
+            snapshot_interval_s: Seconds between snapshot checks; None disables background
+                snapshots (`snapshot()` can still be called).
+            snapshot_min_entries: Journal entries needed before a periodic snapshot is taken.
+        """
+        self._directory = directory
+        self._store = store if store is not None else DictionaryAccountStrategy()
+        self._wal = WriteAheadLog(directory, fsync=fsync, interval_ms=fsync_interval_ms)
+        # Writers wait for fsync under "always"; other policies only write to the page cache
+        self.blocking = fsync == FSYNC_ALWAYS
+        self._snapshot_min_entries = snapshot_min_entries
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._snapshotter = None
+        self._failure: Optional[BaseException] = None
+
+        self._recover()
+        if snapshot_interval_s is not None:
+            self._snapshotter = threading.Thread(
+                target=self._snapshot_periodically, args=(snapshot_interval_s,), name="banking-snapshot", daemon=True
+            )
+            self._snapshotter.start()
+
+    # Snapshots and recovery
+
+    def _snapshot_path(self, number: int) -> str:
+        return os.path.join(self._directory, snapshot_file_name(number))
+
+    def _snapshot_numbers(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self._directory):
+            match = _SNAPSHOT_NAME.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _recover(self) -> None:
+        state: Dict[str, tuple] = {}
+        snapshots = self._snapshot_numbers()
+        latest = snapshots[-1] if snapshots else -1
+        if snapshots:
+            path = self._snapshot_path(latest)
+            payloads, valid_bytes = read_frames(path)
+            if valid_bytes < os.path.getsize(path):
+                raise ValueError(f"Corrupt account snapshot: {path}")
+            for payload in payloads:
+                for account_id, version, fields in decode_entry(payload):
+                    state[account_id] = (version, fields)
+        # Segments up to the snapshot are already in it; only later ones are replayed
+        for payload in self._wal.replay(after=latest):
+            for account_id, version, fields in decode_entry(payload):
+                state[account_id] = (version, fields)
+
+        for account_id, (version, fields) in state.items():
+            self._store.create_account(decode_account(account_id, *fields, version=version))
+        self._wal.open(first_number=latest + 1)
+        self._remove_obsolete(latest)
+
+    def _remove_obsolete(self, snapshot_number: int) -> None:
+        for name in os.listdir(self._directory):
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(self._directory, name))
+        for number in self._snapshot_numbers():
+            if number < snapshot_number:
+                os.remove(self._snapshot_path(number))
+        self._wal.discard_through(snapshot_number)
+
+    def snapshot(self) -> int:
+        """
+        Writes a snapshot of every account and removes the log it supersedes.
+        Writers are paused only while the store is copied and the log rotated.
+        Returns the snapshot's number.
+        """
+        with self._snapshot_lock:
+            with self._lock:
+                self._check_usable()
+                accounts = self._store.snapshot()
+                number = self._wal.rotate()
+                self._pending = 0
+
+            path = self._snapshot_path(number)
+            temporary = path + ".tmp"
+            with open(temporary, "wb") as file:
+                for start in range(0, len(accounts), _SNAPSHOT_BATCH):
+                    # Reading a lazy-interest balance settles interest, so never on a stored instance
+                    batch = [account.clone() if getattr(account, "lazy_interest", False) else account
+                             for account in accounts[start:start + _SNAPSHOT_BATCH]]
+                    file.write(frame(encode_entry(batch)))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temporary, path)
+            fsync_directory(self._directory)
+            self._remove_obsolete(number)
+            return number
+
+    def _snapshot_periodically(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            if self._failure is None and self._pending >= self._snapshot_min_entries:
+                self.snapshot()
+
+    # Journaling
+
+    def _check_usable(self) -> None:
+        if self._failure is not None:
+            raise RuntimeError(
+                "The account journal failed to write, so the store may hold changes it never recorded; "
+                "reopen the strategy to recover the journaled state."
+            ) from self._failure
+
+    def _journal(self, accounts: List[Account], fields: List[tuple]) -> int:
+        """Appends the entry of a change the store already applied; called under the write lock."""
+        try:
+            return self._wal.append(encode_entry(accounts, fields))
+        except BaseException as error:
+            self._failure = error
+            raise
+
+    def _commit(self, sequence: int) -> None:
+        try:
+            self._wal.commit(sequence)
+        except BaseException as error:
+            # After a failed fsync it is unknown what reached the disk
+            self._failure = error
+            raise
+
+    # AccountRepositoryInterface
+
+    def create_account(self, account: Account) -> str:
+        """
+        Persist a new account.
+        Returns the account_id for convenience.
+        """
+        fields = [encode_account(account)]
+        with self._lock:
+            self._check_usable()
+            self._store.create_account(account)
+            sequence = self._journal([account], fields)
+            self._pending += 1
+        self._commit(sequence)
+        return account.account_id
+
+    def get_account_by_id(self, account_id: str) -> Optional[Account]:
+        """
+        Retrieve a detached copy of an account by ID from the in-memory store.
+        """
+        self._check_usable()
+        return self._store.get_account_by_id(account_id)
+
+    def update_account(self, account: Account, expected_version: int = None) -> bool:
+        """
+        Update an existing account; returns True if updated, False if not found
+        or if `expected_version` no longer matches the stored version.
+        """
+        return self.update_accounts([account], [expected_version])
+
+    def update_accounts_atomically(
+        self, source_account: Account, destination_account: Account, expected_versions: Sequence[int] = None
+    ) -> bool:
+        """
+        Atomically update two accounts (e.g. during a transfer) with one journal entry.
+        Returns True if both were updated, False otherwise.
+        """
+        return self.update_accounts([source_account, destination_account], expected_versions)
+
+    def update_accounts(self, accounts: List[Account], expected_versions: Sequence[int] = None) -> bool:
+        """
+        Update many existing accounts with one journal entry.
+        Returns True if all were updated; nothing is written if any is missing
+        or any expected version does not match.
+        """
+        # Encoded before the store clones them, so the journal matches what it keeps
+        fields = [encode_account(account) for account in accounts]
+        with self._lock:
+            self._check_usable()
+            if not self._store.update_accounts(accounts, expected_versions):
+                return False
+            sequence = self._journal(accounts, fields)
+            self._pending += 1
+        self._commit(sequence)
+        return True
+
+    @property
+    def fsyncs(self) -> int:
+        """Number of fsyncs issued on the log so far."""
+        return self._wal.fsyncs
+
+    def flush(self) -> None:
+        """Forces every journaled change to disk, whatever the fsync policy."""
+        self._check_usable()
+        self._wal.sync()
+
+    def close(self) -> None:
+        """Stops the background snapshots and closes the log; the strategy cannot be used afterwards."""
+        self._closed.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        self._wal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,291 @@
+import mmap
+import os
+import struct
+import threading
+import uuid
+import zlib
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from banking_system import Transaction, TransactionRecord, TransactionRepositoryInterface
+from banking_system.application_layer.util.pagination import (
+    DEFAULT_PAGE_SIZE, TransactionPage, decode_cursor, encode_cursor, validate_page_size
+)
+from banking_system.domain_layer.entities.transaction_record import datetime_to_ns
+from .account_time_index import AccountTimeIndex
+
+# id, type code, amount in cents, timestamp in ns, account id, destination account id, CRC-32
+RECORD = struct.Struct("<16sB3xqq36s36sI")
+RECORD_SIZE = RECORD.size
+MAX_ACCOUNT_ID_BYTES = 36
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+_EMPTY = -1
+
+
+def encode_record(record: TransactionRecord) -> bytes:
+    """Packs a TransactionRecord into one fixed-width, checksummed log record."""
+    account_id = record.account_id.encode("utf-8")
+    destination = (record.destination_account_id or "").encode("utf-8")
+    if len(account_id) > MAX_ACCOUNT_ID_BYTES or len(destination) > MAX_ACCOUNT_ID_BYTES:
+        raise ValueError(f"Account IDs longer than {MAX_ACCOUNT_ID_BYTES} bytes cannot be stored in the transaction log")
+    body = RECORD.pack(record.id_bytes, record.type_code, record.amount_cents, record.timestamp_ns, account_id, destination, 0)
+    return body[:-4] + struct.pack("<I", zlib.crc32(memoryview(body)[:-4]))
+
+
+def _is_valid(buffer, offset: int) -> bool:
+    """A record is valid when its checksum matches; preallocated or torn slots never do."""
+    view = memoryview(buffer)[offset:offset + RECORD_SIZE]
+    try:
+        return zlib.crc32(view[:-4]) == struct.unpack_from("<I", view, RECORD_SIZE - 4)[0]
+    finally:
+        view.release()
+
+
+class SegmentedLogTransactionStrategy(TransactionRepositoryInterface):
+    def __init__(self, directory: str, records_per_segment: int = 1 << 18, sync: bool = False) -> None:
+        """
+        Durable transaction storage as an append-only log of fixed-width binary records.
+
+        Records are written sequentially into segment files of `records_per_segment` slots,
+        each preallocated and memory-mapped; a new segment is started when the current one
+        is full. Only compact indexes stay in memory: a per-account (timestamp, row) index
+        and an open-addressing hash of transaction ids to rows. Reads decode records
+        straight out of the mapped segments into `TransactionRecord` views.
+        On start-up, existing segments are scanned and the indexes rebuilt; the scan stops
+        at the first slot whose checksum does not match (unused or torn by a crash).
+
+        Args:
+            directory: Folder holding the segment files (created if missing).
+            records_per_segment: Slots per segment file.
+            sync: When True, every save is flushed to disk before returning.
+        """
+        if records_per_segment < 1:
+            raise ValueError("A segment needs room for at least one record.")
+        self._directory = directory
+        self._records_per_segment = records_per_segment
+        self._segment_bytes = records_per_segment * RECORD_SIZE
+        self._sync = sync
+        self._files = []
+        self._maps: List[mmap.mmap] = []
+        self._count = 0
+        self._account_index: Dict[str, AccountTimeIndex] = {}
+        self._account_ids: Dict[str, str] = {}
+        self._id_index = array("q", [_EMPTY]) * 1024
+        self._id_mask = len(self._id_index) - 1
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # Segment files
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self._directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def _open_segment(self, number: int) -> mmap.mmap:
+        path = self._segment_path(number)
+        file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        if os.fstat(file.fileno()).st_size < self._segment_bytes:
+            file.truncate(self._segment_bytes)
+        segment = mmap.mmap(file.fileno(), self._segment_bytes)
+        self._files.append(file)
+        self._maps.append(segment)
+        return segment
+
+    def _recover(self) -> None:
+        number = 0
+        while os.path.exists(self._segment_path(number)):
+            segment = self._open_segment(number)
+            for slot in range(self._records_per_segment):
+                offset = slot * RECORD_SIZE
+                if not _is_valid(segment, offset):
+                    return
+                self._index(self._count, self._decode(segment, offset))
+                self._count += 1
+            number += 1
+
+    def _locate(self, row: int):
+        segment, slot = divmod(row, self._records_per_segment)
+        return self._maps[segment], slot * RECORD_SIZE
+
+    # Indexes
+
+    def _intern(self, account_id: str) -> str:
+        return self._account_ids.setdefault(account_id, account_id)
+
+    def _probe(self, id_bytes: bytes) -> int:
+        position = int.from_bytes(id_bytes[:8], "little") & self._id_mask
+        while True:
+            row = self._id_index[position]
+            if row == _EMPTY:
+                return position
+            segment, offset = self._locate(row)
+            if segment[offset:offset + 16] == id_bytes:
+                return position
+            position = (position + 1) & self._id_mask
+
+    def _index(self, row: int, record: TransactionRecord) -> None:
+        if (row + 1) * 2 > len(self._id_index):
+            self._id_index = array("q", [_EMPTY]) * (len(self._id_index) * 2)
+            self._id_mask = len(self._id_index) - 1
+            for existing in range(row):
+                segment, offset = self._locate(existing)
+                self._id_index[self._probe(segment[offset:offset + 16])] = existing
+        self._id_index[self._probe(record.id_bytes)] = row
+
+        for account_id in (record.account_id, record.destination_account_id):
+            if account_id:
+                index = self._account_index.get(account_id)
+                if index is None:
+                    index = self._account_index[account_id] = AccountTimeIndex()
+                index.insert(record.timestamp_ns, row)
+
+    # Records
+
+    def _decode(self, segment: mmap.mmap, offset: int) -> TransactionRecord:
+        id_bytes, code, cents, timestamp_ns, account_id, destination, _ = RECORD.unpack_from(segment, offset)
+        destination = destination.rstrip(b"\0")
+        return TransactionRecord(
+            id_bytes,
+            code,
+            cents,
+            timestamp_ns,
+            self._intern(account_id.rstrip(b"\0").decode("utf-8")),
+            self._intern(destination.decode("utf-8")) if destination else None,
+        )
+
+    def _read(self, rows) -> List[TransactionRecord]:
+        records = []
+        for row in rows:
+            segment, offset = self._locate(row)
+            records.append(self._decode(segment, offset))
+        return records
+
+    @staticmethod
+    def _encode(transaction: Transaction) -> Tuple[TransactionRecord, bytes]:
+        record = transaction if isinstance(transaction, TransactionRecord) else TransactionRecord.from_transaction(transaction)
+        return record, encode_record(record)
+
+    def _append(self, record: TransactionRecord, data: bytes) -> None:
+        row = self._count
+        if row // self._records_per_segment == len(self._maps):
+            self._open_segment(len(self._maps))
+        segment, offset = self._locate(row)
+        segment[offset:offset + RECORD_SIZE] = data
+        self._count += 1
+        self._index(row, record)
+
+    def _flush(self, first_row: int) -> None:
+        """Flushes every segment page written since `first_row` to disk."""
+        row = first_row
+        while row < self._count:
+            number, first_slot = divmod(row, self._records_per_segment)
+            end_slot = min(self._count - number * self._records_per_segment, self._records_per_segment)
+            start = first_slot * RECORD_SIZE
+            start -= start % mmap.PAGESIZE
+            self._maps[number].flush(start, end_slot * RECORD_SIZE - start)
+            row = (number + 1) * self._records_per_segment
+
+    # TransactionRepositoryInterface
+
+    def save_transaction(self, transaction: Transaction) -> str:
+        """
+        Append a transaction to the log.
+        """
+        record, data = self._encode(transaction)
+        with self._lock:
+            first_row = self._count
+            self._append(record, data)
+            if self._sync:
+                self._flush(first_row)
+        return transaction.transaction_id
+
+    def save_transactions(self, transactions: List[Transaction]) -> List[str]:
+        """
+        Append many transactions with a single flush.
+        Every transaction is encoded before any is appended, so one that cannot be stored
+        fails the call with nothing written.
+        """
+        encoded = [self._encode(transaction) for transaction in transactions]
+        with self._lock:
+            first_row = self._count
+            for record, data in encoded:
+                self._append(record, data)
+            if self._sync:
+                self._flush(first_row)
+        return [transaction.transaction_id for transaction in transactions]
+
+    def save_transfer_transaction(self, transfer_transaction: Transaction) -> str:
+        """
+        Transfers are appended like any other transaction and indexed under both accounts.
+        """
+        return self.save_transaction(transfer_transaction)
+
+    def get_transactions_by_account_id(self, account_id: str) -> List[TransactionRecord]:
+        """
+        Retrieve all transactions for the specified account, sorted by timestamp.
+        """
+        index = self._account_index.get(account_id)
+        if index is None:
+            return []
+        with self._lock:
+            rows = index.rows[:]
+        return self._read(rows)
+
+    def get_transactions_page(self, account_id: str, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                              start: Optional[datetime] = None, end: Optional[datetime] = None) -> TransactionPage:
+        """
+        Retrieve one page of the account's transactions in timestamp order,
+        restricted to `start <= timestamp < end` when given.
+        """
+        validate_page_size(limit)
+        after = decode_cursor(cursor, 2) if cursor else None
+        index = self._account_index.get(account_id)
+        if index is None:
+            return TransactionPage([])
+        with self._lock:
+            rows, next_key = index.page(
+                after,
+                limit,
+                start_ns=datetime_to_ns(start) if start is not None else None,
+                end_ns=datetime_to_ns(end) if end is not None else None,
+            )
+        return TransactionPage(self._read(rows), encode_cursor(*next_key) if next_key else None)
+
+    def get_transaction_by_id(self, transaction_id: str) -> Optional[TransactionRecord]:
+        """
+        Retrieve a transaction by its ID.
+        """
+        try:
+            id_bytes = uuid.UUID(transaction_id).bytes
+        except ValueError:
+            return None
+        with self._lock:
+            row = self._id_index[self._probe(id_bytes)]
+        if row == _EMPTY:
+            return None
+        return self._read([row])[0]
+
+    def flush(self) -> None:
+        """Forces every written record to disk."""
+        with self._lock:
+            self._flush(0)
+
+    def close(self) -> None:
+        """Flushes and unmaps all segments; the strategy cannot be used afterwards."""
+        with self._lock:
+            self._flush(0)
+            for segment in self._maps:
+                segment.close()
+            for file in self._files:
+                file.close()
+            self._maps, self._files = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,128 @@
+import sqlite3
+from typing import List, Optional, Sequence
+from banking_system.domain_layer import Account
+from banking_system import AccountRepositoryInterface
+from .account_codec import ACCOUNT_FIELDS, decode_account, encode_account
+from .sqlite_connection_pool import SQLiteConnectionPool
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    account_id     TEXT PRIMARY KEY,
+    balance        REAL NOT NULL,
+    account_type   INTEGER NOT NULL,
+    status         INTEGER NOT NULL,
+    creation_date  INTEGER NOT NULL,
+    interest_kind  INTEGER NOT NULL,
+    interest_rate  REAL NOT NULL,
+    has_limits     INTEGER NOT NULL,
+    daily_limit    REAL,
+    monthly_limit  REAL,
+    daily_total    REAL NOT NULL,
+    monthly_total  REAL NOT NULL,
+    last_check     INTEGER NOT NULL,
+    lazy_interest  INTEGER NOT NULL,
+    last_accrual   INTEGER NOT NULL,
+    version        INTEGER NOT NULL DEFAULT 0
+)
+"""
+_INSERT = f"INSERT INTO accounts (account_id, {', '.join(ACCOUNT_FIELDS)}) VALUES ({', '.join('?' * (len(ACCOUNT_FIELDS) + 1))})"
+_SELECT = f"SELECT account_id, {', '.join(ACCOUNT_FIELDS)}, version FROM accounts WHERE account_id = ?"
+# The creation date never changes; everything else is written back with a version compare-and-swap
+_UPDATED_FIELDS = tuple(field for field in ACCOUNT_FIELDS if field != "creation_date")
+_UPDATE = (
+    f"UPDATE accounts SET {', '.join(f'{field} = ?' for field in _UPDATED_FIELDS)}, version = version + 1 "
+    "WHERE account_id = ? AND (? IS NULL OR version = ?) RETURNING version"
+)
+_CREATION_DATE = ACCOUNT_FIELDS.index("creation_date")
+
+
+class _Rejected(Exception):
+    """Aborts (rolls back) a bulk update when one account is missing or has moved on."""
+
+
+class SQLiteAccountStrategy(AccountRepositoryInterface):
+    def __init__(self, path: str, synchronous: str = "NORMAL") -> None:
+        """
+        Durable account storage in a SQLite database file (WAL mode, one connection per thread).
+
+        Accounts are stored as flat rows and materialized as detached views like the columnar
+        strategy. Every multi-account write, including `update_accounts_atomically`, runs in one
+        SQL transaction and applies a version compare-and-swap per row, so it either fully
+        happens or not at all, across threads and processes sharing the file.
+
+        Args:
+            path: Database file; created with its schema if missing.
+            synchronous: SQLite `synchronous` pragma; NORMAL is durable across application
+                crashes in WAL mode, FULL also across power loss.
+        """
+        self._pool = SQLiteConnectionPool(path, synchronous=synchronous)
+        with self._pool.transaction() as connection:
+            connection.execute(_SCHEMA)
+
+    def create_account(self, account: Account) -> str:
+        """
+        Persist a new account.
+        Returns the account_id for convenience.
+        """
+        values = encode_account(account)
+        try:
+            with self._pool.transaction() as connection:
+                connection.execute(_INSERT, (account.account_id, *values))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Account with ID {account.account_id} already exists")
+        return account.account_id
+
+    def get_account_by_id(self, account_id: str) -> Optional[Account]:
+        """
+        Materialize a detached view of the account, or None if it does not exist.
+        """
+        row = self._pool.connection().execute(_SELECT, (account_id,)).fetchone()
+        return decode_account(*row) if row is not None else None
+
+    def update_account(self, account: Account, expected_version: int = None) -> bool:
+        """
+        Write the account back; returns True if updated, False if not found
+        or if `expected_version` no longer matches the stored version.
+        """
+        return self.update_accounts([account], [expected_version])
+
+    def update_accounts_atomically(
+        self, source_account: Account, destination_account: Account, expected_versions: Sequence[int] = None
+    ) -> bool:
+        """
+        Atomically update two accounts (e.g. during a transfer) in one SQL transaction.
+        Returns True if both were updated, False otherwise.
+        """
+        return self.update_accounts([source_account, destination_account], expected_versions)
+
+    def update_accounts(self, accounts: List[Account], expected_versions: Sequence[int] = None) -> bool:
+        """
+        Write many accounts back in one SQL transaction.
+        Returns True if all were updated; nothing is written if any is missing
+        or any expected version does not match.
+        """
+        if expected_versions is None:
+            expected_versions = [None] * len(accounts)
+        parameters = []
+        for account, expected_version in zip(accounts, expected_versions):
+            values = encode_account(account)
+            values = values[:_CREATION_DATE] + values[_CREATION_DATE + 1:]
+            parameters.append((*values, account.account_id, expected_version, expected_version))
+
+        versions = []
+        try:
+            with self._pool.transaction() as connection:
+                for values in parameters:
+                    row = connection.execute(_UPDATE, values).fetchone()
+                    if row is None:
+                        raise _Rejected()
+                    versions.append(row[0])
+        except _Rejected:
+            return False
+        for account, version in zip(accounts, versions):
+            account.version = version
+        return True
+
+    def close(self) -> None:
+        """Closes every pooled connection."""
+        self._pool.close()
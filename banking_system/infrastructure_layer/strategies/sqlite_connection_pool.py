@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class SQLiteConnectionPool:
+    """
+    One SQLite connection per thread for a database file.
+
+    SQLite connections must not be shared between threads mid-transaction, while opening
+    one per call would throw away its prepared-statement cache; a connection per thread
+    keeps both. Connections run in WAL mode, so readers never block the single writer,
+    and in autocommit mode so that `transaction()` controls exactly what is atomic.
+    """
+    def __init__(self, path: str, cached_statements: int = 256, busy_timeout_ms: int = 5000, synchronous: str = "NORMAL"):
+        if synchronous not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Unsupported synchronous mode: {synchronous}")
+        self.path = path
+        self._cached_statements = cached_statements
+        self._busy_timeout_ms = busy_timeout_ms
+        self._synchronous = synchronous
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """Returns the calling thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=self._cached_statements,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={self._synchronous}")
+            connection.execute(f"PRAGMA busy_timeout={int(self._busy_timeout_ms)}")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs the block inside one write transaction on the calling thread's connection.
+        BEGIN IMMEDIATE takes the write lock up front, so a transaction never fails halfway
+        on lock upgrade; it commits on success and rolls back on any exception.
+        """
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Closes every connection opened by the pool."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
@@ -0,0 +1,146 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from banking_system import Transaction, TransactionRecord, TransactionRepositoryInterface
+from banking_system.application_layer.util.pagination import (
+    DEFAULT_PAGE_SIZE, TransactionPage, decode_cursor, encode_cursor, validate_page_size
+)
+from banking_system.domain_layer.entities.transaction_record import datetime_to_ns
+from .sqlite_connection_pool import SQLiteConnectionPool
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS transactions (
+        seq                    INTEGER PRIMARY KEY,
+        transaction_id         BLOB NOT NULL UNIQUE,
+        type_code              INTEGER NOT NULL,
+        amount_cents           INTEGER NOT NULL,
+        timestamp_ns           INTEGER NOT NULL,
+        account_id             TEXT NOT NULL,
+        destination_account_id TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_transactions_account ON transactions (account_id, timestamp_ns, seq)",
+    "CREATE INDEX IF NOT EXISTS ix_transactions_destination ON transactions (destination_account_id, timestamp_ns, seq) "
+    "WHERE destination_account_id IS NOT NULL",
+)
+_COLUMNS = "seq, transaction_id, type_code, amount_cents, timestamp_ns, account_id, destination_account_id"
+_INSERT = (
+    "INSERT INTO transactions (transaction_id, type_code, amount_cents, timestamp_ns, account_id, destination_account_id) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_RANGE = "(timestamp_ns, seq) > (:after_ts, :after_seq) AND timestamp_ns >= :start AND timestamp_ns < :end"
+# Each side of the union walks its own index in order and stops after the page; only the
+# two short runs are merged, so a page costs O(log n + page size)
+_PAGE = (
+    f"SELECT * FROM (SELECT {_COLUMNS} FROM transactions WHERE account_id = :account_id AND {_RANGE} "
+    "ORDER BY timestamp_ns, seq LIMIT :limit) "
+    "UNION ALL "
+    f"SELECT * FROM (SELECT {_COLUMNS} FROM transactions WHERE destination_account_id = :account_id AND {_RANGE} "
+    "ORDER BY timestamp_ns, seq LIMIT :limit) "
+    "ORDER BY timestamp_ns, seq LIMIT :limit"
+)
+_BY_ID = f"SELECT {_COLUMNS} FROM transactions WHERE transaction_id = ?"
+_MIN_KEY, _MAX_KEY = -(1 << 63), (1 << 63) - 1
+
+
+def _row_values(transaction) -> tuple:
+    record = transaction if isinstance(transaction, TransactionRecord) else TransactionRecord.from_transaction(transaction)
+    return (record.id_bytes, record.type_code, record.amount_cents, record.timestamp_ns,
+            record.account_id, record.destination_account_id)
+
+
+def _record(row) -> TransactionRecord:
+    return TransactionRecord(*row[1:])
+
+
+class SQLiteTransactionStrategy(TransactionRepositoryInterface):
+    def __init__(self, path: str, synchronous: str = "NORMAL") -> None:
+        """
+        Durable transaction storage in a SQLite database file (WAL mode, one connection per thread).
+
+        Transactions are stored in their compact form and read back as `TransactionRecord`
+        views. Per-account history is served from indexes on (account_id, timestamp) and
+        (destination_account_id, timestamp); bulk saves use a single `executemany` in one
+        SQL transaction.
+
+        Args:
+            path: Database file; created with its schema if missing. May be shared with
+                SQLiteAccountStrategy.
+            synchronous: SQLite `synchronous` pragma (see SQLiteAccountStrategy).
+        """
+        self._pool = SQLiteConnectionPool(path, synchronous=synchronous)
+        with self._pool.transaction() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    def save_transaction(self, transaction: Transaction) -> str:
+        """
+        Store a new transaction.
+        """
+        with self._pool.transaction() as connection:
+            connection.execute(_INSERT, _row_values(transaction))
+        return transaction.transaction_id
+
+    def save_transactions(self, transactions: List[Transaction]) -> List[str]:
+        """
+        Store many transactions with one executemany in a single SQL transaction.
+        """
+        rows = [_row_values(transaction) for transaction in transactions]
+        with self._pool.transaction() as connection:
+            connection.executemany(_INSERT, rows)
+        return [transaction.transaction_id for transaction in transactions]
+
+    def save_transfer_transaction(self, transfer_transaction: Transaction) -> str:
+        """
+        Transfers are stored like any other transaction and found under both accounts.
+        """
+        return self.save_transaction(transfer_transaction)
+
+    def _query_page(self, account_id: str, after, limit: int, start: Optional[datetime], end: Optional[datetime]):
+        after_ts, after_seq = after if after is not None else (_MIN_KEY, _MIN_KEY)
+        return self._pool.connection().execute(_PAGE, {
+            "account_id": account_id,
+            "after_ts": after_ts,
+            "after_seq": after_seq,
+            "start": datetime_to_ns(start) if start is not None else _MIN_KEY,
+            "end": datetime_to_ns(end) if end is not None else _MAX_KEY,
+            "limit": limit,
+        }).fetchall()
+
+    def get_transactions_by_account_id(self, account_id: str) -> List[TransactionRecord]:
+        """
+        Retrieve all transactions for the specified account, sorted by timestamp.
+        """
+        return [_record(row) for row in self._query_page(account_id, None, -1, None, None)]
+
+    def get_transactions_page(self, account_id: str, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                              start: Optional[datetime] = None, end: Optional[datetime] = None) -> TransactionPage:
+        """
+        Retrieve one page of the account's transactions in timestamp order,
+        restricted to `start <= timestamp < end` when given.
+        """
+        validate_page_size(limit)
+        after = decode_cursor(cursor, 2) if cursor else None
+        # Fetch one extra row to learn whether another page follows
+        rows = self._query_page(account_id, after, limit + 1, start, end)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][4], rows[-1][0])
+        return TransactionPage([_record(row) for row in rows], next_cursor)
+
+    def get_transaction_by_id(self, transaction_id: str) -> Optional[TransactionRecord]:
+        """
+        Retrieve a transaction by its ID.
+        """
+        try:
+            id_bytes = uuid.UUID(transaction_id).bytes
+        except ValueError:
+            return None
+        row = self._pool.connection().execute(_BY_ID, (id_bytes,)).fetchone()
+        return _record(row) if row is not None else None
+
+    def close(self) -> None:
+        """Closes every pooled connection."""
+        self._pool.close()
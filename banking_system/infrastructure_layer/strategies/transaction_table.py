@@ -0,0 +1,103 @@
+from array import array
+from typing import Iterator
+
+from banking_system import TransactionRecord
+
+ID_SIZE = 16
+_EMPTY = -1
+
+
+class TransactionTable:
+    """
+    Array-backed, append-only table of transactions.
+
+    Every column lives in a contiguous typed array, so a stored transaction costs roughly
+    16 (id) + 1 (type) + 8 (cents) + 8 (timestamp) + 4 + 4 (account refs) bytes plus its
+    slot in the id hash index, instead of a heap object per field. Account id strings are
+    interned once per account. Rows are decoded into `TransactionRecord` views on demand.
+    """
+
+    def __init__(self, initial_index_size: int = 1024) -> None:
+        if initial_index_size < 1 or initial_index_size & (initial_index_size - 1):
+            raise ValueError("The initial index size must be a power of two.")
+        self._ids = bytearray()
+        self._types = array("B")
+        self._cents = array("q")
+        self._timestamps = array("q")
+        self._accounts = array("I")
+        self._destinations = array("i")
+        self._account_ids: list[str] = []
+        self._account_slots: dict[str, int] = {}
+        # Open-addressing hash index: transaction id -> row, linear probing, kept at most half full.
+        self._index = array("q", [_EMPTY]) * initial_index_size
+        self._mask = initial_index_size - 1
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def _intern_account(self, account_id: str) -> int:
+        slot = self._account_slots.get(account_id)
+        if slot is None:
+            slot = len(self._account_ids)
+            self._account_ids.append(account_id)
+            self._account_slots[account_id] = slot
+        return slot
+
+    def _probe(self, id_bytes: bytes) -> int:
+        """Returns the index position holding `id_bytes`, or the empty position where it would go."""
+        position = int.from_bytes(id_bytes[:8], "little") & self._mask
+        ids = self._ids
+        while True:
+            row = self._index[position]
+            if row == _EMPTY or ids[row * ID_SIZE:(row + 1) * ID_SIZE] == id_bytes:
+                return position
+            position = (position + 1) & self._mask
+
+    def _grow_index(self) -> None:
+        size = len(self._index) * 2
+        self._index = array("q", [_EMPTY]) * size
+        self._mask = size - 1
+        for row in range(len(self)):
+            self._index[self._probe(bytes(self._ids[row * ID_SIZE:(row + 1) * ID_SIZE]))] = row
+
+    def append(self, transaction) -> int:
+        """Appends a Transaction (or TransactionRecord) and returns its row number."""
+        if not hasattr(transaction, "id_bytes"):
+            transaction = TransactionRecord.from_transaction(transaction)
+        id_bytes = transaction.id_bytes
+
+        row = len(self)
+        if (row + 1) * 2 > len(self._index):
+            self._grow_index()
+        self._ids += id_bytes
+        self._types.append(transaction.type_code)
+        self._cents.append(transaction.amount_cents)
+        self._timestamps.append(transaction.timestamp_ns)
+        self._accounts.append(self._intern_account(transaction.account_id))
+        destination = transaction.destination_account_id
+        self._destinations.append(self._intern_account(destination) if destination else _EMPTY)
+        self._index[self._probe(id_bytes)] = row
+        return row
+
+    def find(self, id_bytes: bytes) -> int:
+        """Returns the row holding the transaction id, or -1."""
+        return self._index[self._probe(id_bytes)]
+
+    def timestamp_ns(self, row: int) -> int:
+        return self._timestamps[row]
+
+    def record(self, row: int) -> TransactionRecord:
+        """Decodes a row into a TransactionRecord view."""
+        destination = self._destinations[row]
+        return TransactionRecord(
+            bytes(self._ids[row * ID_SIZE:(row + 1) * ID_SIZE]),
+            self._types[row],
+            self._cents[row],
+            self._timestamps[row],
+            self._account_ids[self._accounts[row]],
+            self._account_ids[destination] if destination != _EMPTY else None,
+        )
+
+    def records(self, rows) -> Iterator[TransactionRecord]:
+        for row in rows:
+            yield self.record(row)
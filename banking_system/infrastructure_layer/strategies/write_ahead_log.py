@@ -0,0 +1,227 @@
+import os
+import re
+import struct
+import threading
+import zlib
+from typing import Iterator, List, Tuple
+
+# Durability policies: fsync before every write returns, fsync from a background thread
+# every N milliseconds, or hand writes to the OS page cache and let it decide
+FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_OS = "always", "interval", "os"
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_OS)
+
+# Payload length, CRC-32 of the payload
+FRAME_HEADER = struct.Struct("<II")
+SEGMENT_PREFIX = "wal-"
+SEGMENT_SUFFIX = ".log"
+_SEGMENT_NAME = re.compile(rf"^{SEGMENT_PREFIX}(\d+){re.escape(SEGMENT_SUFFIX)}$")
+
+
+def frame(payload: bytes) -> bytes:
+    """Prefixes a payload with its length and checksum."""
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_frames(path: str) -> Tuple[List[bytes], int]:
+    """
+    Returns the payloads of the valid frames at the start of a file and the number of
+    bytes they span; reading stops at the first torn or corrupt frame.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    payloads = []
+    offset = 0
+    while offset + FRAME_HEADER.size <= len(data):
+        length, checksum = FRAME_HEADER.unpack_from(data, offset)
+        end = offset + FRAME_HEADER.size + length
+        if end > len(data):
+            break
+        payload = data[offset + FRAME_HEADER.size:end]
+        if zlib.crc32(payload) != checksum:
+            break
+        payloads.append(payload)
+        offset = end
+    return payloads, offset
+
+
+def fsync_directory(directory: str) -> None:
+    """Makes file creations, renames and removals in `directory` durable (a no-op where unsupported)."""
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+class WriteAheadLog:
+    """
+    An append-only journal of checksummed frames split into numbered segment files.
+
+    Writers call `append` (which writes the frame to the OS) and then `commit`, which under
+    the "always" policy waits until the frame is on disk. Commits are grouped: a writer
+    that finds an fsync in progress waits for it and then finds its own frame already
+    covered, so N concurrent writers share roughly one fsync instead of paying for N.
+    Under "interval" a background thread fsyncs every `interval_ms`; under "os" the log
+    never fsyncs on its own and a crash of the machine (not the process) may lose the tail.
+
+    `rotate` closes the current segment so that a snapshot can make it, and every older
+    segment, obsolete; `discard_through` then removes them.
+
+    A failed write or background fsync leaves the log in an unknown state (a torn frame
+    would end recovery before any later frame), so every later `append` and `commit`
+    raises OSError.
+    """
+    def __init__(self, directory: str, fsync: str = FSYNC_ALWAYS, interval_ms: float = 10.0) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unsupported fsync policy: {fsync}")
+        if interval_ms <= 0:
+            raise ValueError("The fsync interval must be positive.")
+        self.policy = fsync
+        self.fsyncs = 0
+        self._directory = directory
+        self._interval = interval_ms / 1000
+        self._file = None
+        self._number = -1
+        self._appended = 0
+        self._synced = 0
+        # Lock order: _sync_lock before _append_lock
+        self._append_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._syncer = None
+        self._failure = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self._directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+
+    def segment_numbers(self) -> List[int]:
+        """Numbers of the segment files on disk, oldest first."""
+        numbers = []
+        for name in os.listdir(self._directory):
+            match = _SEGMENT_NAME.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def replay(self, after: int = -1) -> Iterator[bytes]:
+        """
+        Yields every payload in the segments numbered above `after`, in write order.
+        A torn tail of the newest segment (a crash mid-write) is cut off so that later
+        appends follow the last valid frame; damage anywhere else raises ValueError.
+        """
+        numbers = [number for number in self.segment_numbers() if number > after]
+        for position, number in enumerate(numbers):
+            path = self._segment_path(number)
+            payloads, valid_bytes = read_frames(path)
+            if valid_bytes < os.path.getsize(path):
+                if position != len(numbers) - 1:
+                    raise ValueError(f"Corrupt write-ahead log segment: {path}")
+                with open(path, "r+b") as file:
+                    file.truncate(valid_bytes)
+                    os.fsync(file.fileno())
+            yield from payloads
+
+    def open(self, first_number: int = 0) -> None:
+        """
+        Starts appending to the newest segment, or to a new one numbered `first_number`
+        if that is newer, and starts the background fsync thread under the "interval" policy.
+        """
+        self._number = max(self.segment_numbers() + [first_number])
+        self._file = open(self._segment_path(self._number), "ab", buffering=0)
+        fsync_directory(self._directory)
+        if self.policy == FSYNC_INTERVAL:
+            self._syncer = threading.Thread(target=self._sync_periodically, name="banking-wal-fsync", daemon=True)
+            self._syncer.start()
+
+    def _check_healthy(self) -> None:
+        if self._failure is not None:
+            raise OSError(f"The write-ahead log can no longer be written: {self._failure}") from self._failure
+
+    def append(self, payload: bytes) -> int:
+        """Writes one frame to the OS and returns its sequence number for `commit`."""
+        data = memoryview(frame(payload))
+        with self._append_lock:
+            self._check_healthy()
+            try:
+                # An unbuffered write may take only part of the frame
+                while data:
+                    written = self._file.write(data)
+                    if not written:
+                        raise OSError(f"The write-ahead log accepted no bytes of a {len(data)} byte write")
+                    data = data[written:]
+            except BaseException as error:
+                self._failure = error
+                raise
+            self._appended += 1
+            return self._appended
+
+    def commit(self, sequence: int) -> None:
+        """Returns once frame `sequence` is as durable as the fsync policy promises."""
+        self._check_healthy()
+        if self.policy == FSYNC_ALWAYS:
+            self._sync_through(sequence)
+
+    def sync(self) -> None:
+        """Forces every appended frame to disk, whatever the policy."""
+        self._sync_through(self._appended)
+
+    def _sync_through(self, sequence: int) -> None:
+        with self._sync_lock:
+            if self._synced >= sequence or self._file is None:
+                return
+            # Everything appended so far is covered by this fsync, not just `sequence`
+            target = self._appended
+            try:
+                os.fsync(self._file.fileno())
+            except BaseException as error:
+                self._failure = error
+                raise
+            self.fsyncs += 1
+            self._synced = target
+
+    def _sync_periodically(self) -> None:
+        while not self._closed.wait(self._interval):
+            try:
+                self.sync()
+            except BaseException:
+                # Recorded by _sync_through; writers learn of it from append and commit
+                return
+
+    def rotate(self) -> int:
+        """Closes the current segment (durably) and starts the next; returns the closed segment's number."""
+        with self._sync_lock, self._append_lock:
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+            self._synced = self._appended
+            self._file.close()
+            closed = self._number
+            self._number += 1
+            self._file = open(self._segment_path(self._number), "ab", buffering=0)
+        fsync_directory(self._directory)
+        return closed
+
+    def discard_through(self, number: int) -> None:
+        """Removes every segment numbered `number` or lower."""
+        for segment in self.segment_numbers():
+            if segment <= number and segment != self._number:
+                os.remove(self._segment_path(segment))
+        fsync_directory(self._directory)
+
+    def close(self) -> None:
+        """Stops the fsync thread and closes the log after a final fsync."""
+        self._closed.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        with self._sync_lock, self._append_lock:
+            if self._file is not None:
+                try:
+                    os.fsync(self._file.fileno())
+                finally:
+                    self._file.close()
+                    self._file = None
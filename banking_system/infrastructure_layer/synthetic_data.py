@@ -0,0 +1,534 @@
+"""
+Synthetic bank datasets for benchmarking at scale.
+
+Accounts and transaction histories are generated straight into their storage formats,
+never through AccountService/TransactionService, and drawn with numpy a block of rows at
+a time when it is installed:
+
+- `write_transaction_segments` writes the segment files SegmentedLogTransactionStrategy
+  loads, one worker process per segment; the fastest target, and the only one where
+  generation and writing both scale with the cores: tens of millions of rows in minutes;
+- `write_account_snapshot` writes the snapshot file JournaledAccountStrategy loads,
+  frames encoded by worker processes;
+- `write_sqlite_database` fills the database file SQLiteAccountStrategy and
+  SQLiteTransactionStrategy open, building the secondary indexes once at the end;
+- `load_accounts` / `load_transactions` fill any other account or transaction strategy
+  (in-memory, columnar, ...) through its bulk interface, rows generated by worker processes.
+
+The last two generate rows on worker processes but insert every row serially on the
+calling process, through one SQLite connection or one strategy, so more cores do not
+make them faster: they run at the speed of a single writer into the target store, and
+the minutes-per-tens-of-millions figure above holds for the segment files only.
+
+Every account and transaction is a pure function of the DatasetSpec (its seed, its
+generator, and the row's position), so a dataset can be built in any number of pieces,
+by any number of processes, and comes out the same. The numpy and the pure-Python
+generators draw from different random streams: their datasets have the same shape but
+not the same rows. Transactions are spread over the spec's time span in
+row order, so each account's history is appended in timestamp order. Histories are drawn
+independently of the opening balances: they look realistic to storage and queries but
+are not replayed against the balances.
+"""
+import math
+import multiprocessing
+import os
+import random
+import sqlite3
+import struct
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from banking_system.domain_layer.entities.transaction_record import TransactionRecord, datetime_to_ns
+from .strategies.account_codec import ACCOUNT_FIELDS, CHECKING_INTEREST, SAVINGS_INTEREST, decode_account
+from .strategies.journaled_account_strategy import encode_states, snapshot_file_name
+from .strategies.segmented_log_transaction_strategy import RECORD, RECORD_SIZE, SEGMENT_PREFIX, SEGMENT_SUFFIX
+from .strategies.write_ahead_log import frame
+
+# Transaction type codes, in TransactionRecord order
+DEPOSIT_CODE, WITHDRAW_CODE, TRANSFER_CODE = 0, 1, 2
+DEFAULT_MIX = {"deposit": 0.45, "withdraw": 0.35, "transfer": 0.20}
+# Accounts per snapshot frame and per random stream, transactions per random stream, and
+# transactions generated per task of the loaders (a multiple of the stream size)
+ACCOUNTS_PER_FRAME = 4096
+TRANSACTIONS_PER_BLOCK = 4096
+TRANSACTIONS_PER_CHUNK = 16 * TRANSACTIONS_PER_BLOCK
+
+_MASK_64 = (1 << 64) - 1
+# Imported on first use; False until then, None when numpy is not installed
+_numpy = False
+_CRC = struct.Struct("<I")
+# A segment log record without its trailing checksum
+_RECORD_BODY = struct.Struct(RECORD.format[:-1])
+
+
+def _mix64(value: int) -> int:
+    """SplitMix64 finalizer: scrambles a 64-bit integer into a well-distributed one."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return value ^ (value >> 31)
+
+
+def _load_numpy():
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+def _as_uuid4(value: int) -> int:
+    """Sets the version 4 and RFC 4122 variant bits of a 128-bit integer."""
+    return (value & ~(0xF << 76) & ~(0x3 << 62)) | (0x4 << 76) | (0x2 << 62)
+
+
+class DatasetSpec:
+    """
+    What to generate.
+
+    Args:
+        accounts: Number of accounts.
+        transactions: Number of transactions.
+        savings_fraction: Share of savings accounts; the rest are checking accounts.
+        closed_fraction: Share of closed accounts.
+        balance_median, balance_sigma: Opening balances are log-normal with this median
+            and shape (savings accounts hold at least the $100 opening minimum).
+        amount_median, amount_sigma: Transaction amounts are log-normal likewise.
+        savings_rate: Annual interest rate of the savings accounts.
+        activity_skew: Zipf exponent of how transactions spread over accounts; 0 is
+            uniform, around 1 a small share of accounts carries most of the activity.
+        mix: Weights of "deposit", "withdraw" and "transfer".
+        end: Time of the last transaction (now by default).
+        days: Length of the time span the transactions cover, ending at `end`.
+        seed: Makes the dataset reproducible.
+        vectorized: Draw the rows with numpy, a block at a time, rather than one by one
+            in Python; None uses numpy when it is installed. The two generators draw
+            different datasets from the same seed.
+    """
+    def __init__(self, accounts: int, transactions: int, savings_fraction: float = 0.3, closed_fraction: float = 0.02,
+                 balance_median: float = 2_500.0, balance_sigma: float = 1.2, amount_median: float = 60.0,
+                 amount_sigma: float = 1.0, savings_rate: float = 0.05, activity_skew: float = 1.1,
+                 mix: Optional[Dict[str, float]] = None, end: Optional[datetime] = None, days: float = 365.0,
+                 seed: int = 42, vectorized: Optional[bool] = None) -> None:
+        if accounts < 1 or transactions < 0:
+            raise ValueError("A dataset needs at least one account and a non-negative number of transactions.")
+        if not 0 <= savings_fraction <= 1 or not 0 <= closed_fraction <= 1:
+            raise ValueError("Fractions must be in [0, 1].")
+        if balance_median <= 0 or amount_median <= 0 or balance_sigma < 0 or amount_sigma < 0 or activity_skew < 0 or days <= 0:
+            raise ValueError("Medians and the time span must be positive; spreads and the skew must not be negative.")
+        mix = dict(DEFAULT_MIX if mix is None else mix)
+        if set(mix) - set(DEFAULT_MIX) or any(weight < 0 for weight in mix.values()) or sum(mix.values()) <= 0:
+            raise ValueError(f"The mix takes non-negative weights for {', '.join(DEFAULT_MIX)}.")
+        if vectorized is None:
+            vectorized = _load_numpy() is not None
+        elif vectorized and _load_numpy() is None:
+            raise ValueError("Vectorized generation needs numpy, which is not installed.")
+        self.accounts = accounts
+        self.transactions = transactions
+        self.savings_fraction = savings_fraction
+        self.closed_fraction = closed_fraction
+        self.balance_median = balance_median
+        self.balance_sigma = balance_sigma
+        self.amount_median = amount_median
+        self.amount_sigma = amount_sigma
+        self.savings_rate = savings_rate
+        self.activity_skew = activity_skew
+        self.mix = mix
+        self.seed = seed
+        end = end or datetime.now()
+        self.end_ns = datetime_to_ns(end)
+        self.start_ns = datetime_to_ns(end - timedelta(days=days))
+        self.seed_key = _mix64(seed & _MASK_64)
+        self.vectorized = vectorized
+
+    def rng(self, stream: str, number: int) -> random.Random:
+        """An independent generator for one piece of the dataset."""
+        return random.Random(f"{self.seed}:{stream}:{number}")
+
+    def numpy_rng(self, stream: str, number: int):
+        """An independent numpy generator for one piece of the dataset."""
+        return _load_numpy().random.default_rng([self.seed_key, zlib.crc32(stream.encode("ascii")), number])
+
+
+def account_id(spec: DatasetSpec, index: int) -> str:
+    """The id of account `index`: a UUID-4 shaped string derived from the seed and the index."""
+    high = _mix64(index ^ spec.seed_key)
+    low = _mix64(high ^ index ^ 0x5851F42D4C957F2D)
+    value = _as_uuid4((high << 64) | low)
+    text = f"{value:032x}"
+    return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
+
+
+def account_fields(spec: DatasetSpec, index: int, rng: random.Random) -> tuple:
+    """Account `index`'s state in account_codec ACCOUNT_FIELDS order, as `encode_account` returns it."""
+    savings = rng.random() < spec.savings_fraction
+    balance = round(rng.lognormvariate(math.log(spec.balance_median), spec.balance_sigma), 2)
+    if savings:
+        balance = max(balance, 100.0)
+    closed = rng.random() < spec.closed_fraction
+    # Opened up to three years before the first transaction
+    creation_ns = spec.start_ns - int(rng.random() * 3 * 365 * 86_400 * 10**9)
+    return (
+        balance,
+        1 if savings else 0,
+        1 if closed else 0,
+        creation_ns,
+        SAVINGS_INTEREST if savings else CHECKING_INTEREST,
+        spec.savings_rate if savings else 0.0,
+        # The limits AccountService opens accounts with, totals settled up to the end
+        True, 1_000.0, 5_000.0, 0.0, 0.0, spec.end_ns,
+        False,
+        spec.end_ns,
+    )
+
+
+def _vectorized_account_frame(spec: DatasetSpec, number: int) -> List[tuple]:
+    """The fields of every account of frame `number`, drawn with numpy as `account_fields` draws them one by one."""
+    np = _load_numpy()
+    rng = spec.numpy_rng("accounts", number)
+    count = min(ACCOUNTS_PER_FRAME, spec.accounts - number * ACCOUNTS_PER_FRAME)
+    savings = rng.random(count) < spec.savings_fraction
+    balances = np.round(rng.lognormal(math.log(spec.balance_median), spec.balance_sigma, count), 2)
+    balances = np.where(savings, np.maximum(balances, 100.0), balances)
+    closed = rng.random(count) < spec.closed_fraction
+    creation_ns = spec.start_ns - (rng.random(count) * (3 * 365 * 86_400 * 10**9)).astype(np.int64)
+    return [
+        (balance, 1 if saving else 0, 1 if is_closed else 0, created, SAVINGS_INTEREST if saving else CHECKING_INTEREST,
+         spec.savings_rate if saving else 0.0, True, 1_000.0, 5_000.0, 0.0, 0.0, spec.end_ns, False, spec.end_ns)
+        for balance, saving, is_closed, created in zip(
+            balances.tolist(), savings.tolist(), closed.tolist(), creation_ns.tolist())
+    ]
+
+
+def generate_accounts(spec: DatasetSpec, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[str, tuple]]:
+    """Yields (account_id, fields) for accounts start..stop-1."""
+    stop = spec.accounts if stop is None else min(stop, spec.accounts)
+    for first in range(start - start % ACCOUNTS_PER_FRAME, stop, ACCOUNTS_PER_FRAME):
+        # One generator per frame, so any range reproduces the same accounts
+        number = first // ACCOUNTS_PER_FRAME
+        if spec.vectorized:
+            frame_fields = iter(_vectorized_account_frame(spec, number))
+        else:
+            rng = spec.rng("accounts", number)
+            frame_fields = (account_fields(spec, index, rng) for index in range(first, stop))
+        for index, fields in zip(range(first, min(first + ACCOUNTS_PER_FRAME, stop)), frame_fields):
+            if index >= start:
+                yield account_id(spec, index), fields
+
+
+def _account_permutation(spec: DatasetSpec) -> Tuple[int, int]:
+    """The multiplier and offset of the affine map spreading activity ranks over account indexes."""
+    count = spec.accounts
+    multiplier = (spec.seed_key | 1) % count or 1
+    while math.gcd(multiplier, count) != 1:
+        multiplier += 1
+    return multiplier, _mix64(spec.seed_key) % count
+
+
+def _account_picker(spec: DatasetSpec, rng: random.Random):
+    """
+    Returns a function drawing account indexes with Zipf-skewed popularity, O(1) per draw
+    and without tables: a rank from the continuous power-law approximation of Zipf's law,
+    then a fixed permutation (an affine map modulo n) so the popular accounts are spread out.
+    """
+    count, last = spec.accounts, spec.accounts - 1
+    exponent = 1.0 - spec.activity_skew
+    multiplier, offset = _account_permutation(spec)
+    draw = rng.random
+
+    if exponent == 1.0:
+        def pick() -> int:
+            return (int(draw() * count) * multiplier + offset) % count
+    elif exponent:
+        span, inverse = (count + 1) ** exponent - 1, 1 / exponent
+
+        def pick() -> int:
+            return (min(int((1 + draw() * span) ** inverse) - 1, last) * multiplier + offset) % count
+    else:
+        span, exp = math.log(count + 1), math.exp
+
+        def pick() -> int:
+            return (min(int(exp(draw() * span)) - 1, last) * multiplier + offset) % count
+    return pick
+
+
+def _vectorized_transaction_block(spec: DatasetSpec, number: int, deposit_cut: float, withdraw_cut: float) -> List[tuple]:
+    """Every row of transaction block `number`, drawn with numpy as `generate_transaction_rows` draws them one by one."""
+    np = _load_numpy()
+    rng = spec.numpy_rng("transactions", number)
+    first = number * TRANSACTIONS_PER_BLOCK
+    size = min(TRANSACTIONS_PER_BLOCK, spec.transactions - first)
+    count, last = spec.accounts, spec.accounts - 1
+    exponent = 1.0 - spec.activity_skew
+    multiplier, offset = _account_permutation(spec)
+
+    def pick(draws: int):
+        # _account_picker's ranks and permutation, over a whole array of draws
+        uniform = rng.random(draws)
+        if exponent == 1.0:
+            ranks = (uniform * count).astype(np.int64)
+        elif exponent:
+            ranks = np.minimum(((1 + uniform * ((count + 1) ** exponent - 1)) ** (1 / exponent)).astype(np.int64) - 1, last)
+        else:
+            ranks = np.minimum(np.exp(uniform * math.log(count + 1)).astype(np.int64) - 1, last)
+        # Unsigned, so rank * multiplier cannot overflow below 2**32 accounts
+        return ((ranks.astype(np.uint64) * multiplier + offset) % count).astype(np.int64)
+
+    kinds = rng.random(size)
+    codes = np.where(kinds < deposit_cut, DEPOSIT_CODE, np.where(kinds < withdraw_cut, WITHDRAW_CODE, TRANSFER_CODE))
+    accounts = pick(size)
+    destinations = np.where(codes == TRANSFER_CODE, pick(size), -1)
+    clashes = destinations == accounts
+    while clashes.any():
+        destinations[clashes] = pick(int(clashes.sum()))
+        clashes = destinations == accounts
+    ids = np.frombuffer(rng.bytes(16 * size), dtype=np.uint8).reshape(size, 16).copy()
+    # The version 4 and RFC 4122 variant bits, as _as_uuid4 sets them
+    ids[:, 6] = ids[:, 6] & 0x0F | 0x40
+    ids[:, 8] = ids[:, 8] & 0x3F | 0x80
+    id_bytes = ids.tobytes()
+    cents = np.maximum(1, np.exp(math.log(spec.amount_median * 100) + spec.amount_sigma * rng.standard_normal(size)).astype(np.int64))
+    slice_ns = (spec.end_ns - spec.start_ns) / max(spec.transactions, 1)
+    timestamps = spec.start_ns + ((np.arange(first, first + size) + rng.random(size)) * slice_ns).astype(np.int64)
+    return list(zip(
+        (id_bytes[position:position + 16] for position in range(0, 16 * size, 16)),
+        codes.tolist(), cents.tolist(), timestamps.tolist(), accounts.tolist(), destinations.tolist(),
+    ))
+
+
+def generate_transaction_rows(spec: DatasetSpec, start: int = 0, stop: Optional[int] = None) -> Iterator[tuple]:
+    """
+    Yields the transactions of rows start..stop-1 as (id_bytes, type_code, amount_cents,
+    timestamp_ns, account_index, destination_index or -1). Row r is timestamped inside the
+    r-th of `transactions` equal slices of the time span, so timestamps never decrease
+    with the row.
+    """
+    stop = spec.transactions if stop is None else min(stop, spec.transactions)
+    weights = [spec.mix.get("deposit", 0), spec.mix.get("withdraw", 0), spec.mix.get("transfer", 0)]
+    total_weight = sum(weights)
+    deposit_cut, withdraw_cut = weights[0] / total_weight, (weights[0] + weights[1]) / total_weight
+    if spec.accounts < 2:
+        withdraw_cut = 1.0
+    log_median, sigma = math.log(spec.amount_median * 100), spec.amount_sigma
+    start_ns, slice_ns = spec.start_ns, (spec.end_ns - spec.start_ns) / max(spec.transactions, 1)
+    clear_bits, set_bits = ~(0xF << 76) & ~(0x3 << 62), (0x4 << 76) | (0x2 << 62)
+    exp = math.exp
+    for first in range(start - start % TRANSACTIONS_PER_BLOCK, stop, TRANSACTIONS_PER_BLOCK):
+        # One generator per block, so any range reproduces the same rows
+        if spec.vectorized:
+            rows = _vectorized_transaction_block(spec, first // TRANSACTIONS_PER_BLOCK, deposit_cut, withdraw_cut)
+            yield from rows[max(start - first, 0):stop - first]
+            continue
+        rng = spec.rng("transactions", first // TRANSACTIONS_PER_BLOCK)
+        pick = _account_picker(spec, rng)
+        # This loop is the generator's hot path, so the draws are bound locally
+        draw, gauss, random_bits = rng.random, rng.gauss, rng.getrandbits
+        for row in range(first, min(first + TRANSACTIONS_PER_BLOCK, stop)):
+            kind = draw()
+            account = pick()
+            if kind < deposit_cut:
+                code, destination = DEPOSIT_CODE, -1
+            elif kind < withdraw_cut:
+                code, destination = WITHDRAW_CODE, -1
+            else:
+                code, destination = TRANSFER_CODE, pick()
+                while destination == account:
+                    destination = pick()
+            transaction = (
+                (random_bits(128) & clear_bits | set_bits).to_bytes(16, "big"),
+                code,
+                max(1, int(exp(log_median + sigma * gauss()))),
+                start_ns + int((row + draw()) * slice_ns),
+                account,
+                destination,
+            )
+            if row >= start:
+                yield transaction
+
+
+def _pool(processes: Optional[int]):
+    return multiprocessing.Pool(processes or os.cpu_count())
+
+
+# Segment files for SegmentedLogTransactionStrategy
+
+def _write_segment(task) -> int:
+    spec, directory, number, records_per_segment = task
+    # Encoded account ids, computed once per segment
+    ids: Dict[int, bytes] = {-1: b""}
+    parts = []
+    pack, pack_crc, crc32, append = _RECORD_BODY.pack, _CRC.pack, zlib.crc32, parts.append
+    for id_bytes, code, cents, timestamp_ns, account, destination in generate_transaction_rows(
+            spec, number * records_per_segment, (number + 1) * records_per_segment):
+        source_id, destination_id = ids.get(account), ids.get(destination)
+        if source_id is None:
+            source_id = ids[account] = account_id(spec, account).encode("ascii")
+        if destination_id is None:
+            destination_id = ids[destination] = account_id(spec, destination).encode("ascii")
+        body = pack(id_bytes, code, cents, timestamp_ns, source_id, destination_id)
+        append(body)
+        append(pack_crc(crc32(body)))
+    path = os.path.join(directory, f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}")
+    with open(path + ".tmp", "wb") as file:
+        file.write(b"".join(parts))
+        # Unused slots are zeros; their checksum never matches, which ends the log
+        file.truncate(records_per_segment * RECORD_SIZE)
+    os.replace(path + ".tmp", path)
+    return len(parts) // 2
+
+
+def write_transaction_segments(spec: DatasetSpec, directory: str, records_per_segment: int = 1 << 18,
+                               processes: Optional[int] = None) -> int:
+    """
+    Writes the spec's transactions as the segment files of a SegmentedLogTransactionStrategy
+    opened on `directory` with the same `records_per_segment`; each segment is generated
+    and written by its own task. Returns the number of transactions written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if any(name.startswith(SEGMENT_PREFIX) for name in os.listdir(directory)):
+        raise ValueError(f"{directory} already holds a transaction log.")
+    segments = -(-spec.transactions // records_per_segment)
+    tasks = [(spec, directory, number, records_per_segment) for number in range(segments)]
+    if segments <= 1:
+        return sum(map(_write_segment, tasks))
+    with _pool(processes) as pool:
+        return sum(pool.imap_unordered(_write_segment, tasks))
+
+
+# Snapshot file for JournaledAccountStrategy
+
+def _encode_account_frame(task) -> bytes:
+    spec, number = task
+    first = number * ACCOUNTS_PER_FRAME
+    states = [(identifier, 0, fields) for identifier, fields in generate_accounts(spec, first, first + ACCOUNTS_PER_FRAME)]
+    return frame(encode_states(states))
+
+
+def write_account_snapshot(spec: DatasetSpec, directory: str, processes: Optional[int] = None) -> int:
+    """
+    Writes the spec's accounts as the snapshot a JournaledAccountStrategy opened on
+    `directory` starts from. Returns the number of accounts written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if os.listdir(directory):
+        raise ValueError(f"{directory} is not empty; an account snapshot needs a fresh journal directory.")
+    path = os.path.join(directory, snapshot_file_name(0))
+    tasks = [(spec, number) for number in range(-(-spec.accounts // ACCOUNTS_PER_FRAME))]
+    with open(path + ".tmp", "wb") as file:
+        if len(tasks) <= 1:
+            file.writelines(map(_encode_account_frame, tasks))
+        else:
+            with _pool(processes) as pool:
+                # imap keeps frame order, so the file is the same however it is built
+                file.writelines(pool.imap(_encode_account_frame, tasks))
+    os.replace(path + ".tmp", path)
+    return spec.accounts
+
+
+# Any strategy, through its repository interface
+
+def load_accounts(spec: DatasetSpec, strategy) -> int:
+    """Creates the spec's accounts in an account strategy. Returns the number created."""
+    for identifier, fields in generate_accounts(spec):
+        strategy.create_account(decode_account(identifier, *fields))
+    return spec.accounts
+
+
+def _transaction_chunk(task) -> List[tuple]:
+    spec, chunk = task
+    return list(generate_transaction_rows(spec, chunk * TRANSACTIONS_PER_CHUNK, (chunk + 1) * TRANSACTIONS_PER_CHUNK))
+
+
+def load_transactions(spec: DatasetSpec, strategy, processes: Optional[int] = None,
+                      account_ids: Optional[Sequence[str]] = None) -> int:
+    """
+    Saves the spec's transactions into a transaction strategy with `save_transactions`,
+    one chunk at a time, as TransactionRecords; the chunks are generated by worker
+    processes while earlier ones are saved. Returns the number saved.
+    """
+    if account_ids is None:
+        account_ids = [account_id(spec, index) for index in range(spec.accounts)]
+    tasks = [(spec, chunk) for chunk in range(-(-spec.transactions // TRANSACTIONS_PER_CHUNK))]
+
+    def save(rows: List[tuple]) -> int:
+        strategy.save_transactions([
+            TransactionRecord(id_bytes, code, cents, timestamp_ns, account_ids[account],
+                              account_ids[destination] if destination >= 0 else None)
+            for id_bytes, code, cents, timestamp_ns, account, destination in rows
+        ])
+        return len(rows)
+
+    if len(tasks) <= 1:
+        return sum(save(_transaction_chunk(task)) for task in tasks)
+    with _pool(processes) as pool:
+        return sum(save(rows) for rows in pool.imap(_transaction_chunk, tasks))
+
+
+# Database file for the SQLite strategies
+
+def write_sqlite_database(spec: DatasetSpec, path: str, processes: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Writes the spec's accounts and transactions into the SQLite database at `path`, for
+    SQLiteAccountStrategy and SQLiteTransactionStrategy. The strategies create the schema;
+    the secondary indexes are then dropped, the rows inserted unsynchronized in large
+    transactions, and the indexes rebuilt in one sorted pass by reopening the strategies,
+    which is several times faster than maintaining them row by row.
+    Returns the numbers of accounts and transactions written.
+    """
+    # Imported here: only this target needs the SQLite strategies
+    from .strategies.sqlite_account_strategy import SQLiteAccountStrategy
+    from .strategies.sqlite_transaction_strategy import SQLiteTransactionStrategy
+
+    if os.path.exists(path):
+        raise ValueError(f"{path} already exists; the dataset needs a new database file.")
+    for strategy in (SQLiteAccountStrategy(path), SQLiteTransactionStrategy(path)):
+        strategy.close()
+
+    connection = sqlite3.connect(path, isolation_level=None)
+    try:
+        connection.execute("PRAGMA synchronous = OFF")
+        indexes = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL"
+        ).fetchall()
+        for (name,) in indexes:
+            connection.execute(f'DROP INDEX "{name}"')
+
+        insert_account = (f"INSERT INTO accounts (account_id, {', '.join(ACCOUNT_FIELDS)}) "
+                          f"VALUES ({', '.join('?' * (len(ACCOUNT_FIELDS) + 1))})")
+        connection.execute("BEGIN")
+        connection.executemany(insert_account, ((identifier, *fields) for identifier, fields in generate_accounts(spec)))
+        connection.execute("COMMIT")
+
+        account_ids = [account_id(spec, index) for index in range(spec.accounts)]
+        insert_transaction = (
+            "INSERT INTO transactions (transaction_id, type_code, amount_cents, timestamp_ns, account_id, "
+            "destination_account_id) VALUES (?, ?, ?, ?, ?, ?)"
+        )
+
+        def save(rows: List[tuple]) -> int:
+            connection.execute("BEGIN")
+            connection.executemany(insert_transaction, (
+                (id_bytes, code, cents, timestamp_ns, account_ids[account],
+                 account_ids[destination] if destination >= 0 else None)
+                for id_bytes, code, cents, timestamp_ns, account, destination in rows
+            ))
+            connection.execute("COMMIT")
+            return len(rows)
+
+        tasks = [(spec, chunk) for chunk in range(-(-spec.transactions // TRANSACTIONS_PER_CHUNK))]
+        if len(tasks) <= 1:
+            saved = sum(save(_transaction_chunk(task)) for task in tasks)
+        else:
+            with _pool(processes) as pool:
+                saved = sum(save(rows) for rows in pool.imap(_transaction_chunk, tasks))
+    finally:
+        connection.close()
+
+    # Reopening runs the strategies' CREATE INDEX IF NOT EXISTS over the loaded rows
+    for strategy in (SQLiteAccountStrategy(path), SQLiteTransactionStrategy(path)):
+        strategy.close()
+    return spec.accounts, saved
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import queue
+import threading
+from typing import List, Optional
+from banking_system.application_layer.util.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def chrome_trace_event(span, pid: int) -> dict:
+    """A finished span as a Chrome trace "complete" event (timestamps in microseconds)."""
+    args = {"trace_id": span.trace_id, "span_id": span.span_id}
+    if span.parent_id:
+        args["parent_id"] = span.parent_id
+    args.update(span.attributes)
+    return {
+        "name": span.name,
+        "cat": "banking",
+        "ph": "X",
+        "ts": span.start_ns / 1000,
+        "dur": span.duration_ns / 1000,
+        "pid": pid,
+        "tid": span.thread_id,
+        "args": args,
+    }
+
+
+class ChromeTraceExporter:
+    """
+    Writes finished traces to a local file in the Chrome trace event format, which
+    chrome://tracing, Perfetto (ui.perfetto.dev) and speedscope load directly. Each
+    span becomes a complete ("X") event on its thread's row, with the trace and span
+    ids and the span's attributes as args.
+
+    `export` only queues the spans; a background thread writes them. When the file
+    passes `max_bytes` it is closed and rotated to `path.1`, `path.2`, ... keeping
+    `backup_count` old files. When `capacity` traces are waiting, further ones are
+    dropped and counted in `dropped`.
+    """
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, backup_count: int = 5, capacity: int = 10_000) -> None:
+        if max_bytes < 1 or backup_count < 0 or capacity < 1:
+            raise ValueError("A trace file needs a positive size limit and queue capacity.")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.exported = Counter()
+        self.dropped = Counter()
+        self._pid = os.getpid()
+        self._queue = queue.Queue(maxsize=capacity)
+        self._file = None
+        self._events_in_file = 0
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+    def export(self, spans: List) -> None:
+        if self._writer is None:
+            self._start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped.inc()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write, name="banking-trace-export", daemon=True)
+                self._writer.start()
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write("[\n")
+        self._events_in_file = 0
+
+    def _close_file(self) -> None:
+        # The viewers accept an unterminated array, but a closed file is valid JSON too
+        self._file.write("\n]\n")
+        self._file.close()
+        self._file = None
+
+    def _rotate(self) -> None:
+        self._close_file()
+        if self.backup_count == 0:
+            os.remove(self.path)
+            return
+        for number in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{number}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{number + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def _write(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = False
+            try:
+                for spans in batch:
+                    if spans is _STOP:
+                        stopping = True
+                        continue
+                    self._write_trace(spans)
+                if self._file is not None:
+                    self._file.flush()
+            except OSError:
+                logger.exception("Could not write traces to %s", self.path)
+            if stopping:
+                if self._file is not None:
+                    self._close_file()
+                return
+
+    def _write_trace(self, spans: List) -> None:
+        if self._file is None:
+            self._open()
+        for span in spans:
+            separator = ",\n" if self._events_in_file else ""
+            self._file.write(separator + json.dumps(chrome_trace_event(span, self._pid), default=str))
+            self._events_in_file += 1
+        self.exported.inc()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def close(self) -> None:
+        """Writes out the queued traces and closes the file."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
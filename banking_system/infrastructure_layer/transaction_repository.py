@@ -1,33 +1,81 @@
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterator, List, Optional
 from banking_system.application_layer.repository_interfaces import TransactionRepositoryInterface
 from banking_system import Transaction
+from banking_system.application_layer.util.group_commit import GroupCommitter
+from banking_system.application_layer.util.pagination import DEFAULT_PAGE_SIZE, EXPORT_CHUNK_SIZE, TransactionPage
+from banking_system.domain_layer.util.tracing import traced
 
 class TransactionRepository(TransactionRepositoryInterface):
-    def __init__(self, strategy) -> None:
+    def __init__(self, strategy, group_commit: Optional[GroupCommitter] = None) -> None:
         """
         Repository for transaction operations with pluggable storage strategy.
+        With `group_commit`, single saves from concurrent callers are gathered and written
+        with one `save_transactions` call per batch; the committer must flush into this
+        repository's strategy (see `with_group_commit`).
         """
         self._strategy:TransactionRepositoryInterface = strategy
+        self.group_commit = group_commit
 
+    @classmethod
+    def with_group_commit(cls, strategy, max_batch: int = 256, max_wait_ms: float = 1.0) -> "TransactionRepository":
+        """Builds a repository whose single saves are group-committed into `strategy`."""
+        return cls(strategy, GroupCommitter(strategy.save_transactions, max_batch=max_batch, max_wait_ms=max_wait_ms))
+
+    @property
+    def blocking(self) -> bool:
+        """Whether calls may block on I/O; strategies that never do declare `blocking = False`."""
+        # Group-committed saves wait for their batch
+        return self.group_commit is not None or getattr(self._strategy, "blocking", True)
+
+    @traced("TransactionRepository.save_transaction")
     def save_transaction(self, transaction: Transaction) -> str:
         """
         Saves a transaction to the persistence layer.
         """
+        if self.group_commit is not None:
+            self.group_commit.submit(transaction)
+            return transaction.transaction_id
         return self._strategy.save_transaction(transaction)
 
+    @traced("TransactionRepository.save_transactions")
+    def save_transactions(self, transactions: List[Transaction]) -> List[str]:
+        """
+        Saves many transactions with a single bulk call to the storage strategy.
+        """
+        return self._strategy.save_transactions(transactions)
+
+    @traced("TransactionRepository.get_transactions_by_account_id")
     def get_transactions_by_account_id(self, account_id: str) -> List[Transaction]:
         """
         Retrieves all transactions for a specific account.
         """
         return self._strategy.get_transactions_by_account_id(account_id)
 
+    @traced("TransactionRepository.get_transactions_page")
+    def get_transactions_page(self, account_id: str, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                              start: Optional[datetime] = None, end: Optional[datetime] = None) -> TransactionPage:
+        """
+        Retrieves one page of an account's transactions in timestamp order.
+        """
+        return self._strategy.get_transactions_page(account_id, cursor=cursor, limit=limit, start=start, end=end)
+
+    def iter_transactions_by_account_id(self, account_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                                        chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Transaction]:
+        """
+        Iterates over an account's transactions in timestamp order, one page at a time.
+        """
+        return self._strategy.iter_transactions_by_account_id(account_id, start=start, end=end, chunk_size=chunk_size)
+
+    @traced("TransactionRepository.save_transfer_transaction")
     def save_transfer_transaction(self, transfer_transaction: Transaction) -> str:
         """
         Saves a transfer transaction to the persistence layer.
         """
-        return self._strategy.save_transaction(transfer_transaction)
+        return self.save_transaction(transfer_transaction)
 
+    @traced("TransactionRepository.get_transaction_by_id")
     def get_transaction_by_id(self, transaction_id: str) -> Optional[Transaction]:
         """
         Retrieves a transaction by its ID.
@@ -1,11 +1,12 @@
-from fastapi import HTTPException, Depends, status
-from typing import List, Optional
-from pydantic import BaseModel, confloat
+from fastapi import HTTPException, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from datetime import datetime
+from pydantic import BaseModel, confloat, conlist
 from enum import Enum
-import uvicorn
 import logging
 
-from domain_layer.entities.bank_accounts.account import Account, Transaction
+from banking_system.domain_layer.entities.bank_accounts.account import Account, Transaction
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -13,18 +14,29 @@ logger = logging.getLogger(__name__)
 
 # Import application services and repository interfaces
 from banking_system.application_layer.services import AccountService, TransactionService
-from banking_system.application_layer.repository_interfaces import AccountRepositoryInterface, TransactionRepositoryInterface
+from banking_system.application_layer.repository_interfaces import AccountRepositoryInterface, TransactionRepositoryInterface, ConcurrentUpdateError, StaleAccountVersionError
 
 # Import concrete repository implementations
 # Import Week 2 additional services and repositories
 from banking_system.application_layer.services import FundTransferService, NotificationService
+from banking_system.application_layer.async_services import AsyncAccountService, AsyncTransactionService, AsyncFundTransferService
+from banking_system.application_layer.repository_interfaces import AsyncAccountRepositoryInterface, AsyncTransactionRepositoryInterface
+from banking_system.application_layer.util.bounded_executor import default_executor
+from banking_system.application_layer.util.batch_engine import BatchOperation
+from banking_system.application_layer.util.pagination import DEFAULT_PAGE_SIZE, TransactionPage
 from banking_system.application_layer.repository_interfaces import LoggingRepositoryInterface
 from banking_system.infrastructure_layer.logger import Logger 
-from banking_system.infrastructure_layer.notifications.mock_notification_adapter import NotificationAdapter
 from banking_system.presentation_layer.monthly_statements.monthly_statemnts import *  # Register the statement route
 from banking_system.presentation_layer.interest_endpoints.interest_endpoints import *
 from main import app
-from banking_system.presentation_layer.utility.refactoring import get_account_repository,get_transaction_repository,get_logging_service
+from banking_system.presentation_layer.utility.refactoring import get_account_repository,get_transaction_repository,get_logging_service,lazy_interest_enabled
+from banking_system.presentation_layer.utility.refactoring import get_async_account_repository,get_async_transaction_repository
+from banking_system.presentation_layer.utility.refactoring import get_notification_adapter,get_notification_outbox
+from banking_system.presentation_layer.utility.refactoring import get_log_pipeline, get_trace_exporter
+from banking_system.presentation_layer.utility.transaction_export import EXPORT_MEDIA_TYPES, stream_export
+from banking_system.presentation_layer.utility.http_metrics import MetricsMiddleware
+from banking_system.presentation_layer.utility.tracing_middleware import TracingMiddleware
+from banking_system.application_layer.util import instrumentation
 # Data Models for API
 class account_type(str, Enum):
     CHECKING = "CHECKING"
@@ -40,6 +52,7 @@ class AccountResponse(BaseModel):
     balance: float
     status: str
     creation_date: str
+    version: int = 0
 
 class DepositRequest(BaseModel):
     amount: confloat(gt=0.0)
@@ -50,6 +63,7 @@ class WithdrawRequest(BaseModel):
 class BalanceResponse(BaseModel):
     balance: float
     availableBalance: float
+    version: int = 0
 
 class TransactionResponse(BaseModel):
     transactionId: str
@@ -72,6 +86,33 @@ class TransferResponse(BaseModel):
     timestamp: str
     status: str
 
+class BatchOperationType(str, Enum):
+    DEPOSIT = "DEPOSIT"
+    WITHDRAW = "WITHDRAW"
+    TRANSFER = "TRANSFER"
+
+class BatchOperationRequest(BaseModel):
+    type: BatchOperationType
+    accountId: str
+    amount: confloat(gt=0.0)
+    destinationAccountId: Optional[str] = None
+
+MAX_BATCH_SIZE = 10_000
+
+class BatchRequest(BaseModel):
+    operations: conlist(BatchOperationRequest, min_length=1, max_length=MAX_BATCH_SIZE)
+
+class BatchItemResponse(BaseModel):
+    index: int
+    status: str
+    transactionId: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemResponse]
+
 class NotificationType(str, Enum):
     EMAIL = "email"
     SMS = "sms"
@@ -93,6 +134,23 @@ class LogEntry(BaseModel):
     transactionId: Optional[str] = None
     accountId: Optional[str] = None
 
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """Parses an If-Match header carrying an account version ETag (e.g. `"3"` or `W/"3"`)."""
+    if if_match is None:
+        return None
+    try:
+        return int(if_match.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be an account version")
+
+MAX_PAGE_SIZE = 1000
+
+def as_local_time(value: Optional[datetime]) -> Optional[datetime]:
+    """Transactions are stamped in naive local time; convert timezone-aware query bounds to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
 # FastAPI dependency injection system for repositories and services
 
 
@@ -101,15 +159,11 @@ def get_logging_repository() -> LoggingRepositoryInterface:
     return Logger()
 
 
-def get_notification_adapter():
-    """Provides an instance of the notification adapter."""
-    return NotificationAdapter()
-
 def get_account_service(
     account_repo: AccountRepositoryInterface = Depends(get_account_repository)
 ) -> AccountService:
     """Provides an instance of the account service with its dependencies."""
-    return AccountService(account_repo)
+    return AccountService(account_repo, lazy_interest=lazy_interest_enabled())
 
 def get_transaction_service(
     account_repo: AccountRepositoryInterface = Depends(get_account_repository),
@@ -126,11 +180,75 @@ def get_fund_transfer_service(
     """Provides an instance of the fund transfer service with its dependencies."""
     return FundTransferService(account_repo, transaction_repo,notification_service=get_notification_service(),logging_service=get_logging_service())
 
+# Async services used by the endpoints: storage, notification and logging calls that can
+# block are awaited on a bounded executor instead of stalling the event loop
+def get_async_account_service(
+    account_repo: AsyncAccountRepositoryInterface = Depends(get_async_account_repository)
+) -> AsyncAccountService:
+    """Provides an instance of the async account service with its dependencies."""
+    return AsyncAccountService(account_repo, lazy_interest=lazy_interest_enabled())
+
+def get_async_transaction_service(
+    account_repo: AsyncAccountRepositoryInterface = Depends(get_async_account_repository),
+    transaction_repo: AsyncTransactionRepositoryInterface = Depends(get_async_transaction_repository)
+) -> AsyncTransactionService:
+    """Provides an instance of the async transaction service with its dependencies."""
+    return AsyncTransactionService(account_repo, transaction_repo,notification_service=get_notification_service(),logging_service=get_logging_service())
+
+def get_async_fund_transfer_service(
+    account_repo: AsyncAccountRepositoryInterface = Depends(get_async_account_repository),
+    transaction_repo: AsyncTransactionRepositoryInterface = Depends(get_async_transaction_repository)
+) -> AsyncFundTransferService:
+    """Provides an instance of the async fund transfer service with its dependencies."""
+    return AsyncFundTransferService(account_repo, transaction_repo,notification_service=get_notification_service(),logging_service=get_logging_service())
+
 def get_notification_service(
     notification_adapter = get_notification_adapter()
 ) -> NotificationService:
     """Provides an instance of the notification service with its dependencies."""
-    return NotificationService(notification_adapter)
+    return NotificationService(notification_adapter, outbox=get_notification_outbox())
+
+NOTIFICATION_DRAIN_TIMEOUT_S = 10.0
+
+def drain_notification_outbox():
+    """Shutdown hook: delivers queued notifications before the process exits."""
+    if not get_notification_outbox().close(timeout=NOTIFICATION_DRAIN_TIMEOUT_S):
+        logger.warning("Notification outbox did not drain within %.0f s", NOTIFICATION_DRAIN_TIMEOUT_S)
+
+app.add_event_handler("shutdown", drain_notification_outbox)
+
+def start_log_pipeline():
+    """Startup hook: moves banking_system log output onto the background log pipeline."""
+    get_log_pipeline().install("banking_system")
+
+app.add_event_handler("startup", start_log_pipeline)
+# Registered after the outbox hook, so records logged while draining are still written
+app.add_event_handler("shutdown", lambda: get_log_pipeline().stop())
+
+app.add_middleware(MetricsMiddleware, registry=instrumentation.default_registry)
+# Added last, so it runs outermost and the trace covers the metrics middleware too
+app.add_middleware(TracingMiddleware)
+
+def close_trace_exporter():
+    """Shutdown hook: writes out the traces still queued for the trace file."""
+    exporter = get_trace_exporter()
+    if exporter is not None:
+        exporter.close()
+
+app.add_event_handler("shutdown", close_trace_exporter)
+instrumentation.default_registry.gauge(
+    "banking_notification_queue_depth", "Notifications waiting for an outbox worker.", lambda: get_notification_outbox().depth)
+instrumentation.default_registry.counter_callback(
+    "banking_notifications_dropped_total", "Notifications dropped because the outbox was full or closed.",
+    lambda: get_notification_outbox().dropped.value)
+instrumentation.default_registry.counter_callback(
+    "banking_log_records_dropped_total", "Log records dropped because the log queue was full.",
+    lambda: get_log_pipeline().dropped.value)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request, service and queue metrics in the Prometheus text format."""
+    return Response(content=instrumentation.default_registry.render(), media_type=instrumentation.CONTENT_TYPE)
 
 
 
@@ -138,49 +256,52 @@ def get_notification_service(
 @app.post("/accounts", response_model=AccountResponse, status_code=status.HTTP_201_CREATED)
 async def create_account(
     request: CreateAccountRequest, 
-    account_service: AccountService = Depends(get_account_service),
-    account_repo: AccountRepositoryInterface = Depends(get_account_repository)
+    account_service: AsyncAccountService = Depends(get_async_account_service),
+    account_repo: AsyncAccountRepositoryInterface = Depends(get_async_account_repository)
 ):
     """
     Create a new account with the specified type and optional initial deposit.
     """
     try:
         # Log incoming request for debugging
-        logger.info(f"Creating account: {request.dict()}")
+        logger.info("Creating account: %s", request)
         
-        account_id:str = account_service.create_account(request.account_type.value, request.initialDeposit)
-        account:Account = account_repo.get_account_by_id(account_id)
+        account_id:str = await account_service.create_account(request.account_type.value, request.initialDeposit)
+        account:Account = await account_repo.get_account_by_id(account_id)
         
-        logger.info(f"Account created with ID: {account_id}")
+        logger.info("Account created with ID: %s", account_id)
         
         return AccountResponse(
             account_id=account.account_id,
             account_type=account.account_type,
             balance=account.balance,
             status=account.status,
-            creation_date=account.creation_date.isoformat()
+            creation_date=account.creation_date.isoformat(),
+            version=account.version
         )
     except ValueError as e:
         # For validation errors like minimum deposit
-        logger.error(f"Validation error: {str(e)}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Log the actual exception for debugging
-        logger.exception(f"Error creating account: {str(e)}")
+        logger.exception("Error creating account: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/accounts/{account_id}/deposit", response_model=TransactionResponse)
 async def deposit_funds(
     account_id: str,
     request: DepositRequest,
-    transaction_service: TransactionService = Depends(get_transaction_service)
+    transaction_service: AsyncTransactionService = Depends(get_async_transaction_service),
+    if_match: Optional[str] = Header(None)
 ):
     """
     Deposit funds into the specified account.
+    An optional If-Match header makes the deposit conditional on the account version.
     """
     try:
-        logger.info(f"Depositing {request.amount} to account {account_id}")
-        transaction:Transaction = transaction_service.deposit(account_id, request.amount)
+        logger.info("Depositing %s to account %s", request.amount, account_id)
+        transaction:Transaction = await transaction_service.deposit(account_id, request.amount, expected_version=parse_if_match(if_match))
         return TransactionResponse(
             transactionId=transaction.transaction_id,
             transactionType=transaction.transaction_type,
@@ -188,26 +309,34 @@ async def deposit_funds(
             timestamp=transaction.timestamp.isoformat(),
             account_id=transaction.account_id
         )
+    except HTTPException:
+        raise
+    except StaleAccountVersionError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
     except Exception as e:
-        logger.exception(f"Error depositing funds: {str(e)}")
+        logger.exception("Error depositing funds: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/accounts/{account_id}/withdraw", response_model=TransactionResponse)
 async def withdraw_funds(
     account_id: str,
     request: WithdrawRequest,
-    transaction_service: TransactionService = Depends(get_transaction_service)
+    transaction_service: AsyncTransactionService = Depends(get_async_transaction_service),
+    if_match: Optional[str] = Header(None)
 ):
     """
     Withdraw funds from the specified account.
+    An optional If-Match header makes the withdrawal conditional on the account version.
     """
     try:
-        logger.info(f"Withdrawing {request.amount} from account {account_id}")
-        transaction = transaction_service.withdraw(account_id, request.amount)
+        logger.info("Withdrawing %s from account %s", request.amount, account_id)
+        transaction = await transaction_service.withdraw(account_id, request.amount, expected_version=parse_if_match(if_match))
         return TransactionResponse(
             transactionId=transaction.transaction_id,
             transactionType=transaction.transaction_type,
@@ -215,52 +344,73 @@ async def withdraw_funds(
             timestamp=transaction.timestamp.isoformat(),
             account_id=transaction.account_id
         )
+    except HTTPException:
+        raise
+    except StaleAccountVersionError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
     except Exception as e:
-        logger.exception(f"Error withdrawing funds: {str(e)}")
+        logger.exception("Error withdrawing funds: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/accounts/{account_id}/balance", response_model=BalanceResponse)
 async def get_balance(
     account_id: str,
-    account_repo: AccountRepositoryInterface = Depends(get_account_repository)
+    response: Response,
+    account_repo: AsyncAccountRepositoryInterface = Depends(get_async_account_repository)
 ):
     """
     Get the current balance of the specified account.
+    The account version is returned in the body and as an ETag for conditional requests.
     """
     try:
-        logger.info(f"Getting balance for account {account_id}")
-        account:Account = account_repo.get_account_by_id(account_id)
+        logger.info("Getting balance for account %s", account_id)
+        account:Account = await account_repo.get_account_by_id(account_id)
         if not account:
             raise HTTPException(status_code=404, detail="Account not found")
         
         # In this simple implementation, available balance equals current balance
+        response.headers["ETag"] = f'"{account.version}"'
         return BalanceResponse(
             balance=account.balance,
-            availableBalance=account.balance
+            availableBalance=account.balance,
+            version=account.version
         )
     except HTTPException:
         raise
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
     except Exception as e:
-        logger.exception(f"Error getting balance: {str(e)}")
+        logger.exception("Error getting balance: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/accounts/{account_id}/transactions", response_model=List[TransactionResponse])
 async def get_transaction_history(
     account_id: str,
-    transaction_repo: TransactionRepositoryInterface = Depends(get_transaction_repository)
+    response: Response,
+    transaction_repo: AsyncTransactionRepositoryInterface = Depends(get_async_transaction_repository),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to")
 ):
     """
-    Get the transaction history for the specified account.
+    Get one page of the transaction history for the specified account, oldest first.
+    `from` (inclusive) and `to` (exclusive) restrict the time range. When more transactions
+    remain, the X-Next-Cursor header carries the cursor to pass for the next page.
     """
     try:
-        logger.info(f"Getting transactions for account {account_id}")
-        transactions:List[Transaction] = transaction_repo.get_transactions_by_account_id(account_id)
+        logger.info("Getting transactions for account %s", account_id)
+        page: TransactionPage = await transaction_repo.get_transactions_page(
+            account_id, cursor=cursor, limit=limit, start=as_local_time(start), end=as_local_time(end)
+        )
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
         
         return [
             TransactionResponse(
@@ -269,27 +419,47 @@ async def get_transaction_history(
                 amount=tx.amount,
                 timestamp=tx.timestamp.isoformat(),
                 account_id=tx.account_id
-            ) for tx in transactions
+            ) for tx in page.transactions
         ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Account {account_id} not found")
     except Exception as e:
-        logger.exception(f"Error getting transactions: {str(e)}")
+        logger.exception("Error getting transactions: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/accounts/{account_id}/transactions/export")
+async def export_transaction_history(
+    account_id: str,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format of the output"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    transaction_repo: AsyncTransactionRepositoryInterface = Depends(get_async_transaction_repository)
+):
+    """
+    Stream the full transaction history of the specified account as NDJSON or CSV, oldest first.
+    Transactions are read page by page and written out as they are encoded, so memory use
+    does not grow with the size of the history.
+    """
+    logger.info("Exporting transactions for account %s as %s", account_id, format)
+    transactions = transaction_repo.iter_transactions_by_account_id(account_id, start=as_local_time(start), end=as_local_time(end))
+    headers = {"Content-Disposition": f'attachment; filename="transactions_{account_id}.{format}"'}
+    return StreamingResponse(stream_export(transactions, format), media_type=EXPORT_MEDIA_TYPES[format], headers=headers)
+
 # Week 2 - New API Endpoints
 
 @app.post("/accounts/transfer", response_model=TransferResponse)
 async def transfer_funds(
     request: TransferRequest,
-    fund_transfer_service: FundTransferService = Depends(get_fund_transfer_service)
+    fund_transfer_service: AsyncFundTransferService = Depends(get_async_fund_transfer_service)
 ):
     """
     Transfer funds from source account to destination account.
     """
     try:
-        logger.info(f"Transferring {request.amount} from account {request.sourceAccountId} to account {request.destinationAccountId}")
-        transfer: Transaction = fund_transfer_service.transfer_funds(
+        logger.info("Transferring %s from account %s to account %s", request.amount, request.sourceAccountId, request.destinationAccountId)
+        transfer: Transaction = await fund_transfer_service.transfer_funds(
             request.sourceAccountId, 
             request.destinationAccountId, 
             request.amount
@@ -303,12 +473,47 @@ async def transfer_funds(
             timestamp=transfer.timestamp.isoformat(),
             status="completed"
         )
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except KeyError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        logger.exception(f"Error transferring funds: {str(e)}")
+        logger.exception("Error transferring funds: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/accounts/batch", response_model=BatchResponse)
+async def apply_batch(
+    request: BatchRequest,
+    transaction_service: TransactionService = Depends(get_transaction_service)
+):
+    """
+    Apply many deposits, withdrawals and transfers in one request.
+    Operations are applied in order and committed together; each one that fails
+    (unknown account, insufficient funds, limits) is reported without affecting the rest.
+    """
+    try:
+        logger.info("Applying batch of %s operations", len(request.operations))
+        operations = [
+            BatchOperation(operation.type.value, operation.accountId, operation.amount, operation.destinationAccountId)
+            for operation in request.operations
+        ]
+        # The batch is CPU-bound and may be large, so keep it off the event loop
+        report = await default_executor.run(transaction_service.apply_batch, operations)
+
+        results = [
+            BatchItemResponse(index=result.index, status="completed", transactionId=result.transaction.transaction_id)
+            if result.succeeded else
+            BatchItemResponse(index=result.index, status="failed", error=result.error)
+            for result in report.results
+        ]
+        failed = len(report.failed)
+        return BatchResponse(succeeded=len(results) - failed, failed=failed, results=results)
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.exception("Error applying batch: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/notifications/subscribe", response_model=NotificationResponse)
@@ -320,8 +525,8 @@ async def subscribe_to_notifications(
     Subscribe to notifications for a specific account.
     """
     try:
-        logger.info(f"Subscribing to {request.notifyType} notifications for account {request.accountId}")
-        notification_service.subscribe(request.accountId, request.notifyType)
+        logger.info("Subscribing to %s notifications for account %s", request.notifyType, request.accountId)
+        await default_executor.run(notification_service.subscribe, request.accountId, request.notifyType)
         
         return NotificationResponse(
             accountId=request.accountId,
@@ -333,7 +538,7 @@ async def subscribe_to_notifications(
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Account {request.accountId} not found")
     except Exception as e:
-        logger.exception(f"Error subscribing to notifications: {str(e)}")
+        logger.exception("Error subscribing to notifications: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/notifications/unsubscribe", response_model=NotificationResponse)
@@ -345,8 +550,8 @@ async def unsubscribe_from_notifications(
     Unsubscribe from notifications for a specific account.
     """
     try:
-        logger.info(f"Unsubscribing from {request.notifyType} notifications for account {request.accountId}")
-        notification_service.unsubscribe(request.accountId, request.notifyType)
+        logger.info("Unsubscribing from %s notifications for account %s", request.notifyType, request.accountId)
+        await default_executor.run(notification_service.unsubscribe, request.accountId, request.notifyType)
         
         return NotificationResponse(
             accountId=request.accountId,
@@ -358,12 +563,13 @@ async def unsubscribe_from_notifications(
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Account {request.accountId} not found")
     except Exception as e:
-        logger.exception(f"Error unsubscribing from notifications: {str(e)}")
+        logger.exception("Error unsubscribing from notifications: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run("api_endpoints:app", host="0.0.0.0", port=8000, reload=True)
     
     
\ No newline at end of file
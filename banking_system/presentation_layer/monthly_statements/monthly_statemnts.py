@@ -1,14 +1,8 @@
 from fastapi import HTTPException, Path, Query
 from fastapi.responses import FileResponse
 from typing import Literal
-from application_layer.repository_interfaces import AccountRepositoryInterface, TransactionRepositoryInterface
-from banking_system.infrastructure_layer.account_repository import AccountRepository
-from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
 from banking_system.application_layer.services import StatementService
-from banking_system.infrastructure_layer.statements.pdf_statement_adapter import PDFStatementAdapter
 from banking_system.infrastructure_layer.statements.csv_statement_adapter import CSVStatementAdapter
-from infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
-from infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
 from main import app # Import your main FastAPI instance
 from banking_system.presentation_layer.utility.refactoring import get_account_repository,get_transaction_repository
 
@@ -29,6 +23,8 @@ def get_monthly_statement(
     try:
         # Choose the adapter based on the format
         if format == "pdf":
+            # reportlab is only loaded once a PDF statement is requested
+            from banking_system.infrastructure_layer.statements.pdf_statement_adapter import PDFStatementAdapter
             adapter = PDFStatementAdapter(folder_name="pdfs")
         elif format == "csv":
             adapter = CSVStatementAdapter(folder_name="csvs")
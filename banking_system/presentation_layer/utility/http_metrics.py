@@ -0,0 +1,73 @@
+import time
+from banking_system.application_layer.util.instrumentation import REQUEST_LATENCY_BUCKETS, MetricsRegistry, default_registry
+
+# Label for requests no route matched, so unknown paths cannot blow up label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope) -> str:
+    """
+    The route a request matched, as its path template ("/accounts/{account_id}/deposit").
+    Read after the app has handled the request, once routing has filled in the scope.
+    """
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    if scope.get("endpoint") is None:
+        return UNMATCHED_ROUTE
+    path = scope.get("path", "")
+    for name, value in (scope.get("path_params") or {}).items():
+        path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+    return path
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording, per method and route template, HTTP request counts by
+    status code, latency histograms and the number of requests in flight, into a
+    MetricsRegistry (`default_registry`, which /metrics serves). Children are cached per
+    (method, route, status), so recording a request is a dict lookup and two lock-free
+    per-thread increments.
+    """
+    def __init__(self, app, registry: MetricsRegistry = default_registry) -> None:
+        self.app = app
+        self._requests = registry.counter(
+            "http_requests_total", "HTTP requests by method, route and status code.", ("method", "route", "status"),
+        )
+        self._latency = registry.histogram(
+            "http_request_duration_seconds", "HTTP request latency, until the response is complete.",
+            ("method", "route"), buckets=REQUEST_LATENCY_BUCKETS,
+        )
+        self._in_flight = 0
+        registry.gauge("http_requests_in_flight", "HTTP requests being handled.", lambda: self._in_flight)
+        self._children = {}
+
+    def _record(self, method: str, route: str, status: int, elapsed: float) -> None:
+        key = (method, route, status)
+        children = self._children.get(key)
+        if children is None:
+            children = self._children[key] = (
+                self._requests.labels(method, route, str(status)), self._latency.labels(method, route),
+            )
+        children[0].inc()
+        children[1].observe(elapsed)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self._in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._in_flight -= 1
+            self._record(scope["method"], route_template(scope), status, time.perf_counter() - started)
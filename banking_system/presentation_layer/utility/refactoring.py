@@ -1,12 +1,80 @@
-from application_layer.repository_interfaces import AccountRepositoryInterface, TransactionRepositoryInterface
-from application_layer.services import LoggingService
-from infrastructure_layer.account_repository import AccountRepository
-from infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
-from infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
-from infrastructure_layer.transaction_repository import TransactionRepository
-
-account_repo: AccountRepository = AccountRepository(strategy= DictionaryAccountStrategy())
-transaction_repo:TransactionRepository = TransactionRepository(strategy=DictionaryTransactionStrategy())
+import os
+from banking_system.application_layer.repository_interfaces import AccountRepositoryInterface, TransactionRepositoryInterface, AsyncAccountRepositoryInterface, AsyncTransactionRepositoryInterface
+from banking_system.application_layer.services import LoggingService
+from banking_system.application_layer.util.log_pipeline import LogPipeline, parse_policies
+from banking_system.application_layer.util.notification_outbox import NotificationOutbox
+from banking_system.infrastructure_layer.notifications.channels import EmailNotificationChannel, SMSNotificationChannel
+from banking_system.infrastructure_layer.notifications.email_client import EmailClient
+from banking_system.infrastructure_layer.notifications.mock_notification_adapter import NotificationAdapter
+from banking_system.infrastructure_layer.notifications.sms_client import SMSClient
+from banking_system.domain_layer.util import tracing
+from banking_system.infrastructure_layer.account_repository import AccountRepository
+from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+from banking_system.infrastructure_layer.async_repositories import AsyncAccountRepository, AsyncTransactionRepository
+
+# Storage strategies, SMTP/HTTP clients and the trace exporter are imported by the
+# builders below, so a process only loads the backends its configuration selects
+
+def storage_backend() -> str:
+    """Storage for accounts and transactions: "memory" (default) or "sqlite" (set BANKING_STORAGE)."""
+    backend = os.environ.get("BANKING_STORAGE", "memory").lower()
+    if backend not in ("memory", "sqlite"):
+        raise ValueError(f"Unsupported BANKING_STORAGE backend: {backend}")
+    return backend
+
+def sqlite_path() -> str:
+    """SQLite database file used by the sqlite backend (set BANKING_SQLITE_PATH)."""
+    return os.environ.get("BANKING_SQLITE_PATH", "banking.db")
+
+def build_account_strategy():
+    """
+    Set BANKING_ACCOUNT_JOURNAL_DIR to make the memory backend durable with a write-ahead log
+    and snapshots; BANKING_JOURNAL_FSYNC picks the fsync policy (always, interval or os) and
+    BANKING_JOURNAL_FSYNC_INTERVAL_MS the period of the interval policy.
+    """
+    if storage_backend() == "sqlite":
+        from banking_system.infrastructure_layer.strategies.sqlite_account_strategy import SQLiteAccountStrategy
+        return SQLiteAccountStrategy(sqlite_path())
+    journal_directory = os.environ.get("BANKING_ACCOUNT_JOURNAL_DIR")
+    if journal_directory:
+        from banking_system.infrastructure_layer.strategies.journaled_account_strategy import JournaledAccountStrategy
+        return JournaledAccountStrategy(
+            journal_directory,
+            fsync=os.environ.get("BANKING_JOURNAL_FSYNC", "always").lower(),
+            fsync_interval_ms=float(os.environ.get("BANKING_JOURNAL_FSYNC_INTERVAL_MS", "10")),
+        )
+    from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+    return DictionaryAccountStrategy()
+
+def build_transaction_strategy():
+    """Set BANKING_TRANSACTION_LOG_DIR to keep transactions in a durable segmented log whatever the backend."""
+    log_directory = os.environ.get("BANKING_TRANSACTION_LOG_DIR")
+    if log_directory:
+        from banking_system.infrastructure_layer.strategies.segmented_log_transaction_strategy import SegmentedLogTransactionStrategy
+        return SegmentedLogTransactionStrategy(log_directory)
+    if storage_backend() == "sqlite":
+        from banking_system.infrastructure_layer.strategies.sqlite_transaction_strategy import SQLiteTransactionStrategy
+        return SQLiteTransactionStrategy(sqlite_path())
+    from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+    return DictionaryTransactionStrategy()
+
+def build_transaction_repository() -> TransactionRepository:
+    """
+    Set BANKING_GROUP_COMMIT_MS to group-commit concurrent transaction saves within that window
+    (worthwhile with a durable transaction store); BANKING_GROUP_COMMIT_MAX caps a batch.
+    """
+    strategy = build_transaction_strategy()
+    window_ms = float(os.environ.get("BANKING_GROUP_COMMIT_MS", "0"))
+    if window_ms > 0:
+        return TransactionRepository.with_group_commit(
+            strategy, max_batch=int(os.environ.get("BANKING_GROUP_COMMIT_MAX", "256")), max_wait_ms=window_ms
+        )
+    return TransactionRepository(strategy=strategy)
+
+account_repo: AccountRepository = AccountRepository(strategy=build_account_strategy())
+transaction_repo:TransactionRepository = build_transaction_repository()
+async_account_repo = AsyncAccountRepository(account_repo)
+async_transaction_repo = AsyncTransactionRepository(transaction_repo)
 def get_account_repository() -> AccountRepositoryInterface:
     """Provides an instance of the account repository."""
     return account_repo
@@ -15,5 +83,97 @@ def get_transaction_repository() -> TransactionRepositoryInterface:
     """Provides an instance of the transaction repository."""
     return transaction_repo
 
+def get_async_account_repository() -> AsyncAccountRepositoryInterface:
+    """Provides the async view of the account repository for async endpoints."""
+    return async_account_repo
+
+def get_async_transaction_repository() -> AsyncTransactionRepositoryInterface:
+    """Provides the async view of the transaction repository for async endpoints."""
+    return async_transaction_repo
+
+def build_notification_channels() -> dict:
+    """
+    Email and SMS delivery. Set BANKING_SMTP_HOST (and BANKING_SMTP_PORT, BANKING_SMTP_POOL) to
+    send email over pooled SMTP connections, and BANKING_SMS_URL (and BANKING_SMS_CONNECTIONS)
+    to post SMS batches to a provider; without them messages are only printed.
+    """
+    smtp_host = os.environ.get("BANKING_SMTP_HOST")
+    if smtp_host:
+        from banking_system.infrastructure_layer.notifications.pooled_email_client import PooledEmailClient
+        email_client = PooledEmailClient(
+            smtp_host, int(os.environ.get("BANKING_SMTP_PORT", "25")), pool_size=int(os.environ.get("BANKING_SMTP_POOL", "4"))
+        )
+    else:
+        email_client = EmailClient("localhost", 25)
+    sms_url = os.environ.get("BANKING_SMS_URL")
+    if sms_url:
+        from banking_system.infrastructure_layer.notifications.batched_sms_client import BatchedSMSClient
+        sms_client = BatchedSMSClient(sms_url, max_connections=int(os.environ.get("BANKING_SMS_CONNECTIONS", "4")))
+    else:
+        sms_client = SMSClient("http://localhost/sms")
+    return {"email": EmailNotificationChannel(email_client), "sms": SMSNotificationChannel(sms_client)}
+
+def build_notification_adapter() -> NotificationAdapter:
+    """Notification preferences are kept in the SQLite database with the sqlite backend, otherwise in memory."""
+    if storage_backend() == "sqlite":
+        from banking_system.infrastructure_layer.sqlite_notification_preferences_repository import SQLiteNotificationPreferencesRepository
+        return NotificationAdapter(SQLiteNotificationPreferencesRepository(sqlite_path()))
+    return NotificationAdapter()
+
+# Subscriptions are saved through the adapter and read back by the outbox workers
+notification_adapter = build_notification_adapter()
+notification_outbox = NotificationOutbox(
+    notification_adapter,
+    build_notification_channels(),
+    workers=int(os.environ.get("BANKING_NOTIFY_WORKERS", "4")),
+    capacity=int(os.environ.get("BANKING_NOTIFY_QUEUE", "10000")),
+    # Set BANKING_NOTIFY_DIGEST_S to fold bursts per account and channel into digests
+    coalesce_window_s=float(os.environ["BANKING_NOTIFY_DIGEST_S"]) if os.environ.get("BANKING_NOTIFY_DIGEST_S") else None,
+)
+
+def get_notification_adapter():
+    """Provides the notification adapter holding subscription preferences."""
+    return notification_adapter
+
+def get_notification_outbox() -> NotificationOutbox:
+    """Provides the outbox through which transaction notifications are delivered."""
+    return notification_outbox
+
+# Set BANKING_LOG_POLICIES to sample or rate-limit loggers, e.g. "banking_system.transactions=0.1:500"
+log_pipeline = LogPipeline(
+    capacity=int(os.environ.get("BANKING_LOG_QUEUE", "10000")),
+    policies=parse_policies(os.environ.get("BANKING_LOG_POLICIES", "")),
+)
+
+def get_log_pipeline() -> LogPipeline:
+    """Provides the background pipeline that writes banking_system logs as JSON lines."""
+    return log_pipeline
+
+def build_trace_exporter():
+    """
+    Request tracing. Set BANKING_TRACE_SAMPLE to the fraction of requests to trace (0, the
+    default, traces none) and BANKING_TRACE_FILE / BANKING_TRACE_MAX_MB for the trace file.
+    """
+    sample_rate = float(os.environ.get("BANKING_TRACE_SAMPLE", "0"))
+    exporter = None
+    if sample_rate > 0:
+        from banking_system.infrastructure_layer.trace_exporter import ChromeTraceExporter
+        exporter = ChromeTraceExporter(
+            os.environ.get("BANKING_TRACE_FILE", "banking-traces.json"),
+            max_bytes=int(float(os.environ.get("BANKING_TRACE_MAX_MB", "64")) * 1024 * 1024),
+        )
+    tracing.configure(sample_rate, exporter)
+    return exporter
+
+trace_exporter = build_trace_exporter()
+
+def get_trace_exporter():
+    """Provides the trace file exporter, or None when tracing is off."""
+    return trace_exporter
+
 def get_logging_service():
-    return LoggingService()
\ No newline at end of file
+    return LoggingService()
+
+def lazy_interest_enabled() -> bool:
+    """Whether new accounts accrue interest lazily on access (set BANKING_LAZY_INTEREST=1)."""
+    return os.environ.get("BANKING_LAZY_INTEREST", "0") == "1"
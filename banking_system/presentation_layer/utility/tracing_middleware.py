@@ -0,0 +1,58 @@
+import re
+from typing import Callable, Optional, Tuple
+from banking_system.domain_layer.util.tracing import Span, Tracer, current_trace_id, get_tracer
+from banking_system.presentation_layer.utility.http_metrics import route_template
+
+TRACE_ID_HEADER = b"x-trace-id"
+# W3C trace context: version-traceid-parentid-flags
+_TRACEPARENT = re.compile(r"^[0-9a-f]{2}-([0-9a-f]{32})-[0-9a-f]{16}-([0-9a-f]{2})$")
+
+
+def incoming_trace(headers) -> Tuple[Optional[str], Optional[bool]]:
+    """
+    The trace id and sampling decision a caller sent, from a W3C `traceparent` header
+    (which carries both) or an `x-trace-id` header (id only); (None, None) without either.
+    """
+    trace_id = None
+    for name, value in headers:
+        if name == b"traceparent":
+            match = _TRACEPARENT.match(value.decode("latin-1").strip().lower())
+            if match:
+                return match.group(1), bool(int(match.group(2), 16) & 1)
+        elif name == TRACE_ID_HEADER:
+            trace_id = value.decode("latin-1").strip()[:64] or None
+    return trace_id, None
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware running each HTTP request as one trace: it continues the caller's
+    trace id when one is sent, names the root span "<METHOD> <route template>", and
+    returns the id in an `x-trace-id` response header so a slow response can be looked
+    up in the trace file. Time in the root span before its first child is routing and
+    request parsing/validation.
+    """
+    def __init__(self, app, tracer: Callable[[], Tracer] = get_tracer) -> None:
+        self.app = app
+        self._tracer = tracer
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace_id, sampled = incoming_trace(scope.get("headers") or ())
+        with self._tracer().start_trace(f"{scope['method']} {scope.get('path', '')}", trace_id, sampled) as root:
+            response_trace_id = current_trace_id().encode("latin-1")
+
+            async def send_with_trace_id(message) -> None:
+                if message["type"] == "http.response.start":
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers") or ()) + [(TRACE_ID_HEADER, response_trace_id)]
+                    root.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                if isinstance(root, Span):
+                    root.name = f"{scope['method']} {route_template(scope)}"
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+
+# Serializers for streaming transaction exports. Rows are encoded one at a time as the
+# repository iterator yields them and flushed in small chunks, so memory stays flat
+# whatever the size of the history.
+
+EXPORT_FIELDS = ("transactionId", "transactionType", "amount", "timestamp", "account_id", "destinationAccountId")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+ROWS_PER_CHUNK = 256
+
+
+def export_row(transaction) -> tuple:
+    """Returns the exported field values of a Transaction or TransactionRecord, in EXPORT_FIELDS order."""
+    transaction_type = transaction.transaction_type
+    return (
+        transaction.transaction_id,
+        getattr(transaction_type, "value", transaction_type),
+        transaction.amount,
+        transaction.timestamp.isoformat(),
+        transaction.account_id,
+        transaction.destination_account_id,
+    )
+
+
+def ndjson_line(transaction) -> str:
+    return json.dumps(dict(zip(EXPORT_FIELDS, export_row(transaction)))) + "\n"
+
+
+class _CsvEncoder:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def encode(self, values) -> str:
+        self._writer.writerow(values)
+        line = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return line
+
+
+async def stream_export(transactions, export_format: str):
+    """
+    Encodes an async iterable of transactions as NDJSON or CSV (with a header row),
+    yielding UTF-8 chunks of up to ROWS_PER_CHUNK rows.
+    """
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    if export_format == "csv":
+        encoder = _CsvEncoder()
+        encode = lambda transaction: encoder.encode(export_row(transaction))
+        yield encoder.encode(EXPORT_FIELDS).encode("utf-8")
+    else:
+        encode = ndjson_line
+
+    chunk = []
+    async for transaction in transactions:
+        chunk.append(encode(transaction))
+        if len(chunk) == ROWS_PER_CHUNK:
+            yield "".join(chunk).encode("utf-8")
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode("utf-8")
@@ -0,0 +1,130 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import AccountType, CheckingAccount
+from banking_system.application_layer.async_services import AsyncAccountService, AsyncTransactionService, AsyncFundTransferService
+from banking_system.application_layer.repository_interfaces import StaleAccountVersionError
+from banking_system.application_layer.util.bounded_executor import BoundedExecutor
+from banking_system.infrastructure_layer.account_repository import AccountRepository
+from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+from banking_system.infrastructure_layer.async_repositories import AsyncAccountRepository, AsyncTransactionRepository
+from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+
+
+class SlowAccountStrategy(DictionaryAccountStrategy):
+    """Simulates storage that blocks on I/O and records which threads served it."""
+    blocking = True
+
+    def __init__(self, delay=0.01):
+        super().__init__()
+        self.delay = delay
+        self.threads = set()
+
+    def get_account_by_id(self, account_id):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return super().get_account_by_id(account_id)
+
+
+class RecordingAccountStrategy(SlowAccountStrategy):
+    blocking = False
+
+
+class Silent:
+    def notify(self, transaction):
+        pass
+
+    def log_transaction(self, transaction):
+        pass
+
+
+def make_services(account_strategy, executor):
+    account_repo = AsyncAccountRepository(AccountRepository(account_strategy), executor)
+    transaction_repo = AsyncTransactionRepository(TransactionRepository(DictionaryTransactionStrategy()), executor)
+    transaction_service = AsyncTransactionService(account_repo, transaction_repo, Silent(), Silent(), executor)
+    transfer_service = AsyncFundTransferService(account_repo, transaction_repo, Silent(), Silent(), executor)
+    return account_repo, transaction_service, transfer_service
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor(max_workers=4, max_pending=8)
+    yield executor
+    executor.shutdown()
+
+
+def test_in_memory_storage_runs_inline(executor):
+    """Test that in-memory strategies are called on the event loop thread."""
+    strategy = RecordingAccountStrategy(delay=0)
+
+    async def scenario():
+        account_repo, transaction_service, _ = make_services(strategy, executor)
+        account_id = await AsyncAccountService(account_repo).create_account("CHECKING", 50.0)
+        await transaction_service.deposit(account_id, 25.0)
+        account = await account_repo.get_account_by_id(account_id)
+        history = await transaction_service.get_transaction_history(account_id)
+        return account, history
+
+    account, history = asyncio.run(scenario())
+    assert account.balance == 75.0
+    assert account.version == 1
+    assert len(history) == 1
+    assert strategy.threads == {threading.current_thread().name}
+
+
+def test_blocking_storage_is_offloaded_and_concurrent(executor):
+    """Test that blocking storage runs on the executor and does not serialize the event loop."""
+    strategy = SlowAccountStrategy(delay=0.05)
+    accounts = [CheckingAccount(AccountType.CHECKING, 100.0) for _ in range(4)]
+    for account in accounts:
+        strategy.create_account(account)
+
+    async def scenario():
+        _, transaction_service, _ = make_services(strategy, executor)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticking = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        await asyncio.gather(*(transaction_service.deposit(account.account_id, 10.0) for account in accounts))
+        elapsed = time.perf_counter() - start
+        ticking.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(scenario())
+    assert all(name.startswith("banking-io") for name in strategy.threads)
+    assert elapsed < 4 * 0.05  # the four reads overlapped
+    assert ticks > 1  # the loop kept running while reads were blocked
+    assert all(strategy.get_account_by_id(account.account_id).balance == 110.0 for account in accounts)
+
+
+def test_concurrent_deposits_on_one_account_are_not_lost(executor):
+    """Test that coroutines racing on the same account queue instead of losing updates."""
+    strategy = SlowAccountStrategy(delay=0.001)
+    account = CheckingAccount(AccountType.CHECKING, 1.0)
+    strategy.create_account(account)
+
+    async def scenario():
+        _, transaction_service, transfer_service = make_services(strategy, executor)
+        await asyncio.gather(*(transaction_service.deposit(account.account_id, 1.0) for _ in range(20)))
+        with pytest.raises(StaleAccountVersionError):
+            await transaction_service.withdraw(account.account_id, 1.0, expected_version=0)
+        with pytest.raises(ValueError):
+            await transfer_service.transfer_funds(account.account_id, account.account_id, 1.0)
+
+    asyncio.run(scenario())
+    stored = strategy.get_account_by_id(account.account_id)
+    assert stored.balance == 21.0
+    assert stored.version == 20
@@ -0,0 +1,106 @@
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import Transaction, TransactionType
+from banking_system.application_layer.util.group_commit import GroupCommitter
+from banking_system.application_layer.util.metrics import Histogram
+from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+
+
+def _submit_concurrently(committer, items):
+    barrier = threading.Barrier(len(items))
+    errors = []
+
+    def submit(item):
+        barrier.wait()
+        try:
+            committer.submit(item)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=submit, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_concurrent_submits_are_flushed_in_batches():
+    """Test that concurrent callers share flushes and are released only after theirs."""
+    flushed = []
+    committer = GroupCommitter(lambda items: flushed.append(list(items)), max_batch=8, max_wait_ms=50)
+    assert _submit_concurrently(committer, list(range(20))) == []
+    committer.close()
+
+    assert sorted(item for batch in flushed for item in batch) == list(range(20))
+    assert all(len(batch) <= 8 for batch in flushed)
+    assert len(flushed) < 20
+    assert committer.batch_sizes.count == len(flushed)
+    assert committer.commit_latency.count == 20
+
+
+def test_flush_failure_fails_only_the_offending_caller():
+    """Test that a failed batch is retried item by item, so only the bad item's caller raises."""
+    flushed = []
+
+    def flush(items):
+        if "bad" in items:
+            raise ValueError("bad item")
+        flushed.extend(items)
+
+    committer = GroupCommitter(flush, max_batch=4, max_wait_ms=50)
+    errors = _submit_concurrently(committer, ["bad", "a", "b", "c"])
+    assert [str(error) for error in errors] == ["bad item"]
+    assert sorted(flushed) == ["a", "b", "c"]
+    committer.submit("d")
+    committer.close()
+    with pytest.raises(RuntimeError):
+        committer.submit("e")
+
+
+def test_waiters_are_released_when_flush_raises_a_base_exception():
+    """Test that even a BaseException from flush reaches the caller instead of stranding it."""
+    class Abort(BaseException):
+        pass
+
+    def flush(items):
+        raise Abort()
+
+    committer = GroupCommitter(flush, max_batch=1, max_wait_ms=0)
+    with pytest.raises(Abort):
+        committer.submit("a")
+    committer.close()
+
+
+def test_repository_group_commit_saves_through_bulk_call():
+    """Test that group-committed saves are readable once save_transaction returns."""
+    strategy = DictionaryTransactionStrategy()
+    calls = []
+    bulk_save = strategy.save_transactions
+    strategy.save_transactions = lambda transactions: calls.append(len(transactions)) or bulk_save(transactions)
+    repository = TransactionRepository.with_group_commit(strategy, max_wait_ms=1)
+    assert repository.blocking
+
+    transaction = Transaction(TransactionType.DEPOSIT, 10.0, "account-1")
+    assert repository.save_transaction(transaction) == transaction.transaction_id
+    assert repository.get_transaction_by_id(transaction.transaction_id) is not None
+    assert calls == [1]
+    repository.group_commit.close()
+
+
+def test_histogram_quantiles():
+    """Test bucketed counts, sums and quantiles."""
+    histogram = Histogram([1, 2, 4])
+    for value in (0.5, 1, 1.5, 3, 10):
+        histogram.observe(value)
+    assert histogram.count == 5 and histogram.sum == 16.0
+    assert histogram.cumulative_counts() == [(1.0, 2), (2.0, 3), (4.0, 4), (float("inf"), 5)]
+    assert histogram.quantile(0.5) == 2.0
+    assert histogram.quantile(1.0) == float("inf")
+    with pytest.raises(ValueError):
+        Histogram([2, 1])
@@ -0,0 +1,117 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system.application_layer.util.instrumentation import MetricsRegistry, SERVICE_CALLS, instrumented
+from banking_system.presentation_layer.utility.http_metrics import MetricsMiddleware, UNMATCHED_ROUTE
+
+
+def test_sharded_counters_and_histograms_sum_across_threads():
+    """Test that per-thread shards add up, including those of threads that have finished."""
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", ("kind",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    def work():
+        for _ in range(1000):
+            calls.labels("a").inc()
+            latency.labels().observe(0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls.labels("a").value == 8000
+    assert latency.labels().cumulative_counts() == [(0.1, 0), (1.0, 8000), (float("inf"), 8000)]
+    assert latency.labels().sum == pytest.approx(4000)
+    assert registry.counter("calls_total", "Calls.", ("kind",)) is calls
+    with pytest.raises(ValueError):
+        registry.histogram("calls_total", "Calls.")
+
+
+def test_render_prometheus_text_format():
+    """Test the exposition format: HELP/TYPE lines, escaped labels, cumulative buckets, sum and count."""
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests.", ("route",)).labels('/a"b').inc(3)
+    histogram = registry.histogram("duration_seconds", "Duration.", ("route",), buckets=(0.5, 1))
+    histogram.labels("/a").observe(0.25)
+    histogram.labels("/a").observe(2)
+    registry.gauge("depth", "Depth.", lambda: 7)
+
+    lines = registry.render().splitlines()
+    assert lines[:3] == ["# HELP depth Depth.", "# TYPE depth gauge", "depth 7"]
+    assert 'duration_seconds_bucket{route="/a",le="0.5"} 1' in lines
+    assert 'duration_seconds_bucket{route="/a",le="1"} 1' in lines
+    assert 'duration_seconds_bucket{route="/a",le="+Inf"} 2' in lines
+    assert 'duration_seconds_sum{route="/a"} 2.25' in lines
+    assert 'duration_seconds_count{route="/a"} 2' in lines
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a\\"b"} 3' in lines
+
+
+def test_instrumented_counts_outcomes_of_sync_and_async_methods():
+    """Test that decorated service methods count successes and failures by exception type."""
+    @instrumented("TestService", "sync_op")
+    def sync_op(fail):
+        if fail:
+            raise ValueError("nope")
+        return "done"
+
+    @instrumented("TestService", "async_op")
+    async def async_op():
+        return "done"
+
+    assert sync_op(False) == "done"
+    with pytest.raises(ValueError):
+        sync_op(True)
+    assert asyncio.run(async_op()) == "done"
+
+    assert SERVICE_CALLS.labels("TestService", "sync_op", "ok").value == 1
+    assert SERVICE_CALLS.labels("TestService", "sync_op", "ValueError").value == 1
+    assert SERVICE_CALLS.labels("TestService", "async_op", "ok").value == 1
+
+
+class _Route:
+    path = "/accounts/{account_id}/deposit"
+
+
+def test_middleware_records_route_templates_and_status_codes():
+    """Test that requests are labelled by route template, not raw path, and unmatched paths share one label."""
+    async def app(scope, receive, send):
+        if scope["path"].startswith("/accounts/"):
+            scope["route"] = _Route()
+            scope["endpoint"] = object()
+            status = 200
+        else:
+            status = 404
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    registry = MetricsRegistry()
+    middleware = MetricsMiddleware(app, registry=registry)
+
+    async def request(path):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+        await middleware({"type": "http", "method": "POST", "path": path}, None, send)
+        return sent
+
+    async def scenario():
+        for account in ("a1", "a2", "a3"):
+            await request(f"/accounts/{account}/deposit")
+        await request("/nowhere")
+    asyncio.run(scenario())
+
+    requests = registry.get("http_requests_total")
+    assert requests.labels("POST", "/accounts/{account_id}/deposit", "200").value == 3
+    assert requests.labels("POST", UNMATCHED_ROUTE, "404").value == 1
+    assert registry.get("http_request_duration_seconds").labels("POST", "/accounts/{account_id}/deposit").count == 3
+    assert "http_requests_in_flight 0" in registry.render()
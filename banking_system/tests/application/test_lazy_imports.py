@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+REPOSITORY_ROOT = str(Path(__file__).resolve().parents[3])
+
+
+def run_fresh(code: str) -> dict:
+    """Runs `code` in a new interpreter (this one has every module imported already) and returns what it prints as JSON."""
+    env = {name: value for name, value in os.environ.items() if not name.startswith("BANKING_")}
+    env["PYTHONPATH"] = REPOSITORY_ROOT
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=REPOSITORY_ROOT, env=env, timeout=60)
+    assert process.returncode == 0, process.stderr
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def test_importing_the_package_loads_no_layer_and_leaves_logging_alone():
+    """Test that `import banking_system` is cheap and its exports are imported on first access."""
+    result = run_fresh(
+        "import json, logging, sys\n"
+        "import banking_system\n"
+        "loaded = sorted(name for name in sys.modules if name.startswith('banking_system.'))\n"
+        "handlers = len(logging.getLogger().handlers)\n"
+        "from banking_system import Account, AccountService\n"
+        "from banking_system.domain_layer import Account as DomainAccount\n"
+        "try:\n"
+        "    banking_system.NoSuchThing\n"
+        "    missing = False\n"
+        "except AttributeError:\n"
+        "    missing = True\n"
+        "print(json.dumps({'loaded': loaded, 'handlers': handlers, 'same': Account is DomainAccount,\n"
+        "                  'service': AccountService.__module__, 'missing': missing,\n"
+        "                  'listed': 'TransactionService' in dir(banking_system)}))\n"
+    )
+    assert result == {
+        "loaded": [], "handlers": 0, "same": True, "service": "banking_system.application_layer.services",
+        "missing": True, "listed": True,
+    }
+
+
+def test_each_module_loads_once_and_backends_load_on_demand():
+    """Test that no module is imported under a second name and the default API wiring skips unused backends."""
+    result = run_fresh(
+        "import json, os, sys\n"
+        "import banking_system.presentation_layer.utility.refactoring\n"
+        "import banking_system.application_layer.services, banking_system.application_layer.async_services\n"
+        "files = {}\n"
+        "for name, module in list(sys.modules.items()):\n"
+        "    path = getattr(module, '__file__', None)\n"
+        "    if path and 'banking_system' in path:\n"
+        "        files.setdefault(os.path.realpath(path), []).append(name)\n"
+        "print(json.dumps({'twice': [names for names in files.values() if len(names) > 1], 'loaded': sorted(sys.modules)}))\n"
+    )
+    assert result["twice"] == []
+    assert not [name for name in result["loaded"] if name.split(".")[0] in ("domain_layer", "application_layer", "infrastructure_layer")]
+    assert "banking_system.infrastructure_layer.strategies.dictionary_account_strategy" in result["loaded"]
+    for unused in (
+        "banking_system.infrastructure_layer.strategies.sqlite_account_strategy",
+        "banking_system.infrastructure_layer.strategies.journaled_account_strategy",
+        "banking_system.infrastructure_layer.strategies.segmented_log_transaction_strategy",
+        "banking_system.infrastructure_layer.notifications.pooled_email_client",
+        "banking_system.infrastructure_layer.notifications.batched_sms_client",
+        "banking_system.infrastructure_layer.trace_exporter",
+        "banking_system.infrastructure_layer.statements.pdf_statement_adapter",
+        "sqlite3", "smtplib", "numpy", "reportlab",
+    ):
+        assert unused not in result["loaded"]
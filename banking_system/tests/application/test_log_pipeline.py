@@ -0,0 +1,82 @@
+import io
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system.application_layer.util.log_pipeline import LogPipeline, LogPolicy, log_fields, parse_policies
+
+
+class BlockingHandler(logging.Handler):
+    """A handler stuck on slow I/O until released."""
+    def __init__(self):
+        super().__init__()
+        self.unblocked = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.unblocked.wait()
+        self.records.append(record)
+
+
+def test_pipeline_writes_structured_json_lines():
+    """Test that installed loggers emit one JSON object per record, with fields and tracebacks."""
+    stream = io.StringIO()
+    pipeline = LogPipeline(handlers=[logging.StreamHandler(stream)]).install("test_pipeline.json")
+    logger = logging.getLogger("test_pipeline.json.child")
+    logger.info("Deposit of %.2f", 10, extra=log_fields(account_id="acc1", amount=10.0))
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Failed")
+    pipeline.stop()
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["message"] == "Deposit of 10.00" and first["level"] == "INFO"
+    assert first["logger"] == "test_pipeline.json.child"
+    assert first["account_id"] == "acc1" and first["amount"] == 10.0
+    assert second["level"] == "ERROR" and "ValueError: boom" in second["exc_info"]
+    assert logging.getLogger("test_pipeline.json").propagate
+
+
+def test_policies_sample_and_rate_limit_per_logger():
+    """Test that sampling and rate limits apply to the named logger and its children only, sparing warnings."""
+    stream = io.StringIO()
+    policies = {"test_pipeline.policy.sampled": LogPolicy(sample_rate=0.25),
+                "test_pipeline.policy.limited": LogPolicy(max_per_second=5)}
+    pipeline = LogPipeline(handlers=[logging.StreamHandler(stream)], policies=policies).install("test_pipeline.policy")
+    for n in range(100):
+        logging.getLogger("test_pipeline.policy.sampled.child").info("sampled %d", n)
+        logging.getLogger("test_pipeline.policy.limited").info("limited %d", n)
+        logging.getLogger("test_pipeline.policy.other").info("other %d", n)
+    logging.getLogger("test_pipeline.policy.limited").warning("always kept")
+    pipeline.stop()
+
+    loggers = [json.loads(line)["logger"] for line in stream.getvalue().splitlines()]
+    assert loggers.count("test_pipeline.policy.sampled.child") == 25
+    assert loggers.count("test_pipeline.policy.limited") == 6
+    assert loggers.count("test_pipeline.policy.other") == 100
+    assert pipeline.sampled.value == 75 and pipeline.rate_limited.value == 95
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test that a stalled handler never blocks the logging thread; overflow is counted."""
+    handler = BlockingHandler()
+    pipeline = LogPipeline(handlers=[handler], capacity=10).install("test_pipeline.full")
+    logger = logging.getLogger("test_pipeline.full")
+    for n in range(50):
+        logger.info("record %d", n)
+    assert pipeline.dropped.value >= 39
+    handler.unblocked.set()
+    pipeline.stop()
+    assert len(handler.records) + pipeline.dropped.value == 50
+
+
+def test_parse_policies():
+    policies = parse_policies("banking_system.transactions=0.1:500, banking_system.validation=:10")
+    assert policies["banking_system.transactions"].sample_rate == 0.1
+    assert policies["banking_system.transactions"].max_per_second == 500
+    assert policies["banking_system.validation"].sample_rate == 1.0
+    assert policies["banking_system.validation"].max_per_second == 10
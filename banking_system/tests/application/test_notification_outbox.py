@@ -0,0 +1,139 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import Transaction, TransactionType
+from banking_system.application_layer.services import NotificationService
+from banking_system.application_layer.util.notification_digest import NotificationCoalescer
+from banking_system.application_layer.util.notification_outbox import NotificationOutbox
+from banking_system.infrastructure_layer.notifications.mock_notification_adapter import NotificationAdapter
+
+
+class RecordingChannel:
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    def send_batch(self, messages):
+        if self.fail:
+            raise ConnectionError("provider down")
+        self.batches.append(list(messages))
+
+
+class BlockingChannel(RecordingChannel):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def send_batch(self, messages):
+        self.release.wait()
+        super().send_batch(messages)
+
+
+def _transaction(account_id, amount=10.0):
+    return Transaction(TransactionType.DEPOSIT, amount, account_id)
+
+
+def test_outbox_delivers_per_preferences_in_batches():
+    """Test that queued events reach only the channels each account subscribed to, batched per channel."""
+    preferences = NotificationAdapter()
+    preferences.save_notification_preference("acc1", "email")
+    preferences.save_notification_preference("acc1", "SMS")
+    preferences.save_notification_preference("acc2", "email")
+    email, sms = RecordingChannel(), RecordingChannel(fail=True)
+    outbox = NotificationOutbox(preferences, {"email": email, "sms": sms}, workers=1, batch_size=50)
+    service = NotificationService(preferences, outbox=outbox)
+
+    for account_id in ("acc1", "acc2", "acc3", "acc1"):
+        service.notify(_transaction(account_id))
+    assert outbox.close(timeout=5)
+
+    delivered = [message for batch in email.batches for message in batch]
+    assert sorted(message.account_id for message in delivered) == ["acc1", "acc1", "acc2"]
+    assert "Amount: $10.00" in delivered[0].body
+    assert outbox.delivered.value == 3 and outbox.failed.value == 2
+    assert outbox.enqueued.value == 4 and outbox.delivery_lag.count == 4
+    assert not outbox.enqueue(_transaction("acc1"))
+
+
+def test_full_outbox_applies_backpressure_then_drops():
+    """Test that a full queue blocks producers briefly and then drops, and that close drains the rest."""
+    preferences = NotificationAdapter()
+    preferences.save_notification_preference("acc1", "email")
+    channel = BlockingChannel()
+    outbox = NotificationOutbox(preferences, {"email": channel}, workers=1, capacity=2, batch_size=1, enqueue_timeout_s=0.01)
+
+    results = [outbox.enqueue(_transaction("acc1")) for _ in range(6)]
+    # One event is held by the blocked worker, two fill the queue
+    assert results.count(False) == outbox.dropped.value >= 3
+    assert outbox.depth == 2
+
+    channel.release.set()
+    assert outbox.close(timeout=5)
+    assert outbox.depth == 0
+    assert outbox.delivered.value == results.count(True)
+
+
+def test_close_returns_within_its_timeout_when_a_channel_stalls():
+    """Test that close gives up on a stalled channel within one timeout and counts what it leaves undelivered."""
+    preferences = NotificationAdapter()
+    preferences.save_notification_preference("acc1", "email")
+    channel = BlockingChannel()
+    outbox = NotificationOutbox(preferences, {"email": channel}, workers=2, capacity=2, batch_size=1, enqueue_timeout_s=0.01)
+    for _ in range(6):
+        outbox.enqueue(_transaction("acc1"))
+
+    started = time.monotonic()
+    assert not outbox.close(timeout=0.5)
+    assert time.monotonic() - started < 1.5
+    assert outbox.depth == 0 and outbox.dropped.value >= 2
+
+    channel.release.set()
+    for worker in outbox._workers:
+        worker.join(5)
+        assert not worker.is_alive()
+    assert outbox.delivered.value == 2
+
+
+def test_busy_account_gets_leading_notification_then_digest():
+    """Test that a burst is sent as one immediate notification plus one digest, while a quiet account is not delayed."""
+    preferences = NotificationAdapter()
+    preferences.save_notification_preference("busy", "email")
+    preferences.save_notification_preference("quiet", "email")
+    email = RecordingChannel()
+    outbox = NotificationOutbox(preferences, {"email": email}, workers=1, coalesce_window_s=60)
+
+    outbox.enqueue(_transaction("quiet"))
+    for _ in range(50):
+        outbox.enqueue(_transaction("busy", 10.0))
+    outbox.enqueue(Transaction(TransactionType.WITHDRAW, 100.0, "busy"))
+    assert outbox.drain(timeout=5)
+    immediate = [message for batch in email.batches for message in batch]
+    assert sorted(message.account_id for message in immediate) == ["busy", "quiet"]
+
+    assert outbox.close(timeout=5)
+    digests = [message for batch in email.batches for message in batch][2:]
+    assert len(digests) == 1
+    assert digests[0].subject == "50 transactions, net +$390.00"
+    assert "... and 30 more" in digests[0].body
+    assert outbox.coalescer.coalesced.value == 50 and outbox.coalescer.digests.value == 1
+
+
+def test_coalescer_window_closes_into_digest_and_goes_quiet():
+    """Test that an expiring window emits its digest and a window with no traffic makes the key quiet again."""
+    sent = []
+    coalescer = NotificationCoalescer(0.05, sent.extend)
+    assert coalescer.offer("email", "acc1", "first")
+    assert not coalescer.offer("email", "acc1", "second")
+    assert not coalescer.offer("email", "acc1", "third")
+    assert coalescer.offer("sms", "acc1", "other channel")
+
+    deadline = time.monotonic() + 5
+    while not sent and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sent == [("acc1", "email", ["second", "third"])]
+    time.sleep(0.15)
+    assert coalescer.offer("email", "acc1", "after quiet period")
+    coalescer.flush()
@@ -1,5 +1,6 @@
 import sys
 import os
+import threading
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
 import pytest
 from unittest.mock import Mock, patch, call, MagicMock
@@ -19,23 +20,28 @@ from banking_system.application_layer.services import (
 
 # Import necessary domain classes
 from banking_system import Transaction, TransactionType, Account, CheckingAccount, SavingsAccount
-from domain_layer import SavingsInterestStrategy, CheckingInterestStrategy, LimitConstraint
+from banking_system.application_layer.repository_interfaces import ConcurrentUpdateError, StaleAccountVersionError
+from banking_system.application_layer.util.batch_engine import BatchOperation
+from banking_system.infrastructure_layer.account_repository import AccountRepository
+from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+from banking_system.domain_layer import SavingsInterestStrategy, CheckingInterestStrategy, InterestStrategy, LimitConstraint
 
 class TestLoggingService:
     def setup_method(self):
         self.logging_service = LoggingService()
     
-    @patch('builtins.print')
-    def test_log_message(self, mock_print):
+    def test_log_message(self, caplog):
         # Test basic logging functionality
         test_message = "Test log message"
-        self.logging_service.log(test_message)
+        with caplog.at_level("INFO", logger="banking_system.transactions"):
+            self.logging_service.log(test_message)
         
-        # Verify print was called with the correct message
-        mock_print.assert_called_once_with(f"LOG: {test_message}")
+        # Verify one record was logged with the correct message
+        assert [record.getMessage() for record in caplog.records] == [test_message]
     
-    @patch('builtins.print')
-    def test_log_transaction(self, mock_print):
+    def test_log_transaction(self, caplog):
         # Create a mock transaction
         transaction = Mock()
         transaction.transaction_type = TransactionType.DEPOSIT
@@ -44,23 +50,18 @@ class TestLoggingService:
         transaction.account_id = str(uuid4())
         
         # Log the transaction
-        self.logging_service.log_transaction(transaction)
+        with caplog.at_level("INFO", logger="banking_system.transactions"):
+            self.logging_service.log_transaction(transaction)
         
-        # Verify print was called with the transaction details
-        expected_log_message = (
-            f"Transaction Log:\n"
-            f"Type: {transaction.transaction_type}\n"
-            f"Amount: ${transaction.amount:.2f}\n"
-            f"Date: {transaction.timestamp}\n"
-            f"Account ID: {transaction.account_id}\n"
-        )
-        
-        # check if print was called with a string that starts with "LOG: "
-        # and contains the expected transaction information
-        mock_print.assert_called_once()
-        actual_call = mock_print.call_args[0][0]
-        assert actual_call.startswith("LOG: ")
-        assert expected_log_message in actual_call
+        # Verify one structured record carries the transaction details
+        assert len(caplog.records) == 1
+        record = caplog.records[0]
+        assert record.getMessage().startswith("Transaction Log: ")
+        assert f"$100.00 on account {transaction.account_id}" in record.getMessage()
+        assert record.fields["amount"] == 100.00
+        assert record.fields["account_id"] == transaction.account_id
+        assert record.fields["transaction_type"] == TransactionType.DEPOSIT.value
+        assert record.fields["timestamp"] == str(transaction.timestamp)
 
 class TestAccountService:
     @pytest.fixture(autouse=True)
@@ -120,20 +121,20 @@ class TestLoggingServiceNew:
     def setup(self):
         self.service = LoggingService()
 
-    def test_log(self):
-        with patch("builtins.print") as mock_print:
+    def test_log(self, caplog):
+        with caplog.at_level("INFO", logger="banking_system.transactions"):
             self.service.log("test message")
-            mock_print.assert_called_with("LOG: test message")
+        assert caplog.records[-1].getMessage() == "test message"
 
-    def test_log_transaction(self):
+    def test_log_transaction(self, caplog):
         transaction = MagicMock()
         transaction.transaction_type = "WITHDRAWAL"
         transaction.amount = 50.0
         transaction.timestamp = "2024-01-01"
         transaction.account_id = "acc1"
-        with patch("builtins.print") as mock_print:
+        with caplog.at_level("INFO", logger="banking_system.transactions"):
             self.service.log_transaction(transaction)
-            assert mock_print.called
+        assert caplog.records
 
 class TestTransactionService:
     @pytest.fixture(autouse=True)
@@ -179,6 +180,111 @@ class TestTransactionService:
         with pytest.raises(ValueError):
             self.service.withdraw("acc1", 50.0)
 
+    def test_deposit_retries_on_conflict(self):
+        self.mock_save_transaction.side_effect = [ConcurrentUpdateError("conflict"), None]
+        self.service.deposit("acc1", 100.0)
+        assert self.mock_save_transaction.call_count == 2
+
+    def test_deposit_gives_up_after_max_retries(self):
+        self.mock_save_transaction.side_effect = ConcurrentUpdateError("conflict")
+        with pytest.raises(ConcurrentUpdateError):
+            self.service.deposit("acc1", 100.0)
+        assert self.mock_save_transaction.call_count == self.service.max_retries + 1
+
+    def test_deposit_stale_expected_version(self):
+        self.mock_account.version = 4
+        with pytest.raises(StaleAccountVersionError):
+            self.service.deposit("acc1", 100.0, expected_version=3)
+        self.mock_save_transaction.assert_not_called()
+
+class TestTransactionServiceBatch:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.account_repo = AccountRepository(DictionaryAccountStrategy())
+        self.transaction_repo = MagicMock(wraps=TransactionRepository(DictionaryTransactionStrategy()))
+        self.service = TransactionService(self.account_repo, self.transaction_repo, MagicMock(), MagicMock())
+        self.first = CheckingAccount(account_type="CHECKING", initial_balance=100.0)
+        self.second = CheckingAccount(account_type="CHECKING", initial_balance=50.0)
+        self.account_repo.create_account(self.first)
+        self.account_repo.create_account(self.second)
+
+    def test_apply_batch_partial_failure(self):
+        report = self.service.apply_batch([
+            BatchOperation("DEPOSIT", self.first.account_id, 25.0),
+            BatchOperation("WITHDRAW", self.second.account_id, 500.0),
+            BatchOperation("TRANSFER", self.first.account_id, 75.0, self.second.account_id),
+            BatchOperation("DEPOSIT", "missing", 10.0),
+        ])
+
+        assert [result.succeeded for result in report.results] == [True, False, True, False]
+        assert "Insufficient funds" in report.results[1].error
+        assert self.account_repo.get_account_by_id(self.first.account_id).balance == 50.0
+        assert self.account_repo.get_account_by_id(self.second.account_id).balance == 125.0
+        self.transaction_repo.save_transactions.assert_called_once()
+        assert len(self.transaction_repo.get_transactions_by_account_id(self.first.account_id)) == 2
+
+    def test_transfer_batch_commits_once(self):
+        with patch.object(self.account_repo, "update_accounts", wraps=self.account_repo.update_accounts) as update_accounts:
+            report = FundTransferService(self.account_repo, self.transaction_repo, MagicMock(), MagicMock()).transfer_batch([
+                (self.first.account_id, self.second.account_id, 10.0),
+                (self.second.account_id, self.first.account_id, 5.0),
+                (self.first.account_id, self.first.account_id, 1.0),
+            ])
+
+        assert [result.succeeded for result in report.results] == [True, True, False]
+        update_accounts.assert_called_once()
+        assert self.account_repo.get_account_by_id(self.first.account_id).version == 1
+
+    def test_apply_batch_takes_no_lock_stripes_and_fails_only_a_busy_account(self):
+        busy_id, read = self.second.account_id, self.account_repo.get_account_by_id
+
+        def read_busy_account_changing(account_id):
+            account = read(account_id)
+            if account_id == busy_id:
+                other = read(account_id)
+                other.deposit(1.0)
+                self.account_repo.update_account(other, expected_version=other.version)
+            return account
+
+        self.account_repo.get_account_by_id = read_busy_account_changing
+        self.service.lock_manager = MagicMock()
+        report = self.service.apply_batch([
+            BatchOperation("DEPOSIT", self.first.account_id, 25.0),
+            BatchOperation("DEPOSIT", busy_id, 10.0),
+            BatchOperation("WITHDRAW", self.first.account_id, 5.0),
+        ])
+
+        self.service.lock_manager.locked.assert_not_called()
+        assert [result.index for result in report.results] == [0, 1, 2]
+        assert [result.succeeded for result in report.results] == [True, False, True]
+        assert "modified concurrently" in report.results[1].error
+        assert read(self.first.account_id).balance == 120.0
+
+class TestAccountRepositoryConcurrency:
+    def test_transfers_on_unrelated_accounts_are_not_serialized(self):
+        """Test that the repository lets two atomic updates reach the strategy at the same time."""
+        both_inside = threading.Barrier(2, timeout=5)
+
+        class MeetingStrategy(DictionaryAccountStrategy):
+            def update_accounts_atomically(self, source_account, destination_account, expected_versions=None):
+                both_inside.wait()
+                return super().update_accounts_atomically(source_account, destination_account, expected_versions)
+
+        repository = AccountRepository(MeetingStrategy())
+        accounts = [CheckingAccount(account_type="CHECKING", initial_balance=100.0) for _ in range(4)]
+        for account in accounts:
+            repository.create_account(account)
+        results = []
+        threads = [
+            threading.Thread(target=lambda pair=pair: results.append(repository.update_accounts_atomically(*pair)))
+            for pair in (accounts[:2], accounts[2:])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [True, True]
+
 class TestInterestService:
     @pytest.fixture(autouse=True)
     def setup(self):
@@ -190,7 +296,7 @@ class TestInterestService:
     def test_apply_interest_to_account_success(self):
         self.service.apply_interest_to_account("acc1")
         self.mock_account.calculate_interest.assert_called()
-        self.mock_account_repo.update_account.assert_called_with(self.mock_account)
+        self.mock_account_repo.update_account.assert_called_with(self.mock_account, expected_version=self.mock_account.version)
 
     def test_apply_interest_to_account_not_found(self):
         self.mock_account_repo.get_account_by_id.return_value = None
@@ -198,9 +304,100 @@ class TestInterestService:
             self.service.apply_interest_to_account("acc1")
 
     def test_apply_interest_batch(self):
-        self.mock_account_repo.get_account_by_id.return_value = self.mock_account
-        self.service.apply_interest_batch(["acc1", "acc2"])
-        assert self.mock_account.calculate_interest.called
+        savings = SavingsAccount(account_type="SAVINGS", initial_balance=1200.0, interest_strategy=SavingsInterestStrategy(0.12))
+        checking = CheckingAccount(account_type="CHECKING", initial_balance=1000.0, interest_strategy=CheckingInterestStrategy())
+        accounts = {savings.account_id: savings, checking.account_id: checking}
+        self.mock_account_repo.get_account_by_id.side_effect = accounts.get
+
+        report = self.service.apply_interest_batch([savings.account_id, checking.account_id])
+
+        assert report.applied[savings.account_id] == pytest.approx(1212.0)
+        assert report.applied[checking.account_id] == pytest.approx(1001.0)
+        self.mock_account_repo.update_accounts.assert_called_once()
+
+    def test_apply_interest_batch_keeps_custom_strategies_apart(self):
+        """Test that accounts of one custom strategy type but different rates each grow by their own factor."""
+        class FixedRateStrategy(InterestStrategy):
+            def __init__(self, rate):
+                self.rate = rate
+
+            def apply_interest(self, balance):
+                return balance * (1 + self.rate)
+
+        low = CheckingAccount(account_type="CHECKING", initial_balance=1000.0, interest_strategy=FixedRateStrategy(0.01))
+        high = CheckingAccount(account_type="CHECKING", initial_balance=1000.0, interest_strategy=FixedRateStrategy(0.02))
+        accounts = {low.account_id: low, high.account_id: high}
+        self.mock_account_repo.get_account_by_id.side_effect = accounts.get
+
+        report = self.service.apply_interest_batch([low.account_id, high.account_id])
+
+        assert report.applied[low.account_id] == pytest.approx(1010.0)
+        assert report.applied[high.account_id] == pytest.approx(1020.0)
+
+    def test_apply_interest_batch_reports_failures(self):
+        self.mock_account_repo.get_account_by_id.return_value = None
+        report = self.service.apply_interest_batch(["acc1"])
+        assert "acc1" in report.failed
+        assert not report.applied
+        self.mock_account_repo.update_accounts.assert_not_called()
+
+class TestInterestServiceConcurrency:
+    """Interest runs against a real repository while a deposit lands between their read and write."""
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.repository = AccountRepository(strategy=DictionaryAccountStrategy())
+        self.account = SavingsAccount(account_type="SAVINGS", initial_balance=100.0, interest_strategy=SavingsInterestStrategy(0.12))
+        self.repository.create_account(self.account)
+        self.service = InterestService(self.repository)
+        read = self.repository.get_account_by_id
+        self.interleaved = False
+
+        def read_then_deposit(account_id):
+            account = read(account_id)
+            if not self.interleaved:
+                self.interleaved = True
+                other = read(account_id)
+                other.deposit(50.0)
+                assert self.repository.update_account(other, expected_version=other.version)
+            return account
+
+        self.repository.get_account_by_id = read_then_deposit
+
+    def test_interest_on_one_account_keeps_a_concurrent_deposit(self):
+        self.service.apply_interest_to_account(self.account.account_id)
+        assert self.repository._strategy.get_account_by_id(self.account.account_id).balance == pytest.approx(151.5)
+
+    def test_interest_batch_keeps_a_concurrent_deposit(self):
+        report = self.service.apply_interest_batch([self.account.account_id])
+        assert report.applied == {self.account.account_id: pytest.approx(151.5)}
+        assert self.repository._strategy.get_account_by_id(self.account.account_id).balance == pytest.approx(151.5)
+
+    def test_interest_batch_reports_a_chunk_that_keeps_conflicting(self):
+        self.service.max_retries = 0
+        report = self.service.apply_interest_batch([self.account.account_id])
+        assert not report.applied and self.account.account_id in report.failed
+        assert self.repository._strategy.get_account_by_id(self.account.account_id).balance == pytest.approx(150.0)
+
+    def test_interest_batch_takes_no_lock_stripes_and_isolates_a_busy_account(self):
+        quiet = SavingsAccount(account_type="SAVINGS", initial_balance=200.0, interest_strategy=SavingsInterestStrategy(0.12))
+        self.repository._strategy.create_account(quiet)
+        busy_id, read = self.account.account_id, self.repository._strategy.get_account_by_id
+
+        def read_busy_account_changing(account_id):
+            account = read(account_id)
+            if account_id == busy_id:
+                other = read(account_id)
+                other.deposit(1.0)
+                self.repository._strategy.update_account(other, expected_version=other.version)
+            return account
+
+        self.repository.get_account_by_id = read_busy_account_changing
+        self.service.lock_manager = MagicMock()
+        report = self.service.apply_interest_batch([busy_id, quiet.account_id])
+
+        self.service.lock_manager.locked.assert_not_called()
+        assert report.applied == {quiet.account_id: pytest.approx(202.0)}
+        assert list(report.failed) == [busy_id]
 
 class TestStatementService:
     @pytest.fixture(autouse=True)
@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+import threading
+import pytest
+
+from banking_system.application_layer.util.striped_locks import StripedLockManager
+
+
+class TestStripedLockManager:
+    def test_requires_a_stripe(self):
+        with pytest.raises(ValueError):
+            StripedLockManager(stripes=0)
+
+    def test_stripe_is_stable_per_account(self):
+        manager = StripedLockManager(stripes=16)
+        assert manager.stripe_for("acc1") == manager.stripe_for("acc1")
+        assert 0 <= manager.stripe_for("acc1") < 16
+
+    def test_locked_is_reentrant_and_handles_shared_stripes(self):
+        manager = StripedLockManager(stripes=1)
+        with manager.locked("acc1", "acc2"):
+            with manager.locked("acc1"):
+                pass
+
+    def test_opposite_transfers_do_not_deadlock(self):
+        manager = StripedLockManager(stripes=64)
+        balances = {"a": 0, "b": 0}
+
+        def move(source, destination):
+            for _ in range(2000):
+                with manager.locked(source, destination):
+                    balances[source] -= 1
+                    balances[destination] += 1
+
+        workers = [threading.Thread(target=move, args=pair) for pair in (("a", "b"), ("b", "a"))]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=10)
+
+        assert not any(worker.is_alive() for worker in workers)
+        assert balances == {"a": 0, "b": 0}
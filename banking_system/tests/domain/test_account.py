@@ -11,7 +11,7 @@ from enum import Enum
 # Add the root directory of the project to the Python path
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 from banking_system import AccountStatus, AccountType, SavingsAccount, CheckingAccount, Account
-from domain_layer import InterestStrategy, LimitConstraint, CheckingInterestStrategy,SavingsInterestStrategy
+from banking_system.domain_layer import InterestStrategy, LimitConstraint, CheckingInterestStrategy,SavingsInterestStrategy
 
 @pytest.fixture
 def savings_interest_strategy() -> InterestStrategy:
@@ -75,6 +75,15 @@ def test_deposit_zero_amount(checking_account):
     with pytest.raises(ValueError, match="Deposit amount must be positive."):
         checking_account.deposit(0.0)
 
+def test_fraction_of_a_cent_is_rejected(checking_account):
+    """Test that amounts the ledger cannot record in cents are rejected before the balance changes."""
+    for operation in (checking_account.deposit, checking_account.withdraw):
+        with pytest.raises(ValueError, match="whole number of cents"):
+            operation(0.004)
+    assert checking_account.balance == 1500.0
+    checking_account.deposit(19.99)
+    assert checking_account.balance == pytest.approx(1519.99)
+
 def test_deposit_negative_amount(checking_account):
     """Test that depositing a negative amount raises ValueError."""
     with pytest.raises(ValueError, match="Deposit amount must be positive."):
@@ -249,4 +258,62 @@ def test_interest_implementation(savings_account):
     pass
 
 def test_statement_generation(checking_account):
-    pass
\ No newline at end of file
+    pass
+
+class FixedRateStrategy(InterestStrategy):
+    """A strategy written before growth_factor existed: it only applies interest."""
+    def __init__(self, rate):
+        self.rate = rate
+
+    def apply_interest(self, balance):
+        return balance * (1 + self.rate)
+
+def test_strategy_without_growth_factor_instantiates():
+    """Test that a strategy implementing only apply_interest gets a growth factor compounded from it."""
+    strategy = FixedRateStrategy(0.01)
+    assert strategy.growth_factor() == pytest.approx(1.01)
+    assert strategy.growth_factor(3) == pytest.approx(1.01 ** 3)
+
+# --- Test lazy interest accrual ---
+
+class MutableClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def test_lazy_interest_accrues_on_read():
+    """Test that a lazy account earns one period of interest per month boundary crossed."""
+    clock = MutableClock(datetime(2025, 1, 15))
+    account = SavingsAccount(account_type=AccountType.SAVINGS, initial_balance=1200.0,
+                             interest_strategy=SavingsInterestStrategy(annual_rate=0.12),
+                             lazy_interest=True, now_provider=clock)
+    assert account.balance == 1200.0
+
+    clock.now = datetime(2025, 1, 31)
+    assert account.balance == 1200.0
+
+    clock.now = datetime(2025, 4, 2)
+    assert account.balance == pytest.approx(1200.0 * 1.01 ** 3)
+    assert account.last_accrual == datetime(2025, 4, 2)
+
+def test_lazy_interest_accrues_before_mutation():
+    """Test that deposits are applied on top of the accrued balance."""
+    clock = MutableClock(datetime(2025, 1, 15))
+    account = CheckingAccount(account_type=AccountType.CHECKING, initial_balance=1000.0,
+                              interest_strategy=CheckingInterestStrategy(),
+                              lazy_interest=True, now_provider=clock)
+    clock.now = datetime(2025, 2, 1)
+    account.deposit(100.0)
+    assert account._balance == pytest.approx(1000.0 * 1.001 + 100.0)
+
+def test_lazy_calculate_interest_only_settles():
+    """Test that an explicit interest calculation does not add an extra period in lazy mode."""
+    clock = MutableClock(datetime(2025, 1, 15))
+    account = SavingsAccount(account_type=AccountType.SAVINGS, initial_balance=1200.0,
+                             interest_strategy=SavingsInterestStrategy(annual_rate=0.12),
+                             lazy_interest=True, now_provider=clock)
+    clock.now = datetime(2025, 2, 15)
+    account.calculate_interest()
+    assert account.balance == pytest.approx(1212.0)
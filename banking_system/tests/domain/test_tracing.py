@@ -0,0 +1,100 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import AccountType, CheckingAccount
+from banking_system.application_layer.services import FundTransferService
+from banking_system.application_layer.util.bounded_executor import BoundedExecutor
+from banking_system.domain_layer.util.tracing import NOOP_SPAN, Tracer, current_trace_id, span
+from banking_system.infrastructure_layer.account_repository import AccountRepository
+from banking_system.infrastructure_layer.transaction_repository import TransactionRepository
+from banking_system.infrastructure_layer.strategies.dictionary_account_strategy import DictionaryAccountStrategy
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+
+
+class RecordingExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, spans):
+        self.traces.append(spans)
+
+
+class Silent:
+    def notify(self, transaction):
+        pass
+
+    def log_transaction(self, transaction):
+        pass
+
+
+def test_spans_nest_under_the_current_span():
+    """Test that spans record their parent, errors and the trace id, and are exported with the root."""
+    exporter = RecordingExporter()
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+    with tracer.start_trace("request", trace_id="abc") as root:
+        assert current_trace_id() == "abc"
+        with span("outer") as outer:
+            with span("inner", key="value"):
+                pass
+        try:
+            with span("failing"):
+                raise ValueError("nope")
+        except ValueError:
+            pass
+    assert current_trace_id() is None
+
+    spans = {recorded.name: recorded for recorded in exporter.traces[0]}
+    assert spans["inner"].parent_id == outer.span_id and spans["inner"].attributes == {"key": "value"}
+    assert spans["outer"].parent_id == root.span_id and spans["request"].parent_id is None
+    assert spans["failing"].attributes["error"] == "ValueError"
+    assert {recorded.trace_id for recorded in spans.values()} == {"abc"}
+    assert spans["outer"].start_ns <= spans["inner"].start_ns and spans["inner"].end_ns <= spans["outer"].end_ns
+
+
+def test_unsampled_traces_keep_an_id_but_record_nothing():
+    """Test that outside sampled traces spans are the shared no-op, while the trace id still propagates."""
+    exporter = RecordingExporter()
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+    assert span("outside") is NOOP_SPAN
+    with tracer.start_trace("request") as root:
+        assert root is NOOP_SPAN
+        assert span("inside") is NOOP_SPAN
+        assert current_trace_id() is not None
+    assert exporter.traces == []
+
+    with tracer.start_trace("forced", sampled=True):
+        pass
+    assert [spans[0].name for spans in exporter.traces] == ["forced"]
+
+
+def test_trace_follows_a_transfer_across_layers_and_executor_threads():
+    """Test that service, domain and repository spans of a transfer, including calls on executor threads, share the trace."""
+    account_repository = AccountRepository(DictionaryAccountStrategy())
+    transaction_repository = TransactionRepository(DictionaryTransactionStrategy())
+    source, destination = CheckingAccount(AccountType.CHECKING, 500), CheckingAccount(AccountType.CHECKING, 10)
+    account_repository.create_account(source)
+    account_repository.create_account(destination)
+    service = FundTransferService(account_repository, transaction_repository, Silent(), Silent())
+    exporter = RecordingExporter()
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+    executor = BoundedExecutor(max_workers=2)
+
+    async def request():
+        with tracer.start_trace("POST /accounts/transfer"):
+            await executor.run(service.transfer_funds, source.account_id, destination.account_id, 50.0)
+
+    asyncio.run(request())
+    executor.shutdown()
+
+    (spans,) = exporter.traces
+    by_id = {recorded.span_id: recorded for recorded in spans}
+    names = {recorded.name for recorded in spans}
+    assert {"FundTransferService.transfer_funds", "Account.transfer", "validate_transaction",
+            "AccountRepository.get_account_by_id", "AccountRepository.update_accounts_atomically",
+            "TransactionRepository.save_transaction"} <= names
+    transfer = next(recorded for recorded in spans if recorded.name == "Account.transfer")
+    assert by_id[transfer.parent_id].name == "FundTransferService.transfer_funds"
+    root = next(recorded for recorded in spans if recorded.parent_id is None)
+    assert transfer.thread_id != root.thread_id
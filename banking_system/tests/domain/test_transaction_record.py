@@ -0,0 +1,64 @@
+import pytest
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import Transaction, TransactionType, TransactionRecord
+from banking_system.domain_layer.entities.transaction_record import amount_to_cents, datetime_to_ns, ns_to_datetime
+
+
+@pytest.fixture
+def transfer() -> Transaction:
+    return Transaction(TransactionType.TRANSFER, 250.75, "acc-src", destination_account_id="acc-dst")
+
+
+def test_record_packs_fields(transfer):
+    """Test that a record stores compact, integer encoded fields."""
+    record = TransactionRecord.from_transaction(transfer)
+
+    assert len(record.id_bytes) == 16
+    assert record.amount_cents == 25075
+    assert record.timestamp_ns == datetime_to_ns(transfer.timestamp)
+    assert not hasattr(record, "__dict__")
+
+
+def test_record_exposes_transaction_api(transfer):
+    """Test that a record decodes to the same values as the transaction it was built from."""
+    record = TransactionRecord.from_transaction(transfer)
+
+    assert record.transaction_id == transfer.transaction_id
+    assert record.transaction_type == TransactionType.TRANSFER
+    assert record.amount == transfer.amount
+    assert record.timestamp == transfer.timestamp
+    assert record.is_transfer() and not record.is_deposit()
+    assert record.return_dict() == transfer.return_dict()
+
+
+def test_record_materializes_transaction(transfer):
+    """Test that a record can be turned back into a full Transaction."""
+    transaction = TransactionRecord.from_transaction(transfer).to_transaction()
+
+    assert isinstance(transaction, Transaction)
+    assert transaction.return_dict() == transfer.return_dict()
+
+
+def test_timestamp_round_trip_is_exact():
+    """Test that nanosecond encoding keeps microsecond precision."""
+    timestamp = datetime(2025, 5, 1, 12, 30, 15, 123456)
+    assert ns_to_datetime(datetime_to_ns(timestamp)) == timestamp
+
+
+def test_aware_timestamps_are_stored_as_local_time():
+    """Test that a timezone-aware datetime is encoded as the naive local time of the same instant."""
+    utc = datetime(2025, 5, 1, 12, 30, tzinfo=timezone.utc)
+    tokyo = utc.astimezone(timezone(timedelta(hours=9)))
+    assert datetime_to_ns(utc) == datetime_to_ns(tokyo) == datetime_to_ns(utc.astimezone().replace(tzinfo=None))
+
+
+def test_amounts_convert_to_exact_cents():
+    """Test that whole-cent amounts convert exactly and a fraction of a cent is refused rather than rounded."""
+    assert amount_to_cents(0.1 + 0.2) == 30
+    assert amount_to_cents(1234567.89) == 123456789
+    with pytest.raises(ValueError):
+        amount_to_cents(0.004)
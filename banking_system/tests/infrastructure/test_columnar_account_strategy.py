@@ -0,0 +1,118 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import AccountStatus, AccountType, SavingsAccount, CheckingAccount
+from banking_system.domain_layer import CheckingInterestStrategy, InterestStrategy, SavingsInterestStrategy, LimitConstraint
+from banking_system.infrastructure_layer.strategies.columnar_account_strategy import ColumnarAccountStrategy
+
+
+@pytest.fixture
+def strategy() -> ColumnarAccountStrategy:
+    return ColumnarAccountStrategy()
+
+@pytest.fixture
+def savings_account() -> SavingsAccount:
+    return SavingsAccount(AccountType.SAVINGS, 1500.0, SavingsInterestStrategy(0.05), LimitConstraint(daily_limit=500.0, monthly_limit=None))
+
+@pytest.fixture
+def checking_account() -> CheckingAccount:
+    return CheckingAccount(AccountType.CHECKING, 200.0, CheckingInterestStrategy(), None)
+
+
+def test_round_trip_materializes_view(strategy, savings_account):
+    """Test that a stored account is materialized with the same state."""
+    strategy.create_account(savings_account)
+    view = strategy.get_account_by_id(savings_account.account_id)
+
+    assert isinstance(view, SavingsAccount)
+    assert view is not savings_account
+    assert view.account_id == savings_account.account_id
+    assert view.account_type == AccountType.SAVINGS
+    assert view.balance == 1500.0
+    assert view.status == AccountStatus.ACTIVE
+    assert view.creation_date == savings_account.creation_date
+    assert view.interest_strategy.annual_rate == 0.05
+    assert view.limit_constraint.daily_limit == 500.0
+    assert view.limit_constraint.monthly_limit is None
+
+
+def test_update_writes_back_balance_and_limits(strategy, savings_account):
+    """Test that mutations on a view are persisted by update_account."""
+    strategy.create_account(savings_account)
+    view = strategy.get_account_by_id(savings_account.account_id)
+    view.withdraw(300.0)
+    view.close_account()
+
+    assert strategy.update_account(view)
+    stored = strategy.get_account_by_id(savings_account.account_id)
+    assert stored.balance == 1200.0
+    assert stored.status == AccountStatus.CLOSED
+    with pytest.raises(ValueError, match="Daily transaction limit exceeded."):
+        stored.limit_constraint.validate(250.0)
+
+
+def test_missing_account(strategy, checking_account):
+    """Test lookups and updates of unknown accounts."""
+    assert strategy.get_account_by_id("missing") is None
+    assert strategy.update_account(checking_account) is False
+
+
+def test_whole_book_scans(strategy, savings_account, checking_account):
+    """Test the array-backed scans."""
+    strategy.create_account(savings_account)
+    strategy.create_account(checking_account)
+
+    assert strategy.total_balance() == 1700.0
+    assert list(strategy.balances()) == [1500.0, 200.0]
+    assert strategy.account_ids() == [savings_account.account_id, checking_account.account_id]
+    assert strategy.update_accounts_atomically(savings_account, checking_account)
+
+
+def test_update_rejects_stale_version(strategy, checking_account):
+    """Test that a compare-and-swap update fails once another writer has bumped the version."""
+    strategy.create_account(checking_account)
+    first = strategy.get_account_by_id(checking_account.account_id)
+    second = strategy.get_account_by_id(checking_account.account_id)
+
+    first.balance = 300.0
+    assert strategy.update_account(first, expected_version=second.version) is True
+    second.balance = 400.0
+    assert strategy.update_account(second, expected_version=second.version) is False
+
+    stored = strategy.get_account_by_id(checking_account.account_id)
+    assert stored.balance == 300.0
+    assert stored.version == 1
+
+
+class _UnsupportedInterest(InterestStrategy):
+    """An interest strategy the flat columns have no encoding for."""
+    def __init__(self, annual_rate):
+        self.annual_rate = annual_rate
+
+    def apply_interest(self, balance, months=1):
+        return balance * self.growth_factor(months)
+
+    def growth_factor(self, months=1):
+        return (1 + self.annual_rate) ** months
+
+
+def test_account_that_cannot_be_encoded_leaves_nothing_behind(strategy, savings_account, checking_account):
+    """Test that a failed encode neither registers a ghost account nor writes part of a batch."""
+    unsupported = SavingsAccount(AccountType.SAVINGS, 10.0, _UnsupportedInterest(0.05), None)
+    with pytest.raises(ValueError, match="Unsupported interest strategy"):
+        strategy.create_account(unsupported)
+    assert strategy.get_account_by_id(unsupported.account_id) is None
+    assert len(strategy) == 0
+
+    strategy.create_account(savings_account)
+    strategy.create_account(checking_account)
+    view = strategy.get_account_by_id(savings_account.account_id)
+    view.balance = 1.0
+    broken = strategy.get_account_by_id(checking_account.account_id)
+    broken.interest_strategy = _UnsupportedInterest(0.01)
+    with pytest.raises(ValueError, match="Unsupported interest strategy"):
+        strategy.update_accounts([view, broken])
+    assert strategy.get_account_by_id(savings_account.account_id).balance == 1500.0
+    assert strategy.get_account_by_id(savings_account.account_id).version == savings_account.version
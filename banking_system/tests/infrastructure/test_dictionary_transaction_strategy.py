@@ -0,0 +1,79 @@
+import pytest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import Transaction, TransactionType
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+
+BASE = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def make_transaction(account_id, minutes, destination_account_id=None):
+    transaction_type = TransactionType.TRANSFER if destination_account_id else TransactionType.DEPOSIT
+    transaction = Transaction(transaction_type, 10.0, account_id, destination_account_id)
+    transaction.timestamp = BASE + timedelta(minutes=minutes)
+    return transaction
+
+
+@pytest.fixture(params=[False, True], ids=["objects", "compact"])
+def strategy(request) -> DictionaryTransactionStrategy:
+    return DictionaryTransactionStrategy(compact=request.param)
+
+
+def test_history_is_time_ordered_despite_late_arrivals(strategy):
+    """Test that transactions saved out of order are read back in timestamp order."""
+    for minutes in (0, 5, 2, 9, 2):
+        strategy.save_transaction(make_transaction("acc1", minutes))
+    strategy.save_transaction(make_transaction("acc2", 1, destination_account_id="acc1"))
+
+    timestamps = [transaction.timestamp for transaction in strategy.get_transactions_by_account_id("acc1")]
+    assert timestamps == sorted(timestamps)
+    assert len(timestamps) == 6
+
+
+def test_cursor_pages_cover_history_exactly_once(strategy):
+    """Test that following cursors visits every transaction once, even with tied timestamps."""
+    saved = [make_transaction("acc1", minutes // 2) for minutes in range(25)]
+    strategy.save_transactions(saved)
+
+    seen, cursor = [], None
+    while True:
+        page = strategy.get_transactions_page("acc1", cursor=cursor, limit=4)
+        seen.extend(transaction.transaction_id for transaction in page.transactions)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [transaction.transaction_id for transaction in saved]
+
+
+def test_time_range_filter(strategy):
+    """Test that `start` is inclusive, `end` exclusive, and paging respects the range."""
+    for minutes in range(10):
+        strategy.save_transaction(make_transaction("acc1", minutes))
+
+    page = strategy.get_transactions_page("acc1", limit=3, start=BASE + timedelta(minutes=2), end=BASE + timedelta(minutes=7))
+    assert [t.timestamp.minute for t in page.transactions] == [2, 3, 4]
+    page = strategy.get_transactions_page("acc1", cursor=page.next_cursor, limit=3, start=BASE + timedelta(minutes=2), end=BASE + timedelta(minutes=7))
+    assert [t.timestamp.minute for t in page.transactions] == [5, 6]
+    assert page.next_cursor is None
+
+    assert strategy.get_transactions_page("missing").transactions == []
+    with pytest.raises(ValueError):
+        strategy.get_transactions_page("acc1", cursor="not-a-cursor")
+
+
+def test_iterator_streams_in_pages(strategy):
+    """Test that the history iterator fetches pages lazily and yields everything in order."""
+    saved = [make_transaction("acc1", minutes) for minutes in range(7)]
+    strategy.save_transactions(saved)
+    pages = []
+    original = strategy.get_transactions_page
+    strategy.get_transactions_page = lambda *args, **kwargs: pages.append(kwargs["limit"]) or original(*args, **kwargs)
+
+    iterator = strategy.iter_transactions_by_account_id("acc1", chunk_size=3)
+    assert next(iterator).transaction_id == saved[0].transaction_id
+    assert len(pages) == 1
+    assert [t.transaction_id for t in iterator] == [t.transaction_id for t in saved[1:]]
+    assert pages == [3, 3, 3]
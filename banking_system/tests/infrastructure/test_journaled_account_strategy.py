@@ -0,0 +1,190 @@
+import os
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import AccountType, CheckingAccount, SavingsAccount
+from banking_system.domain_layer import CheckingInterestStrategy, SavingsInterestStrategy, LimitConstraint
+from banking_system.infrastructure_layer.strategies.columnar_account_strategy import ColumnarAccountStrategy
+from banking_system.infrastructure_layer.strategies.journaled_account_strategy import JournaledAccountStrategy
+from banking_system.infrastructure_layer.strategies import write_ahead_log
+
+
+def _open(directory, **kwargs):
+    kwargs.setdefault("snapshot_interval_s", None)
+    return JournaledAccountStrategy(str(directory), **kwargs)
+
+@pytest.fixture
+def savings_account() -> SavingsAccount:
+    return SavingsAccount(AccountType.SAVINGS, 1500.0, SavingsInterestStrategy(0.05), LimitConstraint(daily_limit=500.0, monthly_limit=None))
+
+@pytest.fixture
+def checking_account() -> CheckingAccount:
+    return CheckingAccount(AccountType.CHECKING, 200.0, CheckingInterestStrategy(), None)
+
+
+@pytest.mark.parametrize("fsync", ["always", "interval", "os"])
+def test_replays_journal_after_restart(tmp_path, savings_account, checking_account, fsync):
+    """Test that every journaled mutation, with its version, survives a restart."""
+    with _open(tmp_path, fsync=fsync, fsync_interval_ms=1) as strategy:
+        strategy.create_account(savings_account)
+        strategy.create_account(checking_account)
+        savings_account.balance = 1200.0
+        checking_account.balance = 500.0
+        assert strategy.update_accounts_atomically(savings_account, checking_account)
+        stale = strategy.get_account_by_id(savings_account.account_id)
+        stale.balance = 1.0
+        assert not strategy.update_account(stale, expected_version=0)
+
+    with _open(tmp_path) as reopened:
+        savings = reopened.get_account_by_id(savings_account.account_id)
+        checking = reopened.get_account_by_id(checking_account.account_id)
+        assert savings.balance == 1200.0 and savings.version == 1
+        assert savings.limit_constraint.daily_limit == 500.0
+        assert savings.limit_constraint.monthly_limit is None
+        assert savings.interest_strategy.annual_rate == 0.05
+        assert checking.balance == 500.0 and checking.version == 1
+
+
+def test_snapshot_replaces_log_and_torn_tail_is_dropped(tmp_path, savings_account, checking_account):
+    """Test recovery from a snapshot plus the log tail, ignoring a write torn by a crash."""
+    with _open(tmp_path) as strategy:
+        strategy.create_account(savings_account)
+        strategy.create_account(checking_account)
+        strategy.snapshot()
+        assert [name for name in os.listdir(tmp_path) if name.startswith("wal-")] == ["wal-000001.log"]
+        savings_account.balance = 900.0
+        assert strategy.update_account(savings_account)
+
+    with open(tmp_path / "wal-000001.log", "ab") as log:
+        log.write(b"\x40\x00\x00\x00torn")
+
+    with _open(tmp_path, store=ColumnarAccountStrategy()) as reopened:
+        assert reopened.get_account_by_id(savings_account.account_id).balance == 900.0
+        assert reopened.get_account_by_id(savings_account.account_id).version == 1
+        assert reopened.get_account_by_id(checking_account.account_id).balance == 200.0
+        checking_account.balance = 300.0
+        assert reopened.update_account(checking_account)
+
+    with _open(tmp_path) as reopened:
+        assert reopened.get_account_by_id(checking_account.account_id).balance == 300.0
+
+
+def test_concurrent_writers_share_fsyncs(tmp_path):
+    """Test that concurrent writers under the "always" policy are all durable, with at most one fsync per write."""
+    accounts = [CheckingAccount(AccountType.CHECKING, 100.0) for _ in range(8)]
+    with _open(tmp_path, fsync="always") as strategy:
+        for account in accounts:
+            strategy.create_account(account)
+        before = strategy.fsyncs
+
+        def write(account):
+            for _ in range(50):
+                copy = strategy.get_account_by_id(account.account_id)
+                copy.balance += 1.0
+                assert strategy.update_account(copy)
+
+        threads = [threading.Thread(target=write, args=(account,)) for account in accounts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert 0 < strategy.fsyncs - before <= 8 * 50
+
+    with _open(tmp_path) as reopened:
+        for account in accounts:
+            assert reopened.get_account_by_id(account.account_id).balance == 150.0
+            assert reopened.get_account_by_id(account.account_id).version == 50
+
+
+class _FullDisk:
+    """Wraps a log file so that a write stores half its bytes and then fails, like a disk running full."""
+    def __init__(self, file):
+        self._file = file
+
+    def write(self, data):
+        self._file.write(data[:len(data) // 2])
+        raise OSError(28, "No space left on device")
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def test_failed_journal_write_is_fatal_until_reopened(tmp_path, checking_account):
+    """Test that a change the log could not record is never served, and reopening recovers the journaled state."""
+    with _open(tmp_path) as strategy:
+        strategy.create_account(checking_account)
+        strategy._wal._file = _FullDisk(strategy._wal._file)
+        checking_account.balance = 999.0
+        with pytest.raises(OSError):
+            strategy.update_account(checking_account)
+        with pytest.raises(RuntimeError):
+            strategy.get_account_by_id(checking_account.account_id)
+        with pytest.raises(RuntimeError):
+            strategy.create_account(CheckingAccount(AccountType.CHECKING, 100.0))
+        with pytest.raises(RuntimeError):
+            strategy.snapshot()
+
+    with _open(tmp_path) as reopened:
+        account = reopened.get_account_by_id(checking_account.account_id)
+        assert account.balance == 200.0 and account.version == 0
+        account.balance = 250.0
+        assert reopened.update_account(account)
+
+    with _open(tmp_path) as reopened:
+        assert reopened.get_account_by_id(checking_account.account_id).balance == 250.0
+
+
+class _TrickleDisk:
+    """Wraps a log file so that each write stores at most `limit` bytes and reports how many it took."""
+    def __init__(self, file, limit):
+        self._file = file
+        self._limit = limit
+
+    def write(self, data):
+        return self._file.write(data[:self._limit])
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def test_short_writes_are_completed_and_a_stalled_write_is_fatal(tmp_path, checking_account):
+    """Test that a frame written in pieces is whole on recovery, and a write that takes no bytes fails the journal."""
+    with _open(tmp_path) as strategy:
+        strategy._wal._file = _TrickleDisk(strategy._wal._file, 7)
+        strategy.create_account(checking_account)
+        checking_account.balance = 300.0
+        assert strategy.update_account(checking_account)
+        strategy._wal._file = _TrickleDisk(strategy._wal._file._file, 0)
+        checking_account.balance = 400.0
+        with pytest.raises(OSError):
+            strategy.update_account(checking_account)
+        with pytest.raises(RuntimeError):
+            strategy.get_account_by_id(checking_account.account_id)
+
+    with _open(tmp_path) as reopened:
+        assert reopened.get_account_by_id(checking_account.account_id).balance == 300.0
+
+
+def test_failed_background_fsync_is_fatal(tmp_path, checking_account, monkeypatch):
+    """Test that under the "interval" policy an fsync failure stops later writes instead of being acknowledged."""
+    with _open(tmp_path, fsync="interval", fsync_interval_ms=1) as strategy:
+        strategy.create_account(checking_account)
+
+        def failing_fsync(descriptor):
+            raise OSError(5, "Input/output error")
+
+        monkeypatch.setattr(write_ahead_log.os, "fsync", failing_fsync)
+        # A write the background thread has yet to fsync
+        strategy.create_account(CheckingAccount(AccountType.CHECKING, 100.0))
+        strategy._wal._syncer.join(5)
+        monkeypatch.undo()
+        assert not strategy._wal._syncer.is_alive()
+
+        checking_account.balance = 300.0
+        with pytest.raises(OSError):
+            strategy.update_account(checking_account)
+        with pytest.raises(RuntimeError):
+            strategy.get_account_by_id(checking_account.account_id)
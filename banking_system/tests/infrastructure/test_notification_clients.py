@@ -0,0 +1,71 @@
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system.infrastructure_layer.notifications.batched_sms_client import BatchedSMSClient
+from banking_system.infrastructure_layer.notifications.local_servers import LocalSMSServer, LocalSMTPServer
+from banking_system.infrastructure_layer.notifications.pooled_email_client import PooledEmailClient
+
+
+@pytest.fixture
+def smtp_server():
+    with LocalSMTPServer() as server:
+        yield server
+
+@pytest.fixture
+def sms_server():
+    with LocalSMSServer() as server:
+        yield server
+
+
+def test_pooled_email_client_reuses_connections(smtp_server):
+    """Test that concurrent batches share a bounded set of persistent SMTP sessions."""
+    client = PooledEmailClient("127.0.0.1", smtp_server.port, pool_size=2)
+
+    def send(worker):
+        for batch in range(5):
+            client.send_mails([("bank@local", f"acc{worker}@local", f"Batch {batch}", "Body") for _ in range(4)])
+
+    threads = [threading.Thread(target=send, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+
+    assert len(smtp_server.messages) == 80
+    assert smtp_server.connections <= 2
+    assert client.metrics.sent.value == 80 and client.metrics.failed.value == 0
+    assert b"Subject: Batch 0" in smtp_server.messages[0][2]
+
+
+def test_pooled_email_client_reconnects_after_server_drops_connection(smtp_server):
+    """Test that a stale pooled connection is replaced and the send retried."""
+    client = PooledEmailClient("127.0.0.1", smtp_server.port, pool_size=1, retry_backoff_s=0)
+    client.send_mail("bank@local", "acc@local", "First", "Body")
+    smtp_server.drop_connections()
+    client.send_mail("bank@local", "acc@local", "Second", "Body")
+
+    assert len(smtp_server.messages) == 2
+    assert client.metrics.retries.value == 1
+    assert client.metrics.connections_opened.value == 2
+    client.close()
+
+
+def test_batched_sms_client_batches_and_retries(sms_server):
+    """Test that messages are posted in batches over one connection and 503s are retried."""
+    client = BatchedSMSClient(sms_server.url, batch_size=10, max_connections=1, retry_backoff_s=0)
+    sms_server.fail_next = 2
+    client.send_messages([("BANK", f"+1555000{n:04d}", f"Message {n}") for n in range(25)])
+
+    assert [message["body"] for message in sms_server.messages] == [f"Message {n}" for n in range(25)]
+    assert sms_server.requests == 5
+    assert client.metrics.sent.value == 25 and client.metrics.retries.value == 2
+
+    sms_server.fail_next = 10
+    with pytest.raises(Exception):
+        client.send_message("BANK", "+15550000000", "Never delivered")
+    assert client.metrics.failed.value == 1
+    client.close()
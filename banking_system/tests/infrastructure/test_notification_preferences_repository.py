@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system.application_layer.util.notification_outbox import NotificationOutbox
+from banking_system.infrastructure_layer.notification_preferences_repository import NotificationPreferencesRepository
+from banking_system.infrastructure_layer.notifications.mock_notification_adapter import NotificationAdapter
+from banking_system.infrastructure_layer.sqlite_notification_preferences_repository import SQLiteNotificationPreferencesRepository
+
+
+class RecordingChannel:
+    def __init__(self):
+        self.batches = []
+
+    def send_batch(self, messages):
+        self.batches.append(list(messages))
+
+
+def test_reverse_index_follows_saves_and_removals():
+    """Test that subscribers per type stay in step with per-account preferences, types normalized."""
+    repository = NotificationPreferencesRepository()
+    assert repository.save_notification_preferences([("acc1", "EMAIL"), ("acc1", "sms"), ("acc2", "Sms"), ("acc1", "email")]) == 3
+    assert sorted(repository.get_subscribers("sms")) == ["acc1", "acc2"]
+    assert repository.get_subscribers("EMAIL") == ["acc1"]
+
+    assert repository.remove_notification_preference("acc2", "SMS")
+    assert not repository.remove_notification_preference("acc2", "SMS")
+    assert repository.remove_notification_preferences([("acc1", "email"), ("acc3", "email")]) == 1
+    assert repository.get_subscribers("sms") == ["acc1"]
+    assert repository.get_subscribers("email") == []
+    assert repository.load_notification_preferences(["acc1", "acc2"]) == {"acc1": ["sms"], "acc2": []}
+
+
+def test_sqlite_preferences_survive_reopen(tmp_path):
+    """Test that preferences and the reverse index are rebuilt from the database file."""
+    path = str(tmp_path / "banking.db")
+    repository = SQLiteNotificationPreferencesRepository(path)
+    repository.save_notification_preferences([(f"acc{n}", "sms") for n in range(100)] + [("acc0", "email")])
+    repository.remove_notification_preferences([("acc1", "sms")])
+    repository.close()
+
+    reopened = SQLiteNotificationPreferencesRepository(path)
+    assert len(reopened.get_subscribers("sms")) == 99
+    assert "acc1" not in reopened.get_subscribers("sms")
+    assert sorted(reopened.get_notification_preferences("acc0")) == ["email", "sms"]
+    reopened.close()
+
+
+def test_broadcast_reaches_every_subscriber_in_batches():
+    """Test that a broadcast goes to exactly the subscribers of the type, batch_size at a time."""
+    adapter = NotificationAdapter()
+    for n in range(25):
+        adapter.save_notification_preference(f"acc{n}", "sms" if n % 5 else "email")
+    channel = RecordingChannel()
+    outbox = NotificationOutbox(adapter, {"sms": channel, "email": RecordingChannel()}, batch_size=8)
+
+    assert outbox.broadcast("SMS", "Rate change", "Savings rate is now 2.5%") == 20
+    assert [len(batch) for batch in channel.batches] == [8, 8, 4]
+    assert sorted(message.account_id for batch in channel.batches for message in batch) == \
+        sorted(f"acc{n}" for n in range(25) if n % 5)
+    assert outbox.delivered.value == 20
@@ -0,0 +1,86 @@
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import Transaction, TransactionType
+from banking_system.infrastructure_layer.strategies.segmented_log_transaction_strategy import (
+    RECORD_SIZE, SegmentedLogTransactionStrategy
+)
+
+
+@pytest.fixture
+def transactions():
+    return [
+        Transaction(TransactionType.DEPOSIT, 100.0, "acc1"),
+        Transaction(TransactionType.WITHDRAW, 25.5, "acc1"),
+        Transaction(TransactionType.TRANSFER, 10.0, "acc1", "acc2"),
+        Transaction(TransactionType.DEPOSIT, 3.0, "acc2"),
+        Transaction(TransactionType.DEPOSIT, 7.25, "acc1"),
+    ]
+
+
+def test_round_trip_and_segment_rotation(tmp_path, transactions):
+    """Test that records spanning several segments read back by account and by id."""
+    with SegmentedLogTransactionStrategy(str(tmp_path), records_per_segment=2) as strategy:
+        strategy.save_transactions(transactions[:3])
+        for transaction in transactions[3:]:
+            strategy.save_transaction(transaction)
+
+        assert len(list(tmp_path.glob("segment-*.log"))) == 3
+        history = strategy.get_transactions_by_account_id("acc1")
+        assert [t.transaction_id for t in history] == [transactions[i].transaction_id for i in (0, 1, 2, 4)]
+        assert [t.transaction_id for t in strategy.get_transactions_by_account_id("acc2")] == [transactions[2].transaction_id, transactions[3].transaction_id]
+
+        transfer = strategy.get_transaction_by_id(transactions[2].transaction_id)
+        assert transfer.transaction_type == TransactionType.TRANSFER
+        assert transfer.amount == 10.0
+        assert transfer.destination_account_id == "acc2"
+        assert transfer.timestamp == transactions[2].timestamp
+        assert strategy.get_transaction_by_id("not-a-uuid") is None
+
+
+def test_recovery_rebuilds_indexes_and_ignores_torn_tail(tmp_path, transactions):
+    """Test that reopening the log restores history and stops at a corrupted record."""
+    with SegmentedLogTransactionStrategy(str(tmp_path), records_per_segment=8, sync=True) as strategy:
+        strategy.save_transactions(transactions)
+
+    # Simulate a torn write of the last record
+    segment = tmp_path / "segment-000000.log"
+    data = bytearray(segment.read_bytes())
+    data[4 * RECORD_SIZE + 20] ^= 0xFF
+    segment.write_bytes(bytes(data))
+
+    with SegmentedLogTransactionStrategy(str(tmp_path), records_per_segment=8) as strategy:
+        assert len(strategy) == 4
+        assert len(strategy.get_transactions_by_account_id("acc1")) == 3
+        assert strategy.get_transaction_by_id(transactions[3].transaction_id).amount == 3.0
+        assert strategy.get_transaction_by_id(transactions[4].transaction_id) is None
+
+        # New writes reuse the torn slot
+        strategy.save_transaction(transactions[4])
+        page = strategy.get_transactions_page("acc1", limit=2)
+        assert len(page.transactions) == 2 and page.next_cursor is not None
+
+    with SegmentedLogTransactionStrategy(str(tmp_path), records_per_segment=8) as strategy:
+        assert len(strategy) == 5
+
+
+def test_rejects_oversized_account_ids(tmp_path):
+    """Test that account ids that do not fit the fixed-width record are refused."""
+    with SegmentedLogTransactionStrategy(str(tmp_path)) as strategy:
+        with pytest.raises(ValueError):
+            strategy.save_transaction(Transaction(TransactionType.DEPOSIT, 1.0, "x" * 40))
+        assert len(strategy) == 0
+
+
+def test_batch_with_an_unstorable_transaction_writes_nothing(tmp_path, transactions):
+    """Test that a batch is encoded up front, so a bad transaction leaves the log untouched for a retry."""
+    bad = Transaction(TransactionType.DEPOSIT, 1.0, "x" * 64)
+    with SegmentedLogTransactionStrategy(str(tmp_path)) as strategy:
+        with pytest.raises(ValueError):
+            strategy.save_transactions([transactions[0], bad, transactions[1]])
+        assert len(strategy) == 0
+        assert strategy.get_transactions_by_account_id("acc1") == []
+        strategy.save_transactions(transactions[:2])
+        assert len(strategy) == 2
@@ -0,0 +1,111 @@
+import pytest
+import sys
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import AccountStatus, AccountType, CheckingAccount, SavingsAccount, Transaction, TransactionType
+from banking_system.domain_layer import CheckingInterestStrategy, SavingsInterestStrategy, LimitConstraint
+from banking_system.infrastructure_layer.strategies.sqlite_account_strategy import SQLiteAccountStrategy
+from banking_system.infrastructure_layer.strategies.sqlite_transaction_strategy import SQLiteTransactionStrategy
+
+
+@pytest.fixture
+def account_strategy(tmp_path):
+    strategy = SQLiteAccountStrategy(str(tmp_path / "bank.db"))
+    yield strategy
+    strategy.close()
+
+@pytest.fixture
+def transaction_strategy(tmp_path):
+    strategy = SQLiteTransactionStrategy(str(tmp_path / "bank.db"))
+    yield strategy
+    strategy.close()
+
+@pytest.fixture
+def savings_account() -> SavingsAccount:
+    return SavingsAccount(AccountType.SAVINGS, 1500.0, SavingsInterestStrategy(0.05), LimitConstraint(daily_limit=500.0, monthly_limit=None))
+
+@pytest.fixture
+def checking_account() -> CheckingAccount:
+    return CheckingAccount(AccountType.CHECKING, 200.0, CheckingInterestStrategy(), None)
+
+
+def test_account_round_trip_and_update(account_strategy, savings_account):
+    """Test that accounts persist across connections and updates bump the version."""
+    account_strategy.create_account(savings_account)
+    with pytest.raises(ValueError):
+        account_strategy.create_account(savings_account)
+
+    view = account_strategy.get_account_by_id(savings_account.account_id)
+    assert isinstance(view, SavingsAccount)
+    assert view.creation_date == savings_account.creation_date
+    assert view.interest_strategy.annual_rate == 0.05
+    assert view.limit_constraint.monthly_limit is None
+
+    view.withdraw(300.0)
+    view.close_account()
+    assert account_strategy.update_account(view, expected_version=0) is True
+    assert view.version == 1
+
+    # Read from another thread, i.e. another pooled connection
+    result = []
+    reader = threading.Thread(target=lambda: result.append(account_strategy.get_account_by_id(savings_account.account_id)))
+    reader.start()
+    reader.join()
+    assert result[0].balance == 1200.0
+    assert result[0].status == AccountStatus.CLOSED
+    assert result[0].version == 1
+    assert account_strategy.get_account_by_id("missing") is None
+
+
+def test_atomic_update_rolls_back_on_version_conflict(account_strategy, savings_account, checking_account):
+    """Test that a transfer-style update writes neither account when one version is stale."""
+    account_strategy.create_account(savings_account)
+    account_strategy.create_account(checking_account)
+    source = account_strategy.get_account_by_id(savings_account.account_id)
+    destination = account_strategy.get_account_by_id(checking_account.account_id)
+    source.transfer(100.0, destination)
+
+    assert account_strategy.update_accounts_atomically(source, destination, expected_versions=(0, 5)) is False
+    assert account_strategy.get_account_by_id(savings_account.account_id).balance == 1500.0
+
+    assert account_strategy.update_accounts_atomically(source, destination, expected_versions=(0, 0)) is True
+    assert account_strategy.get_account_by_id(savings_account.account_id).balance == 1400.0
+    assert account_strategy.get_account_by_id(checking_account.account_id).balance == 300.0
+    assert account_strategy.update_accounts([destination, CheckingAccount(AccountType.CHECKING, 1.0)]) is False
+
+
+def test_transactions_by_account_pages_and_ids(transaction_strategy):
+    """Test bulk saves, time-ordered history including transfers, pagination and id lookups."""
+    base = datetime(2025, 1, 1)
+    transactions = []
+    for minutes in (3, 1, 2, 2, 0):
+        transaction = Transaction(TransactionType.DEPOSIT, 10.0 + minutes, "acc1")
+        transaction.timestamp = base + timedelta(minutes=minutes)
+        transactions.append(transaction)
+    transfer = Transaction(TransactionType.TRANSFER, 5.0, "acc2", "acc1")
+    transfer.timestamp = base + timedelta(minutes=1, seconds=30)
+    transaction_strategy.save_transactions(transactions)
+    transaction_strategy.save_transaction(transfer)
+
+    history = transaction_strategy.get_transactions_by_account_id("acc1")
+    assert [t.timestamp for t in history] == sorted(t.timestamp for t in transactions + [transfer])
+
+    seen, cursor = [], None
+    while True:
+        page = transaction_strategy.get_transactions_page("acc1", cursor=cursor, limit=2)
+        seen.extend(t.transaction_id for t in page.transactions)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == [t.transaction_id for t in history]
+
+    page = transaction_strategy.get_transactions_page("acc1", start=base + timedelta(minutes=1), end=base + timedelta(minutes=2))
+    assert [t.transaction_id for t in page.transactions] == [transactions[1].transaction_id, transfer.transaction_id]
+
+    stored = transaction_strategy.get_transaction_by_id(transfer.transaction_id)
+    assert stored.transaction_type == TransactionType.TRANSFER
+    assert stored.destination_account_id == "acc1"
+    assert transaction_strategy.get_transaction_by_id(Transaction(TransactionType.DEPOSIT, 1.0, "x").transaction_id) is None
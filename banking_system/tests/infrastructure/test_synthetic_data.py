@@ -0,0 +1,102 @@
+import importlib.util
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import TransactionType
+from banking_system.infrastructure_layer.synthetic_data import (
+    TRANSFER_CODE, DatasetSpec, account_id, generate_accounts, generate_transaction_rows, load_accounts,
+    load_transactions, write_account_snapshot, write_sqlite_database, write_transaction_segments,
+)
+from banking_system.infrastructure_layer.strategies.columnar_account_strategy import ColumnarAccountStrategy
+from banking_system.infrastructure_layer.strategies.dictionary_transaction_strategy import DictionaryTransactionStrategy
+from banking_system.infrastructure_layer.strategies.journaled_account_strategy import JournaledAccountStrategy
+from banking_system.infrastructure_layer.strategies.segmented_log_transaction_strategy import SegmentedLogTransactionStrategy
+from banking_system.infrastructure_layer.strategies.sqlite_account_strategy import SQLiteAccountStrategy
+from banking_system.infrastructure_layer.strategies.sqlite_transaction_strategy import SQLiteTransactionStrategy
+
+END = datetime(2026, 1, 1)
+GENERATORS = [False, pytest.param(True, marks=pytest.mark.skipif(
+    importlib.util.find_spec("numpy") is None, reason="the vectorized generator needs numpy"))]
+
+
+def spec(**overrides):
+    settings = dict(accounts=500, transactions=3_000, end=END, days=30, seed=7)
+    settings.update(overrides)
+    return DatasetSpec(**settings)
+
+
+@pytest.mark.parametrize("vectorized", GENERATORS)
+def test_generation_is_reproducible_piecewise_and_shaped_by_the_spec(vectorized):
+    """Test that any range reproduces the same rows, timestamps follow the rows, and skew concentrates activity."""
+    dataset = spec(vectorized=vectorized)
+    accounts = list(generate_accounts(dataset))
+    assert list(generate_accounts(dataset, 123, 321)) == accounts[123:321]
+    assert len({identifier for identifier, _ in accounts}) == 500
+    assert all(uuid.UUID(identifier).version == 4 for identifier, _ in accounts[:20])
+    assert all(fields[0] >= 100 for _, fields in accounts if fields[1] == 1)
+
+    longer = spec(transactions=10_000, vectorized=vectorized)
+    rows = list(generate_transaction_rows(longer))
+    assert len(rows) == 10_000
+    for start, stop in ((0, 1_000), (1_000, 5_000), (4_999, 10_000)):
+        assert list(generate_transaction_rows(longer, start, stop)) == rows[start:stop]
+    assert [row[3] for row in rows] == sorted(row[3] for row in rows)
+    assert longer.start_ns <= rows[0][3] and rows[-1][3] <= longer.end_ns
+    transfers = [row for row in rows if row[1] == TRANSFER_CODE]
+    assert transfers and all(row[5] not in (-1, row[4]) for row in transfers)
+
+    def busiest_share(skew):
+        counts = {}
+        for row in generate_transaction_rows(spec(activity_skew=skew, vectorized=vectorized), 0, 3_000):
+            counts[row[4]] = counts.get(row[4], 0) + 1
+        return max(counts.values()) / 3_000
+
+    assert busiest_share(1.2) > 5 * busiest_share(0)
+    assert all(type(value) in (bytes, int) for value in rows[0])
+
+
+def test_file_layouts_open_in_their_strategies(tmp_path):
+    """Test that parallel-written segments and the account snapshot load as the generated dataset."""
+    dataset = spec()
+    assert write_transaction_segments(dataset, str(tmp_path / "transactions"), records_per_segment=1_000, processes=2) == 3_000
+    assert write_account_snapshot(dataset, str(tmp_path / "accounts"), processes=2) == 500
+
+    rows = list(generate_transaction_rows(dataset, 0, 3_000))
+    with SegmentedLogTransactionStrategy(str(tmp_path / "transactions"), records_per_segment=1_000) as log:
+        assert len(log) == 3_000
+        first = log.get_transaction_by_id(str(uuid.UUID(bytes=rows[0][0])))
+        assert first.account_id == account_id(dataset, rows[0][4]) and first.amount_cents == rows[0][2]
+        history = log.get_transactions_by_account_id(account_id(dataset, rows[-1][4]))
+        assert history[-1].timestamp_ns == rows[-1][3]
+
+    with JournaledAccountStrategy(str(tmp_path / "accounts"), snapshot_interval_s=None) as accounts:
+        identifier, fields = list(generate_accounts(dataset, 42, 43))[0]
+        account = accounts.get_account_by_id(identifier)
+        assert account.balance == fields[0] and account.limit_constraint.daily_limit == 1_000.0
+
+
+def test_loading_into_strategies_and_a_sqlite_database(tmp_path):
+    """Test the generic loaders on in-memory strategies and the bulk SQLite writer."""
+    dataset = spec(transactions=70_000, mix={"deposit": 1, "transfer": 1})
+    columnar, store = ColumnarAccountStrategy(), DictionaryTransactionStrategy(compact=True)
+    assert load_accounts(dataset, columnar) == 500 and len(columnar) == 500
+    assert load_transactions(dataset, store, processes=2) == 70_000
+    sample = account_id(dataset, 3)
+    history = store.get_transactions_by_account_id(sample)
+    assert history and {record.transaction_type for record in history} <= {TransactionType.DEPOSIT, TransactionType.TRANSFER}
+
+    path = str(tmp_path / "bank.db")
+    assert write_sqlite_database(dataset, path, processes=2) == (500, 70_000)
+    accounts, transactions = SQLiteAccountStrategy(path), SQLiteTransactionStrategy(path)
+    try:
+        assert accounts.get_account_by_id(sample).balance == columnar.get_account_by_id(sample).balance
+        assert [record.transaction_id for record in transactions.get_transactions_by_account_id(sample)] == \
+            [record.transaction_id for record in history]
+    finally:
+        accounts.close()
+        transactions.close()
@@ -0,0 +1,64 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system.domain_layer.util.tracing import Tracer, span
+from banking_system.infrastructure_layer.trace_exporter import ChromeTraceExporter
+from banking_system.presentation_layer.utility.tracing_middleware import TracingMiddleware
+
+
+def test_exporter_writes_chrome_trace_events_and_rotates(tmp_path):
+    """Test that traces become complete events in a JSON array file, rotated by size."""
+    path = tmp_path / "traces.json"
+    exporter = ChromeTraceExporter(str(path), max_bytes=2_000, backup_count=2)
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+    for number in range(20):
+        with tracer.start_trace("request", number=number):
+            with span("work"):
+                pass
+    exporter.close()
+
+    names = {file.name for file in tmp_path.iterdir()}
+    assert {"traces.json.1", "traces.json.2"} <= names <= {"traces.json", "traces.json.1", "traces.json.2"}
+    events = json.loads((tmp_path / "traces.json.1").read_text())
+    assert all(json.loads(file.read_text()) for file in tmp_path.iterdir())
+    assert {event["name"] for event in events} <= {"request", "work"}
+    work = next(event for event in events if event["name"] == "work")
+    assert work["ph"] == "X" and work["dur"] >= 0 and work["args"]["parent_id"]
+    assert exporter.exported.value == 20 and exporter.dropped.value == 0
+
+
+def test_middleware_continues_caller_trace_and_returns_its_id(tmp_path):
+    """Test that the traceparent id is used, returned in x-trace-id, and the root span named by route."""
+    exporter = ChromeTraceExporter(str(tmp_path / "traces.json"))
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+
+    class Route:
+        path = "/accounts/{account_id}/balance"
+
+    async def app(scope, receive, send):
+        scope["route"], scope["endpoint"] = Route(), object()
+        with span("endpoint"):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+    middleware = TracingMiddleware(app, tracer=lambda: tracer)
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/accounts/a1/balance",
+             "headers": [(b"traceparent", f"00-{trace_id}-00f067aa0ba902b7-01".encode())]}
+    asyncio.run(middleware(scope, None, send))
+    exporter.close()
+
+    assert (b"x-trace-id", trace_id.encode()) in sent[0]["headers"]
+    events = json.loads((tmp_path / "traces.json").read_text())
+    root = next(event for event in events if "parent_id" not in event["args"])
+    assert root["name"] == "GET /accounts/{account_id}/balance"
+    assert root["args"]["trace_id"] == trace_id and root["args"]["http.status_code"] == 200
+    assert [event["name"] for event in events if event["args"].get("parent_id")] == ["endpoint"]
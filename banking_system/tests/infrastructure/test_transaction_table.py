@@ -0,0 +1,49 @@
+import pytest
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from banking_system import Transaction, TransactionRecord, TransactionType
+from banking_system.infrastructure_layer.strategies.transaction_table import TransactionTable
+
+
+def make_transactions(count):
+    return [
+        Transaction(TransactionType.TRANSFER, 10.0 + row, f"acc-{row % 3}", destination_account_id="acc-dst")
+        if row % 2 else Transaction(TransactionType.DEPOSIT, 10.0 + row, f"acc-{row % 3}")
+        for row in range(count)
+    ]
+
+
+def test_index_grows_and_finds_every_row():
+    """Test that the id index keeps finding every row as it grows past its initial size."""
+    table = TransactionTable(initial_index_size=4)
+    transactions = make_transactions(100)
+    rows = [table.append(transaction) for transaction in transactions]
+
+    assert rows == list(range(100)) and len(table) == 100
+    for row, transaction in enumerate(transactions):
+        assert table.find(uuid.UUID(transaction.transaction_id).bytes) == row
+    assert table.find(uuid.uuid4().bytes) == -1
+
+
+def test_rows_round_trip_as_records():
+    """Test that a stored row decodes to the record of the transaction appended."""
+    table = TransactionTable()
+    transactions = make_transactions(6)
+    for transaction in transactions:
+        table.append(transaction)
+    table.append(TransactionRecord.from_transaction(transactions[0]))
+
+    records = list(table.records(range(len(table))))
+    assert records[:6] == [TransactionRecord.from_transaction(transaction) for transaction in transactions]
+    assert records[0].destination_account_id is None and records[1].destination_account_id == "acc-dst"
+    assert records[6] == records[0]
+    assert table.timestamp_ns(3) == records[3].timestamp_ns
+
+
+def test_index_size_must_be_a_power_of_two():
+    """Test that an index size the probe mask cannot address is rejected."""
+    with pytest.raises(ValueError):
+        TransactionTable(initial_index_size=1000)
@@ -1,4 +1,3 @@
-import uvicorn
 from fastapi import FastAPI
 
 app = FastAPI(title="Banking Application API")
@@ -7,6 +6,9 @@ app = FastAPI(title="Banking Application API")
 
 def run_api():
     """Run the FastAPI application"""
+    # Imported here: the API module imports `app` from this file, and a server that is
+    # not uvicorn should not load it
+    import uvicorn
     # Use a dot notation that doesn't rely on the hyphenated folder name
     uvicorn.run(
         "banking_system.presentation_layer.api_endpoints:app"